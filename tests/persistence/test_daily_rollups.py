@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Tests for the daily fill and PnL rollups
+
+These tests run against fakeredis and mongomock instead of live servers.
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import fakeredis
+import mongomock
+
+from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.fill_repository import FillRepository, FillModel
+from trading_bot.persistence.pnl_repository import PnLRepository, PnLModel
+from trading_bot.persistence.write_behind import WriteBehindQueue
+
+
+class TestDailyRollups(unittest.TestCase):
+    """Test suite for server-side fill and PnL aggregation"""
+
+    def setUp(self):
+        self.db = mongomock.MongoClient().db
+        self.conn_manager = MagicMock(spec=ConnectionManager)
+        self.conn_manager.get_mongo_db.return_value = self.db
+        self.conn_manager.get_redis_client.return_value = fakeredis.FakeRedis(decode_responses=True)
+
+    def _fill(self, timestamp, qty, price, symbol='SPY'):
+        return FillModel(order_internal_id='o1', fill_qty=qty, fill_price=price, timestamp=timestamp,
+                         event_type='partial_fill', symbol=symbol, broker='tradier')
+
+    def test_vwap_combines_rollup_and_partial_days(self):
+        repo = FillRepository(self.conn_manager)
+        day = datetime(2024, 3, 4)
+        fills = [
+            self._fill(day + timedelta(hours=10), 100, 10.0),
+            self._fill(day + timedelta(days=1, hours=10), 50, 12.0),
+            self._fill(day + timedelta(days=1, hours=15), 50, 14.0),
+            self._fill(day + timedelta(days=2, hours=9), 200, 11.0),
+            self._fill(day + timedelta(days=2, hours=16), 100, 20.0),
+            self._fill(day + timedelta(days=1, hours=12), 1000, 1.0, symbol='QQQ'),
+        ]
+        for fill in fills:
+            repo.save_fill(fill)
+
+        self.assertIn('symbol_1_date_1', self.db.fills_daily.index_information())
+        self.assertIn('symbol_1_timestamp_1', self.db.fills.index_information())
+
+        # Partial first day, two whole days
+        start = day + timedelta(hours=12)
+        end = day + timedelta(days=2, hours=23, minutes=59, seconds=59, microseconds=999999)
+        expected = (50 * 12 + 50 * 14 + 200 * 11 + 100 * 20) / 400
+        self.assertAlmostEqual(repo.calculate_vwap('SPY', start, end), expected)
+
+        # Whole first day, partial last day
+        end = day + timedelta(days=2, hours=12)
+        expected = (100 * 10 + 50 * 12 + 50 * 14 + 200 * 11) / 400
+        self.assertAlmostEqual(repo.calculate_vwap('SPY', day, end), expected)
+
+        # Within a single day
+        afternoon = day + timedelta(days=1, hours=14)
+        self.assertAlmostEqual(repo.calculate_vwap('SPY', afternoon, afternoon + timedelta(hours=4)), 14.0)
+        self.assertEqual(repo.calculate_vwap('IWM', day, end), 0.0)
+
+        daily = repo.get_daily_volume('SPY', day, day + timedelta(days=2))
+        self.assertEqual([d['volume'] for d in daily], [100, 100, 300])
+        self.assertAlmostEqual(daily[1]['vwap'], 13.0)
+
+        # Rebuilding from the fills reproduces the incremental rollup
+        before = sorted((d['symbol'], d['date'], d['volume'], d['notional']) for d in self.db.fills_daily.find())
+        self.db.fills_daily.delete_many({})
+        self.assertEqual(repo.rebuild_daily_rollup(), 4)
+        after = sorted((d['symbol'], d['date'], d['volume'], d['notional']) for d in self.db.fills_daily.find())
+        self.assertEqual(after, before)
+
+    def test_rollup_through_write_behind(self):
+        queue = WriteBehindQueue(self.conn_manager)
+        repo = FillRepository(self.conn_manager, write_behind=queue)
+        day = datetime(2024, 3, 4, 10)
+        for i in range(10):
+            repo.save_fill(self._fill(day + timedelta(minutes=i), 10, 100.0 + i))
+
+        # Ten fills, one coalesced rollup increment
+        self.assertEqual(queue.get_metrics()['queue_depth'], 11)
+        queue.flush()
+
+        rollup = self.db.fills_daily.find_one({'symbol': 'SPY'})
+        self.assertEqual((rollup['volume'], rollup['fills']), (100, 10))
+        self.assertAlmostEqual(rollup['notional'], sum(10 * (100.0 + i) for i in range(10)))
+
+    def test_daily_snapshots_and_returns(self):
+        repo = PnLRepository(self.conn_manager)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        closes = [100000.0, 102000.0, 99960.0, 104958.0]
+        for i, close in enumerate(closes):
+            day = today - timedelta(days=len(closes) - 1 - i)
+            for hour, equity in [(10, close - 500.0), (12, close + 700.0), (15, close)]:
+                repo.record_snapshot(PnLModel(day + timedelta(hours=hour), equity, 0.0, 0.0, broker='tradier'))
+            repo.record_snapshot(PnLModel(day + timedelta(hours=15), close / 2, 0.0, 0.0, broker='alpaca'))
+
+        snapshots = repo.get_daily_snapshots(days=10, broker='tradier')
+        self.assertEqual([s.total_equity for s in snapshots], closes)
+        self.assertAlmostEqual(snapshots[1].daily_pnl, 2000.0)
+
+        # Without a broker filter each day sums across brokers
+        combined = repo.get_daily_snapshots(days=10)
+        self.assertEqual([s.total_equity for s in combined], [c * 1.5 for c in closes])
+
+        day = self.db.pnl_daily.find_one({'broker': 'tradier', 'date': today.date().isoformat()})
+        self.assertEqual((day['open_equity'], day['high_equity'], day['low_equity'], day['snapshots']),
+                         (closes[-1] - 500.0, closes[-1] + 700.0, closes[-1] - 500.0, 3))
+
+        returns = repo.calculate_returns(period_days=10)
+        self.assertAlmostEqual(returns['total_return'], 1.5 * (closes[-1] - closes[0]))
+        self.assertAlmostEqual(returns['max_drawdown_pct'], 2.0)
+
+        # Rebuilding from the raw records reproduces the incremental rollup
+        fields = ('broker', 'date', 'open_equity', 'high_equity', 'low_equity', 'close_equity', 'snapshots')
+        before = sorted(tuple(d[f] for f in fields) for d in self.db.pnl_daily.find())
+        self.db.pnl_daily.delete_many({})
+        self.assertEqual(repo.rebuild_daily_rollup(), 8)
+        self.assertEqual(sorted(tuple(d[f] for f in fields) for d in self.db.pnl_daily.find()), before)
+
+    def test_close_is_latest_snapshot_and_missing_brokers_carry_forward(self):
+        queue = WriteBehindQueue(self.conn_manager)
+        repo = PnLRepository(self.conn_manager, write_behind=queue)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        yesterday = today - timedelta(days=1)
+
+        # The 15:00 snapshot arrives before the earlier ones
+        for hour, equity in [(15, 1000.0), (10, 900.0), (12, 950.0)]:
+            repo.record_snapshot(PnLModel(yesterday + timedelta(hours=hour), equity, 0.0, 0.0, broker='tradier'))
+        repo.record_snapshot(PnLModel(yesterday + timedelta(hours=15), 500.0, 0.0, 0.0, broker='alpaca'))
+        # Alpaca records nothing today
+        repo.record_snapshot(PnLModel(today + timedelta(hours=9), 1100.0, 0.0, 0.0, broker='tradier'))
+        queue.flush()
+
+        day = self.db.pnl_daily.find_one({'broker': 'tradier', 'date': yesterday.date().isoformat()})
+        self.assertEqual((day['open_equity'], day['close_equity'], day['high_equity'], day['low_equity']),
+                         (900.0, 1000.0, 1000.0, 900.0))
+
+        snapshots = repo.get_daily_snapshots(days=10)
+        self.assertEqual([s.total_equity for s in snapshots], [1500.0, 1600.0])
+        self.assertAlmostEqual(snapshots[1].daily_pnl, 100.0)
+
+        # A broker whose last close predates the range is carried into it
+        self.assertEqual([s.total_equity for s in repo.get_daily_snapshots(days=0)], [1600.0])
+
+    def test_existing_records_are_backfilled_once(self):
+        day = datetime(2024, 3, 4, 10)
+        self.db.fills.insert_many([
+            {'symbol': 'SPY', 'fill_qty': 100, 'fill_price': 10.0, 'timestamp': day.isoformat()},
+            {'symbol': 'SPY', 'fill_qty': 100, 'fill_price': 12.0, 'timestamp': (day + timedelta(hours=1)).isoformat()}
+        ])
+        today = datetime.now().replace(hour=10, minute=0, second=0, microsecond=0)
+        self.db.pnl_records.insert_one({'timestamp': today.isoformat(), 'total_equity': 1000.0,
+                                        'unrealized_pnl': 0.0, 'realized_pnl': 0.0, 'broker': 'tradier'})
+
+        fills = FillRepository(self.conn_manager)
+        self.assertAlmostEqual(fills.calculate_vwap('SPY', datetime(2024, 3, 4), datetime(2024, 3, 5)), 11.0)
+        self.assertEqual([s.total_equity for s in PnLRepository(self.conn_manager).get_daily_snapshots()],
+                         [1000.0])
+
+        # Later repositories leave the rollup alone
+        fills.save_fill(self._fill(day + timedelta(hours=2), 100, 14.0))
+        FillRepository(self.conn_manager)
+        self.assertEqual(self.db.fills_daily.find_one({'symbol': 'SPY'})['volume'], 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the Redis hot-state layer and position sync
+
+These tests run against fakeredis and mongomock instead of live servers.
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+import mongomock
+
+from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.redis_repository import RedisRepository
+from trading_bot.persistence.position_repository import PositionRepository, PositionModel
+
+
+class TestRedisStateLayer(unittest.TestCase):
+    """Test suite for indexed Redis repositories and dirty-set syncing"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        self.db = mongomock.MongoClient().db
+        self.conn_manager = MagicMock(spec=ConnectionManager)
+        self.conn_manager.get_redis_client.return_value = self.redis
+        self.conn_manager.get_mongo_db.return_value = self.db
+
+        # Any KEYS call would scan the whole keyspace
+        patcher = patch.object(self.redis, 'keys', side_effect=AssertionError("KEYS used"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _positions(self, n, price=100.0):
+        return [
+            PositionModel(symbol=f"SYM{i}", quantity=10, avg_cost=price, broker="tradier")
+            for i in range(n)
+        ]
+
+    def test_index_listing_and_delete(self):
+        repo = RedisRepository(self.conn_manager, 'orders', id_field='internal_id')
+        repo.save_many([{'internal_id': f'o{i}', 'status': 'new'} for i in range(1200)])
+        repo.save({'internal_id': 'o5', 'status': 'filled'})
+
+        self.assertEqual(repo.count(), 1200)
+        self.assertEqual(len(repo.find_all()), 1200)
+        self.assertEqual(repo.find_by_ids(['o5', 'missing']), {'o5': {'internal_id': 'o5', 'status': 'filled'}})
+
+        self.assertTrue(repo.delete('o5'))
+        self.assertEqual(repo.count(), 1199)
+
+        # Keys removed behind the repository's back are pruned from the index
+        self.redis.delete('orders:o6')
+        self.assertEqual(len(repo.find_all()), 1198)
+        self.assertEqual(repo.count(), 1198)
+
+    def test_legacy_keys_are_indexed_with_scan(self):
+        for i in range(50):
+            self.redis.set(f"positions:tradier:SYM{i}", json.dumps({'position_id': f"tradier:SYM{i}"}))
+        self.redis.set("other:key", "x")
+
+        repo = RedisRepository(self.conn_manager, 'positions', id_field='position_id')
+        self.assertEqual(repo.count(), 50)
+        self.assertIn('tradier:SYM7', set(repo.iter_ids()))
+
+    def test_legacy_keys_indexed_when_saving_first(self):
+        for i in range(20):
+            self.redis.set(f"orders:legacy{i}", json.dumps({'internal_id': f"legacy{i}"}))
+
+        RedisRepository(self.conn_manager, 'orders', id_field='internal_id').save({'internal_id': 'new'})
+        repo = RedisRepository(self.conn_manager, 'orders', id_field='internal_id')
+        self.assertEqual(repo.count(), 21)
+
+        # The migration runs once per prefix, not once per instance
+        with patch.object(self.redis, 'scan_iter', side_effect=AssertionError("SCAN used")):
+            RedisRepository(self.conn_manager, 'orders', id_field='internal_id').save({'internal_id': 'x'})
+        self.assertEqual(repo.count(), 22)
+
+    def test_sync_writes_only_dirty_positions(self):
+        position_repo = PositionRepository(self.conn_manager)
+        position_repo.load_positions(self._positions(200))
+
+        self.assertEqual(position_repo.sync_to_durable_storage(), 200)
+        self.assertEqual(self.db.positions.count_documents({}), 200)
+        self.assertEqual(position_repo.sync_to_durable_storage(), 0)
+
+        changed = PositionModel(symbol="SYM3", quantity=25, avg_cost=101.0, broker="tradier")
+        position_repo.redis_repo.update(changed.position_id, changed)
+
+        with patch.object(position_repo.redis_repo, 'find_by_ids',
+                          wraps=position_repo.redis_repo.find_by_ids) as find_by_ids:
+            self.assertEqual(position_repo.sync_to_durable_storage(), 1)
+        find_by_ids.assert_called_once_with(['tradier:SYM3'])
+
+        self.assertEqual(self.db.positions.count_documents({}), 200)
+        self.assertEqual(self.db.positions.find_one({'position_id': 'tradier:SYM3'})['quantity'], 25)
+
+        self.assertEqual(position_repo.sync_to_durable_storage(full=True), 200)
+
+    def test_failed_sync_keeps_positions_dirty(self):
+        position_repo = PositionRepository(self.conn_manager)
+        position_repo.load_positions(self._positions(3))
+
+        with patch.object(mongomock.collection.Collection, 'bulk_write', side_effect=RuntimeError("down")):
+            with self.assertRaises(RuntimeError):
+                position_repo.sync_to_durable_storage()
+
+        # The unsynced positions are merged with later changes
+        position_repo.load_positions(self._positions(5))
+        self.assertEqual(position_repo.sync_to_durable_storage(), 5)
+        self.assertEqual(self.db.positions.count_documents({}), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
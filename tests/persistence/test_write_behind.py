@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-behind persistence queue
+
+These tests run against mongomock instead of a MongoDB server.
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import mongomock
+
+from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.write_behind import WriteBehindQueue
+
+
+class TestWriteBehindQueue(unittest.TestCase):
+    """Test suite for the write-behind queue"""
+
+    def setUp(self):
+        self.db = mongomock.MongoClient().db
+        self.conn_manager = MagicMock(spec=ConnectionManager)
+        self.conn_manager.get_mongo_db.return_value = self.db
+        self.journal_dir = tempfile.mkdtemp()
+        self.journal_path = os.path.join(self.journal_dir, 'write_behind.journal')
+
+    def tearDown(self):
+        shutil.rmtree(self.journal_dir)
+
+    def _queue(self, **kwargs):
+        queue = WriteBehindQueue(self.conn_manager, journal_path=self.journal_path, fsync=False, **kwargs)
+        self.addCleanup(lambda: queue._journal and queue._journal.close())
+        return queue
+
+    def test_upserts_coalesce_per_entity(self):
+        queue = self._queue()
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'new', 'filled_quantity': 0})
+        queue.upsert('orders', {'internal_id': 'o2'}, {'status': 'new'})
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'partially_filled', 'filled_quantity': 5})
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'filled', 'filled_quantity': 10})
+
+        self.assertEqual(queue.get_metrics()['queue_depth'], 2)
+        self.assertEqual(queue.flush(), 2)
+
+        order = self.db.orders.find_one({'internal_id': 'o1'})
+        self.assertEqual((order['status'], order['filled_quantity']), ('filled', 10))
+        self.assertEqual(self.db.orders.count_documents({}), 2)
+
+        metrics = queue.get_metrics()
+        self.assertEqual((metrics['enqueued'], metrics['coalesced'], metrics['flushes']), (4, 2, 1))
+        self.assertEqual(metrics['journal_bytes'], 0)
+
+    def test_update_operators_coalesce(self):
+        queue = self._queue()
+        key = {'symbol': 'SPY', 'date': '2024-03-04'}
+        for qty, price in [(10, 101.0), (5, 99.0), (20, 100.5)]:
+            queue.upsert('fills_daily', key, update={
+                '$inc': {'volume': qty, 'fills': 1},
+                '$min': {'low': price},
+                '$max': {'high': price},
+                '$setOnInsert': {'open': price}
+            }, fields={'close': price})
+
+        self.assertEqual(queue.get_metrics()['queue_depth'], 1)
+        queue.flush()
+
+        day = self.db.fills_daily.find_one(key)
+        self.assertEqual((day['volume'], day['fills'], day['low'], day['high'], day['open'], day['close']),
+                         (35, 3, 99.0, 101.0, 101.0, 100.5))
+
+        with self.assertRaises(ValueError):
+            queue.upsert('fills_daily', key, update={'$push': {'prices': 1.0}})
+
+    def test_inserts_flush_in_batches(self):
+        queue = self._queue(max_batch_size=500)
+        ids = [queue.insert('fills', {'fill_id': f'f{i}', 'fill_qty': 1}) for i in range(1200)]
+        queue.insert('pnl_records', {'total_equity': 100000.0})
+
+        self.assertEqual(queue.flush(), 1201)
+        self.assertEqual(queue.flushes, 3)
+        self.assertEqual(self.db.fills.count_documents({}), 1200)
+        self.assertEqual(str(self.db.fills.find_one({'fill_id': 'f7'})['_id']), ids[7])
+        self.assertEqual(self.db.pnl_records.count_documents({}), 1)
+
+    def test_failed_flush_keeps_writes_queued(self):
+        queue = self._queue()
+        queue.insert('fills', {'fill_id': 'f1'})
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'partially_filled'})
+
+        self.conn_manager.get_mongo_db.side_effect = ConnectionError("mongo down")
+        with self.assertRaises(ConnectionError):
+            queue.flush()
+
+        # A newer update for the same order merges into the requeued one
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'filled'})
+        metrics = queue.get_metrics()
+        self.assertEqual((metrics['queue_depth'], metrics['flush_failures']), (2, 1))
+
+        self.conn_manager.get_mongo_db.side_effect = None
+        self.assertEqual(queue.flush(), 2)
+        self.assertEqual(self.db.orders.find_one({'internal_id': 'o1'})['status'], 'filled')
+        self.assertEqual(self.db.fills.count_documents({}), 1)
+
+    def test_partial_failure_requeues_unapplied_writes_only(self):
+        queue = self._queue()
+        key = {'symbol': 'SPY', 'date': '2024-03-04'}
+        queue.insert('fills', {'fill_id': 'f1', 'fill_qty': 100})
+        queue.upsert('fills_daily', key, update={'$inc': {'volume': 100, 'notional': 1000.0, 'fills': 1}})
+        queue.insert('pnl_records', {'total_equity': 100000.0})
+
+        bulk_write = mongomock.collection.Collection.bulk_write
+
+        def fail_pnl_records(collection, ops, **kwargs):
+            if collection.name == 'pnl_records':
+                raise ConnectionError("mongo down")
+            return bulk_write(collection, ops, **kwargs)
+
+        with patch.object(mongomock.collection.Collection, 'bulk_write', autospec=True,
+                          side_effect=fail_pnl_records):
+            with self.assertRaises(ConnectionError):
+                queue.flush()
+
+        self.assertEqual(queue.get_metrics()['queue_depth'], 1)
+        self.assertEqual(queue.flush(), 1)
+
+        # The rollup increment that already committed is not applied again
+        day = self.db.fills_daily.find_one(key)
+        self.assertEqual((day['volume'], day['notional'], day['fills']), (100, 1000.0, 1))
+        self.assertEqual(self.db.fills.count_documents({}), 1)
+        self.assertEqual(self.db.pnl_records.count_documents({}), 1)
+
+    def test_journal_replays_unflushed_writes(self):
+        queue = self._queue(max_batch_size=1)
+        queue.insert('fills', {'fill_id': 'f1'})
+        queue.insert('fills', {'fill_id': 'f2'})
+        queue.upsert('orders', {'internal_id': 'o1'}, {'status': 'filled'})
+
+        # Only the first write is flushed before the process dies
+        self.assertEqual(queue._flush_batch(), 1)
+        queue._journal.close()
+
+        # f2 reached MongoDB but its commit was never journaled
+        self.db.fills.insert_one(dict(next(iter(queue._pending.values()))['document']))
+
+        recovered = self._queue()
+        self.assertEqual(recovered.get_metrics()['queue_depth'], 2)
+        self.assertEqual(recovered.flush(), 2)
+
+        self.assertEqual(sorted(doc['fill_id'] for doc in self.db.fills.find()), ['f1', 'f2'])
+        self.assertEqual(self.db.orders.find_one({'internal_id': 'o1'})['status'], 'filled')
+
+        # New sequence numbers continue after the recovered ones
+        recovered.insert('fills', {'fill_id': 'f3'})
+        self.assertEqual(recovered._sequence, 4)
+
+    def test_background_flush(self):
+        queue = self._queue(flush_interval=0.01)
+        queue.start()
+        try:
+            for i in range(20):
+                queue.upsert('orders', {'internal_id': f'o{i % 4}'}, {'status': f's{i}'})
+
+            deadline = time.time() + 2.0
+            while self.db.orders.count_documents({}) < 4 and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            queue.stop()
+
+        self.assertEqual(sorted(doc['status'] for doc in self.db.orders.find()), ['s16', 's17', 's18', 's19'])
+        metrics = queue.get_metrics()
+        self.assertEqual(metrics['queue_depth'], 0)
+        self.assertGreater(metrics['flush_latency_ms']['max'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
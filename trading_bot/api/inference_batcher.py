@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Inference Batcher for the Prediction Service
+
+Concurrent prediction requests are queued for a few milliseconds and scored
+together, so each model sees one vectorized call per batch instead of one
+call per HTTP request. Feature dictionaries are written straight into a
+NumPy array through a cached feature name -> column index mapping per model.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Hashable
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureLayout:
+    """Column order a model expects, with a cached name -> index mapping."""
+
+    def __init__(self, feature_names: List[str], named: bool = False):
+        """
+        Initialize the layout
+
+        Args:
+            feature_names: Feature names in model column order
+            named: Whether the model was fitted on named columns (and should
+                get a DataFrame view of the array rather than the bare array)
+        """
+        self.feature_names = [str(name) for name in feature_names]
+        self.index = {name: i for i, name in enumerate(self.feature_names)}
+        self.named = named
+
+    @classmethod
+    def for_model(cls, model_package: Dict[str, Any], sample: Dict[str, float]) -> 'FeatureLayout':
+        """
+        Build the layout for a loaded model
+
+        Uses the fitted feature names of the model, then the 'feature_names'
+        entry of the model package, then the key order of a sample request.
+
+        Args:
+            model_package: Loaded model package with a 'model' entry
+            sample: Feature dictionary of a request
+
+        Returns:
+            FeatureLayout for the model
+        """
+        names = getattr(model_package.get('model'), 'feature_names_in_', None)
+        if names is not None:
+            return cls(list(names), named=True)
+        if model_package.get('feature_names'):
+            return cls(model_package['feature_names'])
+        return cls(list(sample))
+
+    def missing(self, row: Dict[str, float]) -> List[str]:
+        """
+        Get the model features a feature dictionary does not provide
+
+        Args:
+            row: Feature dictionary of a request
+
+        Returns:
+            Missing feature names in model column order
+        """
+        return [name for name in self.feature_names if name not in row]
+
+    def matrix(self, rows: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Fill a feature matrix from feature dictionaries
+
+        Features the model does not use are ignored; missing ones are NaN
+        (callers should reject such rows with missing() first).
+
+        Args:
+            rows: Feature dictionaries, one per request
+
+        Returns:
+            Array of shape (len(rows), n_features)
+        """
+        X = np.full((len(rows), len(self.feature_names)), np.nan)
+        index = self.index
+        for i, row in enumerate(rows):
+            out = X[i]
+            for name, value in row.items():
+                j = index.get(name)
+                if j is not None:
+                    out[j] = value
+        return X
+
+    def model_input(self, X: np.ndarray) -> Any:
+        """
+        Wrap a feature matrix for the model without copying it
+
+        Args:
+            X: Matrix from matrix()
+
+        Returns:
+            DataFrame view for models fitted on named columns, else X
+        """
+        if self.named:
+            return pd.DataFrame(X, columns=self.feature_names, copy=False)
+        return X
+
+
+class InferenceMetrics:
+    """Request latency and batch size statistics over a recent window."""
+
+    def __init__(self, history: int = 10000):
+        """
+        Initialize the metrics
+
+        Args:
+            history: Number of recent requests and batches kept for percentiles
+        """
+        self.latencies_ms = deque(maxlen=history)
+        self.batch_sizes = deque(maxlen=history)
+        self.requests = 0
+        self.batches = 0
+        self.errors = 0
+
+    def record(self, latencies_s: List[float], failed: bool = False, errors: Optional[int] = None) -> None:
+        """
+        Record a scored batch
+
+        Args:
+            latencies_s: Per-request latency in seconds (queue wait included)
+            failed: Whether the batch raised
+            errors: Number of failed requests (default: all of them if failed)
+        """
+        self.latencies_ms.extend(latency * 1000.0 for latency in latencies_s)
+        self.batch_sizes.append(len(latencies_s))
+        self.requests += len(latencies_s)
+        self.batches += 1
+        if errors is None:
+            errors = len(latencies_s) if failed else 0
+        self.errors += errors
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get latency percentiles and batch size statistics
+
+        Returns:
+            Dictionary with counters, 'latency_ms' and 'batch_size' summaries
+        """
+        metrics = {'requests': self.requests, 'batches': self.batches, 'errors': self.errors}
+        for key, values in (('latency_ms', self.latencies_ms), ('batch_size', self.batch_sizes)):
+            if values:
+                array = np.fromiter(values, dtype=float, count=len(values))
+                p50, p99 = np.percentile(array, [50, 99])
+                metrics[key] = {'mean': float(array.mean()), 'p50': float(p50),
+                                'p99': float(p99), 'max': float(array.max())}
+            else:
+                metrics[key] = {'mean': 0.0, 'p50': 0.0, 'p99': 0.0, 'max': 0.0}
+        return metrics
+
+
+class InferenceBatcher:
+    """
+    Collects concurrent requests into micro-batches.
+
+    The first request of a batch waits at most max_wait_ms for others to
+    arrive. Requests are grouped by key (one key per model or ensemble) and
+    each group is passed to its handler in a single call on a worker thread,
+    so scoring does not block the event loop and new requests keep queueing
+    while a batch runs. If a batch call raises, its requests are scored one
+    by one, so a bad request only fails itself.
+    """
+
+    def __init__(self, max_batch_size: int = 64, max_wait_ms: float = 2.0,
+                 metrics: Optional[InferenceMetrics] = None):
+        """
+        Initialize the batcher
+
+        Args:
+            max_batch_size: Largest number of requests scored together
+            max_wait_ms: Longest time a request waits for its batch to fill
+            metrics: Metrics to record into (a new InferenceMetrics by default)
+        """
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.metrics = metrics or InferenceMetrics()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+        self._loop = None
+        self._queue = None
+        self._task = None
+
+    def _ensure_started(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not loop or self._task is None or self._task.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run())
+
+    async def submit(self, key: Hashable, handler: Callable[[List[Any]], List[Any]], item: Any) -> Any:
+        """
+        Queue a request and wait for its result
+
+        Args:
+            key: Batch group; requests with the same key share a handler call
+            handler: Scores a list of items and returns one result per item
+            item: Request payload
+
+        Returns:
+            Result for this item (exceptions raised by the handler propagate)
+        """
+        loop = asyncio.get_running_loop()
+        self._ensure_started(loop)
+        future = loop.create_future()
+        self._queue.put_nowait((key, handler, item, future, time.perf_counter()))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        while True:
+            pending = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                if not queue.empty():
+                    pending.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            groups: Dict[Hashable, List[tuple]] = {}
+            for entry in pending:
+                groups.setdefault(entry[0], []).append(entry)
+            for entries in groups.values():
+                await self._execute(loop, entries)
+
+    async def _execute(self, loop: asyncio.AbstractEventLoop, entries: List[tuple]) -> None:
+        handler = entries[0][1]
+        items = [entry[2] for entry in entries]
+        try:
+            results = await loop.run_in_executor(self._executor, handler, items)
+            outcomes = [(result, None) for result in results]
+        except Exception as e:
+            if len(items) == 1:
+                outcomes = [(None, e)]
+            else:
+                outcomes = [await self._execute_one(loop, handler, item) for item in items]
+
+        errors = 0
+        for entry, (result, error) in zip(entries, outcomes):
+            errors += error is not None
+            if entry[3].done():
+                continue
+            if error is not None:
+                entry[3].set_exception(error)
+            else:
+                entry[3].set_result(result)
+
+        now = time.perf_counter()
+        self.metrics.record([now - entry[4] for entry in entries], errors=errors)
+
+    async def _execute_one(self, loop: asyncio.AbstractEventLoop,
+                           handler: Callable[[List[Any]], List[Any]], item: Any) -> tuple:
+        try:
+            return (await loop.run_in_executor(self._executor, handler, [item]))[0], None
+        except Exception as e:
+            return None, e
+
+    async def close(self) -> None:
+        """Stop the batching task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
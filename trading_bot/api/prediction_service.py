@@ -8,14 +8,20 @@ This module provides a REST API for making predictions with trained models.
 
 import os
 import json
-import pickle
+import time
+import functools
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 
+from trading_bot.api.inference_batcher import FeatureLayout, InferenceBatcher, InferenceMetrics
+from trading_bot.ml_pipeline.model_cache import LazyModelMapping, get_model_cache
+
 # Create FastAPI app
 app = FastAPI(
     title="Trading Bot Prediction API",
@@ -26,9 +32,19 @@ app = FastAPI(
 # Set default model directory
 DEFAULT_MODEL_DIR = os.environ.get('MODEL_DIR', './output/models/latest')
 
+# Inference server mode: queue concurrent requests and score them in micro-batches
+BATCHING_ENABLED = os.environ.get('PREDICTION_BATCHING', 'false').lower() in ('1', 'true', 'yes')
+BATCH_MAX_SIZE = int(os.environ.get('PREDICTION_BATCH_SIZE', 64))
+BATCH_MAX_WAIT_MS = float(os.environ.get('PREDICTION_BATCH_WAIT_MS', 2.0))
+ENSEMBLE_WORKERS = int(os.environ.get('PREDICTION_ENSEMBLE_WORKERS', 4))
+
 # Global variables
 loaded_models = {}
 model_metadata = None
+feature_layouts: Dict[str, FeatureLayout] = {}
+inference_metrics = InferenceMetrics()
+batcher = InferenceBatcher(BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, inference_metrics) if BATCHING_ENABLED else None
+ensemble_executor = ThreadPoolExecutor(max_workers=ENSEMBLE_WORKERS, thread_name_prefix="ensemble")
 
 # Model and data schemas
 class PredictionFeatures(BaseModel):
@@ -56,20 +72,42 @@ class ModelInfo(BaseModel):
     metrics: Dict[str, Any]
     timestamp: str
 
+def _as_model_package(model: Any) -> Dict[str, Any]:
+    """
+    Put a loaded model file in model package form.
+    
+    The model cache holds file contents as loaded, shared with other users
+    of the same files, so the package is built after the cache lookup.
+    
+    Args:
+        model: Object loaded from a pickled model or model package
+        
+    Returns:
+        Dictionary with at least a 'model' entry
+    """
+    if isinstance(model, dict) and 'model' in model:
+        return model
+    # Direct model object
+    return {'model': model}
+
 def load_models(model_dir: str = DEFAULT_MODEL_DIR) -> Dict[str, Any]:
     """
-    Load all models from the specified directory.
+    Index all models in the specified directory.
+    
+    Models are unpickled on first use and kept in the shared model cache,
+    so startup time does not depend on the number of model files.
     
     Args:
         model_dir: Directory containing model files
         
     Returns:
-        Dictionary of loaded models
+        Mapping of model name to model package (loaded on access)
     """
-    global loaded_models, model_metadata
+    global loaded_models, model_metadata, feature_layouts
     
     # Reset loaded models
     loaded_models = {}
+    feature_layouts = {}
     
     # Check if directory exists
     if not os.path.exists(model_dir):
@@ -87,26 +125,14 @@ def load_models(model_dir: str = DEFAULT_MODEL_DIR) -> Dict[str, Any]:
             'models': []
         }
     
-    # Load each model from the directory
+    # Index each model in the directory
+    model_paths = {}
     for filename in os.listdir(model_dir):
         if filename.endswith('.pkl'):
-            model_name = filename.replace('.pkl', '')
-            model_path = os.path.join(model_dir, filename)
-            
-            try:
-                with open(model_path, 'rb') as f:
-                    model_package = pickle.load(f)
-                    
-                # Extract model and relevant information
-                if isinstance(model_package, dict) and 'model' in model_package:
-                    loaded_models[model_name] = model_package
-                    print(f"Loaded model {model_name} from {model_path}")
-                else:
-                    # Direct model object
-                    loaded_models[model_name] = {'model': model_package}
-                    print(f"Loaded model {model_name} from {model_path}")
-            except Exception as e:
-                print(f"Error loading model {model_name}: {str(e)}")
+            model_paths[filename.replace('.pkl', '')] = os.path.join(model_dir, filename)
+    
+    loaded_models = LazyModelMapping(model_paths, wrap=_as_model_package)
+    print(f"Indexed {len(loaded_models)} models in {model_dir}")
     
     return loaded_models
 
@@ -116,10 +142,180 @@ async def startup_event():
     """Load models when the API starts."""
     try:
         load_models()
-        print(f"Loaded {len(loaded_models)} models successfully")
     except Exception as e:
         print(f"Error loading models: {str(e)}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the inference batcher."""
+    if batcher is not None:
+        await batcher.close()
+
+def _feature_layout(model_name: str, sample: Dict[str, float]) -> FeatureLayout:
+    """
+    Get the cached feature layout of a model.
+    
+    Args:
+        model_name: Name of a loaded model
+        sample: Feature dictionary of a request (used when the model does not
+            record its feature names)
+        
+    Returns:
+        FeatureLayout for the model
+    """
+    layout = feature_layouts.get(model_name)
+    if layout is None:
+        layout = FeatureLayout.for_model(loaded_models[model_name], sample)
+        feature_layouts[model_name] = layout
+    return layout
+
+def _check_features(model_names: List[str], features: Dict[str, float]) -> None:
+    """
+    Reject a request that lacks features the models need.
+    
+    Validation happens before the request is queued, so a malformed request
+    fails on its own instead of failing the batch it would have joined.
+    
+    Args:
+        model_names: Names of the loaded models that will score the request
+        features: Feature dictionary of the request
+        
+    Raises:
+        HTTPException: 422 listing the missing features
+    """
+    missing = []
+    for name in model_names:
+        missing.extend(feature for feature in _feature_layout(name, features).missing(features)
+                       if feature not in missing)
+    if missing:
+        raise HTTPException(status_code=422, detail=f"Missing features: {', '.join(missing)}")
+
+def _predict_batch(model_name: str, requests: List[PredictionFeatures]) -> List[Dict[str, Any]]:
+    """
+    Score a batch of requests with one model call.
+    
+    Args:
+        model_name: Name of a loaded model
+        requests: Prediction requests
+        
+    Returns:
+        List of dictionaries with 'prediction' and 'probability', one per request
+    """
+    model = loaded_models[model_name].get('model')
+    layout = _feature_layout(model_name, requests[0].features)
+    X = layout.model_input(layout.matrix([request.features for request in requests]))
+    
+    predictions = np.asarray(model.predict(X)).tolist()
+    probabilities = [None] * len(requests)
+    if hasattr(model, 'predict_proba'):
+        try:
+            probabilities = np.asarray(model.predict_proba(X)).max(axis=1).astype(float).tolist()
+        except:
+            pass
+    
+    return [{'prediction': prediction, 'probability': probability}
+            for prediction, probability in zip(predictions, probabilities)]
+
+def _ensemble_member_columns(name: str, X: Any) -> Dict[str, np.ndarray]:
+    """Prediction and class probability columns of one regime model for the meta-model."""
+    model = loaded_models[name].get('model')
+    columns = {f"{name}_pred": np.asarray(model.predict(X))}
+    if hasattr(model, 'predict_proba'):
+        proba = np.asarray(model.predict_proba(X))
+        for i in range(proba.shape[1]):
+            columns[f"{name}_prob_{i}"] = proba[:, i]
+    return columns
+
+def _ensemble_batch(requests: List[PredictionFeatures]) -> List[Dict[str, Any]]:
+    """
+    Score a batch of requests with the regime models and the meta-model.
+    
+    Regime models run concurrently, each with one call for the whole batch;
+    the meta-model then scores their outputs with one call.
+    
+    Args:
+        requests: Prediction requests
+        
+    Returns:
+        List of dictionaries with 'prediction', 'probability' and
+        'ensemble_features', one per request
+    """
+    regime_models = [name for name in loaded_models if name.startswith('regime_')]
+    
+    # Fill one feature matrix per distinct layout
+    matrices = {}
+    member_inputs = {}
+    for name in regime_models:
+        layout = _feature_layout(name, requests[0].features)
+        key = (tuple(layout.feature_names), layout.named)
+        if key not in matrices:
+            matrices[key] = layout.model_input(layout.matrix([request.features for request in requests]))
+        member_inputs[name] = matrices[key]
+    
+    futures = [(name, ensemble_executor.submit(_ensemble_member_columns, name, member_inputs[name]))
+               for name in regime_models]
+    columns = {}
+    for name, future in futures:
+        try:
+            columns.update(future.result())
+        except Exception as e:
+            print(f"Ensemble member {name} failed: {str(e)}")
+    
+    # Create ensemble feature DataFrame
+    ensemble_df = pd.DataFrame(columns, index=range(len(requests)))
+    
+    # If we have regime column, add it
+    regimes = [request.regime for request in requests]
+    if any(regimes):
+        ensemble_df['regime'] = regimes
+    
+    meta_model = loaded_models['meta_model'].get('model')
+    meta_features = getattr(meta_model, 'feature_names_in_', None)
+    if meta_features is not None:
+        ensemble_df = ensemble_df.reindex(columns=list(meta_features))
+    
+    predictions = np.asarray(meta_model.predict(ensemble_df)).tolist()
+    probabilities = [None] * len(requests)
+    if hasattr(meta_model, 'predict_proba'):
+        try:
+            probabilities = np.asarray(meta_model.predict_proba(ensemble_df)).max(axis=1).astype(float).tolist()
+        except:
+            pass
+    
+    member_values = {column: values.tolist() for column, values in columns.items()}
+    return [
+        {
+            'prediction': prediction,
+            'probability': probability,
+            'ensemble_features': {column: values[i] for column, values in member_values.items()}
+        }
+        for i, (prediction, probability) in enumerate(zip(predictions, probabilities))
+    ]
+
+async def _score(key: Any, handler, features: PredictionFeatures) -> Dict[str, Any]:
+    """
+    Score one request, through the batcher in inference server mode.
+    
+    Args:
+        key: Batch group of the request
+        handler: Batch scoring function
+        features: Prediction request
+        
+    Returns:
+        Result dictionary of the handler for this request
+    """
+    if batcher is not None:
+        return await batcher.submit(key, handler, features)
+    
+    start = time.perf_counter()
+    try:
+        result = handler([features])[0]
+    except Exception:
+        inference_metrics.record([time.perf_counter() - start], failed=True)
+        raise
+    inference_metrics.record([time.perf_counter() - start])
+    return result
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -211,26 +407,13 @@ async def predict(features: PredictionFeatures, model_name: str = None):
     if model_name not in loaded_models:
         raise HTTPException(status_code=404, detail=f"Model {model_name} not found")
     
-    # Get model package
-    model_package = loaded_models[model_name]
-    model = model_package.get('model')
-    
-    # Convert features to DataFrame for prediction
     feature_dict = features.features
-    feature_df = pd.DataFrame([feature_dict])
+    _check_features([model_name], feature_dict)
     
     # Make prediction
     try:
-        prediction = model.predict(feature_df)[0]
-        
-        # Try to get probability if applicable
-        probability = None
-        if hasattr(model, 'predict_proba'):
-            try:
-                proba = model.predict_proba(feature_df)[0]
-                probability = float(proba.max())
-            except:
-                pass
+        model = loaded_models[model_name].get('model')
+        result = await _score(('predict', model_name), functools.partial(_predict_batch, model_name), features)
         
         # Try to get feature importance/explanation
         explanation = None
@@ -243,8 +426,8 @@ async def predict(features: PredictionFeatures, model_name: str = None):
         
         # Create response
         return PredictionResponse(
-            prediction=prediction,
-            probability=probability,
+            prediction=result['prediction'],
+            probability=result['probability'],
             regime=features.regime,
             model_name=model_name,
             model_version=model_metadata.get('run_id', 'unknown') if model_metadata else 'unknown',
@@ -274,69 +457,41 @@ async def predict_ensemble(features: PredictionFeatures):
     if 'meta_model' not in loaded_models:
         raise HTTPException(status_code=404, detail="Ensemble meta-model not found")
     
-    # Get regime models
-    regime_models = {name: model for name, model in loaded_models.items() 
-                    if name.startswith('regime_')}
-    
+    # Check if we have regime models
+    regime_models = [name for name in loaded_models if name.startswith('regime_')]
     if not regime_models:
         raise HTTPException(status_code=404, detail="No regime models found for ensemble")
+    _check_features(regime_models, features.features)
     
-    # Convert features to DataFrame
-    feature_dict = features.features
-    feature_df = pd.DataFrame([feature_dict])
-    
-    # Make predictions with each regime model
-    ensemble_features = {}
-    for name, model_package in regime_models.items():
-        model = model_package.get('model')
-        try:
-            # Get prediction
-            pred = model.predict(feature_df)[0]
-            ensemble_features[f"{name}_pred"] = pred
-            
-            # Try to get probability if applicable
-            if hasattr(model, 'predict_proba'):
-                proba = model.predict_proba(feature_df)[0]
-                for i, p in enumerate(proba):
-                    ensemble_features[f"{name}_prob_{i}"] = p
-        except:
-            pass
-    
-    # Create ensemble feature DataFrame
-    ensemble_df = pd.DataFrame([ensemble_features])
-    
-    # If we have regime column, add it
-    if features.regime:
-        ensemble_df['regime'] = features.regime
-    
-    # Make prediction with meta-model
-    meta_model = loaded_models['meta_model'].get('model')
     try:
-        prediction = meta_model.predict(ensemble_df)[0]
-        
-        # Try to get probability if applicable
-        probability = None
-        if hasattr(meta_model, 'predict_proba'):
-            try:
-                proba = meta_model.predict_proba(ensemble_df)[0]
-                probability = float(proba.max())
-            except:
-                pass
+        result = await _score(('ensemble',), _ensemble_batch, features)
         
         # Create response
         return PredictionResponse(
-            prediction=prediction,
-            probability=probability,
+            prediction=result['prediction'],
+            probability=result['probability'],
             regime=features.regime,
             model_name='ensemble',
             model_version=model_metadata.get('run_id', 'unknown') if model_metadata else 'unknown',
             timestamp=datetime.now().isoformat(),
-            explanation={'ensemble_features': ensemble_features}
+            explanation={'ensemble_features': result['ensemble_features']}
         )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ensemble prediction error: {str(e)}")
 
+@app.get("/metrics/inference")
+async def get_inference_metrics():
+    """Get request latency percentiles, batch size and model cache statistics."""
+    metrics = inference_metrics.get_metrics()
+    metrics['batching'] = {
+        'enabled': batcher is not None,
+        'max_batch_size': batcher.max_batch_size if batcher is not None else 1,
+        'max_wait_ms': batcher.max_wait * 1000.0 if batcher is not None else 0.0
+    }
+    metrics['model_cache'] = get_model_cache().get_stats()
+    return metrics
+
 @app.post("/reload")
 async def reload_models(model_dir: str = DEFAULT_MODEL_DIR):
     """
@@ -16,6 +16,7 @@ from sklearn.model_selection import train_test_split, TimeSeriesSplit
 import sqlite3
 
 from trading_bot.indicators.factory import IndicatorFactory
+from trading_bot.data.market_data_store import MarketDataStore
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,10 @@ class BacktestDataManager:
         # Create data directory if it doesn't exist
         if not os.path.exists(data_dir):
             os.makedirs(data_dir)
+        
+        # CSV files are ingested once into the columnar store and read
+        # memory-mapped by later backtests
+        self.store = MarketDataStore(os.path.join(data_dir, "store"))
     
     def load_market_data(
         self,
@@ -52,6 +57,9 @@ class BacktestDataManager:
         """
         Load market data for a symbol and timeframe.
         
+        Standard data files are read from the columnar store, which is
+        (re)built from ``{symbol}_{timeframe}.csv`` when the file changes.
+        
         Args:
             symbol: Trading symbol
             timeframe: Timeframe for the data
@@ -83,24 +91,46 @@ class BacktestDataManager:
             data_path = os.path.join(self.data_dir, filename)
             
             if not os.path.exists(data_path):
+                if self.store.exists(symbol, timeframe):
+                    return self.store.read(symbol, timeframe, start=start_date, end=end_date)
                 raise FileNotFoundError(f"Data file not found: {data_path}")
             
-            # Load data
-            df = pd.read_csv(data_path)
-            
-            # Convert date column to datetime
-            date_col = next((col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()), None)
-            if date_col:
-                df[date_col] = pd.to_datetime(df[date_col])
-                df = df.rename(columns={date_col: 'datetime'})
-            elif 'datetime' not in df.columns:
-                raise ValueError("DataFrame must have a datetime column")
+            source_mtime = os.path.getmtime(data_path)
+            info = self.store.get_info(symbol, timeframe)
+            if info is None or info['metadata'].get('source_mtime') != source_mtime:
+                self._ingest_csv(symbol, timeframe, data_path, source_mtime)
             
-            # Filter by date range
-            df = df[(df['datetime'] >= start_date) & (df['datetime'] <= end_date)]
+            df = self.store.read(symbol, timeframe, start=start_date, end=end_date)
         
         return df
     
+    def _ingest_csv(self, symbol: str, timeframe: str, data_path: str, source_mtime: float) -> None:
+        """
+        Replace the stored data for a symbol and timeframe with a CSV file.
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe for the data
+            data_path: Path to the CSV file
+            source_mtime: Modification time of the file, recorded in the store
+        """
+        df = pd.read_csv(data_path)
+        
+        # Convert date column to datetime
+        date_col = next((col for col in df.columns if 'date' in col.lower() or 'time' in col.lower()), None)
+        if date_col:
+            df[date_col] = pd.to_datetime(df[date_col])
+            df = df.rename(columns={date_col: 'datetime'})
+        elif 'datetime' not in df.columns:
+            raise ValueError("DataFrame must have a datetime column")
+        
+        self.store.delete(symbol, timeframe)
+        self.store.append(
+            symbol, timeframe, df, partition='month',
+            metadata={'source': data_path, 'source_mtime': source_mtime}
+        )
+        logger.info(f"Ingested {len(df)} rows from {data_path} into the market data store")
+    
     def add_technical_indicators(
         self,
         df: pd.DataFrame,
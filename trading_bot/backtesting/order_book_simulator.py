@@ -5,6 +5,10 @@ from collections import defaultdict
 from typing import Dict, List, Tuple, Optional, Union, Any
 from enum import Enum
 import bisect
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from trading_bot.utils.rolling_window import RollingWindow
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,8 @@ class OrderSide(Enum):
 
 class OrderBookEntry:
     """Entry in the order book at a specific price level"""
+    __slots__ = ('price', 'volume', 'orders')
+    
     def __init__(self, price: float, volume: float):
         self.price = price
         self.volume = volume
@@ -23,8 +29,241 @@ class OrderBookEntry:
     def __repr__(self):
         return f"OrderBookEntry(price={self.price:.6f}, volume={self.volume:.2f})"
 
+class _BookSide:
+    """
+    One side of an order book stored as preallocated NumPy arrays
+    
+    Levels are kept sorted best-first by storing a sort key of ``sign * price``
+    in ascending order (sign is +1 for asks and -1 for bids), so price lookups
+    are a binary search and insertions/removals are in-place array shifts.
+    """
+    __slots__ = ('sign', 'depth', 'keys', 'volumes', 'size', 'total')
+    
+    _TOLERANCE = 1e-10
+    
+    def __init__(self, sign: int, depth: int):
+        self.sign = sign
+        self.depth = depth
+        # One spare slot so an insert can happen before trimming to depth
+        self.keys = np.empty(depth + 1, dtype=np.float64)
+        self.volumes = np.empty(depth + 1, dtype=np.float64)
+        self.size = 0
+        self.total = 0.0
+    
+    @property
+    def prices(self) -> np.ndarray:
+        """Level prices, best first"""
+        return self.sign * self.keys[:self.size]
+    
+    @property
+    def level_volumes(self) -> np.ndarray:
+        """Level volumes, best first"""
+        return self.volumes[:self.size]
+    
+    def clear(self) -> None:
+        """Remove all levels without releasing the buffers"""
+        self.size = 0
+        self.total = 0.0
+    
+    def find(self, price: float) -> int:
+        """Return the index of the level at ``price`` or -1"""
+        key = self.sign * price
+        i = int(np.searchsorted(self.keys[:self.size], key - self._TOLERANCE))
+        if i < self.size and abs(self.keys[i] - key) < self._TOLERANCE:
+            return i
+        return -1
+    
+    def add(self, price: float, volume: float) -> None:
+        """Add volume at a price level, creating and trimming levels as needed"""
+        n = self.size
+        key = self.sign * price
+        i = int(np.searchsorted(self.keys[:n], key - self._TOLERANCE))
+        
+        if i < n and abs(self.keys[i] - key) < self._TOLERANCE:
+            self.volumes[i] += volume
+            self.total += volume
+            return
+        
+        # Shift worse levels down by one and insert
+        self.keys[i + 1:n + 1] = self.keys[i:n]
+        self.volumes[i + 1:n + 1] = self.volumes[i:n]
+        self.keys[i] = key
+        self.volumes[i] = volume
+        self.total += volume
+        n += 1
+        
+        # Trim to max depth
+        if n > self.depth:
+            n -= 1
+            self.total -= self.volumes[n]
+        self.size = n
+    
+    def add_many(self, prices: np.ndarray, volumes: np.ndarray) -> None:
+        """
+        Merge many levels at once
+        
+        Equivalent to calling ``add`` for each (price, volume) pair in turn.
+        """
+        if len(prices) == 0:
+            return
+        
+        new_keys = self.sign * np.asarray(prices, dtype=np.float64)
+        new_volumes = np.asarray(volumes, dtype=np.float64)
+        
+        # Collapse duplicate prices within the batch
+        new_keys, inverse = np.unique(new_keys, return_inverse=True)
+        new_volumes = np.bincount(inverse.ravel(), weights=new_volumes, minlength=len(new_keys))
+        
+        n = self.size
+        keys = self.keys[:n]
+        
+        # Add volume to existing levels that match
+        idx = np.searchsorted(keys, new_keys - self._TOLERANCE)
+        in_range = idx < n
+        matched = np.zeros(len(new_keys), dtype=bool)
+        matched[in_range] = np.abs(keys[idx[in_range]] - new_keys[in_range]) < self._TOLERANCE
+        if matched.any():
+            np.add.at(self.volumes, idx[matched], new_volumes[matched])
+        
+        # Insert the remaining levels and keep the best ``depth`` of them
+        all_keys = np.concatenate([keys, new_keys[~matched]])
+        all_volumes = np.concatenate([self.volumes[:n], new_volumes[~matched]])
+        order = np.argsort(all_keys, kind='stable')[:self.depth]
+        
+        self.size = len(order)
+        self.keys[:self.size] = all_keys[order]
+        self.volumes[:self.size] = all_volumes[order]
+        self.total = float(self.volumes[:self.size].sum())
+    
+    def refresh(self, prices: np.ndarray, volumes: np.ndarray, memory: float) -> None:
+        """
+        Move the levels onto new prices and blend in fresh volumes
+        
+        Level ``i`` keeps ``memory`` of its current volume, so the book's shape
+        carries over between updates instead of being rebuilt. Prices must be
+        strictly ordered best-first and at most ``depth`` long.
+        """
+        n = len(prices)
+        blended = np.array(volumes, dtype=np.float64)
+        kept = min(self.size, n)
+        blended[:kept] = memory * self.volumes[:kept] + (1.0 - memory) * blended[:kept]
+        
+        self.keys[:n] = self.sign * np.asarray(prices, dtype=np.float64)
+        self.volumes[:n] = blended
+        self.size = n
+        self.total = float(blended.sum())
+    
+    def delete(self, i: int) -> None:
+        """Remove the level at index ``i``"""
+        n = self.size
+        self.total -= self.volumes[i]
+        self.keys[i:n - 1] = self.keys[i + 1:n]
+        self.volumes[i:n - 1] = self.volumes[i + 1:n]
+        self.size = n - 1
+    
+    def consume(self, volume: float) -> Tuple[float, float]:
+        """
+        Take up to ``volume`` from the best levels
+        
+        Returns:
+            (matched_volume, notional)
+        """
+        n = self.size
+        if n == 0 or volume <= 0:
+            return 0.0, 0.0
+        
+        level_volumes = self.volumes[:n]
+        filled = np.minimum(np.cumsum(level_volumes), volume)
+        executed = np.diff(filled, prepend=0.0)
+        
+        matched = float(filled[-1])
+        notional = float(np.dot(executed, self.sign * self.keys[:n]))
+        
+        level_volumes -= executed
+        self.total -= matched
+        
+        # Exhausted levels always form a prefix of the book
+        exhausted = int(np.count_nonzero(level_volumes < self._TOLERANCE))
+        if exhausted:
+            self.total -= float(level_volumes[:exhausted].sum())
+            remaining = n - exhausted
+            self.keys[:remaining] = self.keys[exhausted:n]
+            self.volumes[:remaining] = self.volumes[exhausted:n]
+            self.size = remaining
+        
+        return matched, notional
+    
+    def impact(self, volumes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fill size and average price for many order sizes without consuming the book
+        
+        Returns:
+            (executed_volumes, average_prices); average price is NaN where nothing fills
+        """
+        volumes = np.asarray(volumes, dtype=np.float64)
+        n = self.size
+        if n == 0:
+            return np.zeros_like(volumes), np.full_like(volumes, np.nan)
+        
+        prices = self.sign * self.keys[:n]
+        cum_volume = np.cumsum(self.volumes[:n])
+        cum_notional = np.cumsum(self.volumes[:n] * prices)
+        
+        executed = np.clip(volumes, 0.0, cum_volume[-1])
+        
+        # Index of the level where each order finishes filling
+        last = np.minimum(np.searchsorted(cum_volume, executed, side='left'), n - 1)
+        prev_volume = np.where(last > 0, cum_volume[last - 1], 0.0)
+        prev_notional = np.where(last > 0, cum_notional[last - 1], 0.0)
+        notional = prev_notional + (executed - prev_volume) * prices[last]
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            average = np.where(executed > 0, notional / executed, np.nan)
+        
+        return executed, average
+    
+    def scale(self, factor: float) -> None:
+        """Multiply every level's volume by ``factor``"""
+        self.volumes[:self.size] *= factor
+        self.total *= factor
+    
+    def shift_best(self, delta: float) -> None:
+        """Move the best level's price away from the spread by ``delta``"""
+        if self.size == 0:
+            return
+        # Moving away from the spread increases the sort key on both sides
+        self.keys[0] += delta
+        if self.size > 1 and self.keys[0] > self.keys[1]:
+            order = np.argsort(self.keys[:self.size], kind='stable')
+            self.keys[:self.size] = self.keys[:self.size][order]
+            self.volumes[:self.size] = self.volumes[:self.size][order]
+    
+    def entries(self) -> List[OrderBookEntry]:
+        """Snapshot of levels as OrderBookEntry objects"""
+        return [OrderBookEntry(p, v) for p, v in self.levels()]
+    
+    def levels(self) -> List[Tuple[float, float]]:
+        """Snapshot of levels as (price, volume) tuples"""
+        return list(zip(self.prices.tolist(), self.level_volumes.tolist()))
+    
+    def load(self, entries: List[OrderBookEntry]) -> None:
+        """Replace all levels from a list of entries"""
+        self.clear()
+        if entries:
+            self.add_many(
+                np.array([e.price for e in entries], dtype=np.float64),
+                np.array([e.volume for e in entries], dtype=np.float64)
+            )
+
 class OrderBook:
-    """Simulated order book with bids and asks"""
+    """
+    Simulated order book with bids and asks
+    
+    Each side is held in NumPy arrays sorted best-first, so lookups use binary
+    search and market orders and impact curves are computed with cumulative
+    sums instead of Python loops over level objects. ``bids``/``asks`` return
+    snapshots; mutate the book through its methods.
+    """
     
     def __init__(self, symbol: str, tick_size: float = 0.01, depth: int = 10):
         """
@@ -40,8 +279,8 @@ class OrderBook:
         self.depth = depth
         
         # Initialize empty bid and ask books
-        self.bids: List[OrderBookEntry] = []  # Sorted high to low
-        self.asks: List[OrderBookEntry] = []  # Sorted low to high
+        self._bids = _BookSide(-1, depth)  # Sorted high to low
+        self._asks = _BookSide(1, depth)  # Sorted low to high
         
         # Last trade information
         self.last_price: Optional[float] = None
@@ -54,31 +293,69 @@ class OrderBook:
         self.low_price: Optional[float] = None
         self.close_price: Optional[float] = None
         self.total_volume: float = 0.0
-        
-        # Book imbalance metrics
-        self.bid_volume: float = 0.0
-        self.ask_volume: float = 0.0
+    
+    def _side(self, side: OrderSide) -> _BookSide:
+        """Get the storage for one side of the book"""
+        return self._bids if side == OrderSide.BID else self._asks
+    
+    @property
+    def bids(self) -> List[OrderBookEntry]:
+        """Snapshot of bid levels (sorted high to low)"""
+        return self._bids.entries()
+    
+    @bids.setter
+    def bids(self, entries: List[OrderBookEntry]) -> None:
+        self._bids.load(entries)
+    
+    @property
+    def asks(self) -> List[OrderBookEntry]:
+        """Snapshot of ask levels (sorted low to high)"""
+        return self._asks.entries()
+    
+    @asks.setter
+    def asks(self, entries: List[OrderBookEntry]) -> None:
+        self._asks.load(entries)
+    
+    @property
+    def bid_volume(self) -> float:
+        """Total volume resting on the bid side"""
+        return self._bids.total
+    
+    @property
+    def ask_volume(self) -> float:
+        """Total volume resting on the ask side"""
+        return self._asks.total
+    
+    @property
+    def best_bid_price(self) -> Optional[float]:
+        """Best bid price without building a level snapshot"""
+        return float(-self._bids.keys[0]) if self._bids.size else None
+    
+    @property
+    def best_ask_price(self) -> Optional[float]:
+        """Best ask price without building a level snapshot"""
+        return float(self._asks.keys[0]) if self._asks.size else None
     
     @property
     def mid_price(self) -> Optional[float]:
         """Calculate mid price from best bid and ask"""
-        if not self.bids or not self.asks:
+        if not self._bids.size or not self._asks.size:
             return self.last_price
         
-        return (self.bids[0].price + self.asks[0].price) / 2
+        return (self.best_bid_price + self.best_ask_price) / 2
     
     @property
     def spread(self) -> Optional[float]:
         """Calculate bid-ask spread"""
-        if not self.bids or not self.asks:
+        if not self._bids.size or not self._asks.size:
             return None
         
-        return self.asks[0].price - self.bids[0].price
+        return self.best_ask_price - self.best_bid_price
     
     @property
     def relative_spread(self) -> Optional[float]:
         """Calculate relative bid-ask spread as percentage of mid price"""
-        if not self.bids or not self.asks or self.mid_price == 0:
+        if not self._bids.size or not self._asks.size or self.mid_price == 0:
             return None
         
         return self.spread / self.mid_price
@@ -94,19 +371,32 @@ class OrderBook:
     
     def best_bid(self) -> Optional[OrderBookEntry]:
         """Get the best (highest) bid"""
-        return self.bids[0] if self.bids else None
+        if not self._bids.size:
+            return None
+        return OrderBookEntry(self.best_bid_price, float(self._bids.volumes[0]))
     
     def best_ask(self) -> Optional[OrderBookEntry]:
         """Get the best (lowest) ask"""
-        return self.asks[0] if self.asks else None
+        if not self._asks.size:
+            return None
+        return OrderBookEntry(self.best_ask_price, float(self._asks.volumes[0]))
     
     def bid_levels(self) -> List[OrderBookEntry]:
         """Get all bid levels (sorted high to low)"""
-        return self.bids.copy()
+        return self._bids.entries()
     
     def ask_levels(self) -> List[OrderBookEntry]:
         """Get all ask levels (sorted low to high)"""
-        return self.asks.copy()
+        return self._asks.entries()
+    
+    def levels(self, side: OrderSide) -> List[Tuple[float, float]]:
+        """Get (price, volume) tuples for one side, best first"""
+        return self._side(side).levels()
+    
+    def clear(self) -> None:
+        """Remove all levels from both sides, keeping the allocated buffers"""
+        self._bids.clear()
+        self._asks.clear()
     
     def add_order(self, side: OrderSide, price: float, volume: float) -> None:
         """
@@ -120,55 +410,44 @@ class OrderBook:
         # Round price to tick size
         price = round(price / self.tick_size) * self.tick_size
         
-        if side == OrderSide.BID:
-            # Find the correct position to insert the order (bids sorted high to low)
-            i = 0
-            while i < len(self.bids) and price < self.bids[i].price:
-                i += 1
-                
-            # If price level exists, just add volume
-            if i < len(self.bids) and abs(self.bids[i].price - price) < 1e-10:
-                self.bids[i].volume += volume
-            else:
-                # Create new price level
-                new_entry = OrderBookEntry(price, volume)
-                if i < len(self.bids):
-                    self.bids.insert(i, new_entry)
-                else:
-                    self.bids.append(new_entry)
-            
-            # Update bid volume
-            self.bid_volume += volume
-            
-            # Trim to max depth
-            if len(self.bids) > self.depth:
-                removed_entry = self.bids.pop()
-                self.bid_volume -= removed_entry.volume
-        
-        elif side == OrderSide.ASK:
-            # Find the correct position to insert the order (asks sorted low to high)
-            i = 0
-            while i < len(self.asks) and price > self.asks[i].price:
-                i += 1
-                
-            # If price level exists, just add volume
-            if i < len(self.asks) and abs(self.asks[i].price - price) < 1e-10:
-                self.asks[i].volume += volume
-            else:
-                # Create new price level
-                new_entry = OrderBookEntry(price, volume)
-                if i < len(self.asks):
-                    self.asks.insert(i, new_entry)
-                else:
-                    self.asks.append(new_entry)
-            
-            # Update ask volume
-            self.ask_volume += volume
-            
-            # Trim to max depth
-            if len(self.asks) > self.depth:
-                removed_entry = self.asks.pop()
-                self.ask_volume -= removed_entry.volume
+        self._side(side).add(price, volume)
+    
+    def add_orders(self, side: OrderSide, prices: np.ndarray, volumes: np.ndarray) -> None:
+        """
+        Add many orders to one side of the book in a single vectorized merge
+        
+        Args:
+            side: Order side (BID/ASK)
+            prices: Order prices
+            volumes: Order volumes
+        """
+        # Round prices to tick size
+        prices = np.round(np.asarray(prices, dtype=np.float64) / self.tick_size) * self.tick_size
+        
+        self._side(side).add_many(prices, volumes)
+    
+    def refresh_levels(self, side: OrderSide, prices: np.ndarray, volumes: np.ndarray, memory: float) -> None:
+        """
+        Reprice one side of the book in place, keeping part of each level's volume
+        
+        Args:
+            side: Order side (BID/ASK)
+            prices: New level prices, best first
+            volumes: Fresh level volumes, best first
+            memory: Share of each existing level's volume carried over (0-1)
+        """
+        # Round prices to tick size
+        prices = np.round(np.asarray(prices, dtype=np.float64) / self.tick_size) * self.tick_size
+        
+        book_side = self._side(side)
+        keys = book_side.sign * prices
+        if len(prices) > book_side.depth or np.any(np.diff(keys) < book_side._TOLERANCE):
+            # Levels collapsed (e.g. clamped to a minimum price): merge them instead
+            book_side.clear()
+            book_side.add_many(prices, volumes)
+            return
+        
+        book_side.refresh(prices, volumes, memory)
     
     def remove_volume(self, side: OrderSide, price: float, volume: float) -> float:
         """
@@ -185,41 +464,23 @@ class OrderBook:
         # Round price to tick size
         price = round(price / self.tick_size) * self.tick_size
         
-        if side == OrderSide.BID:
-            # Find the price level
-            for i, bid in enumerate(self.bids):
-                if abs(bid.price - price) < 1e-10:
-                    # Remove as much volume as possible
-                    removed = min(volume, bid.volume)
-                    bid.volume -= removed
-                    self.bid_volume -= removed
-                    
-                    # Remove price level if no volume left
-                    if bid.volume < 1e-10:
-                        self.bids.pop(i)
-                    
-                    return removed
-            
-            # Price level not found
-            return 0.0
+        book_side = self._side(side)
+        i = book_side.find(price)
         
-        elif side == OrderSide.ASK:
-            # Find the price level
-            for i, ask in enumerate(self.asks):
-                if abs(ask.price - price) < 1e-10:
-                    # Remove as much volume as possible
-                    removed = min(volume, ask.volume)
-                    ask.volume -= removed
-                    self.ask_volume -= removed
-                    
-                    # Remove price level if no volume left
-                    if ask.volume < 1e-10:
-                        self.asks.pop(i)
-                    
-                    return removed
-            
-            # Price level not found
+        # Price level not found
+        if i < 0:
             return 0.0
+        
+        # Remove as much volume as possible
+        removed = min(volume, float(book_side.volumes[i]))
+        book_side.volumes[i] -= removed
+        book_side.total -= removed
+        
+        # Remove price level if no volume left
+        if book_side.volumes[i] < 1e-10:
+            book_side.delete(i)
+        
+        return removed
     
     def match_market_order(self, side: OrderSide, volume: float) -> Tuple[float, float]:
         """
@@ -232,53 +493,9 @@ class OrderBook:
         Returns:
             (matched_volume, average_price)
         """
-        matched_volume = 0.0
-        total_notional = 0.0
-        remaining = volume
-        
-        if side == OrderSide.BID:
-            # Buy market order matches against asks
-            i = 0
-            while i < len(self.asks) and remaining > 0:
-                ask = self.asks[i]
-                executed = min(remaining, ask.volume)
-                
-                # Update matched volume and notional
-                matched_volume += executed
-                total_notional += executed * ask.volume
-                remaining -= executed
-                
-                # Update ask book
-                self.asks[i].volume -= executed
-                self.ask_volume -= executed
-                
-                # Remove level if no volume left
-                if self.asks[i].volume < 1e-10:
-                    self.asks.pop(i)
-                else:
-                    i += 1
-        
-        elif side == OrderSide.ASK:
-            # Sell market order matches against bids
-            i = 0
-            while i < len(self.bids) and remaining > 0:
-                bid = self.bids[i]
-                executed = min(remaining, bid.volume)
-                
-                # Update matched volume and notional
-                matched_volume += executed
-                total_notional += executed * bid.volume
-                remaining -= executed
-                
-                # Update bid book
-                self.bids[i].volume -= executed
-                self.bid_volume -= executed
-                
-                # Remove level if no volume left
-                if self.bids[i].volume < 1e-10:
-                    self.bids.pop(i)
-                else:
-                    i += 1
+        # Buy market orders match against asks, sell market orders against bids
+        opposite = self._asks if side == OrderSide.BID else self._bids
+        matched_volume, total_notional = opposite.consume(volume)
         
         # Calculate average execution price
         average_price = total_notional / matched_volume if matched_volume > 0 else None
@@ -299,6 +516,28 @@ class OrderBook:
             
         return matched_volume, average_price
     
+    def market_impact(self, side: OrderSide, volumes: Union[List[float], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Estimate fills for many market order sizes at once without changing the book
+        
+        Args:
+            side: Order side (BID/ASK)
+            volumes: Order sizes, each evaluated independently against the current book
+            
+        Returns:
+            (executed_volumes, average_prices) arrays; average price is NaN where nothing fills
+        """
+        opposite = self._asks if side == OrderSide.BID else self._bids
+        return opposite.impact(volumes)
+    
+    def scale_volume(self, side: OrderSide, factor: float) -> None:
+        """Multiply the volume at every level on one side by ``factor``"""
+        self._side(side).scale(factor)
+    
+    def widen_best_price(self, side: OrderSide, amount: float) -> None:
+        """Move the best level on one side away from the spread by ``amount``"""
+        self._side(side).shift_best(amount)
+    
     def reset_daily_stats(self) -> None:
         """Reset daily OHLCV statistics"""
         self.open_price = None
@@ -309,29 +548,19 @@ class OrderBook:
     
     def to_dataframe(self) -> pd.DataFrame:
         """Convert order book to a DataFrame for visualization"""
-        # Create bid and ask DataFrames
-        bid_data = []
-        for bid in self.bids:
-            bid_data.append({"side": "bid", "price": bid.price, "volume": bid.volume})
-        
-        ask_data = []
-        for ask in self.asks:
-            ask_data.append({"side": "ask", "price": ask.price, "volume": ask.volume})
-        
-        # Combine into one DataFrame
-        if bid_data and ask_data:
-            return pd.DataFrame(bid_data + ask_data)
-        elif bid_data:
-            return pd.DataFrame(bid_data)
-        elif ask_data:
-            return pd.DataFrame(ask_data)
-        else:
+        if not self._bids.size and not self._asks.size:
             return pd.DataFrame(columns=["side", "price", "volume"])
+        
+        return pd.DataFrame({
+            "side": ["bid"] * self._bids.size + ["ask"] * self._asks.size,
+            "price": np.concatenate([self._bids.prices, self._asks.prices]),
+            "volume": np.concatenate([self._bids.level_volumes, self._asks.level_volumes])
+        })
     
     def __repr__(self) -> str:
         """String representation of the order book"""
-        bid_str = "\n".join([f"{b.price:.4f}: {b.volume:.2f}" for b in self.bids[:5]])
-        ask_str = "\n".join([f"{a.price:.4f}: {a.volume:.2f}" for a in self.asks[:5]])
+        bid_str = "\n".join([f"{p:.4f}: {v:.2f}" for p, v in self._bids.levels()[:5]])
+        ask_str = "\n".join([f"{p:.4f}: {v:.2f}" for p, v in self._asks.levels()[:5]])
         
         return (f"OrderBook({self.symbol})\n"
                 f"Spread: {self.spread:.6f} ({self.relative_spread*100:.4f}%)\n"
@@ -362,7 +591,8 @@ class OrderBookSimulator:
         mean_reversion_strength: float = 0.1,
         volatility_scaling: bool = True,
         random_seed: int = None,
-        debug_mode: bool = False
+        debug_mode: bool = False,
+        book_memory: float = 0.5
     ):
         """
         Initialize order book simulator
@@ -378,8 +608,11 @@ class OrderBookSimulator:
             volatility_scaling: Whether to scale spreads by volatility
             random_seed: Random seed for reproducibility
             debug_mode: Enable detailed logging
+            book_memory: Share of each level's volume carried over from one bar
+                to the next (0 rebuilds the book from scratch every bar)
         """
         self.depth = depth
+        self.book_memory = min(1.0, max(0.0, book_memory))
         self.price_anchoring = price_anchoring
         self.mean_reversion_strength = mean_reversion_strength
         self.volatility_scaling = volatility_scaling
@@ -425,8 +658,10 @@ class OrderBookSimulator:
                 else:
                     self.price_precision[symbol] = 4
         
-        # Historical data for volatility scaling
-        self.historical_data: Dict[str, pd.DataFrame] = {}
+        # Rolling close-to-close returns for volatility scaling
+        self.volatility_lookback = 50  # Bars of history used for the volatility estimate
+        self.return_windows: Dict[str, RollingWindow] = {}
+        self.last_closes: Dict[str, float] = {}
         self.volatility_estimates: Dict[str, float] = {}
         
         # Create initial order books
@@ -439,13 +674,13 @@ class OrderBookSimulator:
         
         logger.info(f"Initialized OrderBookSimulator with {len(self.symbols)} symbols")
     
-    def update_from_ohlcv(self, symbol: str, ohlc_bar: pd.Series, timestamp: pd.Timestamp = None) -> None:
+    def update_from_ohlcv(self, symbol: str, ohlc_bar: Union[pd.Series, Dict[str, float]], timestamp: pd.Timestamp = None) -> None:
         """
         Update order book based on OHLCV bar data
         
         Args:
             symbol: Symbol to update
-            ohlc_bar: OHLCV data in a pandas Series (open, high, low, close, volume)
+            ohlc_bar: OHLCV data as a pandas Series or dict (open, high, low, close, volume)
             timestamp: Timestamp for the update
         """
         if symbol not in self.order_books:
@@ -468,19 +703,20 @@ class OrderBookSimulator:
             logger.warning(f"Invalid close price for {symbol}: {close_price}")
             return
         
-        # Update order book with historical data if needed
-        if symbol in self.historical_data:
-            hist_data = self.historical_data[symbol]
-            hist_data = pd.concat([hist_data, pd.DataFrame([ohlc_bar])])
-            self.historical_data[symbol] = hist_data.tail(50)  # Keep last 50 bars
-        else:
-            self.historical_data[symbol] = pd.DataFrame([ohlc_bar])
+        # Update rolling returns (the last N bars give N-1 returns)
+        returns = self.return_windows.get(symbol)
+        if returns is None:
+            returns = RollingWindow(self.volatility_lookback - 1)
+            self.return_windows[symbol] = returns
+        
+        prev_close = self.last_closes.get(symbol)
+        if prev_close:
+            returns.append(close_price / prev_close - 1)
+        self.last_closes[symbol] = close_price
         
         # Calculate volatility estimate
-        if len(self.historical_data[symbol]) >= 5:
-            returns = self.historical_data[symbol]['close'].pct_change().dropna()
-            if len(returns) >= 5:
-                self.volatility_estimates[symbol] = returns.std() * np.sqrt(252)
+        if len(returns) >= 5:
+            self.volatility_estimates[symbol] = returns.std(ddof=1) * np.sqrt(252)
         
         # Reset daily stats
         self.order_books[symbol].reset_daily_stats()
@@ -495,19 +731,16 @@ class OrderBookSimulator:
         book.last_price = close_price
         book.last_timestamp = timestamp or pd.Timestamp.now()
         
-        # Clear existing book
-        book.bids = []
-        book.asks = []
-        book.bid_volume = 0.0
-        book.ask_volume = 0.0
-        
-        # Generate new order book shape
+        # Reprice the existing levels around the new close
         self._generate_book_shape(symbol, close_price, volume)
     
     def _generate_book_shape(self, symbol: str, price: float, volume: float) -> None:
         """
         Generate realistic order book shape around a price
         
+        Existing levels are moved onto the new price grid in place and keep
+        ``book_memory`` of their volume; empty sides are built from scratch.
+        
         Args:
             symbol: Symbol to generate for
             price: Current price to center book around
@@ -550,28 +783,25 @@ class OrderBookSimulator:
         # Estimate volume to distribute
         total_book_volume = max(100, volume * 2)  # Typical order book depth relative to trading volume
         
-        # Create the shape of the book
-        self._create_bid_levels(symbol, bid_price, total_book_volume * 0.5)
-        self._create_ask_levels(symbol, ask_price, total_book_volume * 0.5)
+        # Shift the shape of the book onto the new prices
+        tick_offsets = np.arange(self.depth) * tick_size
+        bid_prices = np.maximum(self.min_price, bid_price - tick_offsets)
+        bid_volumes = self._level_volumes(total_book_volume * 0.5)
+        ask_volumes = self._level_volumes(total_book_volume * 0.5)
+        book.refresh_levels(OrderSide.BID, bid_prices, bid_volumes, self.book_memory)
+        book.refresh_levels(OrderSide.ASK, ask_price + tick_offsets, ask_volumes, self.book_memory)
         
         if self.debug_mode:
             logger.debug(f"Generated book for {symbol}: mid={mid_price:.4f}, spread={spread:.6f}")
-            logger.debug(f"Bid levels: {len(book.bids)}, Ask levels: {len(book.asks)}")
+            logger.debug(f"Bid levels: {book._bids.size}, Ask levels: {book._asks.size}")
     
-    def _create_bid_levels(self, symbol: str, best_bid: float, total_volume: float) -> None:
-        """Create bid side of the book with realistic shape"""
-        book = self.order_books[symbol]
-        tick_size = self.tick_sizes.get(symbol, 0.01)
-        
-        # Shape parameters
+    def _level_volumes(self, total_volume: float) -> np.ndarray:
+        """Draw level volumes, best first, with a realistic shape"""
         depth = self.depth
         
         # Distribution parameters (higher alpha = more volume at the top of book)
         alpha = 1.5  # Shape parameter for volume distribution
         
-        # Generate price levels
-        prices = [best_bid - i * tick_size for i in range(depth)]
-        
         # Generate volume distribution that decays with distance from top of book
         volumes = np.random.power(alpha, size=depth)
         
@@ -582,60 +812,65 @@ class OrderBookSimulator:
         noise = np.random.uniform(0.85, 1.15, size=depth)
         volumes = volumes * noise
         
+        return np.maximum(1.0, volumes)  # Ensure minimum volume
+    
+    def _create_bid_levels(self, symbol: str, best_bid: float, total_volume: float) -> None:
+        """Create bid side of the book with realistic shape"""
+        book = self.order_books[symbol]
+        tick_size = self.tick_sizes.get(symbol, 0.01)
+        
+        # Generate price levels
+        prices = np.maximum(self.min_price, best_bid - np.arange(self.depth) * tick_size)
+        
         # Create bid levels
-        for i in range(depth):
-            price = max(self.min_price, prices[i])
-            volume = max(1.0, volumes[i])  # Ensure minimum volume
-            book.add_order(OrderSide.BID, price, volume)
+        book.add_orders(OrderSide.BID, prices, self._level_volumes(total_volume))
     
     def _create_ask_levels(self, symbol: str, best_ask: float, total_volume: float) -> None:
         """Create ask side of the book with realistic shape"""
         book = self.order_books[symbol]
         tick_size = self.tick_sizes.get(symbol, 0.01)
         
-        # Shape parameters
-        depth = self.depth
-        
-        # Distribution parameters (higher alpha = more volume at the top of book)
-        alpha = 1.5  # Shape parameter for volume distribution
-        
         # Generate price levels
-        prices = [best_ask + i * tick_size for i in range(depth)]
-        
-        # Generate volume distribution that decays with distance from top of book
-        volumes = np.random.power(alpha, size=depth)
-        
-        # Normalize to total volume
-        volumes = volumes / volumes.sum() * total_volume
-        
-        # Add random noise to volumes (5-15% variation)
-        noise = np.random.uniform(0.85, 1.15, size=depth)
-        volumes = volumes * noise
+        prices = best_ask + np.arange(self.depth) * tick_size
         
         # Create ask levels
-        for i in range(depth):
-            price = prices[i]
-            volume = max(1.0, volumes[i])  # Ensure minimum volume
-            book.add_order(OrderSide.ASK, price, volume)
+        book.add_orders(OrderSide.ASK, prices, self._level_volumes(total_volume))
     
-    def simulate_market_impact(self, symbol: str, side: OrderSide, volume: float) -> Tuple[float, float]:
+    def simulate_market_impact(
+        self,
+        symbol: str,
+        side: OrderSide,
+        volume: Union[float, List[float], np.ndarray]
+    ) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
         """
         Simulate market impact of an order
         
+        A scalar volume executes against the book and consumes liquidity. A list
+        or array of volumes is a what-if query: each size is evaluated
+        independently against the current book in one vectorized pass and the
+        book is left unchanged.
+        
         Args:
             symbol: Symbol to trade
             side: Order side (BID/ASK)
-            volume: Order volume
+            volume: Order volume, or many order volumes
             
         Returns:
-            (executed_volume, average_price)
+            (executed_volume, average_price), as arrays for array input
         """
+        is_batch = isinstance(volume, (list, tuple, np.ndarray))
+        
         if symbol not in self.order_books:
             logger.warning(f"No order book for symbol {symbol}")
+            if is_batch:
+                return np.zeros(len(volume)), np.zeros(len(volume))
             return 0.0, 0.0
         
         book = self.order_books[symbol]
         
+        if is_batch:
+            return book.market_impact(side, volume)
+        
         # Execute order against the book
         executed_volume, avg_price = book.match_market_order(side, volume)
         
@@ -646,14 +881,12 @@ class OrderBookSimulator:
         # This simulates new orders flowing in to replace executed orders
         if side == OrderSide.BID:
             # Market buy affected the ask side, regenerate it
-            if book.asks:
-                new_best_ask = book.asks[0].price if book.asks else (book.last_price * 1.001)
-                self._create_ask_levels(symbol, new_best_ask, book.ask_volume * 0.8)
+            if book.best_ask_price is not None:
+                self._create_ask_levels(symbol, book.best_ask_price, book.ask_volume * 0.8)
         else:
             # Market sell affected the bid side, regenerate it
-            if book.bids:
-                new_best_bid = book.bids[0].price if book.bids else (book.last_price * 0.999)
-                self._create_bid_levels(symbol, new_best_bid, book.bid_volume * 0.8)
+            if book.best_bid_price is not None:
+                self._create_bid_levels(symbol, book.best_bid_price, book.bid_volume * 0.8)
         
         return executed_volume, avg_price
     
@@ -681,7 +914,7 @@ class OrderBookSimulator:
         total_notional = 0.0
         
         # Check if the limit order crosses the spread (would execute immediately)
-        if side == OrderSide.BID and book.asks and price >= book.asks[0].price:
+        if side == OrderSide.BID and book.best_ask_price is not None and price >= book.best_ask_price:
             # Buy limit crosses with ask side
             price_levels = book.ask_levels()
             remaining = volume
@@ -709,11 +942,10 @@ class OrderBookSimulator:
                 book.add_order(side, price, remaining)
                 
             # After execution, regenerate the ask side
-            if executed_volume > 0 and book.asks:
-                new_best_ask = book.asks[0].price if book.asks else (book.last_price * 1.001)
-                self._create_ask_levels(symbol, new_best_ask, book.ask_volume * 0.8)
+            if executed_volume > 0 and book.best_ask_price is not None:
+                self._create_ask_levels(symbol, book.best_ask_price, book.ask_volume * 0.8)
         
-        elif side == OrderSide.ASK and book.bids and price <= book.bids[0].price:
+        elif side == OrderSide.ASK and book.best_bid_price is not None and price <= book.best_bid_price:
             # Sell limit crosses with bid side
             price_levels = book.bid_levels()
             remaining = volume
@@ -741,9 +973,8 @@ class OrderBookSimulator:
                 book.add_order(side, price, remaining)
                 
             # After execution, regenerate the bid side
-            if executed_volume > 0 and book.bids:
-                new_best_bid = book.bids[0].price if book.bids else (book.last_price * 0.999)
-                self._create_bid_levels(symbol, new_best_bid, book.bid_volume * 0.8)
+            if executed_volume > 0 and book.best_bid_price is not None:
+                self._create_bid_levels(symbol, book.best_bid_price, book.bid_volume * 0.8)
         
         else:
             # Limit order does not cross the spread, add to book
@@ -774,10 +1005,7 @@ class OrderBookSimulator:
             return None, None
         
         book = self.order_books[symbol]
-        best_bid = book.bids[0].price if book.bids else None
-        best_ask = book.asks[0].price if book.asks else None
-        
-        return best_bid, best_ask
+        return book.best_bid_price, book.best_ask_price
     
     def get_mid_price(self, symbol: str) -> Optional[float]:
         """Get mid price for a symbol"""
@@ -809,10 +1037,7 @@ class OrderBookSimulator:
         
         book = self.order_books[symbol]
         
-        if side == OrderSide.BID:
-            return [(bid.price, bid.volume) for bid in book.bids]
-        else:
-            return [(ask.price, ask.volume) for ask in book.asks]
+        return book.levels(side)
     
     def get_order_book_imbalance(self, symbol: str) -> float:
         """Get order book imbalance for a symbol"""
@@ -840,8 +1065,8 @@ class OrderBookSimulator:
             "last_price": book.last_price,
             "last_volume": book.last_volume,
             "total_volume": book.total_volume,
-            "bids": [(bid.price, bid.volume) for bid in book.bids],
-            "asks": [(ask.price, ask.volume) for ask in book.asks]
+            "bids": book.levels(OrderSide.BID),
+            "asks": book.levels(OrderSide.ASK)
         }
     
     def reset(self) -> None:
@@ -853,7 +1078,8 @@ class OrderBookSimulator:
                 depth=self.depth
             )
         
-        self.historical_data = {}
+        self.return_windows = {}
+        self.last_closes = {}
         self.volatility_estimates = {}
         
         logger.info("Reset all order books")
@@ -1155,11 +1381,13 @@ class MarketRegimeDetector:
         self.current_regime = MarketRegime.UNKNOWN
         self.potential_regime = MarketRegime.UNKNOWN
         self.bars_in_potential_regime = 0
-        self.price_history = []
-        self.returns_history = []
-        self.short_ma = []
-        self.long_ma = []
-        self.volatility_history = []
+        self.last_price: Optional[float] = None
+        self.short_window = RollingWindow(short_ma_window)
+        self.long_window = RollingWindow(long_ma_window)
+        self.returns_history = RollingWindow(vol_window)
+        self.short_ma: Optional[float] = None
+        self.long_ma: Optional[float] = None
+        self.volatility_history = RollingWindow(50)  # Baseline is the median of recent volatility
         self.baseline_volatility = None
         self.regime_history = []
     
@@ -1174,51 +1402,45 @@ class MarketRegimeDetector:
         Returns:
             Current market regime
         """
-        # Update price history
-        self.price_history.append(price)
+        # Update price windows
+        self.short_window.append(price)
+        self.long_window.append(price)
         
         # Calculate returns if not provided
-        if returns is None and len(self.price_history) >= 2:
-            returns = (self.price_history[-1] / self.price_history[-2]) - 1
+        if returns is None and self.last_price:
+            returns = (price / self.last_price) - 1
+        self.last_price = price
         
         if returns is not None:
             self.returns_history.append(returns)
         
         # Need sufficient history for regime detection
-        if len(self.price_history) < self.long_ma_window or len(self.returns_history) < self.vol_window:
+        if not self.long_window.is_full or not self.returns_history.is_full:
             return self.current_regime
         
-        # Trim histories to manageable size
-        max_history = max(self.long_ma_window, self.vol_window) * 3
-        if len(self.price_history) > max_history:
-            self.price_history = self.price_history[-max_history:]
-        
-        if len(self.returns_history) > max_history:
-            self.returns_history = self.returns_history[-max_history:]
-        
         # Update moving averages
-        self.short_ma = self._calculate_ma(self.price_history, self.short_ma_window)
-        self.long_ma = self._calculate_ma(self.price_history, self.long_ma_window)
+        self.short_ma = self.short_window.mean()
+        self.long_ma = self.long_window.mean()
         
         # Update volatility
-        current_volatility = np.std(self.returns_history[-self.vol_window:]) * np.sqrt(252)  # Annualized
+        current_volatility = self.returns_history.std() * np.sqrt(252)  # Annualized
         self.volatility_history.append(current_volatility)
         
         # Establish baseline volatility if not set
         if self.baseline_volatility is None and len(self.volatility_history) >= 10:
-            self.baseline_volatility = np.median(self.volatility_history)
+            self.baseline_volatility = self.volatility_history.median()
         elif self.baseline_volatility is None:
             self.baseline_volatility = current_volatility
         
         # Update baseline volatility with long-term median
-        if len(self.volatility_history) >= 50:
-            self.baseline_volatility = np.median(self.volatility_history[-50:])
+        if self.volatility_history.is_full:
+            self.baseline_volatility = self.volatility_history.median()
         
         # Detect regime
         new_regime = self._detect_regime(
             current_price=price,
-            short_ma=self.short_ma[-1] if self.short_ma else price,
-            long_ma=self.long_ma[-1] if self.long_ma else price,
+            short_ma=self.short_ma if self.short_ma is not None else price,
+            long_ma=self.long_ma if self.long_ma is not None else price,
             current_volatility=current_volatility
         )
         
@@ -1252,17 +1474,6 @@ class MarketRegimeDetector:
         
         return self.current_regime
     
-    def _calculate_ma(self, data: List[float], window: int) -> List[float]:
-        """Calculate moving average over the given window"""
-        if len(data) < window:
-            return []
-        
-        result = []
-        for i in range(window-1, len(data)):
-            result.append(sum(data[i-window+1:i+1]) / window)
-        
-        return result
-    
     def _detect_regime(
         self, 
         current_price: float, 
@@ -1323,12 +1534,12 @@ class MarketRegimeDetector:
             "potential_regime": self.potential_regime.name,
             "bars_in_potential_regime": self.bars_in_potential_regime,
             "regime_multiplier": self.get_regime_multiplier(),
-            "current_volatility": self.volatility_history[-1] if self.volatility_history else None,
+            "current_volatility": self.volatility_history.last,
             "baseline_volatility": self.baseline_volatility,
-            "vol_ratio": (self.volatility_history[-1] / self.baseline_volatility 
+            "vol_ratio": (self.volatility_history.last / self.baseline_volatility 
                         if self.volatility_history and self.baseline_volatility else None),
-            "short_ma": self.short_ma[-1] if self.short_ma else None,
-            "long_ma": self.long_ma[-1] if self.long_ma else None,
+            "short_ma": self.short_ma,
+            "long_ma": self.long_ma,
             "regime_history": self.regime_history
         }
     
@@ -1339,7 +1550,7 @@ class MarketRegimeDetector:
         self.bars_in_potential_regime = 0
         
         # Keep history for reference but reset tracking
-        self.baseline_volatility = None if not self.volatility_history else np.median(self.volatility_history)
+        self.baseline_volatility = self.volatility_history.median()
         
         logger.info("Reset market regime detector")
 
@@ -1391,10 +1602,9 @@ class VolatilityBasedPositionSizer:
         self.max_sizing = max_sizing
         
         # Runtime state
-        self.price_history = []
-        self.high_history = []
-        self.low_history = []
-        self.returns_history = []
+        self.last_price: Optional[float] = None
+        self.returns_history = RollingWindow(vol_window)
+        self.true_ranges = RollingWindow(atr_window)
         self.realized_volatility = None
         self.atr_values = []
         self.current_atr = None
@@ -1423,35 +1633,37 @@ class VolatilityBasedPositionSizer:
         high_price = high_price if high_price is not None else close_price
         low_price = low_price if low_price is not None else close_price
         
-        # Update price history
-        self.price_history.append(close_price)
-        self.high_history.append(high_price)
-        self.low_history.append(low_price)
+        prev_close = self.last_price
+        
+        # Update true range against the previous close
+        if prev_close is not None:
+            # True Range is the greatest of:
+            # 1. Current High - Current Low
+            # 2. |Current High - Previous Close|
+            # 3. |Current Low - Previous Close|
+            self.true_ranges.append(max(
+                high_price - low_price,
+                abs(high_price - prev_close),
+                abs(low_price - prev_close)
+            ))
         
         # Calculate returns if not provided
-        if returns is None and len(self.price_history) >= 2:
-            returns = (self.price_history[-1] / self.price_history[-2]) - 1
+        if returns is None and prev_close:
+            returns = (close_price / prev_close) - 1
+        self.last_price = close_price
         
         if returns is not None:
             self.returns_history.append(returns)
         
         # Need sufficient history
-        if len(self.returns_history) < self.vol_window:
+        if not self.returns_history.is_full:
             return 1.0  # Default to normal sizing with insufficient history
         
-        # Trim histories to manageable size
-        max_history = max(self.vol_window, self.atr_window) * 3
-        if len(self.price_history) > max_history:
-            self.price_history = self.price_history[-max_history:]
-            self.high_history = self.high_history[-max_history:]
-            self.low_history = self.low_history[-max_history:]
-            self.returns_history = self.returns_history[-max_history:]
-        
         # Calculate realized volatility (annualized)
-        self.realized_volatility = np.std(self.returns_history[-self.vol_window:]) * np.sqrt(252)
+        self.realized_volatility = self.returns_history.std() * np.sqrt(252)
         
         # Calculate ATR if needed
-        if self.use_atr and len(self.price_history) > self.atr_window:
+        if self.use_atr and self.true_ranges.is_full:
             self.current_atr = self._calculate_atr()
             self.atr_values.append(self.current_atr)
         
@@ -1471,28 +1683,11 @@ class VolatilityBasedPositionSizer:
     
     def _calculate_atr(self) -> float:
         """Calculate Average True Range"""
-        if len(self.price_history) <= self.atr_window:
+        if not self.true_ranges.is_full:
             return 0.0
         
-        true_ranges = []
-        for i in range(1, len(self.price_history)):
-            high = self.high_history[i]
-            low = self.low_history[i]
-            prev_close = self.price_history[i-1]
-            
-            # True Range is the greatest of:
-            # 1. Current High - Current Low
-            # 2. |Current High - Previous Close|
-            # 3. |Current Low - Previous Close|
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
         # Calculate ATR as simple average of true ranges
-        return np.mean(true_ranges[-self.atr_window:])
+        return self.true_ranges.mean()
     
     def _get_volatility_position_size(self) -> float:
         """Calculate position size based on volatility targeting"""
@@ -1510,11 +1705,11 @@ class VolatilityBasedPositionSizer:
     
     def _get_atr_position_size(self) -> float:
         """Calculate position size based on ATR"""
-        if not self.current_atr or self.current_atr < 0.0001 or not self.price_history:
+        if not self.current_atr or self.current_atr < 0.0001 or not self.last_price:
             return 1.0  # Default to normal sizing with negligible ATR
         
         # ATR as percentage of price
-        atr_pct = self.current_atr / self.price_history[-1]
+        atr_pct = self.current_atr / self.last_price
         
         # Risk-based position size multiplier:
         # If ATR is high (volatile), decrease position size
@@ -2013,17 +2208,55 @@ class ScenarioResult:
             },
             "timestamp": self.timestamp,
             "metrics": self.metrics.to_dict(),
-            "equity_final": self.equity_curve[-1] if self.equity_curve else None,
+            "equity_final": self.equity_curve[-1] if len(self.equity_curve) else None,
             "equity_change_pct": ((self.equity_curve[-1] / self.equity_curve[0]) - 1) if len(self.equity_curve) > 1 else 0.0,
             "risk_event_count": len(self.risk_events)
         }
     
-    def save_to_file(self, directory: str) -> str:
+    def to_payload(self) -> Dict[str, Any]:
+        """
+        Convert results to a compact, picklable payload
+        
+        Curves are sent as float arrays and the trade history as records, so
+        results can cross process boundaries without pickling DataFrames.
+        """
+        return {
+            "scenario": self.scenario,
+            "equity_curve": np.asarray(self.equity_curve, dtype=np.float64),
+            "returns": np.asarray(self.returns, dtype=np.float64),
+            "metrics": self.metrics.to_dict(),
+            "trade_history": (self.trade_history.to_dict('records')
+                              if self.trade_history is not None else None),
+            "risk_events": self.risk_events,
+            "timestamp": self.timestamp
+        }
+    
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'ScenarioResult':
+        """Rebuild results from a payload created by ``to_payload``"""
+        metrics = ScenarioPerformanceMetrics()
+        for key, value in payload["metrics"].items():
+            setattr(metrics, key, value)
+        
+        trade_history = payload.get("trade_history")
+        result = cls(
+            scenario=payload["scenario"],
+            equity_curve=payload["equity_curve"].tolist(),
+            returns=payload["returns"].tolist(),
+            metrics=metrics,
+            trade_history=pd.DataFrame(trade_history) if trade_history is not None else None,
+            risk_events=payload.get("risk_events")
+        )
+        result.timestamp = payload.get("timestamp", result.timestamp)
+        return result
+    
+    def save_to_file(self, directory: str, name: Optional[str] = None) -> str:
         """
         Save scenario results to files
         
         Args:
             directory: Directory to save results
+            name: Prefix of the results subdirectory (defaults to the scenario name)
             
         Returns:
             Path to the saved results
@@ -2037,7 +2270,7 @@ class ScenarioResult:
         
         # Create scenario-specific subdirectory
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        scenario_dir = os.path.join(directory, f"{self.scenario.name}_{timestamp}")
+        scenario_dir = os.path.join(directory, f"{name or self.scenario.name}_{timestamp}")
         os.makedirs(scenario_dir, exist_ok=True)
         
         # Save summary as JSON
@@ -2047,9 +2280,11 @@ class ScenarioResult:
         
         # Save equity curve as CSV
         equity_path = os.path.join(scenario_dir, "equity_curve.csv")
+        # Returns start at the second equity point
+        returns = [np.nan] * (len(self.equity_curve) - len(self.returns)) + list(self.returns)
         pd.DataFrame({
             "equity": self.equity_curve,
-            "returns": self.returns
+            "returns": returns
         }).to_csv(equity_path, index=False)
         
         # Save trade history if available
@@ -2271,14 +2506,11 @@ class ScenarioInjector:
         current_spread_multiplier = 1.0 + (spread_multiplier - 1.0) * phase_factor
         
         # Reduce book depth by removing volume
-        for i, bid in enumerate(order_book.bids):
-            order_book.bids[i].volume *= (1.0 - current_depth_reduction)
-        
-        for i, ask in enumerate(order_book.asks):
-            order_book.asks[i].volume *= (1.0 - current_depth_reduction)
+        order_book.scale_volume(OrderSide.BID, 1.0 - current_depth_reduction)
+        order_book.scale_volume(OrderSide.ASK, 1.0 - current_depth_reduction)
         
         # Widen spread by moving best ask up and best bid down
-        if order_book.bids and order_book.asks:
+        if order_book.spread is not None:
             mid_price = order_book.mid_price
             if mid_price:
                 current_spread = order_book.spread or (mid_price * 0.001)  # Default 0.1% spread
@@ -2287,18 +2519,15 @@ class ScenarioInjector:
                 # Adjust best bid and ask to achieve target spread
                 spread_adjustment = (target_spread - current_spread) / 2
                 
-                if order_book.bids:
-                    order_book.bids[0].price -= spread_adjustment
-                
-                if order_book.asks:
-                    order_book.asks[0].price += spread_adjustment
+                order_book.widen_best_price(OrderSide.BID, spread_adjustment)
+                order_book.widen_best_price(OrderSide.ASK, spread_adjustment)
     
     def _apply_volatility_to_book(self, order_book: OrderBook) -> None:
         """Apply volatility effects to order book"""
         vol_multiplier = self._get_vol_multiplier()
         
         # Increase bid-ask spread
-        if order_book.bids and order_book.asks:
+        if order_book.spread is not None:
             mid_price = order_book.mid_price
             if mid_price:
                 current_spread = order_book.spread or (mid_price * 0.001)
@@ -2307,11 +2536,8 @@ class ScenarioInjector:
                 # Adjust best bid and ask to achieve target spread
                 spread_adjustment = (target_spread - current_spread) / 2
                 
-                if order_book.bids:
-                    order_book.bids[0].price -= spread_adjustment
-                
-                if order_book.asks:
-                    order_book.asks[0].price += spread_adjustment
+                order_book.widen_best_price(OrderSide.BID, spread_adjustment)
+                order_book.widen_best_price(OrderSide.ASK, spread_adjustment)
         
         # Increase order book imbalance
         imbalance_direction = self.scenario.params.get('imbalance_direction', 1)  # 1 for bid-heavy, -1 for ask-heavy
@@ -2319,18 +2545,49 @@ class ScenarioInjector:
         
         if imbalance_direction > 0:
             # Increase bid volume relative to ask
-            for bid in order_book.bids:
-                bid.volume *= (1.0 + imbalance_strength)
-            
-            for ask in order_book.asks:
-                ask.volume *= (1.0 - imbalance_strength / 2)
+            order_book.scale_volume(OrderSide.BID, 1.0 + imbalance_strength)
+            order_book.scale_volume(OrderSide.ASK, 1.0 - imbalance_strength / 2)
         else:
             # Increase ask volume relative to bid
-            for bid in order_book.bids:
-                bid.volume *= (1.0 - imbalance_strength / 2)
-            
-            for ask in order_book.asks:
-                ask.volume *= (1.0 + imbalance_strength)
+            order_book.scale_volume(OrderSide.BID, 1.0 - imbalance_strength / 2)
+            order_book.scale_volume(OrderSide.ASK, 1.0 + imbalance_strength)
+
+def _scenario_seed(random_seed: int, scenario_name: str, symbol: str) -> int:
+    """Derive a stable per-scenario, per-symbol seed from a base seed"""
+    return zlib.crc32(f"{random_seed}:{scenario_name}:{symbol}".encode()) & 0x7FFFFFFF
+
+def _run_scenario_task(
+    simulator: OrderBookSimulator,
+    risk_manager: 'BacktestCircuitBreakerManager',
+    scenario: Scenario,
+    symbol: str,
+    columns: Dict[str, np.ndarray],
+    initial_equity: Optional[float],
+    max_bars: int,
+    post_scenario_bars: int,
+    random_seed: Optional[int]
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Run one scenario in a worker process
+    
+    Returns:
+        (scenario_name, symbol, result payload)
+    """
+    tester = ScenarioTester(simulator, risk_manager)
+    tester.add_scenario(scenario)
+    
+    result = tester.run_scenario(
+        scenario_name=scenario.name,
+        ohlc_data=pd.DataFrame(columns),
+        symbol=symbol,
+        initial_equity=initial_equity,
+        max_bars=max_bars,
+        post_scenario_bars=post_scenario_bars,
+        random_seed=random_seed,
+        save_results=False
+    )
+    
+    return scenario.name, symbol, result.to_payload()
 
 class ScenarioTester:
     """
@@ -2485,7 +2742,9 @@ class ScenarioTester:
         symbol: str,
         initial_equity: float = None,
         max_bars: int = 200,
-        post_scenario_bars: int = 50
+        post_scenario_bars: int = 50,
+        random_seed: Optional[int] = None,
+        save_results: bool = True
     ) -> ScenarioResult:
         """
         Run a specific scenario
@@ -2497,6 +2756,8 @@ class ScenarioTester:
             initial_equity: Starting equity (if None, use risk_manager's current equity)
             max_bars: Maximum number of bars to run
             post_scenario_bars: Number of bars to run after scenario ends
+            random_seed: Base seed; each (scenario, symbol) pair gets its own derived seed
+            save_results: Whether to write the result files to results_dir
             
         Returns:
             Scenario test results
@@ -2510,6 +2771,10 @@ class ScenarioTester:
         # Reset state
         self._reset_state(initial_equity)
         
+        # Seed the book generator so results do not depend on run order
+        if random_seed is not None:
+            np.random.seed(_scenario_seed(random_seed, scenario_name, symbol))
+        
         # Create scenario injector
         self.active_scenario = scenario
         self.active_injector = ScenarioInjector(scenario)
@@ -2528,12 +2793,15 @@ class ScenarioTester:
         # Run the backtest
         logger.info(f"Running scenario '{scenario_name}' for {total_bars} bars")
         
+        # Extract bars once rather than indexing the DataFrame every iteration
+        bars = ohlc_data.iloc[:total_bars].to_dict('records')
+        
         for bar in range(total_bars):
             # Update current bar
             self.current_bar = bar
             
             # Get original OHLC data for this bar
-            orig_ohlc = ohlc_data.iloc[bar].to_dict()
+            orig_ohlc = bars[bar]
             
             # Update scenario injector
             in_scenario = self.active_injector.update(bar)
@@ -2549,7 +2817,7 @@ class ScenarioTester:
                 modified_ohlc = orig_ohlc
             
             # Update simulator with the (possibly modified) OHLC data
-            self.simulator.update_from_ohlcv(symbol, pd.Series(modified_ohlc))
+            self.simulator.update_from_ohlcv(symbol, modified_ohlc)
             
             # Update risk management systems
             cb_level, market_regime, position_size = self.risk_manager.update_equity(
@@ -2587,7 +2855,8 @@ class ScenarioTester:
         self.results[scenario_name] = result
         
         # Save result
-        result.save_to_file(self.results_dir)
+        if save_results:
+            result.save_to_file(self.results_dir)
         
         logger.info(f"Completed scenario '{scenario_name}'")
         return result
@@ -2598,7 +2867,10 @@ class ScenarioTester:
         symbol: str,
         initial_equity: float = None,
         max_bars: int = 200,
-        post_scenario_bars: int = 50
+        post_scenario_bars: int = 50,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        random_seed: Optional[int] = None
     ) -> Dict[str, ScenarioResult]:
         """
         Run all defined scenarios
@@ -2609,10 +2881,23 @@ class ScenarioTester:
             initial_equity: Starting equity
             max_bars: Maximum number of bars to run
             post_scenario_bars: Number of bars to run after scenario ends
+            parallel: Fan scenarios out across a process pool
+            max_workers: Number of worker processes (defaults to CPU count)
+            random_seed: Base seed for deterministic per-scenario book generation
             
         Returns:
             Dictionary of scenario results
         """
+        if parallel:
+            return self.run_scenarios_parallel(
+                {symbol: ohlc_data},
+                initial_equity=initial_equity,
+                max_bars=max_bars,
+                post_scenario_bars=post_scenario_bars,
+                max_workers=max_workers,
+                random_seed=random_seed
+            )[symbol]
+        
         results = {}
         
         for scenario_name in self.scenarios:
@@ -2623,7 +2908,8 @@ class ScenarioTester:
                 symbol=symbol,
                 initial_equity=initial_equity,
                 max_bars=max_bars,
-                post_scenario_bars=post_scenario_bars
+                post_scenario_bars=post_scenario_bars,
+                random_seed=random_seed
             )
             
             results[scenario_name] = result
@@ -2633,6 +2919,92 @@ class ScenarioTester:
         
         return results
     
+    def run_scenarios_parallel(
+        self,
+        ohlc_data: Dict[str, pd.DataFrame],
+        scenario_names: List[str] = None,
+        initial_equity: float = None,
+        max_bars: int = 200,
+        post_scenario_bars: int = 50,
+        max_workers: Optional[int] = None,
+        random_seed: Optional[int] = None
+    ) -> Dict[str, Dict[str, ScenarioResult]]:
+        """
+        Run scenarios for one or more symbols across a process pool
+        
+        Every (scenario, symbol) pair is an independent task running against a
+        copy of this tester's simulator and risk manager. Workers receive only
+        the bars they need as NumPy columns and return compact payloads; results
+        are saved and merged into the comparative report as they complete.
+        Unlike a serial run, no risk state carries over between scenarios, so
+        with ``random_seed`` set each result matches running that scenario
+        alone from this tester's current state.
+        
+        Args:
+            ohlc_data: Dictionary of symbol -> OHLC data to use as baseline
+            scenario_names: Scenarios to run (defaults to all)
+            initial_equity: Starting equity
+            max_bars: Maximum number of bars to run
+            post_scenario_bars: Number of bars to run after scenario ends
+            max_workers: Number of worker processes (defaults to CPU count)
+            random_seed: Base seed for deterministic per-scenario book generation
+            
+        Returns:
+            Dictionary of symbol -> scenario name -> results
+        """
+        scenario_names = scenario_names or list(self.scenarios)
+        for scenario_name in scenario_names:
+            if scenario_name not in self.scenarios:
+                raise ValueError(f"Scenario '{scenario_name}' not found")
+        
+        results: Dict[str, Dict[str, ScenarioResult]] = {symbol: {} for symbol in ohlc_data}
+        summaries = {}
+        multi_symbol = len(ohlc_data) > 1
+        
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for symbol, data in ohlc_data.items():
+                for scenario_name in scenario_names:
+                    scenario = self.scenarios[scenario_name]
+                    
+                    # Only ship the bars the scenario will actually use
+                    total_bars = min(
+                        max_bars,
+                        scenario.start_bar + scenario.duration_bars + post_scenario_bars
+                    )
+                    window = data.iloc[:total_bars]
+                    columns = {column: window[column].to_numpy() for column in window.columns}
+                    
+                    futures.append(executor.submit(
+                        _run_scenario_task,
+                        self.simulator,
+                        self.risk_manager,
+                        scenario,
+                        symbol,
+                        columns,
+                        initial_equity,
+                        max_bars,
+                        post_scenario_bars,
+                        random_seed
+                    ))
+            
+            for future in as_completed(futures):
+                scenario_name, symbol, payload = future.result()
+                result = ScenarioResult.from_payload(payload)
+                key = f"{scenario_name}_{symbol}" if multi_symbol else scenario_name
+                result.save_to_file(self.results_dir, name=key)
+                
+                results[symbol][scenario_name] = result
+                self.results[key] = result
+                summaries[key] = self._summarize_result(result)
+                
+                logger.info(f"Completed scenario '{scenario_name}' for {symbol} "
+                            f"({len(summaries)}/{len(futures)})")
+        
+        self._write_comparative_report(summaries)
+        
+        return results
+    
     def _reset_state(self, initial_equity: float = None) -> None:
         """Reset tester state for a new scenario run"""
         # Reset simulator and risk manager
@@ -2778,8 +3150,26 @@ class ScenarioTester:
         
         return metrics
     
+    def _summarize_result(self, result: ScenarioResult) -> Dict[str, Any]:
+        """Summarize one scenario result for the comparative report"""
+        return {
+            "type": result.scenario.scenario_type.value,
+            "equity_change_pct": ((result.equity_curve[-1] / result.equity_curve[0]) - 1) if len(result.equity_curve) > 1 else 0.0,
+            "max_drawdown_pct": result.metrics.max_drawdown_pct,
+            "recovery_bars": result.metrics.recovery_bars,
+            "recovered": result.metrics.recovered,
+            "circuit_breaker_activations": result.metrics.circuit_breaker_activations,
+            "emergency_stop_activated": result.metrics.emergency_stop_activated
+        }
+    
     def _generate_comparative_report(self, results: Dict[str, ScenarioResult]) -> None:
         """Generate a comparative report of all scenario results"""
+        self._write_comparative_report({
+            name: self._summarize_result(result) for name, result in results.items()
+        })
+    
+    def _write_comparative_report(self, summaries: Dict[str, Dict[str, Any]]) -> None:
+        """Write scenario summaries to a comparative report file"""
         import os
         import json
         from datetime import datetime
@@ -2791,22 +3181,10 @@ class ScenarioTester:
         # Prepare comparative data
         comparative_data = {
             "timestamp": datetime.now().isoformat(),
-            "scenario_count": len(results),
-            "scenarios": {}
+            "scenario_count": len(summaries),
+            "scenarios": summaries
         }
         
-        # Add summary of each scenario
-        for name, result in results.items():
-            comparative_data["scenarios"][name] = {
-                "type": result.scenario.scenario_type.value,
-                "equity_change_pct": ((result.equity_curve[-1] / result.equity_curve[0]) - 1) if len(result.equity_curve) > 1 else 0.0,
-                "max_drawdown_pct": result.metrics.max_drawdown_pct,
-                "recovery_bars": result.metrics.recovery_bars,
-                "recovered": result.metrics.recovered,
-                "circuit_breaker_activations": result.metrics.circuit_breaker_activations,
-                "emergency_stop_activated": result.metrics.emergency_stop_activated
-            }
-        
         # Save comparative report
         with open(report_path, 'w') as f:
             json.dump(comparative_data, f, indent=2, default=str)
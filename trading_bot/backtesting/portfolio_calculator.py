@@ -11,6 +11,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Relative tolerance below which a quantity counts as zero, so fractional
+# lots that add up to a whole position close in both accounting paths
+QUANTITY_TOLERANCE = 1e-9
+
+
+def _quantity_tolerance(scale):
+    """Absolute zero tolerance for quantities of the given magnitude."""
+    return QUANTITY_TOLERANCE * np.maximum(1.0, np.abs(scale))
+
+
 class PortfolioCalculator:
     """
     Advanced portfolio calculator that accurately tracks portfolio value based on actual trades.
@@ -265,7 +275,7 @@ class PortfolioCalculator:
             closed_trades = []
             
             for i, trade in enumerate(self.open_trades[symbol]):
-                if remaining_to_sell <= 0:
+                if remaining_to_sell <= _quantity_tolerance(quantity):
                     break
                 
                 # How much we can sell from this trade
@@ -280,7 +290,8 @@ class PortfolioCalculator:
                 remaining_to_sell -= sell_quantity
                 
                 # If trade is fully closed, mark for recording
-                if trade['remaining_quantity'] <= 0:
+                if trade['remaining_quantity'] <= _quantity_tolerance(trade['quantity']):
+                    trade['remaining_quantity'] = 0.0
                     closed_trade = trade.copy()
                     closed_trade['exit_price'] = price
                     closed_trade['exit_date'] = trade_date
@@ -305,7 +316,7 @@ class PortfolioCalculator:
                 position['quantity'] -= quantity
                 
                 # If position is closed, remove it
-                if position['quantity'] <= 0:
+                if position['quantity'] <= _quantity_tolerance(quantity):
                     del self.current_positions[symbol]
             
             # Record realized P&L
@@ -677,6 +688,511 @@ class PortfolioCalculator:
         
         return snapshot
     
+    def calculate_portfolio_series(
+        self,
+        trades: Union[pd.DataFrame, List[Dict[str, Any]]],
+        prices: pd.DataFrame,
+        fx_rates: Optional[pd.DataFrame] = None,
+        detailed_snapshots: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Columnar accounting for a whole trade history.
+        
+        Equivalent to process_trades() followed by calculate_portfolio_value()
+        on every date, with market data taken from the close price panel.
+        Cash, fees and positions come from cumulative sums over the trade
+        table, FIFO lots are matched with searchsorted on cumulative bought
+        and sold quantities, and positions are revalued as date x symbol
+        matrices. The calculator state (cash, positions, open and closed lots,
+        cash transactions, fees, daily values) is rebuilt from initial_capital,
+        so get_performance_series(), get_trade_metrics(),
+        get_attribution_analysis() and get_drawdown_analysis() work as usual.
+        
+        Args:
+            trades: Trade table or list of trade dictionaries (same fields as
+                process_trades), in chronological order
+            prices: Close prices indexed by date with one column per symbol;
+                missing prices fall back to the position's average price
+            fx_rates: Optional rates to the base currency indexed by date with
+                one column per currency. When given, trades are converted at
+                the rate on their date and non-base positions are revalued at
+                the rate on each valuation date. Currencies not in the panel
+                use _get_fx_rate().
+            detailed_snapshots: Keep a full snapshot for every date instead of
+                only the last one
+            
+        Returns:
+            Dictionary with 'portfolio' (value, cash, positions and cumulative
+            fees per date), 'quantities', 'market_values' and 'unrealized_pnl'
+            (date x symbol), 'asset_class_values' and 'strategy_values'
+        """
+        self._reset_state()
+        table = self._build_trade_table(trades, fx_rates)
+        if not table['date'].is_monotonic_increasing:
+            raise ValueError("Trades must be in chronological order")
+        
+        self._account_trades(table)
+        result = self._revalue_positions(table, prices.sort_index(), fx_rates, detailed_snapshots)
+        
+        logger.info(f"Processed {len(table)} trades and {len(prices)} valuation dates")
+        return result
+    
+    def _reset_state(self) -> None:
+        """Reset portfolio state to the initial capital."""
+        self.cash_balance = self.initial_capital
+        self.current_positions = {}
+        self.closed_positions = []
+        self.open_trades = {}
+        self.cash_transactions = []
+        self.dividends = []
+        self.interest = []
+        self.fees = []
+        self.daily_portfolio_values = []
+        self.portfolio_snapshots = []
+        self.strategy_allocations = {}
+        self.asset_class_values = {}
+    
+    def _build_trade_table(
+        self,
+        trades: Union[pd.DataFrame, List[Dict[str, Any]]],
+        fx_rates: Optional[pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        Normalize trades into a table with the defaults used by _process_single_trade.
+        
+        Args:
+            trades: Trade table or list of trade dictionaries
+            fx_rates: Optional FX panel
+            
+        Returns:
+            Trade table with an 'fx_rate' column
+        """
+        table = pd.DataFrame(trades).reset_index(drop=True)
+        defaults = {
+            'symbol': '', 'quantity': 0.0, 'price': 0.0, 'direction': '',
+            'date': datetime.now(), 'type': 'stock', 'strategy': 'unknown',
+            'asset_class': 'equity', 'currency': self.base_currency,
+            'commission': 0.0, 'slippage': 0.0
+        }
+        for column, default in defaults.items():
+            if column not in table:
+                table[column] = default
+            else:
+                table[column] = table[column].fillna(default)
+        
+        for column in ['quantity', 'price', 'commission', 'slippage']:
+            table[column] = table[column].astype(float)
+        table['direction'] = table['direction'].astype(str).str.lower()
+        
+        default_ids = (table['symbol'].map(str) + '_' + table['date'].map(str) + '_'
+                       + table['direction'])
+        table['id'] = table['id'].fillna(default_ids) if 'id' in table else default_ids
+        table['date'] = pd.to_datetime(table['date'])
+        
+        table['fx_rate'] = 1.0
+        foreign = (table['currency'] != self.base_currency).to_numpy()
+        if foreign.any():
+            table.loc[foreign, 'fx_rate'] = self._lookup_fx_rates(
+                table['currency'].to_numpy()[foreign],
+                pd.DatetimeIndex(table['date'].to_numpy()[foreign]),
+                fx_rates
+            )
+        
+        return table
+    
+    def _lookup_fx_rates(
+        self,
+        currencies: np.ndarray,
+        dates: pd.DatetimeIndex,
+        fx_rates: Optional[pd.DataFrame]
+    ) -> np.ndarray:
+        """
+        Rates to the base currency for paired arrays of currencies and dates.
+        
+        Args:
+            currencies: Currency codes
+            dates: Lookup dates
+            fx_rates: Optional FX panel (last rate on or before each date is used)
+            
+        Returns:
+            Array of rates
+        """
+        rates = np.full(len(currencies), np.nan)
+        
+        if fx_rates is not None and not fx_rates.empty:
+            panel = fx_rates.sort_index().ffill()
+            rows = panel.index.searchsorted(dates, side='right') - 1
+            cols = panel.columns.get_indexer(currencies)
+            valid = (rows >= 0) & (cols >= 0)
+            rates[valid] = panel.to_numpy(dtype=float)[rows[valid], cols[valid]]
+        
+        missing = np.flatnonzero(np.isnan(rates))
+        if len(missing):
+            pairs = pd.MultiIndex.from_arrays([currencies[missing], dates[missing]])
+            codes, unique_pairs = pd.factorize(pairs)
+            unique_rates = np.array([
+                self._get_fx_rate(currency, self.base_currency, date)
+                for currency, date in unique_pairs
+            ])
+            rates[missing] = unique_rates[codes]
+        
+        return rates
+    
+    def _account_trades(self, table: pd.DataFrame) -> None:
+        """
+        Apply a trade table to the portfolio state with group operations.
+        
+        Adds per-trade state columns to the table: 'cash', 'fees_paid',
+        'held' (position after the trade), 'average_price' and the
+        attributes of the position the trade belongs to.
+        
+        Args:
+            table: Trade table from _build_trade_table
+        """
+        n = len(table)
+        symbols = table['symbol'].to_numpy()
+        is_buy = (table['direction'] == 'buy').to_numpy()
+        quantity = table['quantity'].to_numpy()
+        price = table['price'].to_numpy()
+        fx_rate = table['fx_rate'].to_numpy()
+        
+        # Cash flows in base currency, accumulated in trade order
+        trade_value = price * quantity * fx_rate
+        commission = table['commission'].to_numpy() * fx_rate
+        slippage = table['slippage'].to_numpy() * fx_rate
+        flows = np.where(is_buy, -(trade_value + commission + slippage),
+                         trade_value - commission - slippage)
+        cash = np.cumsum(np.concatenate([[self.initial_capital], flows]))[1:]
+        table['cash'] = cash
+        
+        recorded_commission = np.where(commission > 0, commission, 0.0) if self.track_fees else np.zeros(n)
+        recorded_slippage = np.where(slippage > 0, slippage, 0.0) if self.track_slippage else np.zeros(n)
+        table['fees_paid'] = np.cumsum(recorded_commission + recorded_slippage)
+        
+        # Position after each trade: a running sum floored at zero, since
+        # selling more than is held closes the position
+        by_symbol = pd.Series(symbols)
+        raw = pd.Series(np.where(is_buy, quantity, -quantity)).groupby(by_symbol).cumsum()
+        floor = raw.groupby(by_symbol).cummin().clip(upper=0)
+        held = (raw - floor).to_numpy()
+        cum_bought = pd.Series(np.where(is_buy, quantity, 0.0)).groupby(by_symbol).cumsum().to_numpy()
+        held = np.where(held <= _quantity_tolerance(cum_bought), 0.0, held)
+        held_before = pd.Series(held).groupby(by_symbol).shift(fill_value=0.0).to_numpy()
+        table['held'] = held
+        
+        # A buy into a flat book opens a new position; the position takes its
+        # attributes from that trade
+        opens = is_buy & (held_before == 0)
+        table['position_id'] = pd.Series(opens).groupby(by_symbol).cumsum().to_numpy()
+        position_keys = [table['symbol'], table['position_id']]
+        for column, attribute in [('type', 'position_type'), ('strategy', 'position_strategy'),
+                                  ('asset_class', 'position_asset_class'),
+                                  ('currency', 'position_currency'), ('date', 'open_date')]:
+            table[attribute] = table[column].groupby(position_keys).transform('first')
+        table['cost_basis'] = (pd.Series(np.where(is_buy, price * quantity, 0.0))
+                               .groupby(position_keys).cumsum().to_numpy())
+        
+        # Average price is a recurrence on the quantity held before each buy
+        average = np.full(n, np.nan)
+        last_average = {}
+        for i in np.flatnonzero(is_buy):
+            previous = last_average.get(symbols[i], 0.0) if held_before[i] > 0 else 0.0
+            average[i] = last_average[symbols[i]] = (
+                (previous * held_before[i]) + (price[i] * quantity[i])
+            ) / (held_before[i] + quantity[i])
+        table['average_price'] = pd.Series(average).groupby(by_symbol).ffill().to_numpy()
+        
+        self._match_fifo_lots(table, is_buy, held, cum_bought)
+        self._record_trade_cash_flows(table, is_buy, trade_value, commission, slippage,
+                                      recorded_commission, recorded_slippage)
+        
+        # Final state
+        self.cash_balance = cash[-1] if n else self.initial_capital
+        last_rows = table[~table['symbol'].duplicated(keep='last')]
+        last_rows = last_rows[last_rows['held'] > 0].sort_values('open_date', kind='stable')
+        for row in last_rows.itertuples(index=False):
+            self.current_positions[row.symbol] = {
+                'quantity': row.held,
+                'average_price': row.average_price,
+                'cost_basis': row.cost_basis,
+                'trade_type': row.position_type,
+                'strategy': row.position_strategy,
+                'asset_class': row.position_asset_class,
+                'open_date': row.open_date
+            }
+    
+    def _match_fifo_lots(self, table: pd.DataFrame, is_buy: np.ndarray, held: np.ndarray,
+                         cum_bought: np.ndarray) -> None:
+        """
+        Match sells to buy lots first-in first-out.
+        
+        Lot k covers the cumulative bought quantity (B[k-1], B[k]]; it is
+        closed by the first sell after which the cumulative quantity sold
+        reaches B[k], within the quantity tolerance so that fractional
+        quantities summed in a different order still close the same lot. As
+        in _update_positions, the realized P&L recorded for a closed lot is
+        that of the portion sold by the closing sell.
+        
+        Args:
+            table: Trade table with per-trade state
+            is_buy: Buy mask
+            held: Position after each trade (zero when flat within tolerance)
+            cum_bought: Cumulative quantity bought per symbol after each trade
+        """
+        price = table['price'].to_numpy()
+        dates = table['date'].tolist()
+        rows_as_records = table[['id', 'symbol', 'quantity', 'price', 'date', 'type', 'strategy',
+                                 'asset_class']].to_dict('records')
+        by_symbol = pd.Series(table['symbol'].to_numpy())
+        cum_sold = cum_bought - held
+        sold_before = pd.Series(cum_sold).groupby(by_symbol).shift(fill_value=0.0).to_numpy()
+        
+        closed = []
+        for symbol, rows in by_symbol.groupby(by_symbol, sort=False).indices.items():
+            lots = rows[is_buy[rows]]
+            if not len(lots):
+                continue
+            sells = rows[~is_buy[rows]]
+            lot_end = cum_bought[lots]
+            lot_start = np.concatenate([[0.0], lot_end[:-1]])
+            sell_sold = cum_sold[sells]
+            closing = np.searchsorted(sell_sold + _quantity_tolerance(sell_sold), lot_end, side='left')
+            is_closed = closing < len(sells)
+            
+            for lot, start, end, sell_index in zip(lots[is_closed], lot_start[is_closed],
+                                                   lot_end[is_closed], closing[is_closed]):
+                exit_row = sells[sell_index]
+                portion = end - max(start, sold_before[exit_row])
+                closed.append((exit_row, lot, portion * (price[exit_row] - price[lot])))
+            
+            still_open = ~is_closed
+            if still_open.any():
+                sold = cum_sold[rows[-1]]
+                self.open_trades[symbol] = [
+                    self._lot_record(rows_as_records[lot], end - max(start, sold))
+                    for lot, start, end in zip(lots[still_open], lot_start[still_open], lot_end[still_open])
+                ]
+        
+        for exit_row, lot, realized_pnl in sorted(closed, key=lambda item: (item[0], item[1])):
+            closed_trade = self._lot_record(rows_as_records[lot], 0.0)
+            closed_trade['exit_price'] = price[exit_row]
+            closed_trade['exit_date'] = dates[exit_row]
+            closed_trade['realized_pnl'] = realized_pnl
+            closed_trade['holding_period'] = (dates[exit_row] - dates[lot]).days
+            self.closed_positions.append(closed_trade)
+    
+    def _lot_record(self, trade: Dict[str, Any], remaining_quantity: float) -> Dict[str, Any]:
+        """Open trade record for a buy, as built by _update_positions."""
+        return {
+            'trade_id': trade['id'],
+            'symbol': trade['symbol'],
+            'quantity': trade['quantity'],
+            'price': trade['price'],
+            'date': trade['date'],
+            'trade_type': trade['type'],
+            'strategy': trade['strategy'],
+            'asset_class': trade['asset_class'],
+            'remaining_quantity': remaining_quantity
+        }
+    
+    def _record_trade_cash_flows(
+        self,
+        table: pd.DataFrame,
+        is_buy: np.ndarray,
+        trade_value: np.ndarray,
+        commission: np.ndarray,
+        slippage: np.ndarray,
+        recorded_commission: np.ndarray,
+        recorded_slippage: np.ndarray
+    ) -> None:
+        """Fill cash_transactions and fees from the trade table."""
+        for row, buy, value, fee, slip in zip(table.itertuples(index=False), is_buy,
+                                              trade_value, commission, slippage):
+            if buy:
+                amount = -(value + fee + slip)
+                details = f"Buy {row.quantity} of {row.symbol} @ {row.price}"
+            else:
+                amount = value - fee - slip
+                details = f"Sell {row.quantity} of {row.symbol} @ {row.price}"
+            self.cash_transactions.append({
+                'date': row.date,
+                'amount': amount,
+                'type': 'buy' if buy else 'sell',
+                'symbol': row.symbol,
+                'details': details,
+                'balance_after': row.cash
+            })
+        
+        dates = table['date'].tolist()
+        symbols = table['symbol'].tolist()
+        for i in np.flatnonzero((recorded_commission > 0) | (recorded_slippage > 0)):
+            for amount, fee_type in [(recorded_commission[i], 'commission'),
+                                     (recorded_slippage[i], 'slippage')]:
+                if amount > 0:
+                    self.fees.append({
+                        'date': dates[i],
+                        'amount': amount,
+                        'type': fee_type,
+                        'symbol': symbols[i]
+                    })
+    
+    def _revalue_positions(
+        self,
+        table: pd.DataFrame,
+        prices: pd.DataFrame,
+        fx_rates: Optional[pd.DataFrame],
+        detailed_snapshots: bool
+    ) -> Dict[str, Any]:
+        """
+        Value the book on every date of the price panel.
+        
+        Args:
+            table: Trade table with per-trade state
+            prices: Close price panel
+            fx_rates: Optional FX panel for revaluing non-base positions
+            detailed_snapshots: Keep a snapshot for every date
+            
+        Returns:
+            Result dictionary for calculate_portfolio_series()
+        """
+        dates = prices.index
+        symbols = list(pd.unique(table['symbol']))
+        
+        # Portfolio-level series as of the last trade on or before each date
+        trade_rows = table['date'].searchsorted(dates, side='right') - 1
+        traded = trade_rows >= 0
+        cash = np.where(traded, table['cash'].to_numpy()[np.maximum(trade_rows, 0)], self.initial_capital)
+        fees = np.where(traded, table['fees_paid'].to_numpy()[np.maximum(trade_rows, 0)], 0.0)
+        
+        # Position state per date and symbol (categorical attributes as codes)
+        state = table.drop_duplicates(['date', 'symbol'], keep='last')
+        category_codes = {}
+        for attribute in ['position_type', 'position_strategy', 'position_asset_class', 'position_currency']:
+            codes, categories = pd.factorize(state[attribute])
+            state = state.assign(**{attribute: codes})
+            category_codes[attribute] = categories
+        
+        def as_of_dates(column: str) -> np.ndarray:
+            panel = state.pivot(index='date', columns='symbol', values=column)
+            return panel.reindex(columns=symbols).ffill().reindex(dates, method='ffill').to_numpy(dtype=float)
+        
+        quantity = np.nan_to_num(as_of_dates('held'))
+        average_price = as_of_dates('average_price')
+        type_codes = as_of_dates('position_type')
+        strategy_codes = as_of_dates('position_strategy')
+        asset_class_codes = as_of_dates('position_asset_class')
+        
+        is_open = quantity > 0
+        if not self.include_open_positions:
+            is_open[:] = False
+        
+        market_price = prices.reindex(columns=symbols).to_numpy(dtype=float)
+        missing_price = is_open & np.isnan(market_price)
+        if missing_price.any():
+            logger.warning(f"No market data for {missing_price.sum()} position-days, using average prices")
+        market_price = np.where(np.isnan(market_price), average_price, market_price)
+        
+        multiplied_types = [code for code, trade_type in enumerate(category_codes['position_type'])
+                            if trade_type in ('future', 'option')]
+        contract_multiplier = np.where(np.isin(type_codes, multiplied_types), 100.0, 1.0)
+        
+        current_value = quantity * market_price * contract_multiplier
+        cost_basis = average_price * quantity * contract_multiplier
+        
+        if fx_rates is not None:
+            currency_codes = as_of_dates('position_currency')
+            fx_matrix = np.ones_like(current_value)
+            for code, currency in enumerate(category_codes['position_currency']):
+                if currency == self.base_currency:
+                    continue
+                rates = self._lookup_fx_rates(np.full(len(dates), currency), pd.DatetimeIndex(dates), fx_rates)
+                fx_matrix = np.where(currency_codes == code, rates[:, None], fx_matrix)
+            current_value = current_value * fx_matrix
+            cost_basis = cost_basis * fx_matrix
+        
+        current_value = np.where(is_open, current_value, 0.0)
+        cost_basis = np.where(is_open, cost_basis, 0.0)
+        unrealized_pnl = current_value - cost_basis
+        position_value = current_value.sum(axis=1)
+        total_value = cash + position_value
+        
+        def grouped_values(codes: np.ndarray, categories) -> pd.DataFrame:
+            return pd.DataFrame({
+                category: np.where(is_open & (codes == code), current_value, 0.0).sum(axis=1)
+                for code, category in enumerate(categories)
+                if (is_open & (codes == code)).any()
+            }, index=dates)
+        
+        asset_class_values = grouped_values(asset_class_codes, category_codes['position_asset_class'])
+        strategy_values = grouped_values(strategy_codes, category_codes['position_strategy'])
+        
+        portfolio = pd.DataFrame({
+            'value': total_value,
+            'cash': cash,
+            'positions': position_value,
+            'fees': fees
+        }, index=dates)
+        
+        self.daily_portfolio_values = [
+            {'date': date, 'value': value, 'cash': cash_value, 'positions': positions}
+            for date, value, cash_value, positions in zip(dates, total_value, cash, position_value)
+        ]
+        
+        def allocation(values: pd.DataFrame, i: int, held_names: set) -> Dict[str, float]:
+            return {
+                name: (values[name].iloc[i] / total_value[i]) * 100.0 if total_value[i] > 0 else 0.0
+                for name in values.columns if name in held_names
+            }
+        
+        snapshot_rows = range(len(dates)) if detailed_snapshots else range(len(dates) - 1, len(dates))
+        for i in snapshot_rows:
+            held_now = np.flatnonzero(is_open[i])
+            positions_detail = {
+                symbols[j]: {
+                    'quantity': quantity[i, j],
+                    'price': market_price[i, j],
+                    'value': current_value[i, j],
+                    'cost_basis': cost_basis[i, j],
+                    'unrealized_pnl': unrealized_pnl[i, j],
+                    'asset_class': category_codes['position_asset_class'][int(asset_class_codes[i, j])],
+                    'trade_type': category_codes['position_type'][int(type_codes[i, j])],
+                    'strategy': category_codes['position_strategy'][int(strategy_codes[i, j])],
+                    'direction': 'long',
+                    'contract_multiplier': contract_multiplier[i, j]
+                }
+                for j in held_now
+            }
+            
+            asset_allocation = allocation(
+                asset_class_values, i, {detail['asset_class'] for detail in positions_detail.values()})
+            strategy_allocation = allocation(
+                strategy_values, i, {detail['strategy'] for detail in positions_detail.values()})
+            self.portfolio_snapshots.append({
+                'date': dates[i],
+                'total_value': total_value[i],
+                'cash_value': cash[i],
+                'position_value': position_value[i],
+                'positions': positions_detail,
+                'asset_allocation': asset_allocation,
+                'strategy_allocation': strategy_allocation
+            })
+        
+        if self.portfolio_snapshots:
+            latest = self.portfolio_snapshots[-1]
+            self.asset_class_values = {
+                name: asset_class_values[name].iloc[-1] for name in latest['asset_allocation']
+            }
+            self.strategy_allocations = latest['strategy_allocation']
+        
+        return {
+            'portfolio': portfolio,
+            'quantities': pd.DataFrame(np.where(is_open, quantity, 0.0), index=dates, columns=symbols),
+            'market_values': pd.DataFrame(current_value, index=dates, columns=symbols),
+            'unrealized_pnl': pd.DataFrame(unrealized_pnl, index=dates, columns=symbols),
+            'asset_class_values': asset_class_values,
+            'strategy_values': strategy_values
+        }
+    
     def get_performance_series(self) -> pd.DataFrame:
         """
         Get a time series of portfolio performance.
@@ -889,28 +1405,28 @@ class PortfolioCalculator:
         # Find maximum drawdown
         max_drawdown = df['drawdown'].min()
         
-        # Find drawdown periods
-        is_drawdown = df['drawdown'] < 0
-        drawdown_periods = []
-        
-        if is_drawdown.any():
-            # Create a group identifier that changes when drawdown starts/ends
-            df['drawdown_group'] = (is_drawdown != is_drawdown.shift()).cumsum()
-            
-            # For each group where drawdown is true, get stats
-            for group, group_df in df[is_drawdown].groupby('drawdown_group'):
-                if len(group_df) > 0:
-                    start_date = group_df['date'].iloc[0]
-                    end_date = group_df['date'].iloc[-1]
-                    max_dd = group_df['drawdown'].min()
-                    duration = len(group_df)
-                    
-                    drawdown_periods.append({
-                        'start_date': start_date,
-                        'end_date': end_date,
-                        'max_drawdown': max_dd,
-                        'duration': duration
-                    })
+        # Find drawdown periods as runs of negative drawdown
+        dates = df['date']
+        values = df['portfolio_value'].to_numpy()
+        peaks = df['peak'].to_numpy()
+        drawdowns = df['drawdown'].to_numpy()
+        is_drawdown = drawdowns < 0
+        edges = np.diff(np.concatenate([[False], is_drawdown, [False]]).astype(int))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        # Rows between runs are not in drawdown, so each reduceat segment's
+        # minimum is the minimum of its run
+        run_minimums = np.minimum.reduceat(drawdowns, starts) if len(starts) else []
+        
+        drawdown_periods = [
+            {
+                'start_date': dates.iloc[start],
+                'end_date': dates.iloc[end],
+                'max_drawdown': max_dd,
+                'duration': int(end - start + 1)
+            }
+            for start, end, max_dd in zip(starts, ends, run_minimums)
+        ]
         
         # Find longest and deepest drawdowns
         if drawdown_periods:
@@ -920,29 +1436,30 @@ class PortfolioCalculator:
             longest_dd = {'duration': 0, 'max_drawdown': 0}
             deepest_dd = {'duration': 0, 'max_drawdown': 0}
         
-        # Calculate time to recovery
+        # Calculate time to recovery: the first date after the drawdown on
+        # which the value is back at the peak of that date. That is normally
+        # the next date, so only the exceptions are searched.
         recovery_periods = []
+        after_end = np.searchsorted(dates.to_numpy(), dates.iloc[ends].to_numpy(), side='right')
         
-        for period in drawdown_periods:
-            end_date = period['end_date']
-            max_dd = period['max_drawdown']
+        for period, first_after in zip(drawdown_periods, after_end):
+            if first_after >= len(values):
+                continue
             
-            # Find when portfolio recovered after this drawdown
-            if end_date < df['date'].iloc[-1]:
-                post_dd = df[df['date'] > end_date]
-                recovery_idx = post_dd[post_dd['portfolio_value'] >= post_dd['peak'].iloc[0]].index
-                
-                if len(recovery_idx) > 0:
-                    first_recovery = recovery_idx[0]
-                    recovery_date = df.loc[first_recovery, 'date']
-                    recovery_duration = (recovery_date - end_date).days
-                    
-                    recovery_periods.append({
-                        'drawdown_end': end_date,
-                        'recovery_date': recovery_date,
-                        'recovery_duration': recovery_duration,
-                        'max_drawdown': max_dd
-                    })
+            recovery_index = first_after
+            if values[first_after] < peaks[first_after]:
+                recovered = np.flatnonzero(values[first_after:] >= peaks[first_after])
+                if not len(recovered):
+                    continue
+                recovery_index += int(recovered[0])
+            recovery_date = dates.iloc[recovery_index]
+            
+            recovery_periods.append({
+                'drawdown_end': period['end_date'],
+                'recovery_date': recovery_date,
+                'recovery_duration': (recovery_date - period['end_date']).days,
+                'max_drawdown': period['max_drawdown']
+            })
         
         return {
             'max_drawdown': max_drawdown,
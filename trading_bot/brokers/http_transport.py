@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+HTTP Transport for Broker and Data REST Clients
+
+This module provides the transport shared by the broker and market data
+REST clients:
+
+- HttpTransport keeps a requests.Session with a keep-alive connection pool
+  per client instead of opening a connection for every call.
+- TokenBucket limits request rate. Buckets are shared per API key through
+  shared_rate_limiter, so every client using the same key draws from one
+  budget at the strictest limit any of them registers. The bucket never sleeps itself; it tells the
+  caller how long to wait for its token. HttpTransport raises
+  RateLimitExceeded (with that wait) rather than sleeping on the calling
+  thread unless created with block=True; AsyncHttpTransport awaits the token.
+- Identical GET requests that are in flight at the same time (e.g. several
+  strategies asking for the same quotes) share a single response.
+- AsyncHttpTransport is the asyncio variant built on aiohttp.
+"""
+
+import json
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, Optional, Callable, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a non-blocking request finds no rate limit token available"""
+
+    def __init__(self, wait: float):
+        super().__init__(f"Rate limit reached, next token in {wait:.3f}s")
+        self.wait = wait
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    reserve() takes a token immediately and returns how long the caller
+    must wait before using it, so waiting callers are served in order and
+    the limiter itself never blocks.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+            clock: Monotonic clock in seconds
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, going into debt if necessary.
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            Seconds to wait before the reservation may be used (0 if none)
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens only if they are available now.
+
+        Args:
+            tokens: Tokens to take
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they would be
+        """
+        with self._lock:
+            self._refill(self._clock())
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back all requests for the given time, e.g. after an HTTP 429.
+
+        Args:
+            seconds: Seconds before the next token becomes available
+        """
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def tighten(self, rate: float, capacity: float) -> None:
+        """
+        Lower the rate and capacity to the given limits if they are stricter.
+
+        Args:
+            rate: Tokens per second
+            capacity: Maximum burst size
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be positive")
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = min(self.rate, rate)
+            self.capacity = min(self.capacity, capacity)
+            self._tokens = min(self._tokens, self.capacity)
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative while reservations are pending)"""
+        with self._lock:
+            self._refill(self._clock())
+            return self._tokens
+
+
+_shared_limiters: Dict[str, TokenBucket] = {}
+_shared_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(key: str, rate: float, capacity: float = 1.0) -> TokenBucket:
+    """
+    Get the token bucket shared by all clients using an API key.
+
+    There is one bucket per key. Clients registering different limits for
+    the same key all run under the strictest rate and capacity any of them
+    asked for, so together they stay within the key's budget.
+
+    Args:
+        key: API key or other identifier of the shared budget
+        rate: Tokens per second
+        capacity: Maximum burst size
+
+    Returns:
+        The shared TokenBucket
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_limiters[key] = TokenBucket(rate, capacity)
+        elif rate < limiter.rate or capacity < limiter.capacity:
+            logger.info(f"Tightening shared rate limit to {min(rate, limiter.rate)}/s, "
+                        f"burst {min(capacity, limiter.capacity)}")
+            limiter.tighten(rate, capacity)
+        return limiter
+
+
+def _retry_after(headers: Any, default: float) -> float:
+    """Seconds from a Retry-After header, or the default."""
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return default
+
+
+class HttpTransport:
+    """
+    Pooled, rate-limited HTTP transport with in-flight GET coalescing.
+    """
+
+    def __init__(
+        self,
+        base_url: str = '',
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        timeout: float = 15,
+        pool_maxsize: int = 20,
+        block: bool = False,
+        rate_limit_pause: float = 1.0
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            base_url: Prefix for relative URLs
+            headers: Headers sent with every request
+            rate_limiter: Token bucket to draw from (no limit if None)
+            timeout: Default request timeout in seconds
+            pool_maxsize: Keep-alive connections kept per host
+            block: Sleep until a rate limit token is available instead of raising
+                RateLimitExceeded
+            rate_limit_pause: Seconds to hold back the limiter after a 429 without Retry-After
+        """
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.block = block
+        self.rate_limit_pause = rate_limit_pause
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._in_flight: Dict[Tuple, Future] = {}
+        self._lock = threading.Lock()
+
+        # Metrics
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+        self.rate_limited = 0
+
+    def _url(self, url: str) -> str:
+        return url if '://' in url else f"{self.base_url}{url}"
+
+    def _wait_for_token(self) -> None:
+        if self.rate_limiter is None:
+            return
+        if self.block:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                time.sleep(wait)
+        else:
+            wait = self.rate_limiter.try_acquire()
+            if wait > 0:
+                raise RateLimitExceeded(wait)
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        self._wait_for_token()
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.request(method, url, **kwargs)
+        self.requests_sent += 1
+
+        if response.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limited += 1
+            self.rate_limiter.pause(_retry_after(response.headers, self.rate_limit_pause))
+        return response
+
+    def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                data: Any = None, json: Any = None, headers: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, coalesce: Optional[bool] = None) -> requests.Response:
+        """
+        Send a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL or path relative to base_url
+            params: Query parameters
+            data: Form body
+            json: JSON body
+            headers: Extra headers for this request
+            timeout: Timeout override in seconds
+            coalesce: Share the response of an identical in-flight request
+                (default: True for GET)
+
+        Returns:
+            requests.Response (shared between coalesced callers)
+
+        Raises:
+            RateLimitExceeded: If no token is available (unless block is True); its
+                wait attribute says when to try again
+            requests.exceptions.RequestException: On connection errors or timeouts
+        """
+        method = method.upper()
+        url = self._url(url)
+        kwargs = {'params': params, 'data': data, 'json': json, 'headers': headers}
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+
+        if coalesce is None:
+            coalesce = method == 'GET'
+        if not coalesce:
+            return self._send(method, url, **kwargs)
+
+        key = (method, url, _freeze(params), _freeze(headers))
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+
+        if not leader:
+            self.requests_coalesced += 1
+            return future.result()
+
+        try:
+            response = self._send(method, url, **kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> requests.Response:
+        """Send a GET request (see request)."""
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url: str, data: Any = None, **kwargs) -> requests.Response:
+        """Send a POST request (see request)."""
+        return self.request('POST', url, data=data, **kwargs)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get transport metrics.
+
+        Returns:
+            Dict with requests sent, requests coalesced and 429 responses
+        """
+        return {
+            'requests_sent': self.requests_sent,
+            'requests_coalesced': self.requests_coalesced,
+            'rate_limited': self.rate_limited,
+            'in_flight': len(self._in_flight)
+        }
+
+
+def _freeze(value: Any) -> Any:
+    """Hashable, order-independent form of request parameters."""
+    if value is None:
+        return None
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return str(value)
+
+
+class AsyncResponse:
+    """Fully read response returned by AsyncHttpTransport"""
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes, url: str):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        """Raise requests.exceptions.HTTPError for 4xx/5xx responses."""
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error for url: {self.url}")
+
+
+class AsyncHttpTransport:
+    """
+    asyncio variant of HttpTransport built on aiohttp.
+
+    The session is created on first use inside the running event loop.
+    Waiting for a rate limit token suspends the coroutine, not the loop.
+    """
+
+    def __init__(
+        self,
+        base_url: str = '',
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        timeout: float = 15,
+        pool_maxsize: int = 20,
+        block: bool = True,
+        rate_limit_pause: float = 1.0
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            base_url: Prefix for relative URLs
+            headers: Headers sent with every request
+            rate_limiter: Token bucket to draw from (no limit if None)
+            timeout: Default request timeout in seconds
+            pool_maxsize: Keep-alive connections kept per host
+            block: Wait for a rate limit token instead of raising RateLimitExceeded
+            rate_limit_pause: Seconds to hold back the limiter after a 429 without Retry-After
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError("aiohttp is required for AsyncHttpTransport. Install with: pip install aiohttp")
+
+        self.base_url = base_url
+        self.headers = dict(headers or {})
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.block = block
+        self.rate_limit_pause = rate_limit_pause
+
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+        # Metrics
+        self.requests_sent = 0
+        self.requests_coalesced = 0
+        self.rate_limited = 0
+
+    @property
+    def session(self) -> 'aiohttp.ClientSession':
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.pool_maxsize)
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self._session
+
+    async def _wait_for_token(self) -> None:
+        if self.rate_limiter is None:
+            return
+        if self.block:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+        else:
+            wait = self.rate_limiter.try_acquire()
+            if wait > 0:
+                raise RateLimitExceeded(wait)
+
+    async def _send(self, method: str, url: str, **kwargs) -> AsyncResponse:
+        await self._wait_for_token()
+        kwargs = {name: value for name, value in kwargs.items() if value is not None}
+        if 'timeout' in kwargs:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=kwargs['timeout'])
+
+        async with self.session.request(method, url, **kwargs) as response:
+            content = await response.read()
+            result = AsyncResponse(response.status, dict(response.headers), content, str(response.url))
+        self.requests_sent += 1
+
+        if result.status_code == 429 and self.rate_limiter is not None:
+            self.rate_limited += 1
+            self.rate_limiter.pause(_retry_after(result.headers, self.rate_limit_pause))
+        return result
+
+    async def request(self, method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                      data: Any = None, json: Any = None, headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None, coalesce: Optional[bool] = None) -> AsyncResponse:
+        """
+        Send a request.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL or path relative to base_url
+            params: Query parameters
+            data: Form body
+            json: JSON body
+            headers: Extra headers for this request
+            timeout: Timeout override in seconds
+            coalesce: Share the response of an identical in-flight request
+                (default: True for GET)
+
+        Returns:
+            AsyncResponse (shared between coalesced callers)
+
+        Raises:
+            RateLimitExceeded: If block is False and no token is available
+            aiohttp.ClientError: On connection errors
+        """
+        method = method.upper()
+        url = url if '://' in url else f"{self.base_url}{url}"
+        kwargs = {'params': params, 'data': data, 'json': json, 'headers': headers, 'timeout': timeout}
+
+        if coalesce is None:
+            coalesce = method == 'GET'
+        if not coalesce:
+            return await self._send(method, url, **kwargs)
+
+        key = (method, url, _freeze(params), _freeze(headers))
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.requests_coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self._in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._send(method, url, **kwargs)
+            future.set_result(response)
+            return response
+        except BaseException as e:
+            future.set_exception(e)
+            # Only retrieved if another caller joined
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def get(self, url: str, params: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncResponse:
+        """Send a GET request (see request)."""
+        return await self.request('GET', url, params=params, **kwargs)
+
+    async def post(self, url: str, data: Any = None, **kwargs) -> AsyncResponse:
+        """Send a POST request (see request)."""
+        return await self.request('POST', url, data=data, **kwargs)
+
+    async def close(self) -> None:
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get transport metrics.
+
+        Returns:
+            Dict with requests sent, requests coalesced and 429 responses
+        """
+        return {
+            'requests_sent': self.requests_sent,
+            'requests_coalesced': self.requests_coalesced,
+            'rate_limited': self.rate_limited,
+            'in_flight': len(self._in_flight)
+        }
@@ -36,7 +36,8 @@ class IGAdapter(BrokerInterface):
                 password: str, 
                 demo: bool = True,
                 timeout: int = 60,
-                auto_refresh: bool = True):
+                auto_refresh: bool = True,
+                confirm_timeout: float = 2.0):
         """
         Initialize the IG adapter
         
@@ -47,6 +48,7 @@ class IGAdapter(BrokerInterface):
             demo: Whether to use demo environment
             timeout: API request timeout in seconds
             auto_refresh: Whether to auto-refresh token
+            confirm_timeout: Seconds to wait for a deal confirmation
         """
         self._api_key = api_key
         self._username = username
@@ -54,6 +56,7 @@ class IGAdapter(BrokerInterface):
         self._demo = demo
         self._timeout = timeout
         self._auto_refresh = auto_refresh
+        self.confirm_timeout = confirm_timeout
         
         # API URLs
         self._base_url = "https://demo-api.ig.com/gateway/deal" if demo else "https://api.ig.com/gateway/deal"
@@ -525,15 +528,8 @@ class IGAdapter(BrokerInterface):
             # Get order details
             deal_id = response['dealReference']
             
-            # Allow time for the order to process
-            time.sleep(1)
-            
             # Get order confirmation
-            confirmation = self._make_request(
-                'GET',
-                f'confirms/{deal_id}',
-                version='1'
-            )
+            confirmation = self._get_confirmation(deal_id)
             
             if not confirmation:
                 return {
@@ -555,6 +551,36 @@ class IGAdapter(BrokerInterface):
             logger.error(f"Error placing order: {str(e)}")
             raise IGAPIError(f"Failed to place order: {str(e)}")
     
+    def _get_confirmation(self, deal_reference: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a deal confirmation as soon as IG has processed the deal
+        
+        The confirms endpoint returns an error until the deal is processed,
+        so it is retried with a short, growing delay rather than after a
+        fixed wait.
+        
+        Args:
+            deal_reference: Deal reference returned when the deal was submitted
+            
+        Returns:
+            Dict: Confirmation, or None if not available within confirm_timeout
+        """
+        deadline = time.monotonic() + self.confirm_timeout
+        delay = 0.05
+        while True:
+            try:
+                confirmation = self._make_request('GET', f'confirms/{deal_reference}', version='1')
+                if confirmation:
+                    return confirmation
+            except IGAPIError as e:
+                logger.debug(f"Confirmation for {deal_reference} not ready: {str(e)}")
+            
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+    
     def get_order_status(self, order_id: str) -> Dict[str, Any]:
         """
         Get order status
@@ -638,16 +664,7 @@ class IGAdapter(BrokerInterface):
                 
             # Get cancellation confirmation
             deal_id = response['dealReference']
-            
-            # Allow time for the cancellation to process
-            time.sleep(1)
-            
-            # Get confirmation
-            confirmation = self._make_request(
-                'GET',
-                f'confirms/{deal_id}',
-                version='1'
-            )
+            confirmation = self._get_confirmation(deal_id)
             
             if not confirmation:
                 return {
@@ -8,11 +8,13 @@ with automatic failover for enhanced trading system reliability.
 import logging
 import time
 import random
+import threading
 from datetime import datetime, timezone
 from typing import Dict, List, Any, Optional, Union, Tuple
 
 from trading_bot.brokers.broker_interface import BrokerInterface, MarketSession
 from trading_bot.brokers.tradier_client import TradierClient
+from trading_bot.brokers.order_tracker import OrderTracker, TrackedOrder
 try:
     from trading_bot.brokers.ig_adapter import IGAdapter
     IG_AVAILABLE = True
@@ -36,7 +38,10 @@ class MultiBrokerExecutor:
                 retry_delay: int = 2,
                 auto_failover: bool = True,
                 auto_refresh: bool = True,
-                refresh_interval: int = 3600):
+                refresh_interval: int = 3600,
+                event_bus: Optional[Any] = None,
+                order_tracker: Optional[OrderTracker] = None,
+                account_refresh_interval: int = 60):
         """
         Initialize the multi-broker executor
         
@@ -48,6 +53,9 @@ class MultiBrokerExecutor:
             auto_failover: Whether to automatically failover to another broker
             auto_refresh: Whether to automatically refresh broker connections
             refresh_interval: Interval for refreshing connections in seconds
+            event_bus: Event bus that order state changes are published on
+            order_tracker: Shared order tracker (one is created if None)
+            account_refresh_interval: Maximum age of cached account data in seconds
         """
         self.brokers = brokers
         self.primary_broker_index = primary_broker_index
@@ -70,6 +78,18 @@ class MultiBrokerExecutor:
         # Initialize trade history
         self.trade_history = []
         self.active_trades = []
+        # Guards active_trades, which the order tracker thread also updates
+        self._trades_lock = threading.Lock()
+        
+        # Order state arrives from the tracker (broker streams or its shared poller)
+        self.order_tracker = order_tracker or OrderTracker(event_bus=event_bus)
+        for broker in brokers:
+            self.order_tracker.register_stream(broker)
+        
+        # Account data per broker, refreshed when stale or after a fill
+        self.account_refresh_interval = account_refresh_interval
+        self.account_data: Dict[str, Dict[str, Any]] = {}
+        self._account_refreshed_at: Dict[str, datetime] = {}
         
         # Verify broker connections
         self._verify_connections()
@@ -152,11 +172,21 @@ class MultiBrokerExecutor:
                 # Wait before retry
                 time.sleep(self.retry_delay)
     
-    def refresh_account_data(self):
-        """Refresh account data from all brokers"""
+    def refresh_account_data(self, force: bool = False):
+        """
+        Refresh account data from brokers whose cached data is stale
+        
+        Args:
+            force: Refresh all brokers regardless of age
+        """
+        now = datetime.now(timezone.utc)
         for i, broker in enumerate(self.brokers):
+            refreshed_at = self._account_refreshed_at.get(broker.name)
+            if not force and refreshed_at and (now - refreshed_at).total_seconds() < self.account_refresh_interval:
+                continue
             try:
-                broker.get_account_balances()
+                self.account_data[broker.name] = broker.get_account_balances()
+                self._account_refreshed_at[broker.name] = now
                 logger.debug(f"Refreshed account data for broker {i} ({broker.name})")
             except Exception as e:
                 logger.warning(f"Error refreshing account data for broker {i} ({broker.name}): {str(e)}")
@@ -334,33 +364,6 @@ class MultiBrokerExecutor:
             # Store the order ID
             order_id = order_result.get('id')
             
-            # Wait for fill if requested
-            if wait_for_fill and order_type.lower() == 'market':
-                max_wait = 60  # Maximum 60 seconds to wait for fill
-                wait_interval = 2  # Check every 2 seconds
-                
-                for _ in range(max_wait // wait_interval):
-                    # Check order status
-                    status = self._execute_with_retry(lambda b, o: b.get_order_status(o), order_id)
-                    
-                    # If filled, break
-                    if status.get('status', '').lower() in ['filled', 'executed', 'complete', 'closed']:
-                        order_result = status
-                        break
-                        
-                    # If rejected, return error
-                    if status.get('status', '').lower() in ['rejected', 'expired', 'canceled', 'cancelled']:
-                        return {
-                            'success': False,
-                            'error': f"Order was {status.get('status', 'rejected')}",
-                            'ticker': symbol,
-                            'action': action,
-                            'order_id': order_id
-                        }
-                        
-                    # Wait and check again
-                    time.sleep(wait_interval)
-            
             # Create trade record
             trade_record = {
                 'trade_id': order_id,
@@ -390,27 +393,34 @@ class MultiBrokerExecutor:
             
             # If it's a buy, add to active trades
             if action.lower() == 'buy':
-                self.active_trades.append(trade_record)
+                with self._trades_lock:
+                    self.active_trades.append(trade_record)
             
-            # Process stop loss and take profit if requested
-            if action.lower() == 'buy' and (stop_loss_pct or take_profit_pct):
-                filled_price = order_result.get('price', price) or price
-                
-                # Set stop loss order
-                if stop_loss_pct and filled_price:
-                    stop_price = filled_price * (1 - stop_loss_pct / 100)
-                    try:
-                        self._place_stop_loss(symbol, quantity, stop_price, order_id, time_in_force)
-                    except Exception as e:
-                        logger.error(f"Error setting stop loss: {str(e)}")
+            # Track the order; fills update the record and place any exits
+            # from the tracker thread
+            fill_future = self.order_tracker.track(
+                self.active_broker, order_id, symbol=symbol, side=side, quantity=quantity,
+                order_type=order_type, callback=lambda order: self._on_order_update(trade_record, order)
+            )
+            
+            # Wait for fill if requested
+            if wait_for_fill and order_type.lower() == 'market':
+                max_wait = 60  # Maximum 60 seconds to wait for fill
+                try:
+                    order = fill_future.result(timeout=max_wait)
+                except Exception:
+                    order = None
+                    logger.warning(f"Order {order_id} not filled within {max_wait} seconds")
                 
-                # Set take profit order
-                if take_profit_pct and filled_price:
-                    target_price = filled_price * (1 + take_profit_pct / 100)
-                    try:
-                        self._place_take_profit(symbol, quantity, target_price, order_id, time_in_force)
-                    except Exception as e:
-                        logger.error(f"Error setting take profit: {str(e)}")
+                # If rejected, return error
+                if order is not None and order.status != 'filled':
+                    return {
+                        'success': False,
+                        'error': f"Order was {order.broker_status or order.status}",
+                        'ticker': symbol,
+                        'action': action,
+                        'order_id': order_id
+                    }
             
             return trade_record
             
@@ -423,6 +433,57 @@ class MultiBrokerExecutor:
                 'action': action
             }
     
+    def _on_order_update(self, trade_record: Dict[str, Any], order: TrackedOrder) -> None:
+        """
+        Apply a tracked order's state change to its trade record
+        
+        Args:
+            trade_record: Trade record created by execute_trade
+            order: Tracked order state
+        """
+        trade_record['status'] = order.status
+        if order.avg_fill_price is not None:
+            trade_record['filled_price'] = order.avg_fill_price
+        if order.filled_quantity:
+            trade_record['filled_quantity'] = order.filled_quantity
+        
+        if order.status in ('canceled', 'rejected'):
+            with self._trades_lock:
+                if trade_record in self.active_trades:
+                    self.active_trades.remove(trade_record)
+        
+        if order.status != 'filled':
+            return
+        
+        # Balances changed; refresh them on next request
+        self._account_refreshed_at.pop(trade_record['broker'], None)
+        
+        # Process stop loss and take profit if requested
+        stop_loss_pct = trade_record.get('stop_loss_pct')
+        take_profit_pct = trade_record.get('take_profit_pct')
+        if trade_record['action'].lower() == 'buy' and (stop_loss_pct or take_profit_pct):
+            filled_price = trade_record.get('filled_price') or trade_record.get('price')
+            symbol = trade_record['ticker']
+            quantity = trade_record['quantity']
+            order_id = trade_record['order_id']
+            time_in_force = trade_record['time_in_force']
+            
+            # Set stop loss order
+            if stop_loss_pct and filled_price:
+                stop_price = filled_price * (1 - stop_loss_pct / 100)
+                try:
+                    self._place_stop_loss(symbol, quantity, stop_price, order_id, time_in_force)
+                except Exception as e:
+                    logger.error(f"Error setting stop loss: {str(e)}")
+            
+            # Set take profit order
+            if take_profit_pct and filled_price:
+                target_price = filled_price * (1 + take_profit_pct / 100)
+                try:
+                    self._place_take_profit(symbol, quantity, target_price, order_id, time_in_force)
+                except Exception as e:
+                    logger.error(f"Error setting take profit: {str(e)}")
+    
     def _place_stop_loss(self, symbol, quantity, stop_price, parent_order_id, time_in_force):
         """Place a stop loss order"""
         # Execute with retry and failover
@@ -517,7 +578,8 @@ class MultiBrokerExecutor:
         """
         # Update active trades based on positions
         self._update_active_trades()
-        return self.active_trades
+        with self._trades_lock:
+            return list(self.active_trades)
     
     def _update_active_trades(self):
         """Update active trades based on current positions"""
@@ -530,7 +592,12 @@ class MultiBrokerExecutor:
         # Create position lookup
         position_by_symbol = {p.get('symbol', ''): p for p in positions if 'symbol' in p}
         
-        # Update active trades
+        # Hold the lock across the rebuild so a trade the tracker removes meanwhile stays removed
+        with self._trades_lock:
+            self._rebuild_active_trades(position_by_symbol)
+    
+    def _rebuild_active_trades(self, position_by_symbol: Dict[str, Dict[str, Any]]):
+        """Keep trades with an open position or a pending entry order (caller holds _trades_lock)"""
         updated_active_trades = []
         
         for trade in self.active_trades:
@@ -547,20 +614,12 @@ class MultiBrokerExecutor:
                 
                 # Keep in active trades
                 updated_active_trades.append(trade)
+            elif self.order_tracker.get_order(self.brokers[trade['broker_index']], trade.get('order_id', '')):
+                # Entry order not filled yet; the order tracker updates it
+                updated_active_trades.append(trade)
             else:
-                # Position is closed
+                # Position is closed (fill details were recorded by the order tracker)
                 trade['status'] = 'closed'
-                
-                # Try to get filled price from broker
-                try:
-                    order_id = trade.get('order_id', '')
-                    if order_id:
-                        order_status = self._execute_with_retry(lambda b, o: b.get_order_status(o), order_id)
-                        if order_status:
-                            trade['filled_price'] = order_status.get('price', trade.get('filled_price', 0))
-                            trade['filled_quantity'] = order_status.get('size', trade.get('filled_quantity', 0))
-                except Exception as e:
-                    logger.warning(f"Error updating trade {trade.get('trade_id', '')}: {str(e)}")
         
         # Update active trades
         self.active_trades = updated_active_trades
@@ -590,12 +649,13 @@ class MultiBrokerExecutor:
 
 
 # Factory function to create a multi-broker executor with available brokers
-def create_multi_broker_executor(config=None) -> MultiBrokerExecutor:
+def create_multi_broker_executor(config=None, event_bus=None) -> MultiBrokerExecutor:
     """
     Create a multi-broker executor with available brokers
     
     Args:
         config: Configuration dictionary
+        event_bus: Event bus that order state changes are published on
         
     Returns:
         MultiBrokerExecutor: Initialized multi-broker executor
@@ -642,7 +702,8 @@ def create_multi_broker_executor(config=None) -> MultiBrokerExecutor:
         retry_delay=config.get('retry_delay', 2),
         auto_failover=config.get('auto_failover', True),
         auto_refresh=config.get('auto_refresh', True),
-        refresh_interval=config.get('refresh_interval', 3600)
+        refresh_interval=config.get('refresh_interval', 3600),
+        event_bus=event_bus
     )
     
     return executor
@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""
+Order State Tracker
+
+Tracks open orders across brokers and publishes their state changes onto the
+event bus, so callers do not sit in sleep/poll loops waiting for fills.
+
+- Brokers that push order updates (a subscribe_order_updates(callback)
+  method, or an external feed calling on_order_update) are applied as soon
+  as they arrive.
+- All other open orders share one background poller. Each broker is polled
+  with a single get_orders() call per cycle. The interval starts short after
+  an order is submitted and backs off while nothing changes.
+
+Fill, cancel and reject events are never dropped: if the event bus stays
+full past a short timeout they are held and republished, in order, before
+the next poll.
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+from trading_bot.event_system.event_types import OrderEvent
+from trading_bot.event_system.event_bus import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+# Broker status strings grouped by the state they represent
+FILLED_STATUSES = {'filled', 'executed', 'complete', 'closed'}
+CANCELED_STATUSES = {'canceled', 'cancelled', 'expired'}
+REJECTED_STATUSES = {'rejected', 'error'}
+PARTIAL_STATUSES = {'partially_filled', 'partial_fill', 'partial'}
+
+
+def normalize_status(status: Optional[str]) -> str:
+    """
+    Map a broker-specific order status onto filled/canceled/rejected/partially_filled/open.
+
+    Args:
+        status: Broker status string
+
+    Returns:
+        Normalized status
+    """
+    status = (status or '').lower()
+    if status in FILLED_STATUSES:
+        return 'filled'
+    if status in CANCELED_STATUSES:
+        return 'canceled'
+    if status in REJECTED_STATUSES:
+        return 'rejected'
+    if status in PARTIAL_STATUSES:
+        return 'partially_filled'
+    return 'open'
+
+
+def order_id_of(order: Dict[str, Any]) -> Optional[str]:
+    """Order ID of a broker order dict (Tradier 'id', IG 'dealId')."""
+    for key in ('id', 'dealId', 'order_id'):
+        if order.get(key):
+            return str(order[key])
+    return None
+
+
+def broker_key(broker: Any) -> str:
+    """Name used to identify a broker in tracker state and events."""
+    try:
+        return str(broker.name)
+    except Exception:
+        return f"{type(broker).__name__}-{id(broker)}"
+
+
+@dataclass
+class TrackedOrder:
+    """State of one order being tracked"""
+    broker: Any
+    order_id: str
+    symbol: str = ''
+    side: str = ''
+    quantity: float = 0.0
+    order_type: str = 'market'
+    submitted_at: float = 0.0
+    status: str = 'open'
+    broker_status: str = ''
+    filled_quantity: float = 0.0
+    avg_fill_price: Optional[float] = None
+    last_update: Dict[str, Any] = field(default_factory=dict)
+    callbacks: List[Callable[['TrackedOrder'], None]] = field(default_factory=list)
+    future: Future = field(default_factory=Future)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in ('filled', 'canceled', 'rejected')
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Order state as a plain dict, in the shape of a broker order status."""
+        return dict(
+            self.last_update,
+            id=self.order_id,
+            symbol=self.symbol,
+            status=self.status,
+            broker_status=self.broker_status,
+            filled_quantity=self.filled_quantity,
+            price=self.avg_fill_price,
+            size=self.filled_quantity or self.quantity
+        )
+
+
+class _BrokerSchedule:
+    """Polling state for one broker"""
+
+    def __init__(self, broker: Any, interval: float):
+        self.broker = broker
+        self.interval = interval
+        self.next_poll = 0.0
+        self.streaming = False
+
+
+class OrderTracker:
+    """
+    Event-driven order state tracker shared by all brokers.
+
+    track() returns a Future that resolves with the final order state. Each
+    state change is published as an OrderEvent (ORDER_FILLED, ORDER_CANCELED
+    or ORDER_UPDATED) and per-order callbacks run on the tracker thread.
+    ORDER_UPDATED events are published without blocking and may be dropped
+    when the bus is full; terminal events wait up to publish_timeout and are
+    retried until delivered.
+    """
+
+    def __init__(
+        self,
+        event_bus: Optional[Any] = None,
+        min_interval: float = 0.25,
+        max_interval: float = 5.0,
+        backoff: float = 1.5,
+        stream_poll_interval: float = 30.0,
+        source: str = 'OrderTracker',
+        publish_timeout: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            event_bus: EventBus to publish order events on (optional)
+            min_interval: Poll interval after an order is submitted or changes (seconds)
+            max_interval: Longest poll interval while nothing changes (seconds)
+            backoff: Factor the interval grows by after a poll with no changes
+            stream_poll_interval: Safety-net poll interval for brokers that stream updates
+            source: Source name on published events
+            publish_timeout: Seconds to wait for bus queue space for a terminal event
+            clock: Monotonic clock in seconds
+        """
+        self.event_bus = event_bus
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.stream_poll_interval = stream_poll_interval
+        self.source = source
+        self.publish_timeout = publish_timeout
+        self._clock = clock
+
+        self._orders: Dict[Tuple[str, str], TrackedOrder] = {}
+        self._schedules: Dict[str, _BrokerSchedule] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self.running = False
+
+        # Terminal events the bus had no room for, in publish order
+        self._undelivered: deque = deque()
+        self._deliver_lock = threading.Lock()
+
+        # Metrics
+        self.fill_latency = LatencyHistogram()
+        self.polls = 0
+        self.poll_errors = 0
+        self.stream_updates = 0
+        self.events_published = 0
+        self.events_dropped = 0
+        self.events_deferred = 0
+
+    def start(self) -> None:
+        """Start the background poller"""
+        with self._condition:
+            if self.running:
+                return
+            self.running = True
+        self._thread = threading.Thread(target=self._run, name='OrderTracker', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background poller"""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join(timeout=5.0)
+            self._thread = None
+
+    def register_stream(self, broker: Any) -> bool:
+        """
+        Subscribe to a broker's pushed order updates, if it offers them.
+
+        Args:
+            broker: Broker with a subscribe_order_updates(callback) method
+
+        Returns:
+            True if the broker streams order updates
+        """
+        subscribe = getattr(broker, 'subscribe_order_updates', None)
+        if not callable(subscribe):
+            return False
+
+        key = broker_key(broker)
+        subscribe(lambda update: self.on_order_update(key, update))
+        with self._condition:
+            schedule = self._schedule(broker)
+            schedule.streaming = True
+            schedule.interval = self.stream_poll_interval
+        logger.info(f"Streaming order updates from {key}")
+        return True
+
+    def _schedule(self, broker: Any) -> _BrokerSchedule:
+        key = broker_key(broker)
+        schedule = self._schedules.get(key)
+        if schedule is None:
+            schedule = self._schedules[key] = _BrokerSchedule(broker, self.min_interval)
+        return schedule
+
+    def track(
+        self,
+        broker: Any,
+        order_id: str,
+        symbol: str = '',
+        side: str = '',
+        quantity: float = 0.0,
+        order_type: str = 'market',
+        callback: Optional[Callable[[TrackedOrder], None]] = None
+    ) -> Future:
+        """
+        Start tracking an acknowledged order.
+
+        Args:
+            broker: Broker the order was placed with
+            order_id: Broker order ID
+            symbol: Symbol
+            side: 'buy' or 'sell'
+            quantity: Order quantity
+            order_type: Order type
+            callback: Called with the TrackedOrder on every state change
+
+        Returns:
+            Future resolving with the TrackedOrder once filled, canceled or rejected
+        """
+        key = (broker_key(broker), str(order_id))
+        with self._condition:
+            order = self._orders.get(key)
+            if order is None:
+                order = self._orders[key] = TrackedOrder(
+                    broker=broker, order_id=str(order_id), symbol=symbol, side=side,
+                    quantity=quantity, order_type=order_type, submitted_at=self._clock()
+                )
+            if callback:
+                order.callbacks.append(callback)
+
+            # Poll this broker soon, unless it streams updates
+            schedule = self._schedule(broker)
+            if not schedule.streaming:
+                schedule.interval = self.min_interval
+                schedule.next_poll = min(schedule.next_poll, self._clock() + self.min_interval)
+            self._condition.notify_all()
+
+        if not self.running:
+            self.start()
+        return order.future
+
+    def on_order_update(self, broker_name: str, update: Dict[str, Any]) -> bool:
+        """
+        Apply a pushed order update (streaming entry point).
+
+        Args:
+            broker_name: Name of the broker the update came from
+            update: Broker order dict with at least an ID and status
+
+        Returns:
+            True if the update changed a tracked order
+        """
+        self.stream_updates += 1
+        order_id = order_id_of(update)
+        with self._condition:
+            order = self._orders.get((broker_name, order_id)) if order_id else None
+        if order is None:
+            return False
+        return self._apply(order, update)
+
+    def _apply(self, order: TrackedOrder, update: Dict[str, Any]) -> bool:
+        """Apply a broker order dict to a tracked order; publish if it changed."""
+        broker_status = str(update.get('status', ''))
+        status = normalize_status(broker_status)
+        filled = update.get('exec_quantity', update.get('filled_quantity', update.get('filled_qty')))
+        price = update.get('avg_fill_price', update.get('filled_price', update.get('price')))
+
+        with self._condition:
+            if order.is_terminal:
+                return False
+            if filled is None and status == 'filled':
+                filled = update.get('size', update.get('quantity', order.quantity))
+            filled = float(filled or 0)
+            if status == order.status and filled == order.filled_quantity:
+                return False
+
+            order.status = status
+            order.broker_status = broker_status
+            order.filled_quantity = filled
+            if price not in (None, '', 0) and status in ('filled', 'partially_filled'):
+                order.avg_fill_price = float(price)
+            order.last_update = dict(update)
+            terminal = order.is_terminal
+            if terminal:
+                self._orders.pop((broker_key(order.broker), order.order_id), None)
+
+        if status == 'filled':
+            self.fill_latency.record(self._clock() - order.submitted_at)
+
+        self._publish(order)
+        for callback in order.callbacks:
+            try:
+                callback(order)
+            except Exception as e:
+                logger.error(f"Order callback failed for {order.order_id}: {str(e)}")
+        if terminal:
+            order.future.set_result(order)
+        return True
+
+    def _publish(self, order: TrackedOrder) -> None:
+        if self.event_bus is None:
+            return
+
+        event = OrderEvent(
+            order_id=order.order_id,
+            symbol=order.symbol,
+            order_type=order.order_type,
+            side=1 if order.side.lower() == 'buy' else -1,
+            quantity=order.quantity,
+            price=order.avg_fill_price,
+            status=order.status,
+            source=self.source,
+            timestamp=datetime.now(),
+            metadata={'broker': broker_key(order.broker), 'broker_status': order.broker_status}
+        )
+        event.data['filled_quantity'] = order.filled_quantity
+        event.data['broker'] = broker_key(order.broker)
+
+        if not order.is_terminal:
+            # Intermediate updates are superseded by the next one; never block on them
+            if self.event_bus.publish(event, block=False):
+                self.events_published += 1
+            else:
+                self.events_dropped += 1
+            return
+
+        with self._condition:
+            self._undelivered.append(event)
+        self._redeliver()
+
+    def _redeliver(self) -> int:
+        """Publish held terminal events in order, stopping at the first that times out."""
+        delivered = 0
+        with self._deliver_lock:
+            while True:
+                with self._condition:
+                    if not self._undelivered:
+                        return delivered
+                    event = self._undelivered[0]
+
+                if not self.event_bus.publish(event, block=True, timeout=self.publish_timeout):
+                    self.events_deferred += 1
+                    logger.warning(f"Event bus full, holding {len(self._undelivered)} order events for retry")
+                    return delivered
+
+                with self._condition:
+                    self._undelivered.popleft()
+                self.events_published += 1
+                delivered += 1
+
+    def poll_once(self, force: bool = False) -> int:
+        """
+        Poll every broker that is due (or all brokers with open orders if forced).
+
+        Args:
+            force: Poll regardless of schedule
+
+        Returns:
+            Number of order state changes applied
+        """
+        if self._undelivered:
+            self._redeliver()
+
+        now = self._clock()
+        with self._condition:
+            open_orders: Dict[str, List[TrackedOrder]] = {}
+            for (key, _), order in self._orders.items():
+                open_orders.setdefault(key, []).append(order)
+            due = [
+                (self._schedules[key], orders) for key, orders in open_orders.items()
+                if force or self._schedules[key].next_poll <= now
+            ]
+
+        changes = 0
+        for schedule, orders in due:
+            changed = self._poll_broker(schedule.broker, orders)
+            changes += changed
+            with self._condition:
+                if schedule.streaming:
+                    schedule.interval = self.stream_poll_interval
+                elif changed:
+                    schedule.interval = self.min_interval
+                else:
+                    schedule.interval = min(self.max_interval, schedule.interval * self.backoff)
+                schedule.next_poll = self._clock() + schedule.interval
+        return changes
+
+    def _poll_broker(self, broker: Any, orders: List[TrackedOrder]) -> int:
+        """Refresh all open orders of one broker with one get_orders() call."""
+        self.polls += 1
+        by_id: Dict[str, Dict[str, Any]] = {}
+        try:
+            for broker_order in broker.get_orders() or []:
+                order_id = order_id_of(broker_order)
+                if order_id:
+                    by_id[order_id] = broker_order
+        except Exception as e:
+            self.poll_errors += 1
+            logger.warning(f"Error polling orders from {broker_key(broker)}: {str(e)}")
+
+        changes = 0
+        for order in orders:
+            update = by_id.get(order.order_id)
+            if update is None:
+                # Not in the order list (e.g. brokers that list only working orders)
+                update = self._fetch_order(broker, order.order_id)
+            if update and self._apply(order, update):
+                changes += 1
+        return changes
+
+    def _fetch_order(self, broker: Any, order_id: str) -> Optional[Dict[str, Any]]:
+        fetch = getattr(broker, 'get_order_status', None) or getattr(broker, 'get_order', None)
+        if fetch is None:
+            return None
+        try:
+            return fetch(order_id)
+        except Exception as e:
+            self.poll_errors += 1
+            logger.warning(f"Error getting order {order_id} from {broker_key(broker)}: {str(e)}")
+            return None
+
+    def _run(self) -> None:
+        while True:
+            if self._undelivered:
+                self._redeliver()
+            with self._condition:
+                if not self.running:
+                    return
+                pending = {key for key, _ in self._orders}
+                wake_at = min((self._schedules[key].next_poll for key in pending), default=None)
+                timeout = None if wake_at is None else wake_at - self._clock()
+                if self._undelivered:
+                    timeout = self.min_interval if timeout is None else min(timeout, self.min_interval)
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                    continue
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.error(f"Order tracker poll failed: {str(e)}")
+
+    def get_order(self, broker: Any, order_id: str) -> Optional[TrackedOrder]:
+        """Get an open tracked order."""
+        with self._condition:
+            return self._orders.get((broker_key(broker), str(order_id)))
+
+    def get_open_orders(self) -> List[TrackedOrder]:
+        """Get all open tracked orders."""
+        with self._condition:
+            return list(self._orders.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get tracker metrics.
+
+        Returns:
+            Dict with open orders, poll counts, event counts and submit-to-fill latency
+        """
+        with self._condition:
+            intervals = {key: schedule.interval for key, schedule in self._schedules.items()}
+            open_orders = len(self._orders)
+            undelivered = len(self._undelivered)
+        return {
+            'open_orders': open_orders,
+            'polls': self.polls,
+            'poll_errors': self.poll_errors,
+            'stream_updates': self.stream_updates,
+            'events_published': self.events_published,
+            'events_dropped': self.events_dropped,
+            'events_deferred': self.events_deferred,
+            'undelivered_events': undelivered,
+            'poll_intervals': intervals,
+            'fill_latency': self.fill_latency.to_dict()
+        }
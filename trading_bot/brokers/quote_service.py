@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Quote and Option Chain Service
+
+This module sits between callers and a broker's market data endpoints:
+
+- ShardedTTLCache (trading_bot.utils.ttl_cache) is an in-memory cache with
+  a staleness bound per data type ('quote', 'option_chain', ...).
+- QuoteService answers quote and option chain requests from the cache and
+  micro-batches concurrent single-symbol quote requests: requests arriving
+  within a few milliseconds of each other are sent as one multi-symbol call.
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable, Union
+
+from trading_bot.utils.ttl_cache import ShardedTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Default staleness bounds in seconds
+DEFAULT_TTLS = {
+    'quote': 10.0,
+    'option_chain': 15.0,
+}
+
+
+class QuoteService:
+    """
+    Cached, micro-batched access to quotes and option chains.
+
+    get_quote() calls arriving from different threads within batch_window
+    seconds are answered by a single fetch_quotes call for all of their
+    symbols. The first caller of a window waits out the window and performs
+    the fetch; the others wait for its result. Once a batch held a single
+    symbol, requests made while no other request is in flight are fetched
+    right away, so serial callers do not keep paying the window.
+    """
+
+    def __init__(
+        self,
+        fetch_quotes: Callable[[List[str], bool], Dict[str, Dict]],
+        fetch_option_chain: Optional[Callable[[str, Optional[str], bool], List[Dict]]] = None,
+        cache: Optional[ShardedTTLCache] = None,
+        ttls: Optional[Dict[str, float]] = None,
+        batch_window: float = 0.005,
+        max_batch_size: int = 200,
+        max_workers: int = 8,
+        timeout: float = 30.0
+    ):
+        """
+        Initialize the service.
+
+        Args:
+            fetch_quotes: Fetches quotes for a list of symbols; returns quotes keyed by symbol
+            fetch_option_chain: Fetches the chain for (symbol, expiration, greeks)
+            cache: Cache to use (one is created from ttls if None)
+            ttls: Staleness bounds per data type for the created cache
+            batch_window: Seconds to collect single-symbol requests before fetching
+            max_batch_size: Maximum symbols per fetch_quotes call
+            max_workers: Concurrent option chain fetches in get_option_chains
+            timeout: Seconds a batched caller waits for its result
+        """
+        self.fetch_quotes = fetch_quotes
+        self.fetch_option_chain = fetch_option_chain
+        self.cache = cache or ShardedTTLCache(dict(DEFAULT_TTLS, **(ttls or {})))
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # Open batches keyed by the greeks flag
+        self._batches: Dict[bool, Dict[str, Future]] = {}
+        self._condition = threading.Condition()
+        # Uncached get_quote calls in flight and the size of the last batch
+        self._active = 0
+        self._last_batch_size = 0
+
+        # Metrics
+        self.quote_requests = 0
+        self.quote_fetches = 0
+        self.chain_fetches = 0
+
+    def get_quote(self, symbol: str, greeks: bool = False, max_age: Optional[float] = None) -> Dict:
+        """
+        Get the quote for one symbol, batched with concurrent requests.
+
+        Args:
+            symbol: Symbol
+            greeks: Include Greeks for options
+            max_age: Tighter staleness bound for this request (seconds)
+
+        Returns:
+            Quote data ({} if the broker returned none)
+
+        Raises:
+            Exception: The fetch error, if the batch fetch failed
+        """
+        self.quote_requests += 1
+        cached = self.cache.get(self._quote_type(greeks), symbol, max_age)
+        if cached is not None:
+            return cached
+
+        with self._condition:
+            self._active += 1
+            batch = self._batches.get(greeks)
+            leader = batch is None
+            if leader:
+                batch = self._batches[greeks] = {}
+            future = batch.get(symbol)
+            if future is None:
+                future = batch[symbol] = Future()
+            if len(batch) >= self.max_batch_size:
+                self._condition.notify_all()
+
+        try:
+            if leader:
+                with self._condition:
+                    # Skip the window for serial callers: nothing else in flight
+                    # and the previous batch had a single symbol
+                    if self._active > 1 or self._last_batch_size != 1:
+                        deadline = time.monotonic() + self.batch_window
+                        while len(batch) < self.max_batch_size:
+                            remaining = deadline - time.monotonic()
+                            if remaining <= 0:
+                                break
+                            self._condition.wait(remaining)
+                    # Close the batch; later requests start a new one
+                    if self._batches.get(greeks) is batch:
+                        del self._batches[greeks]
+                    self._last_batch_size = len(batch)
+                self._run_batch(batch, greeks)
+
+            return future.result(timeout=self.timeout)
+        finally:
+            with self._condition:
+                self._active -= 1
+
+    def _run_batch(self, batch: Dict[str, Future], greeks: bool) -> None:
+        try:
+            quotes = self._fetch(list(batch), greeks)
+        except Exception as e:
+            for future in batch.values():
+                future.set_exception(e)
+            return
+        for symbol, future in batch.items():
+            future.set_result(quotes.get(symbol, {}))
+
+    def _fetch(self, symbols: List[str], greeks: bool) -> Dict[str, Dict]:
+        """Fetch quotes in chunks of max_batch_size and cache them."""
+        quotes: Dict[str, Dict] = {}
+        for i in range(0, len(symbols), self.max_batch_size):
+            self.quote_fetches += 1
+            quotes.update(self.fetch_quotes(symbols[i:i + self.max_batch_size], greeks))
+        self.cache.set_many(self._quote_type(greeks), quotes)
+        return quotes
+
+    @staticmethod
+    def _quote_type(greeks: bool) -> str:
+        return 'quote_greeks' if greeks else 'quote'
+
+    def get_quotes(self, symbols: Union[str, List[str]], greeks: bool = False,
+                   max_age: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Get quotes for many symbols, fetching only the uncached ones.
+
+        Args:
+            symbols: Single symbol or list of symbols
+            greeks: Include Greeks for options
+            max_age: Tighter staleness bound for this request (seconds)
+
+        Returns:
+            Dictionary of quotes keyed by symbol
+
+        Raises:
+            Exception: The fetch error, if fetching uncached symbols failed
+        """
+        if isinstance(symbols, str):
+            symbols = [symbols]
+        symbols = list(dict.fromkeys(symbols))
+        self.quote_requests += len(symbols)
+
+        quotes = self.cache.get_many(self._quote_type(greeks), symbols, max_age)
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if missing:
+            quotes.update(self._fetch(missing, greeks))
+        return quotes
+
+    def get_cached_quotes(self, symbols: List[str], greeks: bool = False) -> Dict[str, Dict]:
+        """
+        Get whichever of the symbols have fresh cached quotes, without fetching.
+
+        Args:
+            symbols: Symbols
+            greeks: Quotes requested with Greeks
+
+        Returns:
+            Dictionary of cached quotes keyed by symbol
+        """
+        return self.cache.get_many(self._quote_type(greeks), symbols)
+
+    def get_option_chain(self, symbol: str, expiration: Optional[str] = None, greeks: bool = True,
+                         max_age: Optional[float] = None) -> List[Dict]:
+        """
+        Get an option chain, from the cache if fresh enough.
+
+        Args:
+            symbol: Underlying symbol
+            expiration: Expiration date in YYYY-MM-DD format
+            greeks: Include Greeks
+            max_age: Tighter staleness bound for this request (seconds)
+
+        Returns:
+            List of option contracts
+
+        Raises:
+            RuntimeError: If the service has no fetch_option_chain
+        """
+        if self.fetch_option_chain is None:
+            raise RuntimeError("QuoteService was created without fetch_option_chain")
+
+        key = (symbol, expiration, greeks)
+        chain = self.cache.get('option_chain', key, max_age)
+        if chain is None:
+            self.chain_fetches += 1
+            chain = self.fetch_option_chain(symbol, expiration, greeks)
+            self.cache.set('option_chain', key, chain)
+        return chain
+
+    def get_option_chains(self, symbols: List[str], expiration: Optional[str] = None, greeks: bool = True,
+                          max_age: Optional[float] = None) -> Dict[str, List[Dict]]:
+        """
+        Get option chains for many underlyings, fetching uncached ones concurrently.
+
+        Args:
+            symbols: Underlying symbols
+            expiration: Expiration date in YYYY-MM-DD format
+            greeks: Include Greeks
+            max_age: Tighter staleness bound for this request (seconds)
+
+        Returns:
+            Dictionary of chains keyed by symbol; symbols that failed are omitted
+        """
+        chains = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                symbol: executor.submit(self.get_option_chain, symbol, expiration, greeks, max_age)
+                for symbol in dict.fromkeys(symbols)
+            }
+            for symbol, future in futures.items():
+                try:
+                    chains[symbol] = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to get option chain for {symbol}: {str(e)}")
+        return chains
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get request, fetch and cache metrics.
+
+        Returns:
+            Dict with quote requests, broker calls made and cache hit/miss counts
+        """
+        return {
+            'quote_requests': self.quote_requests,
+            'quote_fetches': self.quote_fetches,
+            'chain_fetches': self.chain_fetches,
+            'cache': self.cache.get_metrics()
+        }
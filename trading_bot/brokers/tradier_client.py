@@ -6,6 +6,9 @@ import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 
+from .http_transport import HttpTransport, RateLimitExceeded, shared_rate_limiter
+from .quote_service import QuoteService
+
 # Import tenacity for retry mechanisms
 try:
     from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, RetryError
@@ -15,15 +18,6 @@ except ImportError:
     logger = logging.getLogger(__name__)
     logger.warning("tenacity not available. Retry functionality will be disabled. Install with: pip install tenacity")
 
-# Import cachetools for better cache management
-try:
-    from cachetools import TTLCache
-    CACHETOOLS_AVAILABLE = True
-except ImportError:
-    CACHETOOLS_AVAILABLE = False
-    logger = logging.getLogger(__name__)
-    logger.warning("cachetools not available. Using simple dict cache instead. Install with: pip install cachetools")
-
 logger = logging.getLogger(__name__)
 
 class TradierClient:
@@ -43,8 +37,14 @@ class TradierClient:
     
     # Rate limiting parameters
     MAX_REQUESTS_PER_MINUTE = 60
+    RATE_LIMIT_BURST = 10  # requests that may be sent back to back
     RATE_LIMIT_COOLDOWN = 60  # seconds to wait when rate limited
     
+    # Market data caching and batching
+    QUOTE_CACHE_TTL = 10  # seconds
+    OPTION_CHAIN_CACHE_TTL = 15  # seconds
+    QUOTE_BATCH_SIZE = 200  # symbols per quotes request
+    
     def __init__(self, api_key: str, account_id: str, sandbox: bool = True):
         """
         Initialize the Tradier client
@@ -65,39 +65,27 @@ class TradierClient:
             "Accept": "application/json"
         }
         
-        # Cache for market data to reduce API calls
-        if CACHETOOLS_AVAILABLE:
-            # Use TTLCache for automatic expiration
-            self.quote_cache = TTLCache(maxsize=1000, ttl=10)  # Cache up to 1000 symbols, 10s TTL
-            logger.info("Using TTLCache for quote caching")
-        else:
-            # Fallback to manual cache management
-            self.quote_cache = {}
-            self.quote_cache_expiry = {}
-            self.quote_cache_duration = 10  # seconds
-            logger.info("Using simple dict cache for quotes")
-        
-        # Track request timestamps for rate limiting
-        self.request_timestamps = []
+        # Cached market data; concurrent get_quote calls are batched into one request
+        self.market_data = QuoteService(
+            self._fetch_quotes,
+            self._fetch_option_chain,
+            ttls={'quote': self.QUOTE_CACHE_TTL, 'option_chain': self.OPTION_CHAIN_CACHE_TTL},
+            max_batch_size=self.QUOTE_BATCH_SIZE
+        )
+        
+        # Pooled connections; the rate limit budget is shared by all clients using this key,
+        # at the strictest limit any of them registers
+        self.transport = HttpTransport(
+            headers=self.headers,
+            rate_limiter=shared_rate_limiter(
+                api_key, self.MAX_REQUESTS_PER_MINUTE / 60.0, self.RATE_LIMIT_BURST
+            ),
+            timeout=self.DEFAULT_TIMEOUT,
+            rate_limit_pause=self.RATE_LIMIT_COOLDOWN
+        )
         
         logger.info(f"Tradier client initialized for account {account_id} in {'sandbox' if sandbox else 'production'} mode")
     
-    def _check_rate_limits(self):
-        """
-        Check and enforce rate limits.
-        Removes timestamps older than 1 minute and sleeps if too many recent requests.
-        """
-        now = time.time()
-        # Keep only timestamps from the last minute
-        self.request_timestamps = [t for t in self.request_timestamps if now - t < 60]
-        
-        # If approaching limit, sleep to avoid hitting the rate limit
-        if len(self.request_timestamps) >= self.MAX_REQUESTS_PER_MINUTE - 5:
-            sleep_time = 60 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                logger.info(f"Approaching rate limit, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-    
     def _make_request_with_retry(self, method: str, endpoint: str, params: Dict = None, data: Dict = None) -> Dict:
         """
         Make a request to the Tradier API with retry logic
@@ -111,12 +99,6 @@ class TradierClient:
         Returns:
             API response as a dictionary
         """
-        # Implement basic rate limiting
-        self._check_rate_limits()
-        
-        # Track this request
-        self.request_timestamps.append(time.time())
-        
         url = f"{self.base_url}{endpoint}"
         
         # Define retry parameters
@@ -127,46 +109,15 @@ class TradierClient:
         while attempts < max_attempts:
             attempts += 1
             try:
-                if method.upper() == "GET":
-                    response = requests.get(
-                        url, 
-                        headers=self.headers, 
-                        params=params, 
-                        timeout=self.DEFAULT_TIMEOUT
-                    )
-                elif method.upper() == "POST":
-                    response = requests.post(
-                        url, 
-                        headers=self.headers, 
-                        data=data, 
-                        timeout=self.DEFAULT_TIMEOUT
-                    )
-                elif method.upper() == "PUT":
-                    response = requests.put(
-                        url, 
-                        headers=self.headers, 
-                        data=data, 
-                        timeout=self.DEFAULT_TIMEOUT
-                    )
-                elif method.upper() == "DELETE":
-                    response = requests.delete(
-                        url, 
-                        headers=self.headers, 
-                        timeout=self.DEFAULT_TIMEOUT
-                    )
-                else:
+                if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
                     raise ValueError(f"Unsupported method: {method}")
+                response = self.transport.request(method, url, params=params, data=data)
                 
                 # Handle rate limiting with special handling for 429 responses
                 if response.status_code == 429:
-                    logger.warning(f"Rate limited by Tradier API (attempt {attempts}/{max_attempts}). ")
-                    if attempts < max_attempts:
-                        wait_time = self.RATE_LIMIT_COOLDOWN * attempts  # Exponential backoff
-                        logger.warning(f"Cooling down for {wait_time} seconds before retry.")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise TradierRateLimitError("Rate limited by Tradier API, max retries exceeded")
+                    # The transport holds back every client sharing this API key for the cooldown
+                    logger.warning(f"Rate limited by Tradier API. Cooling down for {self.RATE_LIMIT_COOLDOWN} seconds.")
+                    raise TradierRateLimitError("Rate limited by Tradier API")
                 
                 # Check for HTTP errors
                 response.raise_for_status()
@@ -174,6 +125,11 @@ class TradierClient:
                 # Parse JSON response
                 return response.json()
                 
+            except TradierRateLimitError:
+                raise
+            except RateLimitExceeded as e:
+                # No token left in the budget shared by clients using this key
+                raise TradierRateLimitError(f"Tradier API rate limit reached: {str(e)}") from e
             except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
                 # These errors are retryable
                 last_error = e
@@ -246,50 +202,17 @@ class TradierClient:
         Make a request to the Tradier API with tenacity retry library
         Only used if tenacity is available
         """
-        # Implement basic rate limiting
-        self._check_rate_limits()
-        
-        # Track this request
-        self.request_timestamps.append(time.time())
-        
         url = f"{self.base_url}{endpoint}"
         
         try:
-            if method.upper() == "GET":
-                response = requests.get(
-                    url, 
-                    headers=self.headers, 
-                    params=params, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "POST":
-                response = requests.post(
-                    url, 
-                    headers=self.headers, 
-                    data=data, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "PUT":
-                response = requests.put(
-                    url, 
-                    headers=self.headers, 
-                    data=data, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "DELETE":
-                response = requests.delete(
-                    url, 
-                    headers=self.headers, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            else:
+            if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
                 raise ValueError(f"Unsupported method: {method}")
+            response = self.transport.request(method, url, params=params, data=data)
             
             # Handle rate limiting with special handling for 429 responses
             if response.status_code == 429:
+                # The transport holds back every client sharing this API key for the cooldown
                 logger.warning(f"Rate limited by Tradier API. Cooling down for {self.RATE_LIMIT_COOLDOWN} seconds.")
-                time.sleep(self.RATE_LIMIT_COOLDOWN)
-                # This will be retried by the @retry decorator
                 raise TradierRateLimitError("Rate limited by Tradier API")
             
             # Check for HTTP errors
@@ -298,6 +221,9 @@ class TradierClient:
             # Parse JSON response
             return response.json()
             
+        except RateLimitExceeded as e:
+            # No token left in the budget shared by clients using this key
+            raise TradierRateLimitError(f"Tradier API rate limit reached: {str(e)}") from e
         except requests.exceptions.RequestException as e:
             error_msg = f"Error making request to Tradier API: {str(e)}"
             logger.error(error_msg)
@@ -425,6 +351,8 @@ class TradierClient:
         """
         Get quotes for multiple symbols with TTL caching
         
+        Uncached symbols are fetched QUOTE_BATCH_SIZE symbols per request.
+        
         Args:
             symbols: Single symbol or list of symbols
             greeks: Include Greeks for options (default: False)
@@ -440,75 +368,45 @@ class TradierClient:
         if not symbols:
             return {}
         
-        # Check which symbols are in cache and which need to be fetched
-        now = datetime.now().timestamp()
-        cached_quotes = {}
-        symbols_to_fetch = []
-        
-        # Handle different cache implementations
-        if CACHETOOLS_AVAILABLE:
-            # Using TTLCache - expiration is automatic
-            for symbol in symbols:
-                if symbol in self.quote_cache:
-                    cached_quotes[symbol] = self.quote_cache[symbol]
-                else:
-                    symbols_to_fetch.append(symbol)
-        else:
-            # Using manual cache expiration
-            for symbol in symbols:
-                if symbol in self.quote_cache and symbol in self.quote_cache_expiry:
-                    # If cache valid, use it
-                    if now - self.quote_cache_expiry[symbol] < self.quote_cache_duration:
-                        cached_quotes[symbol] = self.quote_cache[symbol]
-                    else:
-                        symbols_to_fetch.append(symbol)
-                else:
-                    symbols_to_fetch.append(symbol)
-        
-        # If all symbols in cache, return cached quotes
-        if not symbols_to_fetch:
-            return cached_quotes
+        try:
+            return self.market_data.get_quotes(symbols, greeks)
+        except Exception as e:
+            logger.error(f"Error fetching quotes: {str(e)}")
+            return self.market_data.get_cached_quotes(list(symbols), greeks)
+    
+    def _fetch_quotes(self, symbols: List[str], greeks: bool) -> Dict[str, Dict]:
+        """
+        Fetch quotes for symbols in one request, bypassing the cache
         
-        # Fetch quotes for uncached symbols
+        Args:
+            symbols: Symbols to fetch
+            greeks: Include Greeks for options
+            
+        Returns:
+            Dictionary of quotes keyed by symbol
+        """
         endpoint = "/markets/quotes"
         params = {
-            "symbols": ",".join(symbols_to_fetch),
+            "symbols": ",".join(symbols),
             "greeks": "true" if greeks else "false"
         }
         
-        try:
-            response = self._make_request("GET", endpoint, params=params)
-            quotes_data = response.get("quotes", {})
-            quotes = quotes_data.get("quote", [])
-            
-            # Handle single quote result
-            if isinstance(quotes, dict):
-                quotes = [quotes]
-            
-            # Process quotes and update cache
-            for quote in quotes:
-                symbol = quote.get("symbol")
-                if symbol:
-                    cached_quotes[symbol] = quote
-                    
-                    # Update cache based on implementation
-                    if CACHETOOLS_AVAILABLE:
-                        self.quote_cache[symbol] = quote
-                    else:
-                        self.quote_cache[symbol] = quote
-                        self.quote_cache_expiry[symbol] = now
-            
-            return cached_quotes
-            
-        except Exception as e:
-            logger.error(f"Error fetching quotes: {str(e)}")
-            return cached_quotes
-        return cached_quotes
+        response = self._make_request("GET", endpoint, params=params)
+        quotes_data = response.get("quotes", {})
+        quotes = quotes_data.get("quote", [])
+        
+        # Handle single quote result
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+        
+        return {quote["symbol"]: quote for quote in quotes if quote.get("symbol")}
     
     def get_quote(self, symbol: str, greeks: bool = False) -> Dict:
         """
         Get quote for a single symbol
         
+        Concurrent calls from other threads are batched into one request.
+        
         Args:
             symbol: Symbol to get quote for
             greeks: Include Greeks for options (default: False)
@@ -516,13 +414,47 @@ class TradierClient:
         Returns:
             Quote data
         """
-        quotes = self.get_quotes(symbol, greeks)
-        return quotes.get(symbol, {})
+        try:
+            return self.market_data.get_quote(symbol, greeks)
+        except Exception as e:
+            logger.error(f"Error fetching quote for {symbol}: {str(e)}")
+            return {}
     
     def get_option_chain(self, symbol: str, expiration: str = None, greeks: bool = True) -> List[Dict]:
         """
         Get option chain for a symbol
         
+        Args:
+            symbol: Underlying symbol
+            expiration: Option expiration date in YYYY-MM-DD format
+            greeks: Include Greeks in the response
+            
+        Returns:
+            List of options
+        """
+        return self.market_data.get_option_chain(symbol, expiration, greeks)
+    
+    def get_option_chains(self, symbols: List[str], expiration: str = None, greeks: bool = True) -> Dict[str, List[Dict]]:
+        """
+        Get option chains for several underlyings
+        
+        Tradier serves one underlying per chain request, so uncached chains
+        are fetched concurrently.
+        
+        Args:
+            symbols: Underlying symbols
+            expiration: Option expiration date in YYYY-MM-DD format
+            greeks: Include Greeks in the response
+            
+        Returns:
+            Dictionary of option lists keyed by symbol
+        """
+        return self.market_data.get_option_chains(symbols, expiration, greeks)
+    
+    def _fetch_option_chain(self, symbol: str, expiration: Optional[str], greeks: bool) -> List[Dict]:
+        """
+        Fetch an option chain, bypassing the cache
+        
         Args:
             symbol: Underlying symbol
             expiration: Option expiration date in YYYY-MM-DD format
@@ -539,7 +471,7 @@ class TradierClient:
         
         if expiration:
             params["expiration"] = expiration
-        
+            
         response = self._make_request("GET", endpoint, params=params)
         options_data = response.get("options", {})
         
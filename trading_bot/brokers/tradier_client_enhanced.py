@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, RetryError
 
+from .http_transport import HttpTransport, RateLimitExceeded, shared_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class TradierClient:
@@ -26,6 +28,7 @@ class TradierClient:
     
     # Rate limiting parameters
     MAX_REQUESTS_PER_MINUTE = 60
+    RATE_LIMIT_BURST = 10  # requests that may be sent back to back
     RATE_LIMIT_COOLDOWN = 60  # seconds to wait when rate limited
     
     def __init__(self, api_key: str, account_id: str, sandbox: bool = True):
@@ -61,8 +64,16 @@ class TradierClient:
             self.quote_cache_expiry = {}
             self.quote_cache_duration = 10  # seconds
         
-        # Track request timestamps for rate limiting
-        self.request_timestamps = []
+        # Pooled connections; the rate limit budget is shared by all clients using this key,
+        # at the strictest limit any of them registers
+        self.transport = HttpTransport(
+            headers=self.headers,
+            rate_limiter=shared_rate_limiter(
+                api_key, self.MAX_REQUESTS_PER_MINUTE / 60.0, self.RATE_LIMIT_BURST
+            ),
+            timeout=self.DEFAULT_TIMEOUT,
+            rate_limit_pause=self.RATE_LIMIT_COOLDOWN
+        )
         
         logger.info(f"Enhanced Tradier client initialized for account {account_id} in {'sandbox' if sandbox else 'production'} mode")
     
@@ -87,48 +98,15 @@ class TradierClient:
         """
         url = f"{self.base_url}{endpoint}"
         
-        # Implement basic rate limiting
-        self._check_rate_limits()
-        
-        # Track this request
-        self.request_timestamps.append(time.time())
-        
         try:
-            if method.upper() == "GET":
-                response = requests.get(
-                    url, 
-                    headers=self.headers, 
-                    params=params, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "POST":
-                response = requests.post(
-                    url, 
-                    headers=self.headers, 
-                    data=data, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "PUT":
-                response = requests.put(
-                    url, 
-                    headers=self.headers, 
-                    data=data, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            elif method.upper() == "DELETE":
-                response = requests.delete(
-                    url, 
-                    headers=self.headers, 
-                    timeout=self.DEFAULT_TIMEOUT
-                )
-            else:
+            if method.upper() not in ("GET", "POST", "PUT", "DELETE"):
                 raise ValueError(f"Unsupported method: {method}")
+            response = self.transport.request(method, url, params=params, data=data)
             
             # Handle rate limiting with special handling for 429 responses
             if response.status_code == 429:
+                # The transport holds back every client sharing this API key for the cooldown
                 logger.warning(f"Rate limited by Tradier API. Cooling down for {self.RATE_LIMIT_COOLDOWN} seconds.")
-                time.sleep(self.RATE_LIMIT_COOLDOWN)
-                # This will be retried by the @retry decorator
                 raise TradierRateLimitError("Rate limited by Tradier API")
             
             # Check for HTTP errors
@@ -137,6 +115,9 @@ class TradierClient:
             # Parse JSON response
             return response.json()
             
+        except RateLimitExceeded as e:
+            # No token left in the budget shared by clients using this key
+            raise TradierRateLimitError(f"Tradier API rate limit reached: {str(e)}") from e
         except requests.exceptions.RequestException as e:
             error_msg = f"Error making request to Tradier API: {str(e)}"
             logger.error(error_msg)
@@ -155,22 +136,6 @@ class TradierClient:
             else:
                 raise TradierAPIError(error_msg) from e
     
-    def _check_rate_limits(self):
-        """
-        Check and enforce rate limits
-        Removes timestamps older than 1 minute and sleeps if too many recent requests
-        """
-        now = time.time()
-        # Keep only timestamps from the last minute
-        self.request_timestamps = [t for t in self.request_timestamps if now - t < 60]
-        
-        # If approaching limit, sleep to avoid hitting the rate limit
-        if len(self.request_timestamps) >= self.MAX_REQUESTS_PER_MINUTE - 5:
-            sleep_time = 60 - (now - self.request_timestamps[0])
-            if sleep_time > 0:
-                logger.info(f"Approaching rate limit, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-    
     # Rest of the TradierClient methods remain the same, with these enhancements
     # 1. All methods that use caching will work with TTLCache
     # 2. Add websocket support (outlined in later methods)
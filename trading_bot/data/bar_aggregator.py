@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""
+Tick-to-Bar Aggregator
+
+This module aggregates streaming ticks into OHLCV bars for several timeframes
+using preallocated NumPy arrays, so each tick is an O(1) update with no
+DataFrame allocation. DataFrames are only built when bars are requested.
+"""
+
+import threading
+import pandas as pd
+import numpy as np
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+BAR_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_HOUR = 60 * _NS_PER_MINUTE
+_NS_PER_DAY = 24 * _NS_PER_HOUR
+_EPOCH = datetime(1970, 1, 1)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def timeframe_to_ns(timeframe: str) -> int:
+    """
+    Convert a timeframe string to its bar length in nanoseconds.
+
+    Args:
+        timeframe: Timeframe such as '1min', '5min', '1hour' or '1day'
+
+    Returns:
+        int: Bar length in nanoseconds (unknown timeframes default to 1 minute)
+    """
+    if timeframe.endswith('min'):
+        return int(timeframe.replace('min', '')) * _NS_PER_MINUTE
+    elif timeframe.endswith('hour'):
+        return int(timeframe.replace('hour', '')) * _NS_PER_HOUR
+    elif timeframe == '1day':
+        return _NS_PER_DAY
+    else:
+        return _NS_PER_MINUTE
+
+
+def wall_time_ns(timestamp: Any) -> Tuple[int, Any]:
+    """
+    Convert a timestamp to wall-clock nanoseconds since the epoch.
+
+    Timezone-aware timestamps are converted to their local wall time so bars
+    are floored on local minute/hour/day boundaries; the timezone is returned
+    so materialized bars can be re-localized.
+
+    Args:
+        timestamp: datetime, pd.Timestamp, np.datetime64, int (ns) or float (seconds)
+
+    Returns:
+        Tuple of (nanoseconds, tzinfo or None)
+    """
+    if isinstance(timestamp, pd.Timestamp):
+        tz = timestamp.tzinfo
+        ns = timestamp.value
+        if tz is not None:
+            ns += int(timestamp.utcoffset().total_seconds()) * 10**9
+        return ns, tz
+    if isinstance(timestamp, datetime):
+        tz = timestamp.tzinfo
+        if tz is not None:
+            timestamp = timestamp.replace(tzinfo=None)
+        return ((timestamp - _EPOCH) // _ONE_MICROSECOND) * 1000, tz
+    if isinstance(timestamp, np.datetime64):
+        return int(timestamp.astype('datetime64[ns]').astype(np.int64)), None
+    if isinstance(timestamp, float):
+        return int(timestamp * 10**9), None
+    return int(timestamp), None
+
+
+class BarSeries:
+    """
+    OHLCV bars for one symbol and timeframe.
+
+    Closed bars live in a ring buffer of NumPy arrays that grows geometrically
+    up to ``max_bars`` and then overwrites the oldest bar. The bar currently
+    being built is held in plain Python scalars so in-bar ticks never touch
+    the arrays.
+    """
+
+    __slots__ = ('timeframe', 'period_ns', 'max_bars', 'tz', '_times', '_values',
+                 '_start', '_count', '_cur_time', '_cur')
+
+    def __init__(self, timeframe: str, max_bars: int = 5000, initial_capacity: int = 256):
+        """
+        Initialize the bar series.
+
+        Args:
+            timeframe: Bar timeframe
+            max_bars: Maximum number of bars retained
+            initial_capacity: Number of bars to preallocate
+        """
+        self.timeframe = timeframe
+        self.period_ns = timeframe_to_ns(timeframe)
+        self.max_bars = max_bars
+        self.tz = None
+
+        capacity = min(initial_capacity, max(max_bars - 1, 1))
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self._start = 0  # Ring index of the oldest closed bar
+        self._count = 0  # Number of closed bars
+
+        # Bar under construction: [open, high, low, close, volume]
+        self._cur_time: Optional[int] = None
+        self._cur: List[float] = []
+
+    def __len__(self) -> int:
+        return self._count + (self._cur_time is not None)
+
+    def update(self, time_ns: int, price: float, volume: float) -> bool:
+        """
+        Apply a tick to the series.
+
+        Args:
+            time_ns: Tick wall time in nanoseconds
+            price: Tick price
+            volume: Tick volume
+
+        Returns:
+            bool: Whether the tick started a new bar
+        """
+        bar_time = time_ns - time_ns % self.period_ns
+
+        if bar_time == self._cur_time:
+            cur = self._cur
+            if price > cur[1]:
+                cur[1] = price
+            if price < cur[2]:
+                cur[2] = price
+            cur[3] = price
+            cur[4] += volume
+            return False
+
+        if self._cur_time is None or bar_time > self._cur_time:
+            if self._cur_time is not None:
+                self._push(self._cur_time, self._cur)
+            self._cur_time = bar_time
+            self._cur = [price, price, price, price, volume]
+            return True
+
+        # Late tick for an earlier bar
+        return self._update_closed(bar_time, price, volume)
+
+    def _capacity(self) -> int:
+        return len(self._times)
+
+    def _push(self, bar_time: int, values: List[float]) -> None:
+        """Append a closed bar, growing or overwriting the ring as needed"""
+        capacity = self._capacity()
+        retained = self.max_bars - 1  # One slot is the bar under construction
+
+        if self._count == capacity and capacity < retained:
+            self._grow(min(capacity * 2, retained))
+            capacity = self._capacity()
+
+        if self._count < capacity:
+            index = (self._start + self._count) % capacity
+            self._count += 1
+        else:
+            # Overwrite the oldest bar
+            index = self._start
+            self._start = (self._start + 1) % capacity
+
+        self._times[index] = bar_time
+        self._values[index] = values
+
+    def _grow(self, capacity: int) -> None:
+        """Reallocate the ring in chronological order with a larger capacity"""
+        times, values = self._ordered()
+        self._times = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self._times[:self._count] = times
+        self._values[:self._count] = values
+        self._start = 0
+
+    def _ordered(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Closed bars oldest first (the last ``n`` if given)"""
+        count = self._count if n is None else min(n, self._count)
+        capacity = self._capacity()
+        first = (self._start + self._count - count) % capacity if capacity else 0
+        index = (first + np.arange(count)) % capacity
+        return self._times[index], self._values[index]
+
+    def _update_closed(self, bar_time: int, price: float, volume: float) -> bool:
+        """Apply a late tick to a closed bar, inserting the bar if it is missing"""
+        times, values = self._ordered()
+        position = int(np.searchsorted(times, bar_time))
+        capacity = self._capacity()
+
+        if position < self._count and times[position] == bar_time:
+            index = (self._start + position) % capacity
+            row = self._values[index]
+            row[1] = max(row[1], price)
+            row[2] = min(row[2], price)
+            row[3] = price
+            row[4] += volume
+            return False
+
+        # Insert the missing bar in time order, rebuilding the ring
+        times = np.insert(times, position, bar_time)
+        values = np.insert(values, position, [price, price, price, price, volume], axis=0)
+        retained = self.max_bars - 1
+        if len(times) > retained:
+            times, values = times[-retained:], values[-retained:]
+
+        count = len(times)
+        if count > capacity:
+            capacity = min(max(capacity * 2, count), retained)
+            self._times = np.empty(capacity, dtype=np.int64)
+            self._values = np.empty((capacity, len(BAR_COLUMNS)), dtype=np.float64)
+        self._times[:count] = times
+        self._values[:count] = values
+        self._start = 0
+        self._count = count
+        return True
+
+    def to_frame(self, n_bars: Optional[int] = None) -> pd.DataFrame:
+        """
+        Materialize the latest bars as a DataFrame.
+
+        Args:
+            n_bars: Number of bars to return (all retained bars if None)
+
+        Returns:
+            DataFrame: OHLCV bars indexed by bar start time
+        """
+        has_current = self._cur_time is not None
+        if n_bars is None:
+            n_bars = len(self)
+        n_closed = max(n_bars - has_current, 0)
+
+        times, values = self._ordered(n_closed)
+        if has_current and n_bars > 0:
+            times = np.append(times, self._cur_time)
+            values = np.vstack([values, self._cur])
+
+        index = pd.DatetimeIndex(times.astype('datetime64[ns]'))
+        if self.tz is not None:
+            index = index.tz_localize(self.tz)
+
+        return pd.DataFrame(values, index=index, columns=BAR_COLUMNS)
+
+
+class _SymbolBars:
+    """Bar series for every timeframe of one symbol, guarded by one lock"""
+
+    __slots__ = ('lock', 'series')
+
+    def __init__(self, timeframes: List[str], max_bars: int):
+        self.lock = threading.Lock()
+        self.series = {tf: BarSeries(tf, max_bars) for tf in timeframes}
+
+
+class BarAggregator:
+    """
+    Aggregates ticks into OHLCV bars for multiple symbols and timeframes.
+
+    Each symbol has its own lock, so ticks for different symbols can be
+    processed concurrently and readers only contend with writers of the
+    symbol they are reading.
+    """
+
+    def __init__(self, timeframes: List[str], max_bars: int = 5000):
+        """
+        Initialize the aggregator.
+
+        Args:
+            timeframes: Timeframes to maintain bars for
+            max_bars: Maximum number of bars retained per symbol and timeframe
+        """
+        self.timeframes = list(timeframes)
+        self.max_bars = max_bars
+        self._symbols: Dict[str, _SymbolBars] = {}
+        self._registry_lock = threading.Lock()
+
+    def _get_symbol(self, symbol: str) -> _SymbolBars:
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            with self._registry_lock:
+                entry = self._symbols.get(symbol)
+                if entry is None:
+                    entry = _SymbolBars(self.timeframes, self.max_bars)
+                    self._symbols[symbol] = entry
+        return entry
+
+    def update(self, symbol: str, timestamp: Any, price: float, volume: float = 0,
+               timeframes: Optional[List[str]] = None) -> List[str]:
+        """
+        Apply a tick to a symbol's bars.
+
+        Args:
+            symbol: Trading symbol
+            timestamp: Tick timestamp
+            price: Tick price
+            volume: Tick volume
+            timeframes: Restrict the update to these timeframes (all if None)
+
+        Returns:
+            List of timeframes in which the tick started a new bar
+        """
+        time_ns, tz = wall_time_ns(timestamp)
+        entry = self._get_symbol(symbol)
+        new_bars = []
+
+        with entry.lock:
+            for timeframe in (timeframes or self.timeframes):
+                series = entry.series[timeframe]
+                if series.tz is None and tz is not None:
+                    series.tz = tz
+                if series.update(time_ns, price, volume):
+                    new_bars.append(timeframe)
+
+        return new_bars
+
+    def has_bars(self, symbol: str, timeframe: str) -> bool:
+        """Whether any bars exist for a symbol and timeframe"""
+        entry = self._symbols.get(symbol)
+        return entry is not None and timeframe in entry.series and len(entry.series[timeframe]) > 0
+
+    def symbols(self, timeframe: str) -> List[str]:
+        """Symbols with at least one bar in a timeframe"""
+        return [symbol for symbol in list(self._symbols) if self.has_bars(symbol, timeframe)]
+
+    def get_bars(self, symbol: str, timeframe: str, n_bars: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the latest bars for a symbol and timeframe as a DataFrame.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Bar timeframe
+            n_bars: Number of bars to return (all retained bars if None)
+
+        Returns:
+            DataFrame: OHLCV bars (empty if none exist)
+        """
+        entry = self._symbols.get(symbol)
+        if entry is None or timeframe not in entry.series:
+            return pd.DataFrame()
+
+        with entry.lock:
+            series = entry.series[timeframe]
+            if len(series) == 0:
+                return pd.DataFrame()
+            return series.to_frame(n_bars)
+
+
+class TimeframeBarsView(Mapping):
+    """
+    Read-only ``symbol -> DataFrame`` view of one timeframe's bars.
+
+    DataFrames are built on access, which keeps the ``bars[timeframe][symbol]``
+    interface without maintaining DataFrames on every tick.
+    """
+
+    def __init__(self, aggregator: BarAggregator, timeframe: str, n_bars: Optional[int] = None):
+        """
+        Initialize the view.
+
+        Args:
+            aggregator: Aggregator holding the bars
+            timeframe: Timeframe to expose
+            n_bars: Number of latest bars returned per symbol (all if None)
+        """
+        self._aggregator = aggregator
+        self._timeframe = timeframe
+        self._n_bars = n_bars
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        if not self._aggregator.has_bars(symbol, self._timeframe):
+            raise KeyError(symbol)
+        return self._aggregator.get_bars(symbol, self._timeframe, self._n_bars)
+
+    def __contains__(self, symbol: object) -> bool:
+        return isinstance(symbol, str) and self._aggregator.has_bars(symbol, self._timeframe)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._aggregator.symbols(self._timeframe))
+
+    def __len__(self) -> int:
+        return len(self._aggregator.symbols(self._timeframe))
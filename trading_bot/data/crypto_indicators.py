@@ -16,6 +16,8 @@ import time
 from datetime import datetime
 from types import SimpleNamespace
 
+from trading_bot.utils.indicator_engine import compute_indicator
+
 # Try to import TA-Lib if available, otherwise use TA
 try:
     import talib
@@ -711,12 +713,8 @@ class CryptoIndicatorSuite:
             fast_rsi_window = self.config.fast_rsi_window
         
         # RSI with standard and faster settings
-        if USE_TALIB:
-            result['rsi'] = talib.RSI(result['close'], timeperiod=self.config.default_length)
-            result['fast_rsi'] = talib.RSI(result['close'], timeperiod=fast_rsi_window)
-        else:
-            result['rsi'] = ta.momentum.rsi(result['close'], window=self.config.default_length)
-            result['fast_rsi'] = ta.momentum.rsi(result['close'], window=fast_rsi_window)
+        result['rsi'] = compute_indicator(result, 'rsi', period=self.config.default_length, smoothing='wilder')
+        result['fast_rsi'] = compute_indicator(result, 'rsi', period=fast_rsi_window, smoothing='wilder')
             
         self.register_indicator_metadata('rsi', {
             'description': 'Relative Strength Index',
@@ -754,26 +752,16 @@ class CryptoIndicatorSuite:
         })
         
         # MACD
-        if USE_TALIB:
-            macd, signal, hist = talib.MACD(
-                result['close'], 
-                fastperiod=self.config.macd_fast,
-                slowperiod=self.config.macd_slow,
-                signalperiod=self.config.macd_signal
-            )
-            result['macd'] = macd
-            result['macd_signal'] = signal
-            result['macd_hist'] = hist
-        else:
-            macd = ta.trend.MACD(
-                close=result['close'],
-                window_slow=self.config.macd_slow,
-                window_fast=self.config.macd_fast,
-                window_sign=self.config.macd_signal
-            )
-            result['macd'] = macd.macd()
-            result['macd_signal'] = macd.macd_signal()
-            result['macd_hist'] = macd.macd_diff()
+        macd = compute_indicator(
+            result, 'macd',
+            fast_period=self.config.macd_fast,
+            slow_period=self.config.macd_slow,
+            signal_period=self.config.macd_signal,
+            warmup=True
+        )
+        result['macd'] = macd['macd']
+        result['macd_signal'] = macd['signal']
+        result['macd_hist'] = macd['hist']
             
         self.register_indicator_metadata('macd', {
             'description': 'MACD Line',
@@ -974,20 +962,7 @@ class CryptoIndicatorSuite:
         result = df.copy()
         
         # Calculate ATR (Average True Range)
-        if USE_TALIB:
-            result['atr'] = talib.ATR(
-                result['high'], 
-                result['low'], 
-                result['close'], 
-                timeperiod=self.config.default_length
-            )
-        else:
-            result['atr'] = ta.volatility.average_true_range(
-                high=result['high'],
-                low=result['low'],
-                close=result['close'],
-                window=self.config.default_length
-            )
+        result['atr'] = compute_indicator(result, 'atr', period=self.config.default_length, smoothing='wilder')
             
         self.register_indicator_metadata('atr', {
             'description': 'Average True Range',
@@ -1006,26 +981,12 @@ class CryptoIndicatorSuite:
             })
         
         # Calculate Bollinger Bands
-        if USE_TALIB:
-            upper, middle, lower = talib.BBANDS(
-                result['close'], 
-                timeperiod=self.config.default_length,
-                nbdevup=self.config.bbands_dev,
-                nbdevdn=self.config.bbands_dev,
-                matype=0  # Simple Moving Average
-            )
-            result['bb_upper'] = upper
-            result['bb_middle'] = middle
-            result['bb_lower'] = lower
-        else:
-            bb = ta.volatility.BollingerBands(
-                close=result['close'],
-                window=self.config.default_length,
-                window_dev=self.config.bbands_dev
-            )
-            result['bb_upper'] = bb.bollinger_hband()
-            result['bb_middle'] = bb.bollinger_mavg()
-            result['bb_lower'] = bb.bollinger_lband()
+        bb = compute_indicator(
+            result, 'bollinger', period=self.config.default_length, num_std=self.config.bbands_dev, ddof=0
+        )
+        result['bb_upper'] = bb['upper']
+        result['bb_middle'] = bb['middle']
+        result['bb_lower'] = bb['lower']
             
         self.register_indicator_metadata('bb_upper', {
             'description': 'Bollinger Band Upper',
@@ -1150,7 +1111,7 @@ class CryptoIndicatorSuite:
         
         # Detect if in trend or range
         typical_price = (result['high'] + result['low'] + result['close']) / 3
-        adx = ta.trend.adx(result['high'], result['low'], result['close'], window=14) if not USE_TALIB else pd.Series(talib.ADX(result['high'], result['low'], result['close'], timeperiod=14), index=result.index)
+        adx = compute_indicator(result, 'adx', period=14, smoothing='wilder')['adx']
         
         # Determine if in trend (ADX > 25) or range
         is_trending = adx > 25
@@ -1680,20 +1641,7 @@ class CryptoIndicatorSuite:
         
         # Calculate ATR if not already present
         if 'atr' not in result.columns:
-            if USE_TALIB:
-                result['atr'] = talib.ATR(
-                    result['high'],
-                    result['low'],
-                    result['close'],
-                    timeperiod=atr_period
-                )
-            else:
-                result['atr'] = ta.volatility.average_true_range(
-                    high=result['high'],
-                    low=result['low'],
-                    close=result['close'],
-                    window=atr_period
-                )
+            result['atr'] = compute_indicator(result, 'atr', period=atr_period, smoothing='wilder')
         
         # Calculate basic upper and lower bands
         result['basic_upper_band'] = ((result['high'] + result['low']) / 2) + (multiplier * result['atr'])
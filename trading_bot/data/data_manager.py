@@ -182,7 +182,7 @@ class DataManager:
         
         # Try to get data from storage for remaining symbols
         for symbol in list(symbols_to_fetch):
-            data = self.data_storage.load_market_data(symbol, "ohlcv")
+            data = self.data_storage.load_market_data(symbol, "ohlcv", start=start_date, end=end_date)
             
             if data is not None:
                 # Filter data by date range
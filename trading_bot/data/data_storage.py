@@ -4,17 +4,24 @@
 Data Storage Module
 
 This module provides functionality for persisting and retrieving historical market data.
+Market data and option chains are kept in the columnar stores of
+trading_bot.data.market_data_store; files written by earlier versions
+(whole-file Parquet and pickled option chains) are still readable.
 """
 
 import os
+import shutil
 import logging
 import pandas as pd
 import json
 import pickle
+import pyarrow as pa
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from trading_bot.data.market_data_store import MarketDataStore, OptionChainStore, SchemaMismatchError
+
 logger = logging.getLogger(__name__)
 
 class DataStorage:
@@ -37,6 +44,10 @@ class DataStorage:
         self.market_data_dir.mkdir(parents=True, exist_ok=True)
         self.option_data_dir.mkdir(parents=True, exist_ok=True)
         
+        # Columnar stores share the directories with legacy files
+        self.market_store = MarketDataStore(self.market_data_dir)
+        self.option_store = OptionChainStore(self.option_data_dir)
+        
         logger.info(f"Data storage initialized with base directory: {self.base_dir}")
     
     def save_market_data(self, symbol: str, data: pd.DataFrame, 
@@ -44,6 +55,12 @@ class DataStorage:
         """
         Save market data to storage.
         
+        Time-indexed data is appended to the partitioned store; rows already
+        stored for the same timestamps are replaced by the new ones. A legacy
+        Parquet file for the symbol is moved into the store first. Data with
+        different columns or timezone than the stored data replaces it. Data
+        without timestamps is written as a single Parquet file.
+        
         Args:
             symbol: Symbol for the data
             data: DataFrame with market data
@@ -57,6 +74,23 @@ class DataStorage:
                 logger.warning(f"Cannot save empty data for {symbol}")
                 return False
             
+            try:
+                self._migrate_legacy_market_data(symbol, data_type)
+                rows = self.market_store.append(symbol, data_type, data, dedupe=True)
+                logger.info(f"Appended {rows} rows of {data_type} data for {symbol}")
+                return True
+            except SchemaMismatchError as e:
+                logger.warning(f"Replacing stored {data_type} data for {symbol}: {e}")
+                self.market_store.delete(symbol, data_type)
+                rows = self.market_store.append(symbol, data_type, data)
+                logger.info(f"Saved {rows} rows of {data_type} data for {symbol}")
+                return True
+            except ValueError as e:
+                logger.debug(f"Storing {data_type} data for {symbol} as a single file: {e}")
+            
+            # Loads read the store first, so drop any stored dataset the file replaces
+            self.market_store.delete(symbol, data_type)
+            
             # Create directory for symbol if it doesn't exist
             symbol_dir = self.market_data_dir / symbol
             symbol_dir.mkdir(exist_ok=True)
@@ -74,18 +108,42 @@ class DataStorage:
             logger.error(f"Error saving market data for {symbol}: {e}")
             return False
     
-    def load_market_data(self, symbol: str, data_type: str = "ohlcv") -> Optional[pd.DataFrame]:
+    def _migrate_legacy_market_data(self, symbol: str, data_type: str) -> None:
+        """Move a legacy Parquet file into the store before its first append."""
+        file_path = self.market_data_dir / symbol / f"{data_type}.parquet"
+        if not file_path.exists() or self.market_store.exists(symbol, data_type):
+            return
+        
+        try:
+            rows = self.market_store.append(symbol, data_type, pd.read_parquet(file_path), dedupe=True)
+            logger.info(f"Migrated {rows} rows of {data_type} data for {symbol} from {file_path}")
+        except ValueError as e:
+            # Untimed data cannot be stored; the timed data being saved replaces it
+            logger.warning(f"Replacing {data_type} data for {symbol} in {file_path}: {e}")
+        file_path.unlink()
+    
+    def load_market_data(self, symbol: str, data_type: str = "ohlcv",
+                         start: Any = None, end: Any = None,
+                         columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
         """
         Load market data from storage.
         
         Args:
             symbol: Symbol to load data for
             data_type: Type of data to load
+            start: Inclusive start of the time range (store data only)
+            end: Inclusive end of the time range (store data only)
+            columns: Columns to load (store data only)
             
         Returns:
             DataFrame with market data or None if not found
         """
         try:
+            if self.market_store.exists(symbol, data_type):
+                data = self.market_store.read(symbol, data_type, start=start, end=end, columns=columns)
+                logger.info(f"Loaded {len(data)} rows of {data_type} data for {symbol}")
+                return data
+            
             # Create file path
             file_path = self.market_data_dir / symbol / f"{data_type}.parquet"
             
@@ -109,6 +167,9 @@ class DataStorage:
         """
         Save option data to storage.
         
+        DataFrames are stored as Arrow files and the remaining fields as JSON.
+        Data that cannot be stored columnar falls back to a pickle.
+        
         Args:
             symbol: Symbol for the options
             expiration_date: Expiration date string
@@ -118,6 +179,14 @@ class DataStorage:
             True if successful, False otherwise
         """
         try:
+            try:
+                self.option_store.save(symbol, expiration_date, data)
+                self._remove_option_pickle(symbol, expiration_date)
+                logger.info(f"Saved option data for {symbol} expiration {expiration_date}")
+                return True
+            except (TypeError, ValueError, pa.ArrowException) as e:
+                logger.warning(f"Pickling option data for {symbol} expiration {expiration_date}: {e}")
+            
             # Create directory for symbol if it doesn't exist
             symbol_dir = self.option_data_dir / symbol
             symbol_dir.mkdir(exist_ok=True)
@@ -161,6 +230,11 @@ class DataStorage:
             Option data or None if not found
         """
         try:
+            data = self.option_store.load(symbol, expiration_date)
+            if data is not None:
+                logger.info(f"Loaded option data for {symbol} expiration {expiration_date}")
+                return data
+            
             # Create file path with sanitized expiration date
             safe_date = expiration_date.replace('-', '_')
             file_path = self.option_data_dir / symbol / f"{safe_date}.pkl"
@@ -181,6 +255,14 @@ class DataStorage:
             logger.error(f"Error loading option data for {symbol} expiration {expiration_date}: {e}")
             return None
     
+    def _remove_option_pickle(self, symbol: str, expiration_date: str) -> None:
+        """Remove a legacy pickle superseded by a columnar snapshot."""
+        safe_date = expiration_date.replace('-', '_')
+        for file_name in [f"{safe_date}.pkl", f"{safe_date}_meta.json"]:
+            file_path = self.option_data_dir / symbol / file_name
+            if file_path.exists():
+                file_path.unlink()
+    
     def list_available_data(self, data_type: str = "market") -> Dict[str, List[str]]:
         """
         List available data in storage.
@@ -219,19 +301,21 @@ class DataStorage:
                         for file_path in symbol_dir.iterdir():
                             if file_path.is_file() and file_path.suffix == '.parquet':
                                 data_types.append(file_path.stem)
+                            elif file_path.is_dir() and self.market_store.exists(symbol, file_path.name):
+                                data_types.append(file_path.name)
                         
-                        result[symbol] = data_types
+                        result[symbol] = sorted(set(data_types))
                     
                     else:  # option data
                         # List available expiration dates
-                        dates = []
+                        dates = self.option_store.list_expirations(symbol)
                         for file_path in symbol_dir.iterdir():
                             if file_path.is_file() and file_path.suffix == '.pkl' and not file_path.name.endswith('_meta.json'):
                                 # Convert filename back to date format
                                 date_str = file_path.stem.replace('_', '-')
                                 dates.append(date_str)
                         
-                        result[symbol] = dates
+                        result[symbol] = sorted(set(dates))
             
             return result
             
@@ -261,9 +345,13 @@ class DataStorage:
             # Delete specific data type
             if data_type is not None:
                 file_path = symbol_dir / f"{data_type}.parquet"
+                deleted = self.market_store.delete(symbol, data_type)
                 
                 if file_path.exists():
                     file_path.unlink()
+                    deleted = True
+                
+                if deleted:
                     logger.info(f"Deleted {data_type} data for {symbol}")
                     return True
                 else:
@@ -272,13 +360,10 @@ class DataStorage:
             
             # Delete all data for symbol
             else:
-                # Delete all files in directory
-                for file_path in symbol_dir.iterdir():
-                    if file_path.is_file():
-                        file_path.unlink()
-                
-                # Remove directory
-                symbol_dir.rmdir()
+                # Delete the directory with legacy files and store partitions
+                self.market_store.delete(symbol)
+                if symbol_dir.exists():
+                    shutil.rmtree(symbol_dir)
                 
                 logger.info(f"Deleted all market data for {symbol}")
                 return True
@@ -10,6 +10,7 @@ import pandas as pd
 from typing import Dict, List, Optional, Any, Union, Tuple
 
 from trading_bot.data.features.base_feature import FeatureExtractor
+from trading_bot.utils.indicator_engine import compute_indicator
 
 logger = logging.getLogger(__name__)
 
@@ -159,11 +160,11 @@ class MLFeatureExtractor(FeatureExtractor):
         
         # Simple Moving Averages
         for window in self.ma_windows:
-            result_df[f'sma_{window}'] = df[self.price_col].rolling(window=window).mean()
+            result_df[f'sma_{window}'] = compute_indicator(df, 'sma', column=self.price_col, period=window)
             
         # Exponential Moving Averages
         for window in self.ma_windows:
-            result_df[f'ema_{window}'] = df[self.price_col].ewm(span=window, adjust=False).mean()
+            result_df[f'ema_{window}'] = compute_indicator(df, 'ema', column=self.price_col, period=window)
             
         # Moving Average Crossovers
         for i, fast_window in enumerate(self.ma_windows[:-1]):
@@ -223,16 +224,7 @@ class MLFeatureExtractor(FeatureExtractor):
         
         # Calculate RSI for different windows
         for window in self.rsi_windows:
-            delta = df[self.price_col].diff()
-            
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=window).mean()
-            avg_loss = loss.rolling(window=window).mean()
-            
-            rs = avg_gain / avg_loss.replace(0, np.finfo(float).eps)
-            rsi = 100 - (100 / (1 + rs))
+            rsi = compute_indicator(df, 'rsi', column=self.price_col, period=window)
             
             result_df[f'rsi_{window}'] = rsi
             
@@ -253,15 +245,10 @@ class MLFeatureExtractor(FeatureExtractor):
         window = 20  # Standard BB window
         std_dev = 2.0  # Standard 2-sigma bands
         
-        # Middle band (20-day SMA)
-        middle_band = df[self.price_col].rolling(window=window).mean()
-        
-        # Calculate standard deviation
-        std = df[self.price_col].rolling(window=window).std()
-        
-        # Upper and lower bands
-        upper_band = middle_band + (std * std_dev)
-        lower_band = middle_band - (std * std_dev)
+        bands = compute_indicator(df, 'bollinger', column=self.price_col, period=window, num_std=std_dev)
+        middle_band = bands['middle']
+        upper_band = bands['upper']
+        lower_band = bands['lower']
         
         # Add bands to result
         result_df['bb_middle'] = middle_band
@@ -323,10 +310,9 @@ class MLFeatureExtractor(FeatureExtractor):
         result_df = df.copy()
         
         # MACD
-        ema12 = df[self.price_col].ewm(span=12, adjust=False).mean()
-        ema26 = df[self.price_col].ewm(span=26, adjust=False).mean()
-        macd_line = ema12 - ema26
-        signal_line = macd_line.ewm(span=9, adjust=False).mean()
+        macd = compute_indicator(df, 'macd', column=self.price_col)
+        macd_line = macd['macd']
+        signal_line = macd['signal']
         
         result_df['macd_line'] = macd_line
         result_df['macd_signal'] = signal_line
@@ -334,45 +320,19 @@ class MLFeatureExtractor(FeatureExtractor):
         result_df['macd_crossover'] = ((macd_line > signal_line) & 
                                       (macd_line.shift(1) <= signal_line.shift(1))).astype(float)
         
-        # ADX (Average Directional Index) - simplified calculation
+        # ADX (Average Directional Index)
         if all(col in df.columns for col in ['high', 'low']):
-            # True Range
-            tr1 = abs(df['high'] - df['low'])
-            tr2 = abs(df['high'] - df[self.price_col].shift(1))
-            tr3 = abs(df['low'] - df[self.price_col].shift(1))
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            
-            # Directional Movement
-            plus_dm = df['high'] - df['high'].shift(1)
-            minus_dm = df['low'].shift(1) - df['low']
-            
-            plus_dm = plus_dm.where((plus_dm > 0) & (plus_dm > minus_dm), 0)
-            minus_dm = minus_dm.where((minus_dm > 0) & (minus_dm > plus_dm), 0)
-            
-            # Smoothed True Range and Directional Movement
-            period = 14
-            smoothed_tr = tr.rolling(window=period).sum()
-            smoothed_plus_dm = plus_dm.rolling(window=period).sum()
-            smoothed_minus_dm = minus_dm.rolling(window=period).sum()
-            
-            # Directional Indicators
-            plus_di = 100 * smoothed_plus_dm / smoothed_tr
-            minus_di = 100 * smoothed_minus_dm / smoothed_tr
-            
-            # Directional Index
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            
-            # Average Directional Index
-            adx = dx.rolling(window=period).mean()
+            ohlc = df if self.price_col == 'close' else df.rename(columns={self.price_col: 'close'})
+            adx = compute_indicator(ohlc, 'adx', period=14)
             
-            result_df['plus_di'] = plus_di
-            result_df['minus_di'] = minus_di
-            result_df['adx'] = adx
+            result_df['plus_di'] = adx['plus_di']
+            result_df['minus_di'] = adx['minus_di']
+            result_df['adx'] = adx['adx']
             
         # Trend detection based on multiple MA crossovers
-        fast_ema = df[self.price_col].ewm(span=10, adjust=False).mean()
-        medium_ema = df[self.price_col].ewm(span=50, adjust=False).mean()
-        slow_ema = df[self.price_col].ewm(span=200, adjust=False).mean()
+        fast_ema = compute_indicator(df, 'ema', column=self.price_col, period=10)
+        medium_ema = compute_indicator(df, 'ema', column=self.price_col, period=50)
+        slow_ema = compute_indicator(df, 'ema', column=self.price_col, period=200)
         
         # Trend strength indicators
         result_df['trend_fast_medium'] = (fast_ema - medium_ema) / medium_ema
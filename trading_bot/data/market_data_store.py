@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+Columnar Market Data Store
+
+This module persists market data as uncompressed Arrow IPC (Feather v2) files
+partitioned by symbol, timeframe and date:
+
+    {base_dir}/{symbol}/{timeframe}/date=YYYY-MM-DD/part-00000.arrow
+    {base_dir}/{symbol}/{timeframe}/_manifest.json
+
+Datasets of daily or slower bars are partitioned by year (date=YYYY) instead,
+so a decade of daily bars is ten files rather than thousands. Bulk history
+can be written with month partitions (date=YYYY-MM), and compact() can move
+a dataset to a coarser partitioning once live appends have accumulated.
+
+Writes are append-only: each append adds new part files and records their row
+count and time range in the manifest, which reads use to prune parts outside
+the requested range without touching them. Parts are memory-mapped, so reads
+return Arrow buffers backed by the page cache instead of re-parsing files.
+Rows appended more than once resolve to the last write; compact() rewrites a
+dataset into one part per partition.
+
+Option chains are stored the same way, one Arrow file per DataFrame plus a
+JSON file for the remaining fields, instead of pickles.
+"""
+
+import os
+import json
+import shutil
+import logging
+import threading
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Union, Tuple
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "_manifest.json"
+MANIFEST_VERSION = 1
+TIME_COLUMNS = ['timestamp', 'datetime', 'date', 'time']
+
+_NS_PER_DAY = 24 * 60 * 60 * 10**9
+_PARTITION_FORMATS = {'date': '%Y-%m-%d', 'month': '%Y-%m', 'year': '%Y'}
+
+
+class SchemaMismatchError(ValueError):
+    """Appended data does not match the columns or timezone of a dataset."""
+
+
+def _safe_name(name: str) -> str:
+    """Make a symbol or timeframe usable as a directory name."""
+    return str(name).replace('/', '_').replace('\\', '_').replace(':', '_')
+
+
+def _write_ipc(path: Path, table: pa.Table) -> None:
+    """Atomically write a table as an uncompressed Arrow IPC file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with pa.OSFile(str(tmp_path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_ipc(path: Path, columns: Optional[List[str]] = None) -> pa.Table:
+    """Memory-map an Arrow IPC file; the returned table does not copy its buffers."""
+    with pa.memory_map(str(path), 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table
+
+
+def _write_json(path: Path, payload: Dict[str, Any]) -> None:
+    """Atomically write a JSON file."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f, default=str)
+    os.replace(tmp_path, path)
+
+
+class MarketDataStore:
+    """
+    Append-only, date-partitioned columnar store for market data.
+    """
+
+    def __init__(self, base_dir: Union[str, Path] = "data/market_store", max_workers: int = 8):
+        """
+        Initialize the store.
+
+        Args:
+            base_dir: Root directory of the store
+            max_workers: Threads used by read_many
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+
+        self._lock = threading.RLock()
+        self._manifests: Dict[Path, Tuple[int, Dict[str, Any]]] = {}
+
+    def _dataset_dir(self, symbol: str, timeframe: str) -> Path:
+        return self.base_dir / _safe_name(symbol) / _safe_name(timeframe)
+
+    def _load_manifest(self, dataset_dir: Path) -> Optional[Dict[str, Any]]:
+        """Load a manifest, reusing the parsed copy while the file is unchanged."""
+        path = dataset_dir / MANIFEST_FILE
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            self._manifests.pop(path, None)
+            return None
+
+        cached = self._manifests.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        self._manifests[path] = (mtime, manifest)
+        return manifest
+
+    def _save_manifest(self, dataset_dir: Path, manifest: Dict[str, Any]) -> None:
+        path = dataset_dir / MANIFEST_FILE
+        _write_json(path, manifest)
+        self._manifests[path] = (path.stat().st_mtime_ns, manifest)
+
+    @staticmethod
+    def _split_time(data: pd.DataFrame) -> Tuple[pd.DataFrame, str, bool]:
+        """
+        Find the timestamp column of a frame.
+
+        Returns:
+            Tuple of (frame with the timestamps as a column, column name,
+            whether the timestamps were the index)
+        """
+        if isinstance(data.index, pd.DatetimeIndex):
+            name = data.index.name or 'timestamp'
+            if name in data.columns:
+                raise ValueError(f"Index name '{name}' collides with a column")
+            return data.reset_index(names=name), name, True
+
+        for name in TIME_COLUMNS:
+            if name in data.columns:
+                frame = data
+                if not pd.api.types.is_datetime64_any_dtype(frame[name]):
+                    frame = frame.assign(**{name: pd.to_datetime(frame[name])})
+                return frame.reset_index(drop=True), name, False
+
+        raise ValueError("Data must have a DatetimeIndex or a timestamp/datetime/date column")
+
+    @staticmethod
+    def _to_ns(value: Any, tz: Optional[str]) -> int:
+        """Convert a range bound to the integer representation used in the manifest."""
+        ts = pd.Timestamp(value)
+        if tz is not None and ts.tzinfo is None:
+            ts = ts.tz_localize(tz)
+        elif tz is None and ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        return ts.value
+
+    @staticmethod
+    def _partition_for(times: pd.DatetimeIndex) -> str:
+        """Use date partitions for intraday bars and year partitions otherwise."""
+        if len(times) < 2:
+            return 'date'
+        spacing = np.median(np.diff(times.asi8))
+        return 'year' if spacing >= _NS_PER_DAY else 'date'
+
+    def append(self, symbol: str, timeframe: str, data: pd.DataFrame,
+               metadata: Optional[Dict[str, Any]] = None, partition: Optional[str] = None,
+               dedupe: bool = False) -> int:
+        """
+        Append rows to a dataset, writing one new part per partition touched.
+
+        Args:
+            symbol: Symbol of the data
+            timeframe: Timeframe (or other dataset name) of the data
+            data: Frame with a DatetimeIndex or a timestamp column
+            metadata: Optional JSON-serializable values merged into the manifest
+            partition: 'date', 'month' or 'year' for a new dataset (default:
+                date for intraday bars, year otherwise); ignored once created
+            dedupe: Compact the dataset if the new rows overlap stored ones,
+                so re-saved history does not accumulate duplicate parts
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            SchemaMismatchError: If the columns or timezone differ from the dataset
+        """
+        if partition is not None and partition not in _PARTITION_FORMATS:
+            raise ValueError(f"Unknown partition '{partition}'")
+        if data.empty:
+            return 0
+
+        frame, time_column, time_index = self._split_time(data)
+        times = pd.DatetimeIndex(frame[time_column]).as_unit('ns')
+        tz = str(times.tz) if times.tz is not None else None
+        if times.hasnans:
+            raise ValueError("Timestamps must not contain NaT")
+        if not times.is_monotonic_increasing:
+            order = np.argsort(times.asi8, kind='stable')
+            frame = frame.iloc[order].reset_index(drop=True)
+            times = times[order]
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        dataset_dir = self._dataset_dir(symbol, timeframe)
+
+        with self._lock:
+            dataset_dir.mkdir(parents=True, exist_ok=True)
+            manifest = self._load_manifest(dataset_dir)
+
+            if manifest is None:
+                manifest = {
+                    'version': MANIFEST_VERSION,
+                    'symbol': symbol,
+                    'timeframe': timeframe,
+                    'time_column': time_column,
+                    'time_index': time_index,
+                    'tz': tz,
+                    'partition': partition or self._partition_for(times),
+                    'columns': table.column_names,
+                    'next_part': 0,
+                    'parts': [],
+                    'metadata': {}
+                }
+            else:
+                manifest = dict(manifest, parts=list(manifest['parts']))
+                if table.column_names != manifest['columns'] or time_column != manifest['time_column']:
+                    raise SchemaMismatchError(
+                        f"Columns {table.column_names} do not match stored columns {manifest['columns']}"
+                    )
+                if tz != manifest['tz']:
+                    raise SchemaMismatchError(f"Timezone {tz} does not match stored timezone {manifest['tz']}")
+                schema = _read_ipc(dataset_dir / manifest['parts'][0]['path']).schema \
+                    if manifest['parts'] else table.schema
+                table = table.cast(schema)
+
+            values = times.asi8
+            overlaps = any(
+                part['start_ns'] <= values[-1] and part['end_ns'] >= values[0]
+                for part in manifest['parts']
+            )
+            n_parts = self._write_parts(dataset_dir, manifest, table, times)
+
+            if metadata:
+                manifest['metadata'] = dict(manifest.get('metadata', {}), **metadata)
+            manifest['updated_at'] = datetime.now().isoformat()
+            self._save_manifest(dataset_dir, manifest)
+
+            if dedupe and overlaps:
+                self.compact(symbol, timeframe)
+
+        logger.debug(f"Appended {len(frame)} rows to {symbol}/{timeframe} in {n_parts} parts")
+        return len(frame)
+
+    @staticmethod
+    def _write_parts(dataset_dir: Path, manifest: Dict[str, Any], table: pa.Table,
+                     times: pd.DatetimeIndex) -> int:
+        """
+        Write a time-sorted table as one new part per partition.
+
+        The parts are added to manifest['parts'] but the manifest is not
+        saved, so they stay invisible to readers until the caller saves it.
+
+        Returns:
+            int: Number of parts written
+        """
+        if not len(times):
+            return 0
+
+        # Partition on the wall-clock date (or year for daily and slower bars)
+        wall = times.tz_localize(None) if times.tz is not None else times
+        if manifest['partition'] == 'year':
+            keys = wall.year.values
+        elif manifest['partition'] == 'month':
+            keys = wall.year.values * 12 + wall.month.values
+        else:
+            keys = wall.asi8 // _NS_PER_DAY
+        boundaries = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(times)]])
+        values = times.asi8
+
+        for start, end in zip(starts, ends):
+            day = wall[start].strftime(_PARTITION_FORMATS[manifest['partition']])
+            relative = f"date={day}/part-{manifest['next_part']:05d}.arrow"
+            path = dataset_dir / relative
+            path.parent.mkdir(exist_ok=True)
+            _write_ipc(path, table.slice(start, end - start))
+
+            manifest['parts'].append({
+                'path': relative,
+                'date': day,
+                'rows': int(end - start),
+                'start_ns': int(values[start]),
+                'end_ns': int(values[end - 1])
+            })
+            manifest['next_part'] += 1
+        return len(starts)
+
+    def read_table(self, symbol: str, timeframe: str, start: Any = None, end: Any = None,
+                   columns: Optional[List[str]] = None) -> Optional[pa.Table]:
+        """
+        Read a time range of a dataset as a memory-mapped Arrow table.
+
+        Args:
+            symbol: Symbol to read
+            timeframe: Timeframe (or dataset name) to read
+            start: Inclusive start of the range (None for the beginning)
+            end: Inclusive end of the range (None for the end)
+            columns: Columns to read (the timestamp column is always included)
+
+        Returns:
+            Arrow table sorted by time, or None if the dataset does not exist
+        """
+        manifest = self._load_manifest(self._dataset_dir(symbol, timeframe))
+        if manifest is None:
+            return None
+
+        tz = manifest['tz']
+        time_column = manifest['time_column']
+        start_ns = self._to_ns(start, tz) if start is not None else None
+        end_ns = self._to_ns(end, tz) if end is not None else None
+
+        # (write sequence, part) for the parts overlapping the range
+        parts = [
+            (sequence, part) for sequence, part in enumerate(manifest['parts'])
+            if (start_ns is None or part['end_ns'] >= start_ns)
+            and (end_ns is None or part['start_ns'] <= end_ns)
+        ]
+
+        if columns is not None:
+            columns = [time_column] + [c for c in columns if c != time_column]
+
+        dataset_dir = self._dataset_dir(symbol, timeframe)
+        if not parts:
+            schema = _read_ipc(dataset_dir / manifest['parts'][-1]['path'], columns).schema \
+                if manifest['parts'] else pa.schema([])
+            return schema.empty_table()
+
+        # Parts are written in time order unless an append went back in time
+        ordered = sorted(parts, key=lambda entry: (entry[1]['start_ns'], entry[0]))
+        overlapping = any(
+            later['start_ns'] <= earlier['end_ns']
+            for (_, earlier), (_, later) in zip(ordered, ordered[1:])
+        )
+
+        table = pa.concat_tables([_read_ipc(dataset_dir / part['path'], columns) for _, part in ordered])
+
+        if overlapping:
+            # Sort by time, then keep the last write of each timestamp
+            times = table.column(time_column).to_numpy().astype('datetime64[ns]').view('int64')
+            write_order = np.repeat(
+                [sequence for sequence, _ in ordered], [part['rows'] for _, part in ordered]
+            )
+            order = np.lexsort((write_order, times))
+            sorted_times = times[order]
+            keep = np.append(sorted_times[1:] != sorted_times[:-1], True)
+            table = table.take(pa.array(order[keep]))
+
+        if start_ns is not None or end_ns is not None:
+            times = table.column(time_column).to_numpy().astype('datetime64[ns]').view('int64')
+            lo = np.searchsorted(times, start_ns, side='left') if start_ns is not None else 0
+            hi = np.searchsorted(times, end_ns, side='right') if end_ns is not None else len(times)
+            table = table.slice(lo, hi - lo)
+
+        return table
+
+    def read(self, symbol: str, timeframe: str, start: Any = None, end: Any = None,
+             columns: Optional[List[str]] = None,
+             as_numpy: bool = False) -> Optional[Union[pd.DataFrame, Dict[str, np.ndarray]]]:
+        """
+        Read a time range of a dataset.
+
+        Args:
+            symbol: Symbol to read
+            timeframe: Timeframe (or dataset name) to read
+            start: Inclusive start of the range (None for the beginning)
+            end: Inclusive end of the range (None for the end)
+            columns: Columns to read (the timestamp column is always included)
+            as_numpy: Return a dict of NumPy arrays instead of a DataFrame
+
+        Returns:
+            DataFrame shaped like the appended data (or dict of arrays), or None
+            if the dataset does not exist
+        """
+        table = self.read_table(symbol, timeframe, start, end, columns)
+        if table is None:
+            return None
+
+        if as_numpy:
+            return {
+                name: column.to_numpy()
+                for name, column in zip(table.column_names, table.columns)
+            }
+
+        manifest = self._load_manifest(self._dataset_dir(symbol, timeframe))
+        frame = table.to_pandas(split_blocks=True, self_destruct=False)
+        if manifest['time_index']:
+            frame = frame.set_index(manifest['time_column'])
+        return frame
+
+    def read_many(self, symbols: List[str], timeframe: str, start: Any = None, end: Any = None,
+                  columns: Optional[List[str]] = None,
+                  as_numpy: bool = False) -> Dict[str, Union[pd.DataFrame, Dict[str, np.ndarray]]]:
+        """
+        Read the same range for several symbols in parallel.
+
+        Returns:
+            Dict mapping symbol to its data; symbols without data are omitted
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(
+                lambda symbol: self.read(symbol, timeframe, start, end, columns, as_numpy), symbols
+            )
+            return {symbol: data for symbol, data in zip(symbols, results) if data is not None}
+
+    def compact(self, symbol: str, timeframe: str, partition: Optional[str] = None) -> int:
+        """
+        Rewrite a dataset into one sorted, de-duplicated part per partition.
+
+        The new parts are written first and swapped in with a single manifest
+        replace; the old parts are removed only after that, so a crash at any
+        point leaves either the old or the new dataset intact.
+
+        Args:
+            symbol: Symbol of the dataset
+            timeframe: Timeframe (or dataset name) of the dataset
+            partition: New partitioning ('date', 'month' or 'year'); the
+                current one is kept by default
+
+        Returns:
+            int: Number of rows after compaction
+        """
+        if partition is not None and partition not in _PARTITION_FORMATS:
+            raise ValueError(f"Unknown partition '{partition}'")
+
+        dataset_dir = self._dataset_dir(symbol, timeframe)
+        with self._lock:
+            manifest = self._load_manifest(dataset_dir)
+            if manifest is None:
+                return 0
+
+            table = self.read_table(symbol, timeframe)
+            times = pd.DatetimeIndex(table.column(manifest['time_column']).to_pandas()).as_unit('ns')
+            old_paths = [dataset_dir / part['path'] for part in manifest['parts']]
+
+            # New part numbers continue after the old ones, so no file is overwritten
+            compacted = dict(manifest, parts=[], partition=partition or manifest['partition'])
+            try:
+                self._write_parts(dataset_dir, compacted, table, times)
+            except Exception:
+                for part in compacted['parts']:
+                    (dataset_dir / part['path']).unlink(missing_ok=True)
+                raise
+            compacted['updated_at'] = datetime.now().isoformat()
+            self._save_manifest(dataset_dir, compacted)
+
+            for path in old_paths:
+                path.unlink(missing_ok=True)
+            for day_dir in dataset_dir.glob('date=*'):
+                if day_dir.is_dir() and not any(day_dir.iterdir()):
+                    day_dir.rmdir()
+            return table.num_rows
+
+    def delete(self, symbol: str, timeframe: Optional[str] = None) -> bool:
+        """
+        Delete one dataset of a symbol, or all of its datasets.
+
+        Returns:
+            bool: True if anything was deleted
+        """
+        target = self._dataset_dir(symbol, timeframe) if timeframe else self.base_dir / _safe_name(symbol)
+        with self._lock:
+            if not target.exists():
+                return False
+            shutil.rmtree(target)
+            self._manifests = {
+                path: entry for path, entry in self._manifests.items() if target not in path.parents
+            }
+            return True
+
+    def exists(self, symbol: str, timeframe: str) -> bool:
+        """Check whether a dataset has a manifest."""
+        return (self._dataset_dir(symbol, timeframe) / MANIFEST_FILE).exists()
+
+    def get_info(self, symbol: str, timeframe: str) -> Optional[Dict[str, Any]]:
+        """
+        Summarize a dataset from its manifest.
+
+        Returns:
+            Dict with rows, parts, start, end, columns and metadata, or None
+        """
+        manifest = self._load_manifest(self._dataset_dir(symbol, timeframe))
+        if manifest is None:
+            return None
+
+        parts = manifest['parts']
+        tz = manifest['tz']
+        to_timestamp = lambda ns: pd.Timestamp(ns, tz='UTC').tz_convert(tz) if tz else pd.Timestamp(ns)
+        return {
+            'rows': sum(part['rows'] for part in parts),
+            'parts': len(parts),
+            'start': to_timestamp(min(part['start_ns'] for part in parts)) if parts else None,
+            'end': to_timestamp(max(part['end_ns'] for part in parts)) if parts else None,
+            'columns': manifest['columns'],
+            'metadata': manifest.get('metadata', {})
+        }
+
+    def list_datasets(self) -> Dict[str, List[str]]:
+        """
+        List stored datasets.
+
+        Returns:
+            Dict mapping symbol directory names to their timeframes
+        """
+        result = {}
+        for manifest_path in sorted(self.base_dir.glob(f"*/*/{MANIFEST_FILE}")):
+            result.setdefault(manifest_path.parent.parent.name, []).append(manifest_path.parent.name)
+        return result
+
+
+class OptionChainStore:
+    """
+    Columnar storage for option chain snapshots.
+
+    Each chain is a directory holding one Arrow file per DataFrame (found at any
+    depth of nested dicts) and a JSON file with every other field.
+    """
+
+    META_FILE = "_chain.json"
+
+    def __init__(self, base_dir: Union[str, Path] = "data/option_store"):
+        """
+        Initialize the store.
+
+        Args:
+            base_dir: Root directory of the store
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def _chain_dir(self, symbol: str, expiration_date: str) -> Path:
+        return self.base_dir / _safe_name(symbol) / f"expiration={expiration_date}"
+
+    def save(self, symbol: str, expiration_date: str, data: Dict[str, Any]) -> Path:
+        """
+        Save an option chain, replacing any previous snapshot of the expiration.
+
+        Args:
+            symbol: Underlying symbol
+            expiration_date: Expiration date string
+            data: Chain data; DataFrames may be nested inside dicts
+
+        Returns:
+            Path: Directory the chain was written to
+        """
+        frames = []
+
+        def split(value: Any, path: List[str]) -> Any:
+            if isinstance(value, pd.DataFrame):
+                file_name = f"frame-{len(frames):03d}.arrow"
+                frames.append({'path': path, 'file': file_name})
+                _write_ipc(staging / file_name, pa.Table.from_pandas(value, preserve_index=True))
+                return None
+            if isinstance(value, dict):
+                return {str(key): split(item, path + [str(key)]) for key, item in value.items()}
+            return value
+
+        chain_dir = self._chain_dir(symbol, expiration_date)
+        staging = chain_dir.with_name(chain_dir.name + ".tmp")
+        if staging.exists():
+            shutil.rmtree(staging)
+        staging.mkdir(parents=True)
+
+        try:
+            values = split(data, [])
+            _write_json(staging / self.META_FILE, {
+                'symbol': symbol,
+                'expiration': expiration_date,
+                'saved_at': datetime.now().isoformat(),
+                'format': 'arrow',
+                'frames': frames,
+                'values': values
+            })
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        if chain_dir.exists():
+            shutil.rmtree(chain_dir)
+        os.replace(staging, chain_dir)
+        return chain_dir
+
+    def load(self, symbol: str, expiration_date: str) -> Optional[Dict[str, Any]]:
+        """
+        Load an option chain saved with save().
+
+        Returns:
+            Chain data with DataFrames restored, or None if not stored
+        """
+        chain_dir = self._chain_dir(symbol, expiration_date)
+        meta_path = chain_dir / self.META_FILE
+        if not meta_path.exists():
+            return None
+
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+
+        data = meta['values']
+        for frame in meta['frames']:
+            value = _read_ipc(chain_dir / frame['file']).to_pandas()
+            if not frame['path']:
+                return value
+            target = data
+            for key in frame['path'][:-1]:
+                target = target[key]
+            target[frame['path'][-1]] = value
+        return data
+
+    def exists(self, symbol: str, expiration_date: str) -> bool:
+        """Check whether a chain snapshot is stored."""
+        return (self._chain_dir(symbol, expiration_date) / self.META_FILE).exists()
+
+    def list_expirations(self, symbol: str) -> List[str]:
+        """List stored expiration dates of a symbol."""
+        symbol_dir = self.base_dir / _safe_name(symbol)
+        if not symbol_dir.exists():
+            return []
+        return sorted(
+            path.parent.name.split('=', 1)[1]
+            for path in symbol_dir.glob(f"expiration=*/{self.META_FILE}")
+        )
+
+    def delete(self, symbol: str, expiration_date: Optional[str] = None) -> bool:
+        """
+        Delete one expiration of a symbol, or all of them.
+
+        Returns:
+            bool: True if anything was deleted
+        """
+        target = self._chain_dir(symbol, expiration_date) if expiration_date else self.base_dir / _safe_name(symbol)
+        if not target.exists():
+            return False
+        shutil.rmtree(target)
+        return True
@@ -7,6 +7,7 @@ It handles data source prioritization, caching, and error recovery.
 """
 
 import os
+import copy
 import json
 import logging
 import pandas as pd
@@ -16,6 +17,9 @@ from enum import Enum, auto
 from typing import Dict, List, Optional, Union, Tuple, Any, Callable
 from dataclasses import dataclass
 
+from trading_bot.utils.options_pricing import price_and_greeks_vectorized
+from trading_bot.utils.ttl_cache import ShardedTTLCache
+
 logger = logging.getLogger(__name__)
 
 class DataSourcePriority(Enum):
@@ -55,7 +59,8 @@ class OptionsMarketData:
         config_path: Optional[str] = None,
         cache_dir: str = "data/options_cache",
         enable_local_cache: bool = True,
-        cache_ttl: int = 3600  # Default cache TTL in seconds
+        cache_ttl: int = 3600,  # Default cache TTL in seconds
+        cache_ttls: Optional[Dict[str, float]] = None
     ):
         """
         Initialize the options market data provider.
@@ -65,11 +70,17 @@ class OptionsMarketData:
             cache_dir: Directory for caching options data
             enable_local_cache: Whether to use local caching
             cache_ttl: Cache time-to-live in seconds
+            cache_ttls: Cache time-to-live per data type ('options_chain', 'iv_surface',
+                'iv_history'), overriding cache_ttl
         """
         self.data_sources: Dict[str, DataSource] = {}
         self.cache_dir = cache_dir
         self.enable_local_cache = enable_local_cache
         self.cache_ttl = cache_ttl
+        self.cache_ttls = dict(cache_ttls or {})
+        
+        # In-memory cache in front of the JSON files
+        self.memory_cache = ShardedTTLCache(self.cache_ttls, default_ttl=cache_ttl)
         
         # Create cache directory if it doesn't exist
         if self.enable_local_cache:
@@ -664,14 +675,19 @@ class OptionsMarketData:
         # Generate cache file path
         cache_file = self._get_cache_file_path(symbol, data_type, **kwargs)
         
+        # Memory first; copies keep callers from mutating the cached data
+        data = self.memory_cache.get(data_type, cache_file)
+        if data is not None:
+            return copy.deepcopy(data)
+        
         try:
             # Check if file exists and is not expired
             if not os.path.exists(cache_file):
                 return None
             
             # Check file modification time for expiration
-            mod_time = os.path.getmtime(cache_file)
-            if datetime.now().timestamp() - mod_time > self.cache_ttl:
+            age = datetime.now().timestamp() - os.path.getmtime(cache_file)
+            if age > self.memory_cache.ttl(data_type):
                 logger.debug(f"Cache expired for {symbol} {data_type}")
                 return None
             
@@ -679,6 +695,8 @@ class OptionsMarketData:
             with open(cache_file, 'r') as f:
                 data = json.load(f)
             
+            # The memory entry expires with the file, not a full TTL from now
+            self.memory_cache.set(data_type, cache_file, copy.deepcopy(data), age=age)
             return data
             
         except Exception as e:
@@ -718,6 +736,8 @@ class OptionsMarketData:
             with open(cache_file, 'w') as f:
                 json.dump(data, f)
             
+            self.memory_cache.set(data_type, cache_file, copy.deepcopy(data))
+            
             return True
             
         except Exception as e:
@@ -938,30 +958,16 @@ class OptionsMarketData:
         is_call = option_type.lower() == 'call'
         time_to_expiry = days_to_expiry / 365.0
         
-        # Simple Black-Scholes approximation
-        d1 = (np.log(stock_price / strike) + (0.02 + 0.5 * iv**2) * time_to_expiry) / (iv * np.sqrt(time_to_expiry))
-        d2 = d1 - iv * np.sqrt(time_to_expiry)
-        
-        if is_call:
-            # Call option
-            delta = self._norm_cdf(d1)
-            option_price = stock_price * delta - strike * np.exp(-0.02 * time_to_expiry) * self._norm_cdf(d2)
-        else:
-            # Put option
-            delta = self._norm_cdf(d1) - 1
-            option_price = strike * np.exp(-0.02 * time_to_expiry) * self._norm_cdf(-d2) - stock_price * self._norm_cdf(-d1)
+        # Black-Scholes price and greeks (2% risk-free rate)
+        price, greeks = price_and_greeks_vectorized(
+            stock_price, strike, time_to_expiry, 0.02, iv, option_type
+        )
+        delta, gamma, theta, vega = (
+            float(greeks[name]) for name in ('delta', 'gamma', 'theta', 'vega')
+        )
         
         # Ensure the price is positive
-        option_price = max(0.01, option_price)
-        
-        # Calculate other greeks
-        gamma = self._norm_pdf(d1) / (stock_price * iv * np.sqrt(time_to_expiry))
-        vega = stock_price * self._norm_pdf(d1) * np.sqrt(time_to_expiry) / 100  # Scaled for percentage point
-        theta = -(stock_price * iv * self._norm_pdf(d1)) / (2 * np.sqrt(time_to_expiry) * 365)
-        if not is_call:
-            theta -= 0.02 * strike * np.exp(-0.02 * time_to_expiry) * self._norm_cdf(-d2) / 365
-        else:
-            theta -= 0.02 * strike * np.exp(-0.02 * time_to_expiry) * self._norm_cdf(d2) / 365
+        option_price = max(0.01, float(price))
         
         # Create option symbol
         option_symbol = f"{symbol}{expiration.replace('-', '')}{'C' if is_call else 'P'}{int(strike * 1000):08d}"
@@ -1126,11 +1132,3 @@ class OptionsMarketData:
         })
         
         return df
-    
-    def _norm_cdf(self, x: float) -> float:
-        """Standard normal cumulative distribution function."""
-        return 0.5 * (1 + np.math.erf(x / np.sqrt(2)))
-    
-    def _norm_pdf(self, x: float) -> float:
-        """Standard normal probability density function."""
-        return np.exp(-0.5 * x**2) / np.sqrt(2 * np.pi) 
\ No newline at end of file
@@ -13,6 +13,7 @@ import time
 from collections import defaultdict
 
 from trading_bot.data.processors.base_processor import DataProcessor
+from trading_bot.utils.indicator_engine import get_indicator_engine
 
 logger = logging.getLogger("MultiTimeframeProcessor")
 
@@ -74,13 +75,8 @@ class MultiTimeframeProcessor(DataProcessor):
             '1M': '1M'
         }
         
-        # Initialize TA-lib if available
-        try:
-            import talib
-            self.talib_available = True
-        except ImportError:
-            self.talib_available = False
-            logger.warning("TA-lib not available, using pandas for technical indicators")
+        # Shared indicator engine (memoizes indicators across processors)
+        self.indicator_engine = get_indicator_engine()
     
     def init_from_config(self) -> None:
         """Initialize additional attributes from configuration."""
@@ -288,7 +284,7 @@ class MultiTimeframeProcessor(DataProcessor):
             try:
                 if indicator == 'rsi' and 'rsi' in self.indicator_params:
                     period = self.indicator_params['rsi']['period']
-                    result = self._add_rsi(result, period)
+                    result = self._add_rsi(result, period, timeframe=timeframe)
                 
                 elif indicator == 'macd' and 'macd' in self.indicator_params:
                     params = self.indicator_params['macd']
@@ -296,24 +292,27 @@ class MultiTimeframeProcessor(DataProcessor):
                         result, 
                         params['fast_period'], 
                         params['slow_period'], 
-                        params['signal_period']
+                        params['signal_period'],
+                        timeframe=timeframe
                     )
                 
                 elif indicator == 'bollinger' and 'bollinger' in self.indicator_params:
                     params = self.indicator_params['bollinger']
-                    result = self._add_bollinger_bands(result, params['period'], params['std_dev'])
+                    result = self._add_bollinger_bands(
+                        result, params['period'], params['std_dev'], timeframe=timeframe
+                    )
                 
                 elif indicator == 'atr' and 'atr' in self.indicator_params:
                     period = self.indicator_params['atr']['period']
-                    result = self._add_atr(result, period)
+                    result = self._add_atr(result, period, timeframe=timeframe)
                 
                 elif indicator == 'sma' and 'sma' in self.indicator_params:
                     periods = self.indicator_params['sma']['periods']
-                    result = self._add_sma(result, periods)
+                    result = self._add_sma(result, periods, timeframe=timeframe)
                 
                 elif indicator == 'ema' and 'ema' in self.indicator_params:
                     periods = self.indicator_params['ema']['periods']
-                    result = self._add_ema(result, periods)
+                    result = self._add_ema(result, periods, timeframe=timeframe)
                 
                 elif indicator == 'stoch' and 'stoch' in self.indicator_params:
                     params = self.indicator_params['stoch']
@@ -321,12 +320,13 @@ class MultiTimeframeProcessor(DataProcessor):
                         result, 
                         params['k_period'], 
                         params['d_period'], 
-                        params['slowing']
+                        params['slowing'],
+                        timeframe=timeframe
                     )
                 
                 elif indicator == 'adx' and 'adx' in self.indicator_params:
                     period = self.indicator_params['adx']['period']
-                    result = self._add_adx(result, period)
+                    result = self._add_adx(result, period, timeframe=timeframe)
             
             except Exception as e:
                 logger.error(f"Error calculating {indicator} for {timeframe}: {str(e)}")
@@ -337,13 +337,14 @@ class MultiTimeframeProcessor(DataProcessor):
         
         return result
     
-    def _add_rsi(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    def _add_rsi(self, df: pd.DataFrame, period: int = 14, timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Relative Strength Index (RSI) to DataFrame.
         
         Args:
             df: DataFrame with OHLCV data
             period: RSI period
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with RSI
@@ -351,34 +352,14 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['rsi'] = talib.RSI(result['close'], timeperiod=period)
-            else:
-                # Calculate price changes
-                delta = result['close'].diff()
-                
-                # Separate gains and losses
-                gain = delta.copy()
-                loss = delta.copy()
-                gain[gain < 0] = 0
-                loss[loss > 0] = 0
-                loss = abs(loss)
-                
-                # Calculate average gain and loss
-                avg_gain = gain.rolling(window=period).mean()
-                avg_loss = loss.rolling(window=period).mean()
-                
-                # Calculate RS and RSI
-                rs = avg_gain / avg_loss
-                result['rsi'] = 100 - (100 / (1 + rs))
+            result['rsi'] = self.indicator_engine.compute(result, 'rsi', timeframe=timeframe, period=period)
         except Exception as e:
             logger.error(f"Error calculating RSI: {str(e)}")
         
         return result
     
     def _add_macd(self, df: pd.DataFrame, fast_period: int = 12, slow_period: int = 26, 
-                signal_period: int = 9) -> pd.DataFrame:
+                signal_period: int = 9, timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Moving Average Convergence Divergence (MACD) to DataFrame.
         
@@ -387,6 +368,7 @@ class MultiTimeframeProcessor(DataProcessor):
             fast_period: Fast EMA period
             slow_period: Slow EMA period
             signal_period: Signal line period
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with MACD
@@ -394,33 +376,20 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['macd'], result['macd_signal'], result['macd_hist'] = talib.MACD(
-                    result['close'], 
-                    fastperiod=fast_period, 
-                    slowperiod=slow_period, 
-                    signalperiod=signal_period
-                )
-            else:
-                # Calculate EMAs
-                fast_ema = result['close'].ewm(span=fast_period, adjust=False).mean()
-                slow_ema = result['close'].ewm(span=slow_period, adjust=False).mean()
-                
-                # Calculate MACD line
-                result['macd'] = fast_ema - slow_ema
-                
-                # Calculate signal line
-                result['macd_signal'] = result['macd'].ewm(span=signal_period, adjust=False).mean()
-                
-                # Calculate histogram
-                result['macd_hist'] = result['macd'] - result['macd_signal']
+            macd = self.indicator_engine.compute(
+                result, 'macd', timeframe=timeframe,
+                fast_period=fast_period, slow_period=slow_period, signal_period=signal_period
+            )
+            result['macd'] = macd['macd']
+            result['macd_signal'] = macd['signal']
+            result['macd_hist'] = macd['hist']
         except Exception as e:
             logger.error(f"Error calculating MACD: {str(e)}")
         
         return result
     
-    def _add_bollinger_bands(self, df: pd.DataFrame, period: int = 20, std_dev: float = 2.0) -> pd.DataFrame:
+    def _add_bollinger_bands(self, df: pd.DataFrame, period: int = 20, std_dev: float = 2.0,
+                             timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Bollinger Bands to DataFrame.
         
@@ -428,6 +397,7 @@ class MultiTimeframeProcessor(DataProcessor):
             df: DataFrame with OHLCV data
             period: SMA period
             std_dev: Standard deviation multiplier
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with Bollinger Bands
@@ -435,39 +405,25 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['bb_upper'], result['bb_middle'], result['bb_lower'] = talib.BBANDS(
-                    result['close'], 
-                    timeperiod=period, 
-                    nbdevup=std_dev, 
-                    nbdevdn=std_dev
-                )
-            else:
-                # Calculate middle band (SMA)
-                result['bb_middle'] = result['close'].rolling(window=period).mean()
-                
-                # Calculate standard deviation
-                result['bb_std'] = result['close'].rolling(window=period).std()
-                
-                # Calculate upper and lower bands
-                result['bb_upper'] = result['bb_middle'] + (result['bb_std'] * std_dev)
-                result['bb_lower'] = result['bb_middle'] - (result['bb_std'] * std_dev)
-                
-                # Drop the std column
-                result.drop(columns=['bb_std'], inplace=True)
+            bands = self.indicator_engine.compute(
+                result, 'bollinger', timeframe=timeframe, period=period, num_std=std_dev
+            )
+            result['bb_middle'] = bands['middle']
+            result['bb_upper'] = bands['upper']
+            result['bb_lower'] = bands['lower']
         except Exception as e:
             logger.error(f"Error calculating Bollinger Bands: {str(e)}")
         
         return result
     
-    def _add_atr(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    def _add_atr(self, df: pd.DataFrame, period: int = 14, timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Average True Range (ATR) to DataFrame.
         
         Args:
             df: DataFrame with OHLCV data
             period: ATR period
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with ATR
@@ -475,41 +431,21 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['atr'] = talib.ATR(
-                    result['high'], 
-                    result['low'], 
-                    result['close'], 
-                    timeperiod=period
-                )
-            else:
-                # Calculate true range
-                result['tr'] = np.maximum(
-                    result['high'] - result['low'],
-                    np.maximum(
-                        abs(result['high'] - result['close'].shift(1)),
-                        abs(result['low'] - result['close'].shift(1))
-                    )
-                )
-                
-                # Calculate ATR
-                result['atr'] = result['tr'].rolling(window=period).mean()
-                
-                # Drop the TR column
-                result.drop(columns=['tr'], inplace=True)
+            result['atr'] = self.indicator_engine.compute(result, 'atr', timeframe=timeframe, period=period)
         except Exception as e:
             logger.error(f"Error calculating ATR: {str(e)}")
         
         return result
     
-    def _add_sma(self, df: pd.DataFrame, periods: List[int] = [10, 20, 50, 200]) -> pd.DataFrame:
+    def _add_sma(self, df: pd.DataFrame, periods: List[int] = [10, 20, 50, 200],
+                 timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Simple Moving Averages to DataFrame.
         
         Args:
             df: DataFrame with OHLCV data
             periods: List of SMA periods
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with SMAs
@@ -518,23 +454,23 @@ class MultiTimeframeProcessor(DataProcessor):
         
         for period in periods:
             try:
-                if self.talib_available:
-                    import talib
-                    result[f'sma_{period}'] = talib.SMA(result['close'], timeperiod=period)
-                else:
-                    result[f'sma_{period}'] = result['close'].rolling(window=period).mean()
+                result[f'sma_{period}'] = self.indicator_engine.compute(
+                    result, 'sma', timeframe=timeframe, period=period
+                )
             except Exception as e:
                 logger.error(f"Error calculating SMA_{period}: {str(e)}")
         
         return result
     
-    def _add_ema(self, df: pd.DataFrame, periods: List[int] = [9, 21, 55, 200]) -> pd.DataFrame:
+    def _add_ema(self, df: pd.DataFrame, periods: List[int] = [9, 21, 55, 200],
+                 timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Exponential Moving Averages to DataFrame.
         
         Args:
             df: DataFrame with OHLCV data
             periods: List of EMA periods
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with EMAs
@@ -543,18 +479,16 @@ class MultiTimeframeProcessor(DataProcessor):
         
         for period in periods:
             try:
-                if self.talib_available:
-                    import talib
-                    result[f'ema_{period}'] = talib.EMA(result['close'], timeperiod=period)
-                else:
-                    result[f'ema_{period}'] = result['close'].ewm(span=period, adjust=False).mean()
+                result[f'ema_{period}'] = self.indicator_engine.compute(
+                    result, 'ema', timeframe=timeframe, period=period
+                )
             except Exception as e:
                 logger.error(f"Error calculating EMA_{period}: {str(e)}")
         
         return result
     
     def _add_stochastic(self, df: pd.DataFrame, k_period: int = 14, d_period: int = 3, 
-                      slowing: int = 3) -> pd.DataFrame:
+                      slowing: int = 3, timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Stochastic Oscillator to DataFrame.
         
@@ -563,6 +497,7 @@ class MultiTimeframeProcessor(DataProcessor):
             k_period: %K period
             d_period: %D period
             slowing: Slowing period
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with Stochastic Oscillator
@@ -570,42 +505,25 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['stoch_k'], result['stoch_d'] = talib.STOCH(
-                    result['high'], 
-                    result['low'], 
-                    result['close'], 
-                    fastk_period=k_period, 
-                    slowk_period=slowing, 
-                    slowk_matype=0, 
-                    slowd_period=d_period, 
-                    slowd_matype=0
-                )
-            else:
-                # Calculate %K
-                result['stoch_k'] = 100 * ((result['close'] - result['low'].rolling(k_period).min()) / 
-                                         (result['high'].rolling(k_period).max() - 
-                                          result['low'].rolling(k_period).min()))
-                
-                # Apply slowing
-                if slowing > 1:
-                    result['stoch_k'] = result['stoch_k'].rolling(slowing).mean()
-                
-                # Calculate %D
-                result['stoch_d'] = result['stoch_k'].rolling(d_period).mean()
+            stoch = self.indicator_engine.compute(
+                result, 'stochastic', timeframe=timeframe,
+                k_period=k_period, d_period=d_period, slowing=slowing
+            )
+            result['stoch_k'] = stoch['k']
+            result['stoch_d'] = stoch['d']
         except Exception as e:
             logger.error(f"Error calculating Stochastic Oscillator: {str(e)}")
         
         return result
     
-    def _add_adx(self, df: pd.DataFrame, period: int = 14) -> pd.DataFrame:
+    def _add_adx(self, df: pd.DataFrame, period: int = 14, timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Add Average Directional Index (ADX) to DataFrame.
         
         Args:
             df: DataFrame with OHLCV data
             period: ADX period
+            timeframe: Timeframe identifier (indicator cache namespace)
             
         Returns:
             DataFrame with ADX
@@ -613,72 +531,11 @@ class MultiTimeframeProcessor(DataProcessor):
         result = df.copy()
         
         try:
-            if self.talib_available:
-                import talib
-                result['adx'] = talib.ADX(
-                    result['high'], 
-                    result['low'], 
-                    result['close'], 
-                    timeperiod=period
-                )
-                result['plus_di'] = talib.PLUS_DI(
-                    result['high'], 
-                    result['low'], 
-                    result['close'], 
-                    timeperiod=period
-                )
-                result['minus_di'] = talib.MINUS_DI(
-                    result['high'], 
-                    result['low'], 
-                    result['close'], 
-                    timeperiod=period
-                )
-            else:
-                # This is a simplified implementation
-                # Calculate True Range
-                result['tr'] = np.maximum(
-                    result['high'] - result['low'],
-                    np.maximum(
-                        abs(result['high'] - result['close'].shift(1)),
-                        abs(result['low'] - result['close'].shift(1))
-                    )
-                )
-                
-                # Calculate Directional Movement
-                result['up_move'] = result['high'] - result['high'].shift(1)
-                result['down_move'] = result['low'].shift(1) - result['low']
-                
-                # Calculate +DM and -DM
-                result['plus_dm'] = np.where(
-                    (result['up_move'] > result['down_move']) & (result['up_move'] > 0),
-                    result['up_move'],
-                    0
-                )
-                result['minus_dm'] = np.where(
-                    (result['down_move'] > result['up_move']) & (result['down_move'] > 0),
-                    result['down_move'],
-                    0
-                )
-                
-                # Calculate smoothed TR, +DM, and -DM
-                result['atr'] = result['tr'].rolling(window=period).mean()
-                result['plus_dm_smooth'] = result['plus_dm'].rolling(window=period).mean()
-                result['minus_dm_smooth'] = result['minus_dm'].rolling(window=period).mean()
-                
-                # Calculate +DI and -DI
-                result['plus_di'] = 100 * result['plus_dm_smooth'] / result['atr']
-                result['minus_di'] = 100 * result['minus_dm_smooth'] / result['atr']
-                
-                # Calculate DX
-                result['dx'] = 100 * abs(result['plus_di'] - result['minus_di']) / \
-                             (result['plus_di'] + result['minus_di'])
-                
-                # Calculate ADX
-                result['adx'] = result['dx'].rolling(window=period).mean()
-                
-                # Drop intermediate columns
-                result.drop(columns=['tr', 'up_move', 'down_move', 'plus_dm', 'minus_dm',
-                                   'plus_dm_smooth', 'minus_dm_smooth', 'dx'], inplace=True)
+            adx = self.indicator_engine.compute(result, 'adx', timeframe=timeframe, period=period)
+            result['atr'] = adx['atr']
+            result['plus_di'] = adx['plus_di']
+            result['minus_di'] = adx['minus_di']
+            result['adx'] = adx['adx']
         except Exception as e:
             logger.error(f"Error calculating ADX: {str(e)}")
         
@@ -18,12 +18,13 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Callable, Optional, Union, Tuple
 from datetime import datetime, timedelta
 import websocket
-import requests
-from urllib.parse import urlencode
 
 # Import local modules
 from trading_bot.optimization.advanced_market_regime_detector import AdvancedMarketRegimeDetector
 from trading_bot.optimization.strategy_regime_rotator import StrategyRegimeRotator
+from trading_bot.data.bar_aggregator import BarAggregator, TimeframeBarsView
+from trading_bot.brokers.http_transport import HttpTransport, RateLimitExceeded, shared_rate_limiter
+from trading_bot.event_system.latency_tracer import get_latency_tracer
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -84,12 +85,18 @@ class MarketDataSource(ABC):
         """
         self.last_update_time = datetime.now()
         
-        # Call all registered callbacks with the data
-        for callback in self.callbacks:
-            try:
-                callback(data)
-            except Exception as e:
-                self.logger.error(f"Error in callback: {str(e)}")
+        # Sampled ticks carry a latency trace through the callbacks' call stack
+        tracer = get_latency_tracer()
+        token = tracer.activate(tracer.start_trace("tick_received"))
+        try:
+            # Call all registered callbacks with the data
+            for callback in self.callbacks:
+                try:
+                    callback(data)
+                except Exception as e:
+                    self.logger.error(f"Error in callback: {str(e)}")
+        finally:
+            tracer.deactivate(token)
     
     @abstractmethod
     def connect(self) -> bool:
@@ -204,6 +211,20 @@ class AlpacaDataSource(MarketDataSource):
         self.ws = None
         self.ws_thread = None
         self.ws_connected = False
+        
+        # Pooled REST connections; the rate limit budget is shared by all clients using this key,
+        # at the strictest limit any of them registers
+        self.rest_transport = HttpTransport(
+            base_url=self.config.get('rest_data_url', 'https://data.alpaca.markets/v2'),
+            headers={
+                'APCA-API-KEY-ID': self.api_key,
+                'APCA-API-SECRET-KEY': self.api_secret
+            },
+            rate_limiter=shared_rate_limiter(
+                self.api_key, self.config.get('max_requests_per_minute', 200) / 60.0, 10
+            ),
+            timeout=self.config.get('timeout', 15)
+        )
     
     def connect(self) -> bool:
         """
@@ -322,14 +343,6 @@ class AlpacaDataSource(MarketDataSource):
         Returns:
             Dict mapping symbol to DataFrame of OHLCV data
         """
-        headers = {
-            'APCA-API-KEY-ID': self.api_key,
-            'APCA-API-SECRET-KEY': self.api_secret
-        }
-        
-        # Use Alpaca V2 bars API
-        base_url = 'https://data.alpaca.markets/v2'
-        
         results = {}
         
         for symbol in self.symbols:
@@ -340,10 +353,9 @@ class AlpacaDataSource(MarketDataSource):
                 'adjustment': 'raw'
             }
             
-            url = f"{base_url}/stocks/bars?{urlencode(params)}"
-            
             try:
-                response = requests.get(url, headers=headers)
+                # Alpaca V2 bars API
+                response = self.rest_transport.get('/stocks/bars', params=params)
                 response.raise_for_status()
                 
                 data = response.json()
@@ -368,6 +380,10 @@ class AlpacaDataSource(MarketDataSource):
                     df.set_index('timestamp', inplace=True)
                     
                     results[symbol] = df
+            except RateLimitExceeded as e:
+                # The remaining symbols are fetched on the next call
+                self.logger.warning(f"Stopped fetching bars at {symbol}: {str(e)}")
+                break
             except Exception as e:
                 self.logger.error(f"Error fetching bars for {symbol}: {str(e)}")
         
@@ -523,24 +539,26 @@ class DataProcessor:
     Processes incoming market data streams and maintains up-to-date OHLCV bars.
     
     This class converts streaming tick data into OHLCV bars and provides methods
-    to access the latest market data for analysis and trading decisions.
+    to access the latest market data for analysis and trading decisions. Bars are
+    aggregated in NumPy arrays by a BarAggregator; DataFrames are only built when
+    bars are requested or passed to callbacks.
     """
     
-    def __init__(self, timeframes: List[str] = ['1min', '5min', '15min', '1hour', '1day']):
+    def __init__(self, timeframes: List[str] = ['1min', '5min', '15min', '1hour', '1day'],
+                 max_bars: int = 5000):
         """
         Initialize the data processor.
         
         Args:
             timeframes: List of timeframes to maintain bars for
+            max_bars: Maximum number of bars retained per symbol and timeframe
         """
         self.timeframes = timeframes
         self.latest_ticks = {}
-        self.bars = {tf: {} for tf in timeframes}
+        self.aggregator = BarAggregator(timeframes, max_bars=max_bars)
+        self.bars = {tf: TimeframeBarsView(self.aggregator, tf) for tf in timeframes}
         self.callbacks = []
         
-        # Lock for thread safety
-        self.data_lock = threading.RLock()
-        
         # Set up logging
         self.logger = logging.getLogger(f"{__name__}.DataProcessor")
     
@@ -586,20 +604,25 @@ class DataProcessor:
         if isinstance(timestamp, str):
             timestamp = pd.to_datetime(timestamp)
         
-        with self.data_lock:
-            # Update latest tick for this symbol
-            self.latest_ticks[symbol] = {
-                'timestamp': timestamp,
-                'price': price,
-                'volume': data.get('volume', 0),
-                'bid': data.get('bid', price),
-                'ask': data.get('ask', price),
-                'trade_id': data.get('trade_id', None)
-            }
-            
-            # Update bars for each timeframe
-            for timeframe in self.timeframes:
-                self._update_bars(symbol, timeframe, timestamp, price, data.get('volume', 0))
+        volume = data.get('volume', 0)
+        
+        # Update latest tick for this symbol
+        self.latest_ticks[symbol] = {
+            'timestamp': timestamp,
+            'price': price,
+            'volume': volume,
+            'bid': data.get('bid', price),
+            'ask': data.get('ask', price),
+            'trade_id': data.get('trade_id', None)
+        }
+        
+        # Update bars for each timeframe
+        new_bars = self.aggregator.update(symbol, timestamp, price, volume)
+        if new_bars:
+            tracer = get_latency_tracer()
+            tracer.mark(tracer.current(), "bar_emitted")
+        if new_bars and self.callbacks:
+            self._notify_new_bars(symbol, new_bars)
     
     def _update_bars(self, symbol: str, timeframe: str, timestamp: datetime, 
                    price: float, volume: int) -> None:
@@ -613,42 +636,28 @@ class DataProcessor:
             price: Tick price
             volume: Tick volume
         """
-        # Get bar timestamp (floor to timeframe)
-        bar_timestamp = self._floor_timestamp(timestamp, timeframe)
-        
-        # Initialize symbol dict if needed
-        if symbol not in self.bars[timeframe]:
-            self.bars[timeframe][symbol] = pd.DataFrame(
-                columns=['open', 'high', 'low', 'close', 'volume']
-            )
+        new_bars = self.aggregator.update(symbol, timestamp, price, volume, timeframes=[timeframe])
+        if new_bars and self.callbacks:
+            self._notify_new_bars(symbol, new_bars)
+    
+    def _notify_new_bars(self, symbol: str, timeframes: List[str]) -> None:
+        """
+        Call registered callbacks for newly created bars.
         
-        # Get current bars for this symbol and timeframe
-        df = self.bars[timeframe][symbol]
+        Callbacks run outside the aggregator's locks, so a slow callback does
+        not block tick processing for other threads.
         
-        # Check if we need to create a new bar
-        if bar_timestamp not in df.index:
-            # Add new bar
-            new_bar = pd.DataFrame(
-                [[price, price, price, price, volume]],
-                index=[bar_timestamp],
-                columns=['open', 'high', 'low', 'close', 'volume']
-            )
-            
-            # Append to existing bars
-            self.bars[timeframe][symbol] = pd.concat([df, new_bar]).sort_index()
-            
-            # Call callbacks
+        Args:
+            symbol: Trading symbol
+            timeframes: Timeframes in which a new bar was created
+        """
+        for timeframe in timeframes:
+            bars = self.aggregator.get_bars(symbol, timeframe)
             for callback in self.callbacks:
                 try:
-                    callback(timeframe, symbol, self.bars[timeframe][symbol])
+                    callback(timeframe, symbol, bars)
                 except Exception as e:
                     self.logger.error(f"Error in callback: {str(e)}")
-        else:
-            # Update existing bar
-            df.at[bar_timestamp, 'high'] = max(df.at[bar_timestamp, 'high'], price)
-            df.at[bar_timestamp, 'low'] = min(df.at[bar_timestamp, 'low'], price)
-            df.at[bar_timestamp, 'close'] = price
-            df.at[bar_timestamp, 'volume'] += volume
     
     def _floor_timestamp(self, timestamp: datetime, timeframe: str) -> datetime:
         """
@@ -692,15 +701,7 @@ class DataProcessor:
         Returns:
             DataFrame: OHLCV bars
         """
-        with self.data_lock:
-            if timeframe not in self.bars:
-                return pd.DataFrame()
-            
-            if symbol not in self.bars[timeframe]:
-                return pd.DataFrame()
-            
-            # Return the latest N bars
-            return self.bars[timeframe][symbol].tail(n_bars)
+        return self.aggregator.get_bars(symbol, timeframe, n_bars)
     
     def get_latest_tick(self, symbol: str) -> Dict[str, Any]:
         """
@@ -712,8 +713,7 @@ class DataProcessor:
         Returns:
             Dict: Latest tick data
         """
-        with self.data_lock:
-            return self.latest_ticks.get(symbol, {})
+        return self.latest_ticks.get(symbol, {})
 
 
 class RealTimeDataManager:
@@ -773,8 +773,8 @@ class RealTimeDataManager:
                     max_allocation_change=self.config.get('max_allocation_change', 0.2)
                 )
         
-        # Market data cache
-        self.market_data_cache = {symbol: None for symbol in symbols}
+        # Market data cache: latest 1-day bars per symbol, built on access
+        self.market_data_cache = TimeframeBarsView(self.data_processor.aggregator, '1day', n_bars=100)
         
         # Current market regime
         self.current_regime = "unknown"
@@ -815,17 +815,9 @@ class RealTimeDataManager:
         Args:
             data: Market data dictionary
         """
-        # Process the tick data
+        # Process the tick data (market_data_cache reads the updated bars lazily)
         self.data_processor.process_tick(data)
         
-        # Update OHLCV cache for the symbol
-        symbol = data.get('symbol')
-        if symbol and symbol in self.symbols:
-            # Get latest 1-day bar data for this symbol
-            bars = self.data_processor.get_latest_bars(symbol, '1day', 100)
-            if not bars.empty:
-                self.market_data_cache[symbol] = bars
-        
         # Once per minute (to reduce computational load), update market regime
         timestamp = data.get('timestamp')
         if timestamp and self.market_regime_detector and timestamp.second == 0:
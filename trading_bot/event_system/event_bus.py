@@ -11,6 +11,9 @@ import logging
 import asyncio
 import threading
 import queue
+import heapq
+import itertools
+from bisect import bisect_left
 from typing import Dict, List, Any, Callable, Set, Optional, Union, Tuple
 from datetime import datetime
 import time
@@ -23,6 +26,83 @@ from trading_bot.event_system.event_types import Event, EventType
 # Set up logging
 logger = logging.getLogger("EventBus")
 
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+    
+    Recording is a bisect and an increment, cheap enough to run on every
+    event. Percentiles are reported as the upper bound of the bucket they
+    fall in.
+    """
+    
+    # Bucket upper bounds in microseconds (last bucket is unbounded)
+    BUCKET_BOUNDS_US = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000,
+                        10000, 20000, 50000, 100000, 200000, 500000, 1000000)
+    
+    _BUCKET_BOUNDS_S = tuple(bound / 1e6 for bound in BUCKET_BOUNDS_US)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        """
+        Record a latency sample
+        
+        Args:
+            seconds: Latency in seconds
+        """
+        self.counts[bisect_left(self._BUCKET_BOUNDS_S, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, pct: float) -> float:
+        """
+        Get a latency percentile
+        
+        Args:
+            pct: Percentile (0-100)
+            
+        Returns:
+            Bucket upper bound in milliseconds (max observed for the last bucket)
+        """
+        if self.count == 0:
+            return 0.0
+        
+        target = pct / 100.0 * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target and bucket_count:
+                if i < len(self.BUCKET_BOUNDS_US):
+                    return min(self.BUCKET_BOUNDS_US[i] / 1000.0, self.max * 1000)
+                break
+        return self.max * 1000
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary with non-empty buckets keyed by their upper bound"""
+        buckets = {}
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count:
+                label = f"<={self.BUCKET_BOUNDS_US[i]}us" if i < len(self.BUCKET_BOUNDS_US) else \
+                    f">{self.BUCKET_BOUNDS_US[-1]}us"
+                buckets[label] = bucket_count
+        
+        return {
+            "count": self.count,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max * 1000,
+            "buckets": buckets
+        }
+
 class EventHandler:
     """
     Handler for a specific event type with filtering capabilities.
@@ -38,7 +118,8 @@ class EventHandler:
         metadata_filter: Optional[Dict[str, Any]] = None,
         priority: int = 0,
         async_handler: bool = False,
-        name: Optional[str] = None
+        name: Optional[str] = None,
+        inline: bool = False
     ):
         """
         Initialize event handler
@@ -52,6 +133,8 @@ class EventHandler:
             priority: Handler priority (higher runs first)
             async_handler: Whether handler is asynchronous
             name: Handler name for identification
+            inline: Run directly on the dispatching worker thread instead of
+                the thread pool (for cheap, non-blocking handlers)
         """
         self.callback = callback
         self.name = name or callback.__name__
@@ -75,11 +158,20 @@ class EventHandler:
         self.metadata_filter = metadata_filter
         self.priority = priority
         self.async_handler = async_handler
+        self.inline = inline and not async_handler
+        
+        # Whether anything beyond the event type needs checking
+        self.has_filters = (
+            self.source_filters is not None or
+            self.symbol_filters is not None or
+            self.metadata_filter is not None
+        )
         
         # Statistics
         self.events_processed = 0
         self.last_event_time = None
         self.total_processing_time = 0
+        self.latency = LatencyHistogram()
         
     def matches(self, event: Event) -> bool:
         """
@@ -95,6 +187,21 @@ class EventHandler:
         if self.event_types is not None and event.event_type not in self.event_types:
             return False
         
+        return self.matches_filters(event)
+    
+    def matches_filters(self, event: Event) -> bool:
+        """
+        Check source, symbol and metadata filters (not the event type)
+        
+        Args:
+            event: Event to check
+            
+        Returns:
+            True if event matches, False otherwise
+        """
+        if not self.has_filters:
+            return True
+        
         # Check source
         if self.source_filters is not None and event.source not in self.source_filters:
             return False
@@ -120,15 +227,17 @@ class EventHandler:
         Args:
             event: Event to handle
         """
-        start_time = time.time()
+        start_time = time.perf_counter()
         
         try:
             self.callback(event)
             
             # Update statistics
+            elapsed = time.perf_counter() - start_time
             self.events_processed += 1
             self.last_event_time = datetime.now()
-            self.total_processing_time += (time.time() - start_time)
+            self.total_processing_time += elapsed
+            self.latency.record(elapsed)
             
             # Mark as processed
             if self.name not in event.processed_by:
@@ -138,28 +247,32 @@ class EventHandler:
             logger.error(f"Error in event handler {self.name}: {e}")
             logger.error(traceback.format_exc())
             
-    async def handle_async(self, event: Event) -> None:
+    async def handle_async(self, event: Event,
+                           executor: Optional[concurrent.futures.Executor] = None) -> None:
         """
         Handle event asynchronously
         
         Args:
             event: Event to handle
+            executor: Executor for synchronous handlers (loop default if None)
         """
         if not self.async_handler:
             # Run synchronous handler in executor
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, lambda: self.handle(event))
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(executor, self.handle, event)
         else:
             # Run directly if handler is already asynchronous
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             try:
                 await self.callback(event)
                 
                 # Update statistics
+                elapsed = time.perf_counter() - start_time
                 self.events_processed += 1
                 self.last_event_time = datetime.now()
-                self.total_processing_time += (time.time() - start_time)
+                self.total_processing_time += elapsed
+                self.latency.record(elapsed)
                 
                 # Mark as processed
                 if self.name not in event.processed_by:
@@ -177,24 +290,35 @@ class EventBus:
     filtering capabilities.
     """
     
-    def __init__(self, max_queue_size: int = 1000, worker_threads: int = 4):
+    def __init__(self, max_queue_size: int = 1000, worker_threads: int = 4, batch_size: int = 256):
         """
         Initialize the event bus
         
         Args:
             max_queue_size: Maximum number of events in queue before blocking
             worker_threads: Number of worker threads for event processing
+            batch_size: Maximum number of events a worker drains from the queue at once
         """
+        # Handlers sorted by priority. The list and the per-type dispatch table
+        # are replaced (never mutated) on registration changes, so the dispatch
+        # path reads them without locking.
         self.handlers: List[EventHandler] = []
+        self._dispatch_table: Dict[EventType, Tuple[EventHandler, ...]] = {}
+        self._registry_lock = threading.Lock()
+        
         self.event_queue = queue.PriorityQueue(maxsize=max_queue_size)
+        self._sequence = itertools.count()
         self.worker_threads = worker_threads
+        self.batch_size = max(1, batch_size)
         self.running = False
         self.workers: List[threading.Thread] = []
         
-        # Async event loop
+        # Async event loop (queue and tasks are bound to the loop in start_async)
+        self.max_queue_size = max_queue_size
         self.async_mode = False
-        self.async_queue = asyncio.Queue(maxsize=max_queue_size)
-        self.async_task = None
+        self.async_queue: Optional[asyncio.Queue] = None
+        self.async_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Thread pool for concurrent dispatch
         self.thread_pool = concurrent.futures.ThreadPoolExecutor(
@@ -216,9 +340,10 @@ class EventBus:
         Args:
             handler: Handler to register
         """
-        self.handlers.append(handler)
-        # Sort handlers by priority (highest first)
-        self.handlers.sort(key=lambda h: h.priority, reverse=True)
+        with self._registry_lock:
+            # Sort handlers by priority (highest first)
+            self.handlers = sorted(self.handlers + [handler], key=lambda h: h.priority, reverse=True)
+            self._dispatch_table = {}
         logger.debug(f"Registered handler: {handler.name} with priority {handler.priority}")
         
     def unregister_handler(self, handler_name: str) -> bool:
@@ -231,11 +356,13 @@ class EventBus:
         Returns:
             True if handler was unregistered, False if not found
         """
-        for i, handler in enumerate(self.handlers):
-            if handler.name == handler_name:
-                self.handlers.pop(i)
-                logger.debug(f"Unregistered handler: {handler_name}")
-                return True
+        with self._registry_lock:
+            for i, handler in enumerate(self.handlers):
+                if handler.name == handler_name:
+                    self.handlers = self.handlers[:i] + self.handlers[i + 1:]
+                    self._dispatch_table = {}
+                    logger.debug(f"Unregistered handler: {handler_name}")
+                    return True
         
         logger.warning(f"Handler not found: {handler_name}")
         return False
@@ -254,15 +381,49 @@ class EventBus:
         """
         # Add event to queue
         try:
-            # Use negative priority as lower number means higher priority in queue
+            # Use negative priority as lower number means higher priority in queue;
+            # the sequence number keeps FIFO order within a priority
             priority = -event.priority  
-            self.event_queue.put((priority, event), block=block, timeout=timeout)
+            self.event_queue.put((priority, next(self._sequence), event), block=block, timeout=timeout)
             self.events_published += 1
             return True
         except queue.Full:
             logger.warning(f"Event queue full, could not publish event: {event}")
             return False
     
+    def publish_batch(self, events: List[Event], block: bool = True, timeout: Optional[float] = None) -> int:
+        """
+        Publish several events with a single queue lock acquisition
+        
+        Events that do not fit in the queue are published one at a time
+        with the given blocking behaviour.
+        
+        Args:
+            events: Events to publish
+            block: Whether to block if queue is full
+            timeout: Timeout in seconds if blocking
+            
+        Returns:
+            Number of events published
+        """
+        q = self.event_queue
+        with q.not_full:
+            count = len(events)
+            if q.maxsize > 0:
+                count = max(0, min(count, q.maxsize - len(q.queue)))
+            for event in events[:count]:
+                heapq.heappush(q.queue, (-event.priority, next(self._sequence), event))
+            q.unfinished_tasks += count
+            q.not_empty.notify(count)
+        self.events_published += count
+        
+        published = count
+        for event in events[count:]:
+            if not self.publish(event, block=block, timeout=timeout):
+                break
+            published += 1
+        return published
+    
     def start(self) -> None:
         """Start event processing workers"""
         if self.running:
@@ -304,18 +465,23 @@ class EventBus:
         
         while self.running:
             try:
-                # Get event from queue (with timeout to check running flag)
-                try:
-                    _, event = self.event_queue.get(timeout=0.1)
-                except queue.Empty:
+                # Get events from queue (with timeout to check running flag)
+                batch = self._get_batch(timeout=0.1)
+                if not batch:
                     continue
-                    
-                # Process event
-                self._process_event(event)
                 
-                # Mark as done
-                self.event_queue.task_done()
-                self.events_processed += 1
+                try:
+                    for _, _, event in batch:
+                        try:
+                            self._process_event(event)
+                        except Exception as e:
+                            logger.error(f"Error processing event {event}: {e}")
+                            logger.error(traceback.format_exc())
+                finally:
+                    # Mark as done
+                    self._task_done(len(batch))
+                
+                self.events_processed += len(batch)
                 
             except Exception as e:
                 logger.error(f"Error in event worker: {e}")
@@ -323,84 +489,278 @@ class EventBus:
                 
         logger.debug(f"Event worker stopped: {threading.current_thread().name}")
     
+    def _get_batch(self, timeout: float) -> List[Tuple[int, int, Event]]:
+        """
+        Take up to ``batch_size`` queued events in priority order
+        
+        Waits up to ``timeout`` seconds for the first event, then drains
+        whatever else is queued under a single lock acquisition.
+        
+        Args:
+            timeout: Seconds to wait for the first event
+            
+        Returns:
+            List of (priority, sequence, event) entries (empty on timeout)
+        """
+        q = self.event_queue
+        with q.not_empty:
+            if not q.queue:
+                q.not_empty.wait(timeout)
+                if not q.queue:
+                    return []
+            
+            count = min(self.batch_size, len(q.queue))
+            batch = [heapq.heappop(q.queue) for _ in range(count)]
+            q.not_full.notify(count)
+        
+        return batch
+    
+    def _task_done(self, count: int) -> None:
+        """
+        Mark several queued events as done (``Queue.task_done`` for a batch)
+        
+        Args:
+            count: Number of events processed
+        """
+        q = self.event_queue
+        with q.all_tasks_done:
+            unfinished = q.unfinished_tasks - count
+            if unfinished < 0:
+                raise ValueError("task_done() called too many times")
+            if unfinished == 0:
+                q.all_tasks_done.notify_all()
+            q.unfinished_tasks = unfinished
+    
+    def _handlers_for(self, event_type: EventType) -> Tuple[EventHandler, ...]:
+        """
+        Get the handlers registered for an event type, in priority order
+        
+        Args:
+            event_type: Event type
+            
+        Returns:
+            Handlers for the type plus handlers for all types
+        """
+        table = self._dispatch_table
+        handlers = table.get(event_type)
+        if handlers is None:
+            handlers = tuple(
+                h for h in self.handlers
+                if h.event_types is None or event_type in h.event_types
+            )
+            table[event_type] = handlers
+        return handlers
+    
     def _process_event(self, event: Event) -> None:
         """
         Process event by dispatching to matching handlers
         
+        Inline handlers run on the calling thread. Other handlers run on the
+        thread pool, except when only one matches, which is run directly since
+        the caller would only block waiting for it.
+        
         Args:
             event: Event to process
         """
-        matching_handlers = [h for h in self.handlers if h.matches(event)]
-        
-        if not matching_handlers:
+        matching_handlers = []
+        async_handlers = []
+        pooled_count = 0
+        for handler in self._handlers_for(event.event_type):
+            if handler.matches_filters(event):
+                if handler.async_handler:
+                    async_handlers.append(handler)
+                else:
+                    matching_handlers.append(handler)
+                    if not handler.inline:
+                        pooled_count += 1
+        
+        if not matching_handlers and not async_handlers:
             logger.debug(f"No handlers for event: {event}")
             return
-            
-        # Process with matching handlers
-        futures = []
-        for handler in matching_handlers:
-            future = self.thread_pool.submit(handler.handle, event)
-            futures.append(future)
-            
+        
+        # Coroutine handlers run on the async event loop
+        futures = self._schedule_on_loop(async_handlers, event) if async_handlers else []
+        
+        if pooled_count <= 1:
+            for handler in matching_handlers:
+                handler.handle(event)
+        else:
+            # Process with matching handlers
+            futures.extend(
+                self.thread_pool.submit(handler.handle, event)
+                for handler in matching_handlers if not handler.inline
+            )
+            for handler in matching_handlers:
+                if handler.inline:
+                    handler.handle(event)
+        
         # Wait for all handlers to complete
-        concurrent.futures.wait(futures)
+        if futures:
+            concurrent.futures.wait(futures)
+    
+    def _schedule_on_loop(self, handlers: List[EventHandler], event: Event) -> List[concurrent.futures.Future]:
+        """
+        Schedule coroutine handlers on the async event loop from a worker thread
+        
+        Args:
+            handlers: Coroutine handlers
+            event: Event to handle
+            
+        Returns:
+            Futures for the scheduled handlers
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"Async mode not running, skipping async handlers for event: {event}")
+            return []
+        return [asyncio.run_coroutine_threadsafe(handler.handle_async(event), loop) for handler in handlers]
         
     # Async API for EventBus
     
-    async def publish_async(self, event: Event) -> bool:
+    async def start_async(self, workers: int = 1) -> None:
+        """
+        Start async event processing on the running event loop
+        
+        The async queue is created here, bound to the running loop and sized
+        by max_queue_size, so publish_async waits when consumers fall behind.
+        
+        Args:
+            workers: Number of concurrent processor tasks (1 keeps events in order)
+        """
+        if self.async_mode:
+            logger.warning("EventBus async mode already running")
+            return
+            
+        self._loop = asyncio.get_running_loop()
+        self.async_queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.async_tasks = [
+            self._loop.create_task(self._async_event_processor()) for _ in range(max(1, workers))
+        ]
+        self.async_mode = True
+        logger.info(f"Started async event processing with {len(self.async_tasks)} tasks")
+    
+    async def stop_async(self, drain: bool = True) -> None:
+        """
+        Stop async event processing
+        
+        Args:
+            drain: Wait for queued events to be processed first
+        """
+        if not self.async_mode:
+            return
+            
+        if drain:
+            await self.async_queue.join()
+            
+        for task in self.async_tasks:
+            task.cancel()
+        await asyncio.gather(*self.async_tasks, return_exceptions=True)
+        
+        self.async_tasks = []
+        self.async_mode = False
+        self._loop = None
+        logger.info("Stopped async event processing")
+    
+    async def publish_async(self, event: Event, timeout: Optional[float] = None) -> bool:
         """
         Publish event to the async event queue
         
+        Starts async processing on the running loop if needed. Waits while
+        the queue is full.
+        
         Args:
             event: Event to publish
+            timeout: Maximum seconds to wait for queue space (None waits indefinitely)
             
         Returns:
-            True if event was published
+            True if event was published, False on timeout
         """
         if not self.async_mode:
-            self.async_mode = True
-            self._start_async_task()
+            await self.start_async()
+        
+        try:
+            if timeout is None:
+                await self.async_queue.put(event)
+            else:
+                await asyncio.wait_for(self.async_queue.put(event), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Async event queue full, could not publish event: {event}")
+            return False
             
-        await self.async_queue.put(event)
         self.events_published += 1
         return True
     
-    def _start_async_task(self) -> None:
-        """Start the async event processing task"""
-        if self.async_task is None:
-            loop = asyncio.get_event_loop()
-            self.async_task = loop.create_task(self._async_event_processor())
-            logger.info("Started async event processor")
+    def publish_threadsafe(self, event: Event, timeout: Optional[float] = None) -> bool:
+        """
+        Publish event to the async event queue from another thread
+        
+        Blocks the calling thread while the queue is full. Must not be called
+        from the event loop thread (use publish_async there).
+        
+        Args:
+            event: Event to publish
+            timeout: Maximum seconds to wait for queue space (None waits indefinitely)
+            
+        Returns:
+            True if event was published, False on timeout or if async mode is not running
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"Async mode not running, could not publish event: {event}")
+            return False
+            
+        future = asyncio.run_coroutine_threadsafe(self.publish_async(event, timeout), loop)
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error publishing event to async queue: {e}")
+            return False
     
     async def _async_event_processor(self) -> None:
         """Async task for processing events"""
         logger.debug("Async event processor started")
         
         while True:
+            # Get event from queue
+            event = await self.async_queue.get()
+            
             try:
-                # Get event from queue
-                event = await self.async_queue.get()
-                
-                # Process event
-                matching_handlers = [h for h in self.handlers if h.matches(event)]
-                
-                if matching_handlers:
-                    # Process with matching handlers
-                    tasks = []
-                    for handler in matching_handlers:
-                        task = asyncio.create_task(handler.handle_async(event))
-                        tasks.append(task)
-                        
-                    # Wait for all handlers to complete
-                    await asyncio.gather(*tasks)
-                
-                # Mark as done
-                self.async_queue.task_done()
-                self.events_processed += 1
-                
+                await self._process_event_async(event)
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Error in async event processor: {e}")
                 logger.error(traceback.format_exc())
+            finally:
+                # Mark as done
+                self.async_queue.task_done()
+                self.events_processed += 1
+    
+    async def _process_event_async(self, event: Event) -> None:
+        """
+        Process event on the event loop
+        
+        Coroutine handlers are awaited concurrently, inline handlers run on
+        the loop and other synchronous handlers run on the bounded thread pool.
+        
+        Args:
+            event: Event to process
+        """
+        awaitables = []
+        for handler in self._handlers_for(event.event_type):
+            if not handler.matches_filters(event):
+                continue
+            if handler.async_handler:
+                awaitables.append(handler.handle_async(event))
+            elif handler.inline:
+                handler.handle(event)
+            else:
+                awaitables.append(self._loop.run_in_executor(self.thread_pool, handler.handle, event))
+        
+        if len(awaitables) == 1:
+            await awaitables[0]
+        elif awaitables:
+            await asyncio.gather(*awaitables)
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get event bus performance metrics"""
@@ -412,6 +772,7 @@ class EventBus:
             "events_processed": self.events_processed,
             "events_per_second": self.events_processed / uptime_seconds if uptime_seconds > 0 else 0,
             "queue_size": self.event_queue.qsize(),
+            "async_queue_size": self.async_queue.qsize() if self.async_queue is not None else 0,
             "handler_count": len(self.handlers),
             "uptime_seconds": uptime_seconds,
             "handlers": []
@@ -425,7 +786,9 @@ class EventBus:
                 "name": handler.name,
                 "events_processed": handler.events_processed,
                 "avg_processing_time_ms": avg_time * 1000,
-                "priority": handler.priority
+                "priority": handler.priority,
+                "inline": handler.inline,
+                "latency": handler.latency.to_dict()
             })
             
         return metrics
@@ -18,6 +18,7 @@ import queue
 import uuid
 
 from trading_bot.event_system.event_bus import EventBus, EventHandler
+from trading_bot.event_system.latency_tracer import TRACE_KEY, get_latency_tracer
 from trading_bot.event_system.event_types import (
     Event, EventType, MarketDataEvent, SignalEvent, 
     OrderEvent, RiskEvent, AnalysisEvent
@@ -53,6 +54,11 @@ class EventManager:
             worker_threads=worker_threads
         )
         
+        # Sampled tick-to-order latency tracing (shared with the data layer)
+        self.latency_tracer = get_latency_tracer()
+        if "latency_sample_rate" in self.config:
+            self.latency_tracer.set_sample_rate(self.config["latency_sample_rate"])
+        
         # Components
         self.strategies: Dict[str, Strategy] = {}
         self.trading_mode: Optional[BaseTradingMode] = None
@@ -217,6 +223,12 @@ class EventManager:
         Returns:
             True if event was published
         """
+        metadata = metadata or {}
+        trace = metadata.get(TRACE_KEY) or self.latency_tracer.current_or_start("market_data_published")
+        if trace is not None:
+            metadata = dict(metadata, **{TRACE_KEY: trace})
+            self.latency_tracer.mark(trace, "market_data_published")
+        
         event = MarketDataEvent(
             symbol=symbol,
             data=data,
@@ -251,6 +263,9 @@ class EventManager:
         Returns:
             True if event was published
         """
+        if metadata:
+            self.latency_tracer.mark(metadata.get(TRACE_KEY), "signal_published")
+        
         event = SignalEvent(
             symbol=symbol,
             signal_type=signal_type,
@@ -292,6 +307,9 @@ class EventManager:
         Returns:
             True if event was published
         """
+        if metadata:
+            self.latency_tracer.mark(metadata.get(TRACE_KEY), "order_published")
+        
         event = OrderEvent(
             order_id=order_id,
             symbol=symbol,
@@ -306,6 +324,21 @@ class EventManager:
         )
         return self.publish_event(event)
     
+    def _with_trace(self, metadata: Dict[str, Any], trace: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Attach a copy of a latency trace to a derived event's metadata
+        
+        Args:
+            metadata: Metadata of the event being published
+            trace: Trace of the event it was derived from (or None)
+            
+        Returns:
+            Metadata
+        """
+        if trace is not None:
+            metadata[TRACE_KEY] = self.latency_tracer.fork(trace)
+        return metadata
+    
     def _processing_loop(self) -> None:
         """Main processing loop for periodic tasks"""
         logger.debug("Processing loop started")
@@ -432,11 +465,15 @@ class EventManager:
             if not symbol:
                 return
                 
+            trace = event.metadata.get(TRACE_KEY)
+            self.latency_tracer.mark(trace, "strategy_dispatch")
+            
             # Create data dictionary in required format
             data = {symbol: event.data}
             
             # Generate signals
-            signals = strategy.generate_signals(data, datetime.now())
+            with self.latency_tracer.span(trace, f"strategy.{name}"):
+                signals = strategy.generate_signals(data, datetime.now())
             
             # Publish signals
             for sym, signal in signals.items():
@@ -448,7 +485,7 @@ class EventManager:
                         strength=1.0,  # Set default strength
                         strategy=name,
                         source=name,
-                        metadata={"strategy_type": strategy.__class__.__name__}
+                        metadata=self._with_trace({"strategy_type": strategy.__class__.__name__}, trace)
                     )
         
         # Register handler
@@ -484,6 +521,9 @@ class EventManager:
             if not all([symbol, strategy, direction is not None]):
                 logger.warning(f"Invalid signal event: {event}")
                 return
+            
+            trace = event.metadata.get(TRACE_KEY)
+            self.latency_tracer.mark(trace, "signal_dispatch")
                 
             # Map signals by strategy
             strategy_signals = {
@@ -498,12 +538,13 @@ class EventManager:
             market_data = {symbol: {"price": 100.0}}  # Mock data
             account_balance = 10000.0  # Mock balance
             
-            orders = trading_mode.process_signals(
-                strategy_signals=strategy_signals,
-                market_data=market_data,
-                current_time=datetime.now(),
-                account_balance=account_balance
-            )
+            with self.latency_tracer.span(trace, f"trading_mode.{trading_mode.name}"):
+                orders = trading_mode.process_signals(
+                    strategy_signals=strategy_signals,
+                    market_data=market_data,
+                    current_time=datetime.now(),
+                    account_balance=account_balance
+                )
             
             # Publish order events
             for order in orders:
@@ -516,10 +557,10 @@ class EventManager:
                     price=order.price,
                     status="created",
                     source=trading_mode.name,
-                    metadata={
+                    metadata=self._with_trace({
                         "trading_mode": trading_mode.name,
                         "order": order.to_dict()
-                    }
+                    }, trace)
                 )
         
         # Register signal handler
@@ -585,8 +626,12 @@ class EventManager:
                 logger.warning(f"Invalid order created event: {event}")
                 return
                 
+            trace = event.metadata.get(TRACE_KEY)
+            self.latency_tracer.mark(trace, "risk_dispatch")
+            
             # Check risk limits
-            should_reduce, reasons = risk_manager.check_risk_limits()
+            with self.latency_tracer.span(trace, "risk.check_risk_limits"):
+                should_reduce, reasons = risk_manager.check_risk_limits()
             
             if should_reduce:
                 # Publish risk limit breach event
@@ -633,11 +678,15 @@ class EventManager:
             # Update market data for stop loss checks
             market_data = {symbol: {"price": price}}
             
+            trace = event.metadata.get(TRACE_KEY)
+            
             # Update trailing stops
-            risk_manager.update_trailing_stops(market_data)
+            with self.latency_tracer.span(trace, "risk.update_trailing_stops"):
+                risk_manager.update_trailing_stops(market_data)
             
             # Check stop losses
-            triggered_stops = risk_manager.check_stop_losses(market_data)
+            with self.latency_tracer.span(trace, "risk.check_stop_losses"):
+                triggered_stops = risk_manager.check_stop_losses(market_data)
             
             # Publish stop loss events for triggered stops
             for stop in triggered_stops:
@@ -673,6 +722,7 @@ class EventManager:
         # Build overall metrics
         metrics = {
             "event_bus": bus_metrics,
+            "latency": self.latency_tracer.get_metrics(),
             "components": {
                 "strategies": len(self.strategies),
                 "trading_mode": self.trading_mode.name if self.trading_mode else None,
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Latency Tracer - Sampled end-to-end latency tracing for the live pipeline.
+
+A trace starts when a tick arrives at a market data source and travels with
+the events derived from it (bar, market data, signal, order) in the event
+metadata under TRACE_KEY. Each stage records the time elapsed since the tick
+arrived, and timed sections (strategy signal generation, risk checks) record
+their own duration, into per-stage log-linear (HDR-style) histograms.
+
+Market data published outside a tick's call stack starts its own trace at
+publication. Stage histograms are therefore keyed by origin and stage
+("tick_received.signal_published" vs "market_data_published.signal_published")
+so time since a tick is never mixed with time since a publish.
+
+Only one in every N ticks is traced, so the untraced path costs a counter
+increment and a context variable lookup.
+"""
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, Any, Callable, Optional
+
+# Set up logging
+logger = logging.getLogger("LatencyTracer")
+
+# Event metadata key the trace travels under
+TRACE_KEY = "latency_trace"
+
+# Context marker for code that does not run inside a tick's call stack
+_NO_SCOPE = object()
+
+_current_trace = contextvars.ContextVar("latency_trace", default=_NO_SCOPE)
+
+
+class HdrHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values below 2**SUB_BUCKET_BITS nanoseconds are counted exactly; above
+    that every power of two is split into 2**(SUB_BUCKET_BITS - 1) linear
+    sub-buckets, so the reported value is within 1/128 of the recorded one
+    over the whole range.
+    """
+
+    SUB_BUCKET_BITS = 8
+
+    def __init__(self, max_value_ns: int = 60 * 10**9):
+        """
+        Initialize the histogram
+
+        Args:
+            max_value_ns: Largest trackable value; larger values are clamped
+        """
+        self.max_value_ns = max_value_ns
+        self.counts = [0] * (self._index(max_value_ns) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def _index(cls, value: int) -> int:
+        bits = cls.SUB_BUCKET_BITS
+        length = value.bit_length()
+        if length <= bits:
+            return value
+        shift = length - bits
+        return (shift << (bits - 1)) + (value >> shift)
+
+    @classmethod
+    def _value_at(cls, index: int) -> int:
+        """Highest value that falls in a bucket"""
+        bits = cls.SUB_BUCKET_BITS
+        if index < (1 << bits):
+            return index
+        shift = (index >> (bits - 1)) - 1
+        mantissa = index - (shift << (bits - 1))
+        return ((mantissa + 1) << shift) - 1
+
+    def record(self, value_ns: int) -> None:
+        """
+        Record a latency sample
+
+        Args:
+            value_ns: Latency in nanoseconds
+        """
+        value_ns = min(max(int(value_ns), 0), self.max_value_ns)
+        index = self._index(value_ns)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total_ns += value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def percentile(self, pct: float) -> float:
+        """
+        Get a latency percentile
+
+        Args:
+            pct: Percentile (0-100)
+
+        Returns:
+            Latency in milliseconds
+        """
+        if self.count == 0:
+            return 0.0
+
+        target = max(1, pct / 100.0 * self.count)
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                return min(self._value_at(index), self.max_ns) / 1e6
+        return self.max_ns / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Summary in milliseconds"""
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "p999_ms": self.percentile(99.9),
+            "max_ms": self.max_ns / 1e6
+        }
+
+
+class _Span:
+    """Times a section of a trace and records its duration on exit"""
+
+    __slots__ = ("tracer", "trace", "stage", "start")
+
+    def __init__(self, tracer: "LatencyTracer", trace: Dict[str, Any], stage: str):
+        self.tracer = tracer
+        self.trace = trace
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = self.tracer.clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = self.tracer.clock() - self.start
+        self.trace["spans"][self.stage] = elapsed
+        self.tracer._histogram(self.stage).record(elapsed)
+        return False
+
+
+class _NullSpan:
+    """Span used for untraced events"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class LatencyTracer:
+    """
+    Samples traces and aggregates per-stage latency histograms.
+
+    Traces are plain dictionaries so they survive event serialization:
+    ``{"id": int, "origin": str, "origin_ns": int, "stages": {stage: ns since
+    origin}, "spans": {section: duration ns}}``. Stage latencies are recorded
+    under "<origin>.<stage>", section durations under the section name.
+    """
+
+    def __init__(self, sample_rate: float = 0.01,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        """
+        Initialize the latency tracer
+
+        Args:
+            sample_rate: Fraction of ticks traced (1.0 traces every tick, 0 disables)
+            clock: Monotonic nanosecond clock
+        """
+        self.clock = clock
+        self.sample_rate = 0.0
+        self._sample_every = 0
+        self._counter = itertools.count(1)
+        self._trace_ids = itertools.count(1)
+        self._histograms: Dict[str, HdrHistogram] = {}
+        self._lock = threading.Lock()
+        self.set_sample_rate(sample_rate)
+
+    def set_sample_rate(self, sample_rate: float) -> None:
+        """
+        Change the fraction of ticks traced
+
+        Args:
+            sample_rate: Fraction of ticks traced (1.0 traces every tick, 0 disables)
+        """
+        self.sample_rate = max(0.0, min(1.0, float(sample_rate)))
+        self._sample_every = round(1.0 / self.sample_rate) if self.sample_rate > 0 else 0
+
+    def start_trace(self, stage: str = "tick_received") -> Optional[Dict[str, Any]]:
+        """
+        Start a trace if this call is sampled
+
+        Args:
+            stage: Name of the origin stage
+
+        Returns:
+            New trace, or None if not sampled
+        """
+        if not self._sample_every or next(self._counter) % self._sample_every:
+            return None
+        return {
+            "id": next(self._trace_ids),
+            "origin": stage,
+            "origin_ns": self.clock(),
+            "stages": {stage: 0},
+            "spans": {}
+        }
+
+    def activate(self, trace: Optional[Dict[str, Any]]) -> contextvars.Token:
+        """
+        Make a trace current for the calling context
+
+        Passing None marks the context as an untraced tick, so code further
+        down the call stack does not start its own trace.
+
+        Args:
+            trace: Trace to activate (or None)
+
+        Returns:
+            Token for deactivate()
+        """
+        return _current_trace.set(trace)
+
+    def deactivate(self, token: contextvars.Token) -> None:
+        """
+        Restore the trace that was current before activate()
+
+        Args:
+            token: Token returned by activate()
+        """
+        _current_trace.reset(token)
+
+    def current(self) -> Optional[Dict[str, Any]]:
+        """Trace of the tick being processed in this context, if sampled"""
+        trace = _current_trace.get()
+        return None if trace is _NO_SCOPE else trace
+
+    def current_or_start(self, stage: str) -> Optional[Dict[str, Any]]:
+        """
+        Current trace, or a new one when running outside a tick's call stack
+
+        Args:
+            stage: Origin stage for a new trace
+
+        Returns:
+            Trace, or None if not sampled
+        """
+        trace = _current_trace.get()
+        if trace is _NO_SCOPE:
+            return self.start_trace(stage)
+        return trace
+
+    def mark(self, trace: Optional[Dict[str, Any]], stage: str) -> None:
+        """
+        Record that a trace reached a stage
+
+        Args:
+            trace: Trace (None is ignored)
+            stage: Stage name
+        """
+        if trace is None:
+            return
+        elapsed = self.clock() - trace["origin_ns"]
+        trace["stages"][stage] = elapsed
+        if stage != trace["origin"]:
+            self._histogram(f"{trace['origin']}.{stage}").record(elapsed)
+
+    def span(self, trace: Optional[Dict[str, Any]], stage: str):
+        """
+        Context manager timing a section of a trace
+
+        Args:
+            trace: Trace (None gives a no-op context manager)
+            stage: Section name, e.g. "strategy.<name>" or "risk.<check>"
+        """
+        if trace is None:
+            return _NULL_SPAN
+        return _Span(self, trace, stage)
+
+    def fork(self, trace: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Copy a trace for a derived event
+
+        Several signals can come from one market data event and several orders
+        from one signal; each carries its own copy so their stages do not
+        overwrite each other.
+
+        Args:
+            trace: Trace to copy (or None)
+
+        Returns:
+            Copied trace, or None
+        """
+        if trace is None:
+            return None
+        return dict(trace, stages=dict(trace["stages"]), spans=dict(trace["spans"]))
+
+    def _histogram(self, stage: str) -> HdrHistogram:
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, HdrHistogram())
+        return histogram
+
+    def get_histogram(self, stage: str) -> Optional[HdrHistogram]:
+        """
+        Get the histogram for a stage
+
+        Args:
+            stage: "<origin>.<stage>" or section name
+
+        Returns:
+            Histogram, or None if the stage was never recorded
+        """
+        return self._histograms.get(stage)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Per-stage latency summaries"""
+        return {stage: histogram.to_dict() for stage, histogram in list(self._histograms.items())}
+
+    def reset(self) -> None:
+        """Discard all recorded latencies"""
+        with self._lock:
+            self._histograms = {}
+
+
+# Singleton instance for global access
+latency_tracer = None
+
+def get_latency_tracer() -> LatencyTracer:
+    """
+    Get the shared latency tracer instance.
+
+    Returns:
+        LatencyTracer instance
+    """
+    global latency_tracer
+    if latency_tracer is None:
+        latency_tracer = LatencyTracer()
+    return latency_tracer
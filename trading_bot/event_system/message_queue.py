@@ -12,6 +12,8 @@ import queue
 import threading
 import time
 import asyncio
+import itertools
+import concurrent.futures
 from enum import Enum
 from typing import Dict, List, Any, Optional, Union, Callable, TypeVar, Generic
 import multiprocessing
@@ -175,6 +177,14 @@ class MessageQueue:
         self.worker_threads = worker_threads
         self.backend_config = backend_config or {}
         
+        # Async API state (queue, tasks and executor are bound to the loop in start_async)
+        self.async_queue: Optional[asyncio.Queue] = None
+        self.async_tasks: List[asyncio.Task] = []
+        self.async_running = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._async_sequence = itertools.count()
+        
         # Setup based on backend type
         self._setup_backend()
         
@@ -198,9 +208,6 @@ class MessageQueue:
                 self.queue = queue.PriorityQueue(maxsize=self.max_size)
             else:
                 self.queue = queue.Queue(maxsize=self.max_size)
-                
-            # Async queue for async API
-            self.async_queue = asyncio.Queue(maxsize=self.max_size)
             
         elif self.backend == QueueBackend.REDIS:
             try:
@@ -342,12 +349,69 @@ class MessageQueue:
             self.stats["errors"] += 1
             return False
             
-    async def publish_async(self, message: Union[Message, Any]) -> bool:
+    async def start_async(self, workers: int = 1) -> None:
+        """
+        Start async message delivery on the running event loop
+        
+        The async queue is created here, bound to the running loop and sized
+        by max_size, so publish_async waits when subscribers fall behind.
+        Coroutine subscribers are awaited on the loop; synchronous subscribers
+        run on an executor with worker_threads threads.
+        
+        Args:
+            workers: Number of concurrent delivery tasks (1 keeps messages in order)
+        """
+        if self.async_running:
+            logger.warning(f"Queue '{self.name}' async delivery already running")
+            return
+            
+        self._loop = asyncio.get_running_loop()
+        if self.queue_type == QueueType.PRIORITY:
+            self.async_queue = asyncio.PriorityQueue(maxsize=self.max_size)
+        else:
+            self.async_queue = asyncio.Queue(maxsize=self.max_size)
+        self._async_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.worker_threads,
+            thread_name_prefix=f"MQ-{self.name}-Async"
+        )
+        self.async_tasks = [self._loop.create_task(self._async_worker()) for _ in range(max(1, workers))]
+        self.async_running = True
+        
+        logger.info(f"MessageQueue '{self.name}' started async delivery with {len(self.async_tasks)} tasks")
+    
+    async def stop_async(self, drain: bool = True) -> None:
+        """
+        Stop async message delivery
+        
+        Args:
+            drain: Wait for queued messages to be delivered first
+        """
+        if not self.async_running:
+            return
+            
+        if drain:
+            await self.async_queue.join()
+            
+        for task in self.async_tasks:
+            task.cancel()
+        await asyncio.gather(*self.async_tasks, return_exceptions=True)
+        self._async_executor.shutdown(wait=False)
+        
+        self.async_tasks = []
+        self.async_running = False
+        self._loop = None
+        logger.info(f"MessageQueue '{self.name}' stopped async delivery")
+    
+    async def publish_async(self, message: Union[Message, Any], timeout: Optional[float] = None) -> bool:
         """
         Publish message asynchronously
         
+        For the memory backend this starts async delivery on the running loop
+        if needed and waits while the queue is full.
+        
         Args:
             message: Message to publish or raw payload
+            timeout: Maximum seconds to wait for queue space (None waits indefinitely)
             
         Returns:
             True if published successfully
@@ -359,24 +423,70 @@ class MessageQueue:
                 source=self.name,
                 destination=self.name
             )
+        
+        # Set destination if not set
+        if not message.destination:
+            message.destination = self.name
             
         try:
             if self.backend == QueueBackend.MEMORY:
-                await self.async_queue.put(message)
-                
-            elif self.backend == QueueBackend.REDIS:
-                # Redis implementation using aioredis would go here
-                pass
+                if not self.async_running:
+                    await self.start_async()
+                    
+                if self.queue_type == QueueType.PRIORITY:
+                    item = (-message.priority, next(self._async_sequence), message)
+                else:
+                    item = message
+                    
+                if timeout is None:
+                    await self.async_queue.put(item)
+                else:
+                    await asyncio.wait_for(self.async_queue.put(item), timeout)
+                    
+            else:
+                # Other backends publish through their (blocking) clients off the loop
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(None, self.publish, message, True, timeout)
                 
             # Update stats
             self.stats["messages_in"] += 1
             return True
             
+        except asyncio.TimeoutError:
+            logger.warning(f"Queue '{self.name}' is full, message not published")
+            return False
         except Exception as e:
             logger.error(f"Error async publishing to queue '{self.name}': {e}")
             self.stats["errors"] += 1
             return False
     
+    def publish_threadsafe(self, message: Union[Message, Any], timeout: Optional[float] = None) -> bool:
+        """
+        Publish message to the async queue from another thread
+        
+        Blocks the calling thread while the queue is full. Must not be called
+        from the event loop thread (use publish_async there).
+        
+        Args:
+            message: Message to publish or raw payload
+            timeout: Maximum seconds to wait for queue space (None waits indefinitely)
+            
+        Returns:
+            True if published successfully
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"Queue '{self.name}' async delivery not running, message not published")
+            return False
+            
+        future = asyncio.run_coroutine_threadsafe(self.publish_async(message, timeout), loop)
+        try:
+            return future.result()
+        except Exception as e:
+            logger.error(f"Error publishing to async queue '{self.name}': {e}")
+            self.stats["errors"] += 1
+            return False
+    
     def subscribe(self, callback: Callable[[Message], None], subscriber_id: Optional[str] = None) -> str:
         """
         Subscribe to receive messages from this queue
@@ -474,35 +584,63 @@ class MessageQueue:
                     self.stats["errors"] += 1
     
     async def _async_worker(self) -> None:
-        """Async worker for processing messages"""
+        """Async worker for delivering messages on the event loop"""
         logger.debug("Started async worker")
         
-        while self.running:
+        while True:
+            # Get message from async queue
+            item = await self.async_queue.get()
+            message = item[2] if self.queue_type == QueueType.PRIORITY else item
+            
             try:
-                # Get message from async queue
-                message = await self.async_queue.get()
-                
                 # Skip expired messages
                 if message.is_expired():
                     logger.debug(f"Skipping expired message {message.message_id}")
-                    self.async_queue.task_done()
                     continue
                 
                 # Process message
                 message.received_time = datetime.now()
                 message.attempts += 1
-                message.last_attempt = datetime.now()
+                message.last_attempt = message.received_time
                 
-                # For async interface, publish to regular queue for delivery
-                self.publish(message, block=False)
+                await self._deliver_to_subscribers_async(message)
                 
-                # Mark as done
-                self.async_queue.task_done()
+                message.processed_time = datetime.now()
+                self.stats["messages_out"] += 1
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(f"Error in async message queue worker: {e}")
                 logger.error(traceback.format_exc())
                 self.stats["errors"] += 1
+            finally:
+                # Mark as done
+                self.async_queue.task_done()
+    
+    async def _deliver_to_subscribers_async(self, message: Message) -> None:
+        """
+        Deliver message to all subscribers from the event loop
+        
+        Args:
+            message: Message to deliver
+        """
+        pending = []
+        for subscriber_id, callbacks in list(self.subscribers.items()):
+            for callback in callbacks:
+                if asyncio.iscoroutinefunction(callback):
+                    pending.append((subscriber_id, callback(message)))
+                else:
+                    pending.append((subscriber_id, self._loop.run_in_executor(self._async_executor, callback, message)))
+        
+        if not pending:
+            return
+            
+        results = await asyncio.gather(*(awaitable for _, awaitable in pending), return_exceptions=True)
+        for (subscriber_id, _), result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error in subscriber {subscriber_id} callback: {result}")
+                self.stats["errors"] += 1
     
     def get_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
@@ -511,7 +649,7 @@ class MessageQueue:
         # Add current queue size
         if self.backend == QueueBackend.MEMORY:
             stats["queue_size"] = self.queue.qsize()
-            stats["async_queue_size"] = self.async_queue.qsize() if hasattr(self, "async_queue") else 0
+            stats["async_queue_size"] = self.async_queue.qsize() if self.async_queue is not None else 0
             
         elif self.backend == QueueBackend.REDIS:
             if self.queue_type == QueueType.PRIORITY:
@@ -10,6 +10,8 @@ import numpy as np
 import logging
 from typing import Dict, List, Any, Optional, Union
 
+from trading_bot.utils.indicator_engine import compute_indicator
+
 logger = logging.getLogger(__name__)
 
 class FeatureEngineeringFramework:
@@ -178,29 +180,15 @@ class FeatureEngineeringFramework:
     
     def _calculate_atr(self, df: pd.DataFrame, window: int = 14) -> pd.Series:
         """Calculate Average True Range (ATR)"""
-        high = df["high"]
-        low = df["low"]
-        close = df["close"]
-        
-        tr1 = high - low
-        tr2 = abs(high - close.shift(1))
-        tr3 = abs(low - close.shift(1))
-        
-        tr = pd.DataFrame({"tr1": tr1, "tr2": tr2, "tr3": tr3}).max(axis=1)
-        atr = tr.rolling(window=window).mean()
-        return atr
+        return compute_indicator(df, "atr", period=window)
     
     def _calculate_bollinger_upper(self, df: pd.DataFrame, window: int = 20, std: float = 2.0) -> pd.Series:
         """Calculate upper Bollinger Band"""
-        sma = df["close"].rolling(window=window).mean()
-        std_dev = df["close"].rolling(window=window).std()
-        return sma + (std_dev * std)
+        return compute_indicator(df, "bollinger", period=window, num_std=std)["upper"]
     
     def _calculate_bollinger_lower(self, df: pd.DataFrame, window: int = 20, std: float = 2.0) -> pd.Series:
         """Calculate lower Bollinger Band"""
-        sma = df["close"].rolling(window=window).mean()
-        std_dev = df["close"].rolling(window=window).std()
-        return sma - (std_dev * std)
+        return compute_indicator(df, "bollinger", period=window, num_std=std)["lower"]
     
     def _calculate_bollinger_width(self, df: pd.DataFrame) -> pd.Series:
         """Calculate Bollinger Band width"""
@@ -208,22 +196,11 @@ class FeatureEngineeringFramework:
     
     def _calculate_rsi(self, df: pd.DataFrame, window: int = 14) -> pd.Series:
         """Calculate Relative Strength Index (RSI)"""
-        delta = df["close"].diff()
-        gain = delta.where(delta > 0, 0)
-        loss = -delta.where(delta < 0, 0)
-        
-        avg_gain = gain.rolling(window=window).mean()
-        avg_loss = loss.rolling(window=window).mean()
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return compute_indicator(df, "rsi", period=window)
     
     def _calculate_macd(self, df: pd.DataFrame, fast: int = 12, slow: int = 26) -> pd.Series:
         """Calculate MACD line"""
-        ema_fast = df["close"].ewm(span=fast, adjust=False).mean()
-        ema_slow = df["close"].ewm(span=slow, adjust=False).mean()
-        return ema_fast - ema_slow
+        return compute_indicator(df, "macd", fast_period=fast, slow_period=slow)["macd"]
     
     def _calculate_macd_signal(self, df: pd.DataFrame, signal: int = 9) -> pd.Series:
         """Calculate MACD signal line"""
@@ -235,17 +212,15 @@ class FeatureEngineeringFramework:
     
     def _calculate_sma(self, df: pd.DataFrame, window: int) -> pd.Series:
         """Calculate Simple Moving Average"""
-        return df["close"].rolling(window=window).mean()
+        return compute_indicator(df, "sma", period=window)
     
     def _calculate_ema(self, df: pd.DataFrame, window: int) -> pd.Series:
         """Calculate Exponential Moving Average"""
-        return df["close"].ewm(span=window, adjust=False).mean()
+        return compute_indicator(df, "ema", period=window)
     
     def _calculate_stoch_k(self, df: pd.DataFrame, window: int = 14) -> pd.Series:
         """Calculate Stochastic Oscillator %K"""
-        low_min = df["low"].rolling(window=window).min()
-        high_max = df["high"].rolling(window=window).max()
-        return 100 * ((df["close"] - low_min) / (high_max - low_min))
+        return compute_indicator(df, "stochastic", k_period=window)["k"]
     
     def _calculate_stoch_d(self, df: pd.DataFrame, window: int = 3) -> pd.Series:
         """Calculate Stochastic Oscillator %D"""
@@ -253,33 +228,4 @@ class FeatureEngineeringFramework:
     
     def _calculate_adx(self, df: pd.DataFrame, window: int = 14) -> pd.Series:
         """Calculate Average Directional Index (ADX)"""
-        # +DM and -DM
-        high_diff = df["high"].diff()
-        low_diff = df["low"].diff().mul(-1)
-        
-        plus_dm = ((high_diff > 0) & (high_diff > low_diff)) * high_diff
-        minus_dm = ((low_diff > 0) & (low_diff > high_diff)) * low_diff
-        
-        # True Range
-        high_low = df["high"] - df["low"]
-        high_close = (df["high"] - df["close"].shift(1)).abs()
-        low_close = (df["low"] - df["close"].shift(1)).abs()
-        tr = pd.DataFrame({
-            "hl": high_low,
-            "hc": high_close, 
-            "lc": low_close
-        }).max(axis=1)
-        
-        # ATR
-        atr = tr.rolling(window=window).mean()
-        
-        # Smooth +DM and -DM
-        plus_di = 100 * (plus_dm.rolling(window=window).mean() / atr)
-        minus_di = 100 * (minus_dm.rolling(window=window).mean() / atr)
-        
-        # Directional movement index
-        dx = 100 * ((plus_di - minus_di).abs() / (plus_di + minus_di))
-        
-        # Average directional index
-        adx = dx.rolling(window=window).mean()
-        return adx
+        return compute_indicator(df, "adx", period=window)["adx"]
@@ -0,0 +1,382 @@
+"""
+Model Cache
+
+Process-wide LRU cache of loaded models, shared by the model registry, the
+real-time analyzer and the prediction service so that a model file is
+unpickled once per process and only when it is first used.
+
+Entries are accounted by their estimated in-memory size and the least
+recently used ones are evicted once the cache exceeds its byte budget.
+Large joblib files are loaded with mmap_mode='r', so their numpy arrays are
+paged in from disk on demand instead of being copied onto the heap.
+"""
+
+import os
+import time
+import types
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Hashable, Iterator, Mapping, Tuple
+
+import joblib
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_BYTES = int(float(os.environ.get('MODEL_CACHE_MB', 2048)) * 1024 * 1024)
+DEFAULT_MMAP_THRESHOLD_BYTES = int(float(os.environ.get('MODEL_MMAP_THRESHOLD_MB', 64)) * 1024 * 1024)
+
+
+_OPAQUE_TYPES = (str, bytes, int, float, bool, type, types.ModuleType, types.FunctionType,
+                 types.BuiltinFunctionType, types.MethodType)
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = array.base if isinstance(array.base, np.ndarray) else None
+    return False
+
+
+def estimate_model_size(model: Any) -> Tuple[int, int]:
+    """
+    Estimate the memory held by a model's numpy arrays
+
+    Walks the attributes, containers and pickled state of the model.
+    Arrays backed by a memory-mapped file are counted separately, since
+    their pages belong to the OS page cache rather than the heap.
+
+    Args:
+        model: Loaded model object
+
+    Returns:
+        Tuple of (heap bytes, memory-mapped bytes)
+    """
+    heap_bytes = 0
+    mapped_bytes = 0
+    # Keeps visited objects alive, so temporary state dicts cannot reuse an id
+    seen = {}
+    stack = [model]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, _OPAQUE_TYPES):
+            continue
+        seen[id(obj)] = obj
+
+        if isinstance(obj, np.ndarray):
+            if _is_mapped(obj):
+                mapped_bytes += obj.nbytes
+            else:
+                heap_bytes += obj.nbytes
+            if obj.dtype == object:
+                stack.extend(obj.ravel())
+        elif isinstance(obj, dict):
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(obj, '__dict__'):
+            stack.extend(vars(obj).values())
+        else:
+            # Extension types (e.g. fitted sklearn trees) expose their arrays through their state
+            try:
+                state = obj.__getstate__()
+            except Exception:
+                continue
+            if isinstance(state, dict):
+                stack.extend(state.values())
+
+    return heap_bytes, mapped_bytes
+
+
+class ModelCache:
+    """
+    Thread-safe LRU cache of loaded models with a memory budget.
+
+    The most recently used entry is never evicted, so a model larger than
+    the whole budget is still cached until the next model is added.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Budget for the estimated heap size of cached models
+        """
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int, int]]' = OrderedDict()
+        self._lock = threading.RLock()
+        self._loading: Dict[Hashable, threading.Lock] = {}
+        self.current_bytes = 0
+        self.mapped_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.load_seconds = 0.0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached model and mark it as recently used
+
+        Args:
+            key: Cache key
+            default: Value returned if the key is not cached
+
+        Returns:
+            Cached model or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, model: Any, size_bytes: Optional[int] = None, mapped_bytes: int = 0):
+        """
+        Add a model to the cache, evicting least recently used models if needed
+
+        Args:
+            key: Cache key
+            model: Loaded model
+            size_bytes: Heap size of the model (default: estimated)
+            mapped_bytes: Memory-mapped size of the model (only used with size_bytes)
+        """
+        if size_bytes is None:
+            size_bytes, mapped_bytes = estimate_model_size(model)
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (model, size_bytes, mapped_bytes)
+            self.current_bytes += size_bytes
+            self.mapped_bytes += mapped_bytes
+
+            while self.current_bytes > self.max_bytes and len(self._entries) > 1:
+                evicted_key = next(iter(self._entries))
+                self._remove(evicted_key)
+                self.evictions += 1
+                logger.debug(f"Evicted model from cache: {evicted_key}")
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Get a cached model, loading it on a miss
+
+        Concurrent misses for the same key wait for a single load.
+
+        Args:
+            key: Cache key
+            loader: Called without arguments to load the model
+
+        Returns:
+            Loaded model
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                with self._lock:
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        self._entries.move_to_end(key)
+                        self.hits += 1
+                        return entry[0]
+                    self.misses += 1
+
+                start = time.perf_counter()
+                model = loader()
+                with self._lock:
+                    self.load_seconds += time.perf_counter() - start
+                self.put(key, model)
+                return model
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+
+    def pop(self, key: Hashable) -> Any:
+        """
+        Remove a model from the cache
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Removed model or None
+        """
+        with self._lock:
+            entry = self._remove(key)
+            return entry[0] if entry is not None else None
+
+    def clear(self, path_prefix: Optional[str] = None):
+        """
+        Remove cached models
+
+        Args:
+            path_prefix: Only remove entries for this file or the files under
+                this directory (default: remove everything)
+        """
+        with self._lock:
+            if path_prefix is None:
+                keys = list(self._entries)
+            else:
+                path_prefix = os.path.abspath(path_prefix)
+                keys = [key for key in self._entries
+                        if _key_path(key) == path_prefix
+                        or str(_key_path(key)).startswith(path_prefix + os.sep)]
+            for key in keys:
+                self._remove(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+
+        Returns:
+            Dictionary with entry count, memory accounting and hit counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'current_bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'mapped_bytes': self.mapped_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'load_seconds': self.load_seconds
+            }
+
+    def _remove(self, key: Hashable) -> Optional[Tuple[Any, int, int]]:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry[1]
+            self.mapped_bytes -= entry[2]
+        return entry
+
+
+def _key_path(key: Hashable) -> Hashable:
+    return key[0] if isinstance(key, tuple) and key else key
+
+
+# Process-wide cache shared by all registries and services
+_model_cache = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> ModelCache:
+    """
+    Get the process-wide model cache
+
+    Returns:
+        Shared ModelCache instance
+    """
+    global _model_cache
+    if _model_cache is None:
+        with _model_cache_lock:
+            if _model_cache is None:
+                _model_cache = ModelCache()
+    return _model_cache
+
+
+def load_model_file(path: str, mmap_threshold_bytes: int = DEFAULT_MMAP_THRESHOLD_BYTES) -> Any:
+    """
+    Load a joblib or pickle file, memory-mapping the arrays of large files
+
+    Args:
+        path: Model file path
+        mmap_threshold_bytes: Files at least this large are loaded with
+            mmap_mode='r' (only uncompressed joblib dumps can be mapped)
+
+    Returns:
+        Loaded object
+    """
+    mmap_mode = 'r' if os.path.getsize(path) >= mmap_threshold_bytes else None
+    return joblib.load(path, mmap_mode=mmap_mode)
+
+
+def load_cached(path: str, loader: Optional[Callable[[str], Any]] = None,
+                cache: Optional[ModelCache] = None,
+                mmap_threshold_bytes: int = DEFAULT_MMAP_THRESHOLD_BYTES) -> Any:
+    """
+    Load a model file through the model cache
+
+    Entries are keyed by absolute path and modification time, so a file
+    that is overwritten is loaded again on its next use. The loader is not
+    part of the key: every loader sharing a cache must return the object
+    stored in the file, and callers that reshape it should do so after the
+    lookup (see LazyModelMapping's wrap).
+
+    Args:
+        path: Model file path
+        loader: Called with the path to load the model (default: load_model_file)
+        cache: Cache to use (default: the process-wide cache)
+        mmap_threshold_bytes: Memory-mapping threshold for the default loader
+
+    Returns:
+        Loaded model
+    """
+    path = os.path.abspath(path)
+    key = (path, os.stat(path).st_mtime_ns)
+    if cache is None:
+        cache = get_model_cache()
+    if loader is None:
+        return cache.get_or_load(key, lambda: load_model_file(path, mmap_threshold_bytes))
+    return cache.get_or_load(key, lambda: loader(path))
+
+
+class LazyModelMapping(Mapping):
+    """
+    Read-only mapping of model name -> model that loads models on first access.
+
+    Only file paths are held; loaded models live in the model cache, so
+    building the mapping costs one directory listing regardless of how many
+    models are registered.
+    """
+
+    def __init__(self, paths: Dict[str, str], loader: Optional[Callable[[str], Any]] = None,
+                 cache: Optional[ModelCache] = None, wrap: Optional[Callable[[Any], Any]] = None):
+        """
+        Initialize the mapping
+
+        Args:
+            paths: Model name -> file path
+            loader: Called with a file path to load a model (default: load_model_file)
+            cache: Cache to use (default: the process-wide cache)
+            wrap: Applied to the cached model on each access, e.g. to put it
+                in the shape this mapping's users expect
+        """
+        self.paths = dict(paths)
+        self.loader = loader
+        self.cache = cache
+        self.wrap = wrap
+
+    def __getitem__(self, name: str) -> Any:
+        model = load_cached(self.paths[name], loader=self.loader, cache=self.cache)
+        return self.wrap(model) if self.wrap is not None else model
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.paths
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
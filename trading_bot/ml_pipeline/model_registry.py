@@ -3,6 +3,11 @@ Model Registry
 
 Handles registration, versioning, and management of prediction models for the
 multi-model prediction pipeline.
+
+Model files are indexed in a manifest (name -> version -> file), so looking
+up a version does not scan the model directories, and loaded models are kept
+in the process-wide model cache, so each file is unpickled once and only on
+first use.
 """
 
 import os
@@ -17,6 +22,10 @@ from typing import Dict, List, Any, Optional, Union, Callable
 from dataclasses import dataclass, field
 import importlib.util
 
+from trading_bot.ml_pipeline.model_cache import (
+    ModelCache, get_model_cache, load_cached, load_model_file, DEFAULT_MMAP_THRESHOLD_BYTES
+)
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -41,18 +50,27 @@ class ModelRegistry:
     - Model registration, versioning, and management
     - Model metadata storage and retrieval
     - Model performance tracking
+    - Lazy, cached model loading
     """
     
-    def __init__(self, registry_path: str = "models"):
+    MODEL_EXTENSIONS = ('.joblib', '.pkl', '.py', '.json')
+    
+    def __init__(self, registry_path: str = "models", cache: Optional[ModelCache] = None,
+                 mmap_threshold_bytes: int = DEFAULT_MMAP_THRESHOLD_BYTES):
         """
         Initialize the model registry
         
         Args:
             registry_path: Base path for model storage
+            cache: Model cache (default: the process-wide cache)
+            mmap_threshold_bytes: joblib files at least this large are loaded
+                with memory-mapped numpy arrays
         """
         self.registry_path = registry_path
         self.models_metadata = {}
-        self.active_models = {}
+        self.cache = cache if cache is not None else get_model_cache()
+        self.mmap_threshold_bytes = mmap_threshold_bytes
+        self.manifest_path = os.path.join(registry_path, "manifest.json")
         
         # Create the registry directory if it doesn't exist
         os.makedirs(registry_path, exist_ok=True)
@@ -60,6 +78,7 @@ class ModelRegistry:
         
         # Load existing models metadata
         self._load_registry()
+        self.manifest = self._load_manifest()
         
         logger.info(f"Model registry initialized at {registry_path}")
     
@@ -85,6 +104,100 @@ class ModelRegistry:
                     except Exception as e:
                         logger.error(f"Error loading model metadata from {filename}: {e}")
     
+    def _load_manifest(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Load the model file manifest, building it from the model directories if missing
+        
+        Returns:
+            Dictionary of model name -> version -> file entry
+        """
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r') as f:
+                    return json.load(f).get('models', {})
+            except Exception as e:
+                logger.error(f"Error loading model manifest, rebuilding it: {e}")
+        
+        self.manifest = {}
+        for name in self.models_metadata:
+            self._index_model_dir(name)
+        self._save_manifest()
+        return self.manifest
+    
+    def _save_manifest(self):
+        """Save the model file manifest to disk"""
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'models': self.manifest}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+    
+    def _index_model(self, name: str, version: str, model_path: str, model_type: str):
+        """
+        Add a model file to the manifest
+        
+        Args:
+            name: Model name
+            version: Version string
+            model_path: Path to the model file
+            model_type: Type of model
+        """
+        self.manifest.setdefault(name, {})[version] = {
+            'path': os.path.relpath(model_path, self.registry_path),
+            'type': model_type,
+            'size_bytes': os.path.getsize(model_path)
+        }
+    
+    def _index_model_dir(self, name: str):
+        """
+        Add the files in a model's directory to the manifest
+        
+        Args:
+            name: Model name
+        """
+        model_dir = os.path.join(self.registry_path, name)
+        if not os.path.isdir(model_dir):
+            return
+        
+        metadata = self.models_metadata.get(name)
+        # Strip the name itself, which may contain "_v" (e.g. spy_volatility)
+        prefix = f"{name}_v"
+        for filename in os.listdir(model_dir):
+            stem, extension = os.path.splitext(filename)
+            if extension not in self.MODEL_EXTENSIONS or not stem.startswith(prefix):
+                continue
+            version = stem[len(prefix):]
+            if metadata is not None and metadata.version == version:
+                model_type = metadata.type
+            else:
+                model_type = 'ml' if extension in ('.joblib', '.pkl') else 'unknown'
+            self._index_model(name, version, os.path.join(model_dir, filename), model_type)
+    
+    def _model_path(self, name: str, version: Optional[str] = None) -> str:
+        """
+        Get the file of a model version
+        
+        Args:
+            name: Model name
+            version: Optional version (default: latest)
+            
+        Returns:
+            Path to the model file
+        """
+        if name not in self.models_metadata:
+            raise ValueError(f"Model {name} not found in registry")
+        
+        if version is None:
+            return self.models_metadata[name].path
+        
+        if version not in self.manifest.get(name, {}):
+            # Files added to the model directory outside the registry
+            self._index_model_dir(name)
+            if version not in self.manifest.get(name, {}):
+                raise ValueError(f"Version {version} of model {name} not found")
+            self._save_manifest()
+        
+        return os.path.join(self.registry_path, self.manifest[name][version]['path'])
+    
     def register_model(self, 
                       name: str, 
                       model: Any, 
@@ -112,23 +225,71 @@ class ModelRegistry:
         """
         # Determine version
         if version is None:
-            if name in self.models_metadata:
-                # Auto-increment version
-                prev_version = self.models_metadata[name].version
-                try:
-                    # Try to increment numeric version
-                    version_num = int(prev_version)
-                    version = str(version_num + 1)
-                except ValueError:
-                    # If not numeric, just append timestamp
-                    version = f"{prev_version}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            else:
-                # First version
-                version = "1"
+            version = self._next_version(name)
         
         # Save the model
         model_path = self._save_model(name, model, model_type, version)
         
+        return self._add_version(name, model_type, version, model_path, description,
+                                 parameters, tags, metrics)
+    
+    def register_model_file(self, 
+                           name: str, 
+                           model_path: str, 
+                           model_type: str = 'ml', 
+                           description: str = "", 
+                           parameters: Dict[str, Any] = None, 
+                           tags: List[str] = None, 
+                           metrics: Dict[str, float] = None,
+                           version: Optional[str] = None) -> ModelMetadata:
+        """
+        Register a model that is already saved to a file, without loading it
+        
+        Args:
+            name: Model name
+            model_path: Path to the model file (.joblib, .pkl, .py or .json)
+            model_type: Type of model (ml, statistical, rule_based, hybrid, ensemble)
+            description: Description of the model
+            parameters: Parameters used to train the model
+            tags: Tags for categorizing the model
+            metrics: Performance metrics
+            version: Optional version string (default: auto-increment)
+            
+        Returns:
+            ModelMetadata object
+        """
+        if version is None:
+            version = self._next_version(name)
+        
+        # Copy the file into the registry
+        model_dir = os.path.join(self.registry_path, name)
+        os.makedirs(model_dir, exist_ok=True)
+        extension = os.path.splitext(model_path)[1]
+        registry_model_path = os.path.join(model_dir, f"{name}_v{version}{extension}")
+        shutil.copy(model_path, registry_model_path)
+        
+        return self._add_version(name, model_type, version, registry_model_path, description,
+                                 parameters, tags, metrics)
+    
+    def _next_version(self, name: str) -> str:
+        """Get the version following the latest registered version of a model"""
+        if name not in self.models_metadata:
+            # First version
+            return "1"
+        
+        # Auto-increment version
+        prev_version = self.models_metadata[name].version
+        try:
+            # Try to increment numeric version
+            return str(int(prev_version) + 1)
+        except ValueError:
+            # If not numeric, just append timestamp
+            return f"{prev_version}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    
+    def _add_version(self, name: str, model_type: str, version: str, model_path: str,
+                     description: str, parameters: Optional[Dict[str, Any]],
+                     tags: Optional[List[str]], metrics: Optional[Dict[str, float]]) -> ModelMetadata:
+        """Record metadata and manifest entries for a saved model version"""
         # Create metadata
         now = datetime.now()
         metadata = ModelMetadata(
@@ -149,6 +310,8 @@ class ModelRegistry:
         
         # Update registry
         self.models_metadata[name] = metadata
+        self._index_model(name, version, model_path, model_type)
+        self._save_manifest()
         
         logger.info(f"Registered model: {name} (v{version})")
         
@@ -214,6 +377,9 @@ class ModelRegistry:
         """
         Load a model from the registry
         
+        The model is loaded on first use and then served from the model
+        cache until it is evicted or its file changes.
+        
         Args:
             name: Model name
             version: Optional version (default: latest)
@@ -221,35 +387,33 @@ class ModelRegistry:
         Returns:
             Loaded model object
         """
-        if name not in self.models_metadata:
-            raise ValueError(f"Model {name} not found in registry")
+        model_path = self._model_path(name, version)
+        if not os.path.exists(model_path):
+            raise ValueError(f"Model file not found: {model_path}")
         
-        # Get metadata
-        metadata = self.models_metadata[name]
+        return load_cached(model_path, loader=lambda path: self._load_model_file(name, path),
+                           cache=self.cache)
+    
+    def _load_model_file(self, name: str, model_path: str) -> Any:
+        """
+        Load a model file
         
-        # Use specific version if provided
-        if version is not None:
-            # Find version in registry
-            model_dir = os.path.join(self.registry_path, name)
-            for filename in os.listdir(model_dir):
-                if filename.endswith(f"_v{version}.joblib") or filename.endswith(f"_v{version}.py") or filename.endswith(f"_v{version}.json"):
-                    metadata.path = os.path.join(model_dir, filename)
-                    break
+        Args:
+            name: Model name
+            model_path: Path to the model file
             
-            if not os.path.exists(metadata.path):
-                raise ValueError(f"Version {version} of model {name} not found")
-        
-        # Check if already loaded
-        if name in self.active_models:
-            return self.active_models[name]
+        Returns:
+            Loaded model object
+        """
+        metadata = self.models_metadata[name]
         
         # Load model based on type
-        if metadata.path.endswith('.joblib'):
-            model = joblib.load(metadata.path)
-        elif metadata.path.endswith('.py'):
+        if model_path.endswith(('.joblib', '.pkl')):
+            model = load_model_file(model_path, self.mmap_threshold_bytes)
+        elif model_path.endswith('.py'):
             # Load Python module
-            module_name = f"{name}_model_v{metadata.version}"
-            spec = importlib.util.spec_from_file_location(module_name, metadata.path)
+            module_name = f"{name}_model_{os.path.splitext(os.path.basename(model_path))[0]}"
+            spec = importlib.util.spec_from_file_location(module_name, model_path)
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
             
@@ -264,13 +428,13 @@ class ModelRegistry:
                         break
             
             if model_class is None:
-                raise ValueError(f"No model class found in {metadata.path}")
+                raise ValueError(f"No model class found in {model_path}")
                 
             # Instantiate model
             model = model_class(**metadata.parameters)
-        elif metadata.path.endswith('.json'):
+        elif model_path.endswith('.json'):
             # Load from parameters
-            with open(metadata.path, 'r') as f:
+            with open(model_path, 'r') as f:
                 model_info = json.load(f)
             
             # Import module
@@ -280,12 +444,9 @@ class ModelRegistry:
             # Instantiate model
             model = model_class(**model_info['parameters'])
         else:
-            raise ValueError(f"Unsupported model format: {metadata.path}")
-        
-        # Cache model
-        self.active_models[name] = model
+            raise ValueError(f"Unsupported model format: {model_path}")
         
-        logger.info(f"Loaded model: {name} (v{metadata.version})")
+        logger.info(f"Loaded model: {name} from {model_path}")
         
         return model
     
@@ -339,10 +500,10 @@ class ModelRegistry:
         
         if version:
             # Delete specific version
-            for filename in os.listdir(model_dir):
-                if filename.endswith(f"_v{version}.joblib") or filename.endswith(f"_v{version}.py") or filename.endswith(f"_v{version}.json"):
-                    os.remove(os.path.join(model_dir, filename))
-                    break
+            model_path = self._model_path(name, version)
+            os.remove(model_path)
+            self.cache.clear(path_prefix=model_path)
+            del self.manifest[name][version]
         else:
             # Delete all versions
             shutil.rmtree(model_dir)
@@ -353,12 +514,14 @@ class ModelRegistry:
                 os.remove(metadata_path)
             
             # Remove from cache
-            if name in self.active_models:
-                del self.active_models[name]
+            self.cache.clear(path_prefix=model_dir)
             
             # Remove from registry
             if name in self.models_metadata:
                 del self.models_metadata[name]
+            self.manifest.pop(name, None)
+        
+        self._save_manifest()
         
         logger.info(f"Deleted model: {name}")
     
@@ -395,20 +558,7 @@ class ModelRegistry:
         if name not in self.models_metadata:
             return []
         
-        model_dir = os.path.join(self.registry_path, name)
-        if not os.path.exists(model_dir):
-            return []
-        
-        versions = []
-        for filename in os.listdir(model_dir):
-            if "_v" in filename:
-                try:
-                    version = filename.split("_v")[1].split(".")[0]
-                    versions.append(version)
-                except Exception:
-                    pass
-        
-        return sorted(versions)
+        return sorted(self.manifest.get(name, {}))
     
     def export_model(self, name: str, export_path: str, version: Optional[str] = None):
         """
@@ -419,26 +569,10 @@ class ModelRegistry:
             export_path: Path to export to
             version: Optional version (default: latest)
         """
-        if name not in self.models_metadata:
-            raise ValueError(f"Model {name} not found in registry")
-        
         # Get metadata
+        model_path = self._model_path(name, version)
         metadata = self.models_metadata[name]
         
-        # Use specific version if provided
-        if version is not None:
-            # Find version in registry
-            model_dir = os.path.join(self.registry_path, name)
-            for filename in os.listdir(model_dir):
-                if filename.endswith(f"_v{version}.joblib") or filename.endswith(f"_v{version}.py") or filename.endswith(f"_v{version}.json"):
-                    model_path = os.path.join(model_dir, filename)
-                    break
-            
-            if not os.path.exists(model_path):
-                raise ValueError(f"Version {version} of model {name} not found")
-        else:
-            model_path = metadata.path
-        
         # Copy model file
         shutil.copy(model_path, export_path)
         
@@ -530,12 +664,14 @@ class ModelRegistry:
         
         # Update registry
         self.models_metadata[name] = metadata
+        self._index_model(name, metadata.version, new_model_path, metadata.type)
+        self._save_manifest()
         
         logger.info(f"Imported model: {name} (v{metadata.version})")
         
         return metadata
     
     def clear_cache(self):
-        """Clear the model cache"""
-        self.active_models = {}
+        """Remove this registry's models from the model cache"""
+        self.cache.clear(path_prefix=self.registry_path)
         logger.info("Cleared model cache")
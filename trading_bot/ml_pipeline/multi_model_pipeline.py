@@ -15,7 +15,6 @@ import json
 import concurrent.futures
 from typing import Dict, List, Any, Optional, Union, Callable, Tuple
 from dataclasses import dataclass, field
-import joblib
 from datetime import datetime, timedelta
 import importlib
 import os
@@ -23,6 +22,7 @@ import os
 from trading_bot.ml_pipeline.advanced_feature_generator import AdvancedFeatureGenerator
 from trading_bot.ml_pipeline.realtime_analyzer import RealtimeAnalyzer
 from trading_bot.ml_pipeline.model_registry import ModelRegistry
+from trading_bot.ml_pipeline.model_cache import load_cached
 from trading_bot.ml_pipeline.ensemble_methods import EnsembleAggregator, EnsembleMethod, adjust_model_weights
 from trading_bot.ml_pipeline.freqtrade_adapter import FreqTradeStrategyRegistry, FreqTradeStrategyAdapter
 
@@ -159,12 +159,11 @@ class MultiModelPipeline:
                 if existing_model is None:
                     # Register the model
                     if model_type == 'ml':
-                        # For ML models, load and register
-                        model = self._load_ml_model(model_path)
-                        if model is not None:
-                            self.model_registry.register_model(
+                        # For ML models, register the file; it is loaded on first use
+                        if os.path.exists(model_path):
+                            self.model_registry.register_model_file(
                                 name=model_name,
-                                model=model,
+                                model_path=model_path,
                                 model_type=model_type,
                                 parameters=model_params
                             )
@@ -197,7 +196,7 @@ class MultiModelPipeline:
     def _load_ml_model(self, path: str):
         """Load machine learning model from file"""
         try:
-            return joblib.load(path) if os.path.exists(path) else None
+            return load_cached(path) if os.path.exists(path) else None
         except Exception as e:
             logger.error(f"Failed to load ML model from {path}: {e}")
             return None
@@ -14,6 +14,7 @@ import pandas as pd
 import numpy as np
 
 from trading_bot.ml_pipeline.optimizer.metrics import StrategyMetrics
+from trading_bot.ml_pipeline.signal_evaluation import generate_signal_records
 
 logger = logging.getLogger(__name__)
 
@@ -101,17 +102,7 @@ class BaseOptimizer:
                     continue
                 
                 # Generate signals
-                signals = []
-                for i in range(len(data) - 1):  # Leave last row for position exit
-                    df_subset = data.iloc[:i+1].copy()
-                    try:
-                        signal = strategy.generate_signals(df_subset)
-                        if signal:
-                            signal['timestamp'] = data.index[i]
-                            signal['symbol'] = symbol
-                            signals.append(signal)
-                    except Exception as e:
-                        logger.debug(f"Error generating signal for {symbol} at index {i}: {e}")
+                signals = self._generate_signals(strategy, data, symbol)
                 
                 # If no signals generated, skip this symbol
                 if not signals:
@@ -145,6 +136,20 @@ class BaseOptimizer:
             logger.error(f"Error evaluating strategy: {e}")
             return {"error": str(e)}
     
+    def _generate_signals(self, strategy, data: pd.DataFrame, symbol: str) -> List[Dict[str, Any]]:
+        """
+        Generate signals for a symbol using the fastest path the strategy supports
+        
+        Args:
+            strategy: Initialized strategy instance
+            data: Historical price data for the symbol
+            symbol: Symbol being evaluated
+            
+        Returns:
+            List of signal dictionaries with 'timestamp' and 'symbol' set
+        """
+        return generate_signal_records(strategy, data, symbol)
+    
     def _calculate_metrics(self, signals_df: pd.DataFrame, price_data: pd.DataFrame, symbol: str) -> Dict[str, float]:
         """
         Calculate performance metrics for a strategy
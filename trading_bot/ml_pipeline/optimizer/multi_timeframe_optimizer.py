@@ -467,17 +467,7 @@ class MultiTimeframeOptimizer:
                         strategy = strategy_class(parameters=parameters)
                         
                         # Generate signals
-                        signals = []
-                        for i in range(len(regime_df) - 1):
-                            df_subset = regime_df.iloc[:i+1].copy()
-                            try:
-                                signal = strategy.generate_signals(df_subset)
-                                if signal:
-                                    signal['timestamp'] = regime_df.index[i]
-                                    signal['symbol'] = symbol
-                                    signals.append(signal)
-                            except Exception as e:
-                                logger.debug(f"Error generating signal for regime {regime}: {e}")
+                        signals = self.base_optimizer._generate_signals(strategy, regime_df, symbol)
                         
                         # Calculate metrics
                         if signals:
@@ -309,17 +309,7 @@ class WalkForwardOptimizer:
                 continue
                 
             # Generate signals
-            signals = []
-            for i in range(len(data) - 1):  # Leave last row for position exit
-                df_subset = data.iloc[:i+1].copy()
-                try:
-                    signal = strategy.generate_signals(df_subset)
-                    if signal:
-                        signal['timestamp'] = data.index[i]
-                        signal['symbol'] = symbol
-                        signals.append(signal)
-                except Exception as e:
-                    logger.debug(f"Error generating validation signal for {symbol} at index {i}: {e}")
+            signals = self.base_optimizer._generate_signals(strategy, data, symbol)
             
             # If no signals generated, skip this symbol
             if not signals:
@@ -17,7 +17,8 @@ from trading_bot.ml_pipeline.optimizer import (
     GeneticOptimizer, 
     BayesianOptimizer,
     MultiTimeframeOptimizer,
-    WalkForwardOptimizer
+    WalkForwardOptimizer,
+    generate_signal_records
 )
 from trading_bot.ml_pipeline.market_regime_detector import MarketRegimeDetector
 from trading_bot.strategies.strategy_factory import StrategyFactory
@@ -332,17 +333,7 @@ class OptimizerIntegration:
                     strategy = strategy_class(parameters=parameters)
                     
                     # Generate signals
-                    signals = []
-                    for i in range(len(regime_df) - 1):
-                        df_subset = regime_df.iloc[:i+1].copy()
-                        try:
-                            signal = strategy.generate_signals(df_subset)
-                            if signal:
-                                signal['timestamp'] = regime_df.index[i]
-                                signal['symbol'] = symbol
-                                signals.append(signal)
-                        except Exception as e:
-                            logger.debug(f"Error generating signal for regime {regime}: {e}")
+                    signals = generate_signal_records(strategy, regime_df, symbol)
                     
                     # Calculate metrics
                     if signals:
@@ -7,6 +7,7 @@ This module provides a real-time analysis system with:
 - Runtime signal aggregation and processing
 """
 
+import os
 import pandas as pd
 import numpy as np
 import logging
@@ -14,12 +15,12 @@ import time
 import concurrent.futures
 from typing import Dict, List, Any, Optional, Union, Callable
 from dataclasses import dataclass, field
-import joblib
 import asyncio
 import queue
 from threading import Thread
 
 from trading_bot.ml_pipeline.advanced_feature_generator import AdvancedFeatureGenerator
+from trading_bot.ml_pipeline.model_cache import load_cached
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +36,7 @@ class AnalysisModel:
     target_variable: str = ""  # Target variable for the model
     thresholds: Dict[str, float] = field(default_factory=dict)  # Thresholds for signal generation
     enabled: bool = True
+    model: Any = field(default=None, repr=False)  # Rule-based/hybrid instance, created on first use
 
 @dataclass
 class SignalConfig:
@@ -103,7 +105,12 @@ class RealtimeAnalyzer:
         logger.info("Real-time Analyzer initialized")
     
     def _load_models(self):
-        """Load all models defined in the configuration"""
+        """
+        Register all models defined in the configuration
+        
+        Models are loaded on first use (ML models through the shared model
+        cache), so startup time does not depend on the number of models.
+        """
         models_config = self.config.get('models', [])
         for model_config in models_config:
             model_obj = AnalysisModel(
@@ -118,29 +125,41 @@ class RealtimeAnalyzer:
                 enabled=model_config.get('enabled', True)
             )
             
-            try:
-                if model_obj.type == 'ml':
-                    model_obj.model = joblib.load(model_obj.path)
-                elif model_obj.type == 'rule_based':
-                    # Import rule-based model from module
-                    import importlib.util
-                    spec = importlib.util.spec_from_file_location("model_module", model_obj.path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    model_obj.model = getattr(module, model_obj.params.get('class_name', 'RuleBasedModel'))()
-                elif model_obj.type == 'hybrid':
-                    # Import hybrid model from module
-                    import importlib.util
-                    spec = importlib.util.spec_from_file_location("model_module", model_obj.path)
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    model_class = getattr(module, model_obj.params.get('class_name', 'HybridModel'))
-                    model_obj.model = model_class(**model_obj.params.get('init_params', {}))
-                
-                self.models[model_obj.name] = model_obj
-                logger.info(f"Loaded model: {model_obj.name}")
-            except Exception as e:
-                logger.error(f"Error loading model {model_obj.name}: {e}")
+            if model_obj.type in ('ml', 'rule_based', 'hybrid') and not os.path.exists(model_obj.path):
+                logger.error(f"Error loading model {model_obj.name}: file not found: {model_obj.path}")
+                continue
+            
+            self.models[model_obj.name] = model_obj
+            logger.info(f"Registered model: {model_obj.name}")
+    
+    def _get_model(self, model_obj: AnalysisModel) -> Any:
+        """
+        Get the model instance for a model configuration, loading it on first use
+        
+        Args:
+            model_obj: Model configuration
+            
+        Returns:
+            Model instance
+        """
+        if model_obj.type == 'ml':
+            return load_cached(model_obj.path)
+        
+        if model_obj.model is None and model_obj.type in ('rule_based', 'hybrid'):
+            import importlib.util
+            spec = importlib.util.spec_from_file_location("model_module", model_obj.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if model_obj.type == 'rule_based':
+                # Import rule-based model from module
+                model_obj.model = getattr(module, model_obj.params.get('class_name', 'RuleBasedModel'))()
+            elif model_obj.type == 'hybrid':
+                # Import hybrid model from module
+                model_class = getattr(module, model_obj.params.get('class_name', 'HybridModel'))
+                model_obj.model = model_class(**model_obj.params.get('init_params', {}))
+            logger.info(f"Loaded model: {model_obj.name}")
+        
+        return model_obj.model
     
     def process_data(self, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, Any]:
         """
@@ -236,6 +255,12 @@ class RealtimeAnalyzer:
         Returns:
             Model prediction or signal
         """
+        try:
+            model = self._get_model(model_obj)
+        except Exception as e:
+            logger.error(f"Error loading model {model_obj.name}: {e}")
+            return None
+        
         if model_obj.type == 'ml':
             # Select features for this model
             if model_obj.feature_set and hasattr(self.feature_generator, 'feature_sets'):
@@ -251,10 +276,10 @@ class RealtimeAnalyzer:
             
             # Apply model
             try:
-                predictions = model_obj.model.predict(X)
+                predictions = model.predict(X)
                 # If the model has predict_proba method, use it for signal strength
-                if hasattr(model_obj.model, 'predict_proba'):
-                    probabilities = model_obj.model.predict_proba(X)
+                if hasattr(model, 'predict_proba'):
+                    probabilities = model.predict_proba(X)
                     if probabilities.shape[1] >= 2:  # Binary classification
                         signal_strength = probabilities[:, 1] - probabilities[:, 0]
                     else:
@@ -274,7 +299,7 @@ class RealtimeAnalyzer:
         elif model_obj.type == 'rule_based':
             # Apply rule-based model
             try:
-                result = model_obj.model.apply(features)
+                result = model.apply(features)
                 return {
                     'signals': result.get('signals', []),
                     'signal_strength': result.get('signal_strength', 0),
@@ -288,7 +313,7 @@ class RealtimeAnalyzer:
         elif model_obj.type == 'hybrid':
             # Apply hybrid model
             try:
-                result = model_obj.model.analyze(features)
+                result = model.analyze(features)
                 return {
                     'signals': result.get('signals', []),
                     'signal_strength': result.get('signal_strength', 0),
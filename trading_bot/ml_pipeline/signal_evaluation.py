@@ -0,0 +1,123 @@
+"""
+Signal Evaluation
+
+Generates per-bar trading signals from a strategy over a price history for
+the optimizers. Kept free of optimizer imports so that StrategyOptimizer and
+the optimizer package can both use it.
+"""
+
+import logging
+from numbers import Number
+from typing import Dict, List, Any, Optional
+
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_signal(signal) -> Optional[Dict[str, Any]]:
+    """Convert a single signal value (dict, action string, +1/-1 or NaN) to a dict or None"""
+    if signal is None:
+        return None
+    if isinstance(signal, dict):
+        return dict(signal) if signal else None
+    if isinstance(signal, str):
+        return {'action': signal} if signal else None
+    if isinstance(signal, Number) and not isinstance(signal, (bool, np.bool_)):
+        if np.isnan(signal) or signal == 0:
+            return None
+        return {'action': 'buy' if signal > 0 else 'sell'}
+    return None
+
+
+def _signal_series_values(raw, data: pd.DataFrame) -> List[Any]:
+    """Convert the output of generate_signal_series to one value per bar"""
+    if isinstance(raw, pd.DataFrame):
+        raw = raw.reindex(data.index)
+        return [
+            None if pd.isna(record.get('action')) else
+            {k: v for k, v in record.items() if not (np.isscalar(v) and pd.isna(v))}
+            for record in raw.to_dict('records')
+        ]
+    if isinstance(raw, pd.Series):
+        return raw.reindex(data.index).tolist()
+    return list(raw) if raw is not None else []
+
+
+def generate_signal_records(strategy, data: pd.DataFrame, symbol: str) -> List[Dict[str, Any]]:
+    """
+    Generate trading signals for every bar of a history except the last
+
+    Strategies can opt into faster evaluation by exposing one of:
+
+    - ``generate_signal_series(data)``: vectorized, whole-series signals. Must
+      return a Series of actions (strings or +1/-1), a DataFrame with an
+      'action' column (indexed like ``data``) or a list of per-bar signal
+      dicts. The value for bar ``i`` must only depend on ``data.iloc[:i+1]``.
+    - ``on_bar(timestamp, bar)``: stateful streaming update called once per bar
+      with a dict of column values, returning a signal dict or None. An optional
+      ``reset()`` is called before each symbol.
+
+    Legacy strategies, and strategies whose generate_signal_series raises,
+    fall back to the per-bar paths; ``generate_signals`` on an expanding
+    window is O(N^2) in the number of bars.
+
+    Args:
+        strategy: Initialized strategy instance
+        data: Historical price data for the symbol
+        symbol: Symbol being evaluated
+
+    Returns:
+        List of signal dictionaries with 'timestamp' and 'symbol' set
+    """
+    signals = []
+    n_bars = len(data) - 1  # Leave last row for position exit
+    if n_bars <= 0:
+        return signals
+
+    if callable(getattr(strategy, 'generate_signal_series', None)):
+        try:
+            values = _signal_series_values(strategy.generate_signal_series(data), data)
+        except Exception as e:
+            logger.warning(f"Error generating signal series for {symbol}, evaluating bar by bar: {e}")
+        else:
+            for i, value in enumerate(values[:n_bars]):
+                signal = _normalize_signal(value)
+                if signal:
+                    signal['timestamp'] = data.index[i]
+                    signal['symbol'] = symbol
+                    signals.append(signal)
+            return signals
+
+    if callable(getattr(strategy, 'on_bar', None)):
+        if callable(getattr(strategy, 'reset', None)):
+            strategy.reset()
+
+        bars = data.iloc[:n_bars].to_dict('records')
+        for i, bar in enumerate(bars):
+            timestamp = data.index[i]
+            try:
+                signal = _normalize_signal(strategy.on_bar(timestamp, bar))
+            except Exception as e:
+                logger.debug(f"Error generating signal for {symbol} at index {i}: {e}")
+                continue
+            if signal:
+                signal['timestamp'] = timestamp
+                signal['symbol'] = symbol
+                signals.append(signal)
+        return signals
+
+    # Legacy path: re-evaluate the strategy on an expanding window
+    for i in range(n_bars):
+        df_subset = data.iloc[:i+1].copy()
+        try:
+            signal = strategy.generate_signals(df_subset)
+            if signal:
+                signal['timestamp'] = data.index[i]
+                signal['symbol'] = symbol
+                signals.append(signal)
+        except Exception as e:
+            logger.debug(f"Error generating signal for {symbol} at index {i}: {e}")
+
+    return signals
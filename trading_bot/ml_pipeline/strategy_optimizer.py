@@ -16,6 +16,8 @@ from datetime import datetime
 import multiprocessing
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from trading_bot.ml_pipeline.signal_evaluation import generate_signal_records
+
 logger = logging.getLogger(__name__)
 
 class StrategyOptimizer:
@@ -296,17 +298,7 @@ class StrategyOptimizer:
                     continue
                 
                 # Generate signals
-                signals = []
-                for i in range(len(data) - 1):  # Leave last row for position exit
-                    df_subset = data.iloc[:i+1].copy()
-                    try:
-                        signal = strategy.generate_signals(df_subset)
-                        if signal:
-                            signal['timestamp'] = data.index[i]
-                            signal['symbol'] = symbol
-                            signals.append(signal)
-                    except Exception as e:
-                        logger.debug(f"Error generating signal for {symbol} at index {i}: {e}")
+                signals = generate_signal_records(strategy, data, symbol)
                 
                 # If no signals generated, skip this symbol
                 if not signals:
@@ -12,14 +12,19 @@ import numpy as np
 import pandas as pd
 import pickle
 import os
+import sys
 import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from datetime import datetime
 from typing import Dict, List, Optional, Union, Any, Tuple, Callable
-from copy import deepcopy
+from copy import copy, deepcopy
 
 # ML Models
 from sklearn.linear_model import LogisticRegression, LinearRegression
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+from sklearn.base import clone
 from sklearn.model_selection import TimeSeriesSplit
 from sklearn.metrics import (
     accuracy_score, precision_score, recall_score, f1_score,
@@ -36,6 +41,143 @@ try:
 except ImportError:
     SHAP_AVAILABLE = False
 
+
+class _SharedFeatureMatrix:
+    """
+    Numeric feature matrix placed in shared memory, so pool workers attach to
+    it instead of receiving a pickled copy of X with every task.
+    
+    Mixed column dtypes (e.g. bool and float) are stored as float64, since
+    an object array cannot be placed in shared memory.
+    """
+    
+    def __init__(self, X: pd.DataFrame):
+        values = X.to_numpy()
+        if values.dtype == object:
+            values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = np.ascontiguousarray(values)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=values.dtype, buffer=self._shm.buf)[...] = values
+        self.descriptor = (self._shm.name, values.shape, values.dtype.str, list(X.columns))
+    
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+
+# Shared data attached by each pool worker
+_worker_data = {}
+
+
+def _attach_worker_data(descriptor: Tuple, y: pd.Series) -> None:
+    """Pool initializer: map the shared feature matrix (y is sent once per worker)."""
+    name, shape, dtype, columns = descriptor
+    shm = shared_memory.SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    _worker_data.update(shm=shm, X=pd.DataFrame(values, columns=columns, copy=False),
+                        y=y.reset_index(drop=True))
+
+
+def _run_worker_task(job: Tuple[Callable, Any]) -> Any:
+    func, task = job
+    return func(task, _worker_data['X'], _worker_data['y'])
+
+
+def _fit_and_score_folds(task: Tuple, X: pd.DataFrame, y: pd.Series) -> List[Dict[str, Any]]:
+    """
+    Fit a model on consecutive CV folds and score each fold once.
+    
+    With warm start the same estimator is refit fold after fold, starting
+    from the previous fold's solution.
+    
+    Args:
+        task: (model, folds, model_type, with_confusion_matrix, warm_start)
+        X: Feature DataFrame
+        y: Target Series
+        
+    Returns:
+        List of fold results (model, train_score, test_score, metrics, importance)
+    """
+    model, folds, model_type, with_confusion, warm_start = task
+    results = []
+    
+    for train_idx, test_idx in folds:
+        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+        y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
+        
+        model.fit(X_train, y_train)
+        train_pred = model.predict(X_train)
+        y_pred = model.predict(X_test)
+        
+        if model_type == 'classification':
+            train_score = accuracy_score(y_train, train_pred)
+            test_score = accuracy_score(y_test, y_pred)
+            metrics = {
+                'accuracy': test_score,
+                'precision': precision_score(y_test, y_pred, average='weighted', zero_division=0),
+                'recall': recall_score(y_test, y_pred, average='weighted', zero_division=0),
+                'f1': f1_score(y_test, y_pred, average='weighted', zero_division=0)
+            }
+            if with_confusion:
+                metrics['confusion_matrix'] = confusion_matrix(y_test, y_pred).tolist()
+        else:
+            train_score = r2_score(y_train, train_pred)
+            test_score = r2_score(y_test, y_pred)
+            metrics = {
+                'r2': test_score,
+                'mse': mean_squared_error(y_test, y_pred),
+                'mae': mean_absolute_error(y_test, y_pred)
+            }
+        
+        # Extract feature importance for this fold
+        if hasattr(model, 'feature_importances_'):
+            importance = dict(zip(X.columns, model.feature_importances_))
+        elif hasattr(model, 'coef_'):
+            coef = np.abs(model.coef_)
+            if coef.ndim > 1:
+                coef = coef.mean(axis=0)
+            importance = dict(zip(X.columns, coef))
+        else:
+            importance = {}
+        
+        results.append({
+            'model': deepcopy(model) if warm_start else model,
+            'train_score': train_score,
+            'test_score': test_score,
+            'metrics': metrics,
+            'importance': importance
+        })
+    
+    return results
+
+
+def _fit_rows(task: Tuple, X: pd.DataFrame, y: pd.Series) -> Any:
+    """Fit a model on a subset of rows (task: (model, row positions))."""
+    model, rows = task
+    return model.fit(X.iloc[rows], y.iloc[rows])
+
+
+def _content_hash(*objects: Any) -> str:
+    """SHA-256 over DataFrame/Series contents, arrays and reprs of everything else."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        if isinstance(obj, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+            digest.update(repr(list(obj.columns) if isinstance(obj, pd.DataFrame) else obj.name).encode())
+        elif isinstance(obj, np.ndarray):
+            digest.update(np.ascontiguousarray(obj).tobytes())
+        else:
+            digest.update(repr(obj).encode())
+    return digest.hexdigest()
+
+
+def _estimator_signature(model: Any) -> str:
+    """Estimator class, library version and parameters (n_jobs excluded) for cache keys."""
+    library = sys.modules.get(type(model).__module__.split('.')[0])
+    params = sorted((k, v) for k, v in model.get_params().items() if k != 'n_jobs')
+    return f"{type(model).__module__}.{type(model).__name__}|{getattr(library, '__version__', '')}|{params!r}"
+
+
 class ModelTrainer:
     """
     Model trainer class for creating and training interpretable ML models.
@@ -264,12 +406,89 @@ class ModelTrainer:
         except Exception as e:
             print(f"Error calculating SHAP values: {str(e)}")
     
+    def _run_tasks(self, func: Callable, tasks: List[Any], X: pd.DataFrame, y: pd.Series) -> List[Any]:
+        """
+        Run fitting tasks, in a process pool when 'cv_workers' allows it.
+        
+        Workers map X from shared memory; only the tasks (unfitted estimators
+        and row positions) are pickled. Non-numeric features fall back to
+        running the tasks in this process.
+        
+        Args:
+            func: Module-level function called as func(task, X, y)
+            tasks: Task arguments
+            X: Feature DataFrame
+            y: Target Series
+            
+        Returns:
+            Results in task order
+        """
+        workers = self.params.get('cv_workers', 1)
+        if workers == -1:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(tasks))
+        numeric = all(pd.api.types.is_numeric_dtype(dtype) for dtype in X.dtypes)
+        
+        if workers <= 1 or not numeric:
+            return [func(task, X, y) for task in tasks]
+        
+        # Split the cores between workers instead of letting each estimator use all of them
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        for task in tasks:
+            if task[0].get_params().get('n_jobs') is not None:
+                task[0].set_params(n_jobs=threads)
+        
+        shared = _SharedFeatureMatrix(X)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach_worker_data,
+                                     initargs=(shared.descriptor, y)) as pool:
+                return list(pool.map(_run_worker_task, [(func, task) for task in tasks]))
+        finally:
+            shared.close()
+    
+    def _load_cached_fit(self, key: str) -> Any:
+        """Load a cached fit result from 'cv_cache_dir' (None if caching is off or missing)."""
+        cache_dir = self.params.get('cv_cache_dir')
+        if not cache_dir:
+            return None
+        
+        path = os.path.join(cache_dir, f"{key}.pkl")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Error loading cached model {path}: {str(e)}")
+            return None
+    
+    def _store_cached_fit(self, key: str, result: Any) -> None:
+        """Store a fit result in 'cv_cache_dir' (if configured)."""
+        cache_dir = self.params.get('cv_cache_dir')
+        if not cache_dir:
+            return
+        
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(cache_dir, f"{key}.pkl")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, path)
+    
     def time_series_cv(self, X: pd.DataFrame, y: pd.Series, 
                        model_type: str = 'classification', 
                        model_name: str = 'default') -> Dict[str, Any]:
         """
         Perform time series cross-validation.
         
+        Folds are fit in parallel with 'cv_workers' > 1 (-1 = one per core).
+        With 'cv_warm_start', estimators whose warm start only initializes the
+        solver (e.g. logistic regression, not tree ensembles where it adds
+        estimators) are refit fold after fold from the previous solution.
+        With 'cv_cache_dir', fitted fold models and scores are cached by a
+        hash of the data, fold and estimator parameters, so unchanged reruns
+        skip fitting.
+        
         Args:
             X: Feature DataFrame
             y: Target Series
@@ -281,6 +500,47 @@ class ModelTrainer:
         """
         n_splits = self.params.get('cv_splits', 5)
         tscv = TimeSeriesSplit(n_splits=n_splits)
+        folds = list(tscv.split(X))
+        
+        # Create the model
+        if model_type == 'classification':
+            base_model = self._create_classification_model(self.params.get('model_algorithm', 'random_forest'))
+        else:
+            base_model = self._create_regression_model(self.params.get('model_algorithm', 'random_forest'))
+        
+        model_params = base_model.get_params()
+        warm_start = (self.params.get('cv_warm_start', False) and 'warm_start' in model_params
+                      and 'n_estimators' not in model_params)
+        if warm_start:
+            base_model.set_params(warm_start=True)
+        
+        # Confusion matrix only for a reasonable number of classes
+        with_confusion = model_type == 'classification' and len(np.unique(y)) <= 10
+        
+        # Reuse cached folds
+        data_hash = _content_hash(X, y)
+        keys = [
+            _content_hash(data_hash, _estimator_signature(base_model), model_type, with_confusion,
+                          warm_start, n_splits, train_idx[[0, -1]], test_idx[[0, -1]])
+            for train_idx, test_idx in folds
+        ]
+        fold_results = [self._load_cached_fit(key) for key in keys]
+        missing = [fold for fold, result in enumerate(fold_results) if result is None]
+        
+        if missing:
+            if warm_start:
+                # Warm-started folds depend on the previous ones: one chain
+                tasks = [(base_model, folds, model_type, with_confusion, True)]
+                missing = list(range(len(folds)))
+            else:
+                tasks = [(clone(base_model), [folds[fold]], model_type, with_confusion, False)
+                         for fold in missing]
+            
+            computed = [result for results in self._run_tasks(_fit_and_score_folds, tasks, X, y)
+                        for result in results]
+            for fold, result in zip(missing, computed):
+                fold_results[fold] = result
+                self._store_cached_fit(keys[fold], result)
         
         # Results storage
         cv_scores = {
@@ -290,64 +550,12 @@ class ModelTrainer:
             'fold_indices': []
         }
         
-        for fold, (train_idx, test_idx) in enumerate(tscv.split(X)):
-            X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
-            y_train, y_test = y.iloc[train_idx], y.iloc[test_idx]
-            
-            # Create and train model
-            if model_type == 'classification':
-                model = self._create_classification_model(self.params.get('model_algorithm', 'random_forest'))
-            else:
-                model = self._create_regression_model(self.params.get('model_algorithm', 'random_forest'))
-            
-            model.fit(X_train, y_train)
-            
-            # Evaluate
-            if model_type == 'classification':
-                train_score = accuracy_score(y_train, model.predict(X_train))
-                test_score = accuracy_score(y_test, model.predict(X_test))
-                
-                # Detailed metrics for test set
-                y_pred = model.predict(X_test)
-                metrics = {
-                    'accuracy': accuracy_score(y_test, y_pred),
-                    'precision': precision_score(y_test, y_pred, average='weighted', zero_division=0),
-                    'recall': recall_score(y_test, y_pred, average='weighted', zero_division=0),
-                    'f1': f1_score(y_test, y_pred, average='weighted', zero_division=0)
-                }
-                
-                # Add confusion matrix
-                if len(np.unique(y)) <= 10:  # Only for a reasonable number of classes
-                    metrics['confusion_matrix'] = confusion_matrix(y_test, y_pred).tolist()
-            else:
-                train_score = r2_score(y_train, model.predict(X_train))
-                test_score = r2_score(y_test, model.predict(X_test))
-                
-                # Detailed metrics for test set
-                y_pred = model.predict(X_test)
-                metrics = {
-                    'r2': test_score,
-                    'mse': mean_squared_error(y_test, y_pred),
-                    'mae': mean_absolute_error(y_test, y_pred)
-                }
-            
-            cv_scores['train_scores'].append(train_score)
-            cv_scores['test_scores'].append(test_score)
-            cv_scores[f'fold_{fold}_metrics'] = metrics
+        for fold, ((train_idx, test_idx), result) in enumerate(zip(folds, fold_results)):
+            cv_scores['train_scores'].append(result['train_score'])
+            cv_scores['test_scores'].append(result['test_score'])
+            cv_scores[f'fold_{fold}_metrics'] = result['metrics']
             cv_scores['fold_indices'].append((train_idx.tolist(), test_idx.tolist()))
-            
-            # Extract feature importance for this fold
-            if hasattr(model, 'feature_importances_'):
-                fold_importance = dict(zip(X.columns, model.feature_importances_))
-            elif hasattr(model, 'coef_'):
-                coef = np.abs(model.coef_)
-                if coef.ndim > 1:
-                    coef = coef.mean(axis=0)
-                fold_importance = dict(zip(X.columns, coef))
-            else:
-                fold_importance = {}
-                
-            cv_scores['feature_importance'].append(fold_importance)
+            cv_scores['feature_importance'].append(result['importance'])
         
         # Store CV results
         self.performance_metrics[model_name] = {
@@ -365,6 +573,9 @@ class ModelTrainer:
         """
         Train specialized models for each market regime in the data.
         
+        Regimes are fit in parallel with 'cv_workers' > 1 and their fitted
+        models are cached in 'cv_cache_dir', as in time_series_cv().
+        
         Args:
             X: Feature DataFrame
             y: Target Series
@@ -385,45 +596,57 @@ class ModelTrainer:
         # Minimum samples required for training a regime-specific model
         min_samples = self.params.get('min_regime_samples', 30)
         
-        # Store models for each regime
-        regime_models = {}
+        features = X.drop(columns=[regime_column])
+        regime_values = X[regime_column].to_numpy()
+        data_hash = _content_hash(features, y)
         
-        # Train a model for each regime
+        # Collect one fitting task per regime
+        pending = []
         for regime in regimes:
-            # Filter data for this regime
-            regime_mask = X[regime_column] == regime
-            X_regime = X[regime_mask].drop(columns=[regime_column])
-            y_regime = y[regime_mask]
+            # Rows for this regime
+            rows = np.flatnonzero(regime_values == regime)
             
             # Check if we have enough samples
-            if len(y_regime) < min_samples:
-                print(f"Skipping regime '{regime}' with only {len(y_regime)} samples (min required: {min_samples})")
+            if len(rows) < min_samples:
+                print(f"Skipping regime '{regime}' with only {len(rows)} samples (min required: {min_samples})")
                 continue
-                
-            # Generate a model name for this regime
-            model_name = f"{base_model_name}_{regime}"
-            
-            print(f"Training model for regime '{regime}' with {len(y_regime)} samples")
             
             # Get algorithm params specific to this regime (if any)
             regime_params = self.params.get(f'regime_{regime}_params', {})
-            merged_params = self.params.copy()
-            merged_params.update(regime_params)
-            
-            # Use class-specific instance with regime-specific params
-            temp_trainer = deepcopy(self)
-            temp_trainer.params = merged_params
+            temp_trainer = copy(self)
+            temp_trainer.params = self.params.copy()
+            temp_trainer.params.update(regime_params)
             
-            # Train model for this regime
             if model_type == 'classification':
-                model = temp_trainer.train_classification_model(X_regime, y_regime, model_name)
+                model = temp_trainer._create_classification_model(temp_trainer.params.get('model_algorithm', 'random_forest'))
             else:
-                model = temp_trainer.train_regression_model(X_regime, y_regime, model_name)
-                
+                model = temp_trainer._create_regression_model(temp_trainer.params.get('model_algorithm', 'random_forest'))
+            
+            key = _content_hash(data_hash, _estimator_signature(model), rows)
+            pending.append((regime, rows, model, key, self._load_cached_fit(key)))
+        
+        to_fit = [(model, rows) for regime, rows, model, key, cached in pending if cached is None]
+        for regime, rows, model, key, cached in pending:
+            if cached is None:
+                print(f"Training model for regime '{regime}' with {len(rows)} samples")
+        fitted = iter(self._run_tasks(_fit_rows, to_fit, features, y))
+        
+        # Store models for each regime
+        regime_models = {}
+        for regime, rows, model, key, cached in pending:
+            if cached is None:
+                model = next(fitted)
+                self._store_cached_fit(key, model)
+            else:
+                model = cached
+            
             # Store model in this instance
+            model_name = f"{base_model_name}_{regime}"
             self.models[model_name] = model
-            self.model_metrics[model_name] = temp_trainer.model_metrics.get(model_name, {})
-            self.feature_importance[model_name] = temp_trainer.feature_importance.get(model_name, {})
+            self.regime_models[regime] = model
+            self._extract_feature_importance(model, features.columns, model_name)
+            if self.params.get('calculate_shap', True) and SHAP_AVAILABLE:
+                self._calculate_shap_values(model, features.iloc[rows], model_name)
             
             # Add to result
             regime_models[regime] = model
@@ -451,20 +674,7 @@ class ModelTrainer:
         # Handle regime-specific prediction
         if regime_column is not None and regime_column in X_copy.columns:
             # Predict using regime-specific models where available
-            predictions = np.zeros(len(X_copy))
-            
-            for idx, row_regime in enumerate(X_copy[regime_column]):
-                if row_regime in self.regime_models:
-                    # Use regime-specific model
-                    row_features = X_copy.iloc[idx:idx+1].drop(columns=[regime_column])
-                    predictions[idx] = self.regime_models[row_regime].predict(row_features)[0]
-                else:
-                    # Fallback to default model
-                    if model_name in self.models:
-                        row_features = X_copy.iloc[idx:idx+1].drop(columns=[regime_column])
-                        predictions[idx] = self.models[model_name].predict(row_features)[0]
-            
-            return predictions
+            return self._predict_by_regime(X_copy, regime_column, model_name, 'predict')
         
         # If regime is specified, use that specific model
         if regime is not None:
@@ -496,23 +706,7 @@ class ModelTrainer:
         
         # Similar approach to predict() but with predict_proba()
         if regime_column is not None and regime_column in X_copy.columns:
-            # Initialize with zeros - shape will be (n_samples, n_classes)
-            # We need to determine number of classes
-            # Let's get it from the first available model
-            sample_model = next(iter(self.models.values()))
-            n_classes = sample_model.predict_proba(X_copy.iloc[:1]).shape[1]
-            predictions = np.zeros((len(X_copy), n_classes))
-            
-            for idx, row_regime in enumerate(X_copy[regime_column]):
-                if row_regime in self.regime_models:
-                    row_features = X_copy.iloc[idx:idx+1].drop(columns=[regime_column])
-                    predictions[idx] = self.regime_models[row_regime].predict_proba(row_features)[0]
-                else:
-                    if model_name in self.models:
-                        row_features = X_copy.iloc[idx:idx+1].drop(columns=[regime_column])
-                        predictions[idx] = self.models[model_name].predict_proba(row_features)[0]
-            
-            return predictions
+            return self._predict_by_regime(X_copy, regime_column, model_name, 'predict_proba')
         
         if regime is not None:
             model_key = f"{model_name}_{regime}"
@@ -524,6 +718,51 @@ class ModelTrainer:
         
         raise ValueError(f"Model '{model_name}' not found")
     
+    def _predict_by_regime(self, X: pd.DataFrame, regime_column: str, model_name: str,
+                           method: str) -> np.ndarray:
+        """
+        Score each row with the model for its regime.
+        
+        Rows are partitioned by regime so every regime model (and the default
+        model, for rows whose regime has no model) is called once on its
+        block; results are scattered back in row order. Rows with no model
+        to score them are left at zero.
+        
+        Args:
+            X: Feature DataFrame including the regime column
+            regime_column: Column in X that contains regime information
+            model_name: Name of the fallback model
+            method: 'predict' or 'predict_proba'
+            
+        Returns:
+            Numpy array with predictions (or class probabilities)
+        """
+        features = X.drop(columns=[regime_column])
+        codes, regimes = pd.factorize(X[regime_column])
+        
+        blocks = []
+        fallback = np.ones(len(X), dtype=bool)
+        for code, regime in enumerate(regimes):
+            if regime in self.regime_models:
+                rows = np.flatnonzero(codes == code)
+                blocks.append((self.regime_models[regime], rows))
+                fallback[rows] = False
+        if fallback.any() and model_name in self.models:
+            blocks.append((self.models[model_name], np.flatnonzero(fallback)))
+        
+        if method == 'predict':
+            predictions = np.zeros(len(X))
+        else:
+            # Number of classes comes from the first model that will be used
+            sample_model = blocks[0][0] if blocks else next(iter(self.models.values()))
+            n_classes = sample_model.predict_proba(features.iloc[:1]).shape[1]
+            predictions = np.zeros((len(X), n_classes))
+        
+        for model, rows in blocks:
+            predictions[rows] = getattr(model, method)(features.iloc[rows])
+        
+        return predictions
+    
     def get_top_features(self, model_name: str = 'default', regime: str = None, 
                          top_n: int = 10) -> Dict[str, float]:
         """
@@ -569,88 +808,57 @@ class ModelTrainer:
         model = self.models[model_key]
         explanations = []
         
+        # Score all samples in one call
+        if hasattr(model, 'predict_proba'):
+            probabilities = model.predict_proba(X)
+            confidences = np.max(probabilities, axis=1)
+            predicted_classes = np.argmax(probabilities, axis=1)
+            predictions = predicted_classes
+        else:
+            predictions = model.predict(X)
+            confidences = [None] * len(X)
+            predicted_classes = None
+        
         # If SHAP values available, use them
         if SHAP_AVAILABLE and model_key in self.shap_values:
             shap_data = self.shap_values[model_key]
             explainer = shap_data['explainer']
-            feature_names = shap_data['feature_names']
+            feature_names = np.asarray(shap_data['feature_names'], dtype=object)
             
             # Calculate SHAP values for this data
             shap_values = explainer.shap_values(X)
             
-            # Process each sample
+            # SHAP values of each sample's predicted class (first class for regression)
+            if isinstance(shap_values, list):  # For multi-class
+                stacked = np.stack(shap_values)
+                classes = predicted_classes if predicted_classes is not None else np.zeros(len(X), dtype=int)
+                sample_shap = stacked[classes, np.arange(len(X))]
+            else:
+                sample_shap = np.asarray(shap_values)
+            
+            # Top five features by absolute SHAP value (stable, as sorted() is)
+            top = np.argsort(-np.abs(sample_shap), axis=1, kind='stable')[:, :5]
+            
             for i in range(len(X)):
-                # Get model prediction
-                if hasattr(model, 'predict_proba'):
-                    prediction = model.predict_proba(X.iloc[i:i+1])[0]
-                    confidence = np.max(prediction)
-                    predicted_class = np.argmax(prediction)
-                else:
-                    prediction = model.predict(X.iloc[i:i+1])[0]
-                    confidence = None
-                    predicted_class = None
-                
-                # Get SHAP values for this prediction
-                if isinstance(shap_values, list):  # For multi-class
-                    sample_shap = shap_values[predicted_class][i] if predicted_class is not None else shap_values[0][i]
-                else:
-                    sample_shap = shap_values[i]
-                
-                # Sort features by absolute SHAP value
-                feature_contributions = dict(zip(feature_names, sample_shap))
-                sorted_contributions = {k: v for k, v in sorted(
-                    feature_contributions.items(), key=lambda item: abs(item[1]), reverse=True
-                )}
-                
-                # Create explanation
-                explanation = {
-                    'prediction': predicted_class if predicted_class is not None else prediction,
-                    'confidence': confidence,
-                    'top_features': dict(list(sorted_contributions.items())[:5])
-                }
-                explanations.append(explanation)
+                explanations.append({
+                    'prediction': predictions[i],
+                    'confidence': confidences[i],
+                    'top_features': dict(zip(feature_names[top[i]], sample_shap[i, top[i]]))
+                })
         else:
-            # Fallback to simpler feature importance
+            # Fallback to simpler feature importance based on global feature importance
             if model_key in self.feature_importance:
-                feature_importance = self.feature_importance[model_key]
-                
-                # Process each sample
-                for i in range(len(X)):
-                    # Get model prediction
-                    if hasattr(model, 'predict_proba'):
-                        prediction = model.predict_proba(X.iloc[i:i+1])[0]
-                        confidence = np.max(prediction)
-                        predicted_class = np.argmax(prediction)
-                    else:
-                        prediction = model.predict(X.iloc[i:i+1])[0]
-                        confidence = None
-                        predicted_class = None
-                    
-                    # Create explanation based on global feature importance
-                    explanation = {
-                        'prediction': predicted_class if predicted_class is not None else prediction,
-                        'confidence': confidence,
-                        'top_features': dict(list(feature_importance.items())[:5])
-                    }
-                    explanations.append(explanation)
+                top_features = dict(list(self.feature_importance[model_key].items())[:5])
             else:
                 # No feature importance available
-                for i in range(len(X)):
-                    if hasattr(model, 'predict_proba'):
-                        prediction = model.predict_proba(X.iloc[i:i+1])[0]
-                        confidence = np.max(prediction)
-                        predicted_class = np.argmax(prediction)
-                    else:
-                        prediction = model.predict(X.iloc[i:i+1])[0]
-                        confidence = None
-                        predicted_class = None
-                        
-                    explanation = {
-                        'prediction': predicted_class if predicted_class is not None else prediction,
-                        'confidence': confidence,
-                        'top_features': {}
-                    }
-                    explanations.append(explanation)
+                top_features = None
+            
+            for i in range(len(X)):
+                explanations.append({
+                    'prediction': predictions[i],
+                    'confidence': confidences[i],
+                    'top_features': dict(top_features) if top_features is not None else {}
+                })
         
         return explanations
     
@@ -20,6 +20,7 @@ from prometheus_client import REGISTRY, PROCESS_COLLECTOR, PLATFORM_COLLECTOR
 from trading_bot.risk_manager import RiskManager
 from trading_bot.options_risk_manager import OptionsRiskManager
 from trading_bot.adapters.multi_asset_adapter import MultiAssetAdapter
+from trading_bot.event_system.latency_tracer import LatencyTracer, get_latency_tracer
 
 # Configure logging
 logging.basicConfig(
@@ -38,7 +39,8 @@ class TradingBotMetricsExporter:
         multi_asset_adapter: MultiAssetAdapter,
         risk_manager: RiskManager,
         options_risk_manager: Optional[OptionsRiskManager] = None,
-        collection_interval: int = 15
+        collection_interval: int = 15,
+        latency_tracer: Optional[LatencyTracer] = None
     ):
         """
         Initialize the metrics exporter.
@@ -48,11 +50,13 @@ class TradingBotMetricsExporter:
             risk_manager: Instance of RiskManager
             options_risk_manager: Optional instance of OptionsRiskManager
             collection_interval: Metrics collection interval in seconds
+            latency_tracer: Pipeline latency tracer (defaults to the shared tracer)
         """
         self.multi_asset_adapter = multi_asset_adapter
         self.risk_manager = risk_manager
         self.options_risk_manager = options_risk_manager
         self.collection_interval = collection_interval
+        self.latency_tracer = latency_tracer or get_latency_tracer()
         
         # Flag to control the background thread
         self.running = False
@@ -147,6 +151,18 @@ class TradingBotMetricsExporter:
             ['endpoint', 'method', 'status']
         )
         
+        # Pipeline latency metrics (tick-to-order stages, strategy and risk sections)
+        self.stage_latency = Gauge(
+            'trading_bot_stage_latency_ms',
+            'Sampled pipeline stage latency in milliseconds',
+            ['stage', 'quantile']
+        )
+        self.stage_latency_samples = Gauge(
+            'trading_bot_stage_latency_samples',
+            'Number of sampled latencies recorded for a pipeline stage',
+            ['stage']
+        )
+        
         # Options-specific metrics
         if self.options_risk_manager:
             self.options_delta_exposure = Gauge(
@@ -187,6 +203,9 @@ class TradingBotMetricsExporter:
         try:
             logger.info("Collecting metrics...")
             
+            # Latency comes from the in-process tracer, so collect it even if a broker call fails
+            self._collect_latency_metrics()
+            
             # Collect account metrics
             account_info = self.multi_asset_adapter.get_account_info()
             self.account_balance.set(account_info.get('balance', 0))
@@ -274,6 +293,18 @@ class TradingBotMetricsExporter:
         except Exception as e:
             logger.error(f"Error collecting options metrics: {str(e)}", exc_info=True)
     
+    def _collect_latency_metrics(self):
+        """Collect per-stage pipeline latency percentiles."""
+        try:
+            for stage, summary in self.latency_tracer.get_metrics().items():
+                for quantile in ('p50', 'p90', 'p99', 'p999', 'max'):
+                    self.stage_latency.labels(stage=stage, quantile=quantile).set(
+                        summary[f'{quantile}_ms']
+                    )
+                self.stage_latency_samples.labels(stage=stage).set(summary['count'])
+        except Exception as e:
+            logger.error(f"Error collecting latency metrics: {str(e)}", exc_info=True)
+    
     def start_metrics_server(self, port: int = 8000):
         """
         Start the Prometheus metrics server.
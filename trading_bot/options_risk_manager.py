@@ -10,6 +10,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Union, Any
 
+from trading_bot.utils.options_pricing import price_and_greeks_vectorized, calculate_greeks_vectorized
+
 
 # Enums and Type Definitions
 class AssetClass(enum.Enum):
@@ -227,112 +229,14 @@ class OptionsRiskManager:
         if option_type is None:
             option_type = OptionType.CALL
         
-        # Handle expired/expiring options
-        if time_to_expiry <= 0:
-            if option_type == OptionType.CALL:
-                intrinsic_value = max(0, spot_price - strike_price)
-                return {
-                    "price": intrinsic_value,
-                    "greeks": OptionGreeks(
-                        delta=1.0 if intrinsic_value > 0 else 0.0,
-                        gamma=0.0,
-                        theta=0.0,
-                        vega=0.0,
-                        rho=0.0
-                    )
-                }
-            else:
-                intrinsic_value = max(0, strike_price - spot_price)
-                return {
-                    "price": intrinsic_value,
-                    "greeks": OptionGreeks(
-                        delta=-1.0 if intrinsic_value > 0 else 0.0,
-                        gamma=0.0,
-                        theta=0.0,
-                        vega=0.0,
-                        rho=0.0
-                    )
-                }
-        
-        # Core Black-Scholes calculation
-        sqrt_time = math.sqrt(time_to_expiry)
-        iv_times_sqrt = iv * sqrt_time
-        
-        # Calculate d1 and d2
-        d1 = (math.log(spot_price / strike_price) + 
-              (risk_free_rate + 0.5 * iv * iv) * time_to_expiry) / iv_times_sqrt
-        d2 = d1 - iv_times_sqrt
-        
-        # Standard normal CDF for d1 and d2
-        if option_type == OptionType.CALL:
-            nd1 = self.normal_cdf(d1)
-            nd2 = self.normal_cdf(d2)
-        else:
-            nd1 = self.normal_cdf(-d1)
-            nd2 = self.normal_cdf(-d2)
-        
-        # Standard normal PDF for d1
-        pd1 = self.normal_pdf(d1)
-        
-        # Calculate option price
-        if option_type == OptionType.CALL:
-            price = spot_price * nd1 - strike_price * math.exp(-risk_free_rate * time_to_expiry) * nd2
-        else:
-            price = strike_price * math.exp(-risk_free_rate * time_to_expiry) * (1 - nd2) - spot_price * (1 - nd1)
-        
-        # Calculate Greeks
-        # Delta - rate of change of option price with respect to underlying price
-        delta = nd1 if option_type == OptionType.CALL else nd1 - 1
-        
-        # Gamma - rate of change of delta with respect to underlying price (same for calls and puts)
-        gamma = pd1 / (spot_price * iv_times_sqrt)
-        
-        # Theta - rate of change of option price with respect to time (per day)
-        theta1 = -spot_price * pd1 * iv / (2 * sqrt_time)
-        theta2 = risk_free_rate * strike_price * math.exp(-risk_free_rate * time_to_expiry)
-        
-        if option_type == OptionType.CALL:
-            theta = -(theta1 + theta2 * nd2) / 365  # Convert to daily
-        else:
-            theta = -(theta1 - theta2 * (1 - nd2)) / 365
-        
-        # Vega - rate of change of option price with respect to volatility (per 1% change)
-        vega = spot_price * sqrt_time * pd1 * 0.01  # Scale for 1% change
-        
-        # Rho - rate of change of option price with respect to interest rate (per 1% change)
-        if option_type == OptionType.CALL:
-            rho = strike_price * time_to_expiry * math.exp(-risk_free_rate * time_to_expiry) * nd2 * 0.01
-        else:
-            rho = -strike_price * time_to_expiry * math.exp(-risk_free_rate * time_to_expiry) * (1 - nd2) * 0.01
-        
-        # Advanced Greeks (second-order)
-        # Charm - rate of change of delta with respect to time (delta decay)
-        charm = -pd1 * (
-            (risk_free_rate - ((iv * iv) / 2)) / (iv * sqrt_time) +
-            (2 * risk_free_rate) / iv
-        ) / 365  # Daily
-        
-        # Vanna - sensitivity of delta with respect to volatility change
-        vanna = -pd1 * d2 / iv
-        
-        # Volga - sensitivity of vega with respect to volatility change
-        volga = vega * (d1 * d2 / iv)
-        
-        # Create and return Greeks object
-        greeks = OptionGreeks(
-            delta=delta,
-            gamma=gamma,
-            theta=theta,
-            vega=vega,
-            rho=rho,
-            charm=charm,
-            vanna=vanna,
-            volga=volga
+        price, greeks = price_and_greeks_vectorized(
+            spot_price, strike_price, time_to_expiry, risk_free_rate, iv,
+            option_type, second_order=time_to_expiry > 0
         )
         
         return {
-            "price": price,
-            "greeks": greeks
+            "price": float(price),
+            "greeks": OptionGreeks(**{name: float(value) for name, value in greeks.items()})
         }
 
     def normal_cdf(self, x: float) -> float:
@@ -815,26 +719,27 @@ class OptionsRiskManager:
         """
         self.reset_portfolio_greeks()
         
-        for position in positions:
-            underlying_price = self.market_data.get_spot_price(position.underlying_symbol)
-            result = self.calculate_black_scholes(
-                underlying_price,
-                position.strike_price,
-                self.calculate_time_to_expiry(position.expiration),
-                position.implied_volatility,
-                self.risk_free_rate,
-                position.option_type
-            )
-            
-            greeks = result["greeks"]
-            
-            position_multiplier = 1 if position.side == PositionSide.LONG else -1
-            contract_multiplier = position.contract_size * position.quantity * position_multiplier
-            
-            self.portfolio_greeks.delta += greeks.delta * contract_multiplier
-            self.portfolio_greeks.gamma += greeks.gamma * contract_multiplier
-            self.portfolio_greeks.theta += greeks.theta * contract_multiplier
-            self.portfolio_greeks.vega += greeks.vega * contract_multiplier
-            self.portfolio_greeks.rho += greeks.rho * contract_multiplier
+        if not positions:
+            return self.portfolio_greeks
+        
+        # Price every position in one vectorized call
+        greeks = calculate_greeks_vectorized(
+            np.array([self.market_data.get_spot_price(p.underlying_symbol) for p in positions], dtype=float),
+            np.array([p.strike_price for p in positions], dtype=float),
+            np.array([self.calculate_time_to_expiry(p.expiration) for p in positions], dtype=float),
+            self.risk_free_rate,
+            np.array([p.implied_volatility for p in positions], dtype=float),
+            [p.option_type for p in positions]
+        )
+        contract_multipliers = np.array([
+            p.contract_size * p.quantity * (1 if p.side == PositionSide.LONG else -1)
+            for p in positions
+        ], dtype=float)
+        
+        self.portfolio_greeks.delta = float(greeks["delta"] @ contract_multipliers)
+        self.portfolio_greeks.gamma = float(greeks["gamma"] @ contract_multipliers)
+        self.portfolio_greeks.theta = float(greeks["theta"] @ contract_multipliers)
+        self.portfolio_greeks.vega = float(greeks["vega"] @ contract_multipliers)
+        self.portfolio_greeks.rho = float(greeks["rho"] @ contract_multipliers)
         
         return self.portfolio_greeks 
\ No newline at end of file
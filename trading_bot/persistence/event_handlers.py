@@ -19,28 +19,36 @@ from trading_bot.persistence.fill_repository import FillRepository
 from trading_bot.persistence.position_repository import PositionRepository, PositionModel
 from trading_bot.persistence.pnl_repository import PnLRepository, PnLModel
 from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.write_behind import WriteBehindQueue
 
 
 class PersistenceEventHandler:
     """Handles persistence of trading events to the database"""
     
-    def __init__(self, connection_manager: ConnectionManager, event_bus: EventBus):
+    def __init__(self, connection_manager: ConnectionManager, event_bus: EventBus,
+                 write_behind: Optional[WriteBehindQueue] = None):
         """
         Initialize the persistence event handler.
         
         Args:
             connection_manager: Database connection manager
             event_bus: Event bus to subscribe to
+            write_behind: Optional write-behind queue for order, fill and PnL
+                writes, so handlers do not wait on MongoDB round-trips
         """
         self.connection_manager = connection_manager
         self.event_bus = event_bus
+        self.write_behind = write_behind
         self.logger = logging.getLogger(__name__)
         
         # Initialize repositories
-        self.order_repo = OrderRepository(connection_manager)
-        self.fill_repo = FillRepository(connection_manager)
+        self.order_repo = OrderRepository(connection_manager, write_behind=write_behind)
+        self.fill_repo = FillRepository(connection_manager, write_behind=write_behind)
         self.position_repo = PositionRepository(connection_manager)
-        self.pnl_repo = PnLRepository(connection_manager)
+        self.pnl_repo = PnLRepository(connection_manager, write_behind=write_behind)
+        
+        if write_behind is not None:
+            write_behind.start()
         
         # Subscribe to events
         self._subscribe_to_events()
@@ -62,6 +70,11 @@ class PersistenceEventHandler:
         
         self.logger.info("Persistence event handlers subscribed to event bus")
     
+    def close(self) -> None:
+        """Flush pending write-behind writes and stop the flush thread."""
+        if self.write_behind is not None:
+            self.write_behind.close()
+    
     def _handle_order_acknowledged(self, event: OrderAcknowledged) -> None:
         """
         Handle OrderAcknowledged event.
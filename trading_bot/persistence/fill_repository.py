@@ -7,11 +7,14 @@ This module provides the repository implementation for order fills.
 
 import logging
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union
 
+from pymongo import ReplaceOne
+
 from trading_bot.persistence.mongo_repository import MongoRepository
 from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.write_behind import WriteBehindQueue
 from trading_bot.core.events import OrderFilled, OrderPartialFill
 
 
@@ -145,16 +148,34 @@ class FillModel:
 class FillRepository:
     """Repository for Fill persistence"""
     
-    def __init__(self, connection_manager: ConnectionManager):
+    def __init__(self, connection_manager: ConnectionManager,
+                 write_behind: Optional[WriteBehindQueue] = None):
         """
         Initialize the fill repository.
         
         Args:
             connection_manager: Database connection manager
+            write_behind: Optional write-behind queue for fill inserts
         """
         self.connection_manager = connection_manager
-        self.mongo_repo = MongoRepository(connection_manager, 'fills')
+        self.mongo_repo = MongoRepository(connection_manager, 'fills', indexes=[
+            {'keys': [('symbol', 1), ('timestamp', 1)]},
+            {'keys': [('broker', 1), ('timestamp', 1)]},
+            {'keys': [('order_internal_id', 1)]}
+        ])
+        # Per symbol and day volume/notional, maintained on every fill
+        self.daily_repo = MongoRepository(connection_manager, 'fills_daily', indexes=[
+            {'keys': [('symbol', 1), ('date', 1)], 'unique': True}
+        ])
+        self.write_behind = write_behind
         self.logger = logging.getLogger(__name__)
+        
+        # Fills recorded before the rollup existed are folded in once
+        self._rollup_ready = False
+        try:
+            self._ensure_daily_rollup()
+        except Exception as e:
+            self.logger.warning(f"Deferred daily fill rollup backfill: {str(e)}")
     
     def record_fill(self, event: Union[OrderFilled, OrderPartialFill]) -> str:
         """
@@ -172,16 +193,43 @@ class FillRepository:
                 fill = FillModel.from_order_filled(event)
             else:  # OrderPartialFill
                 fill = FillModel.from_order_partial_fill(event)
-                
-            # Save to MongoDB
-            self.mongo_repo.save(fill)
             
-            return fill.fill_id
+            return self.save_fill(fill)
             
         except Exception as e:
             self.logger.error(f"Failed to record fill: {str(e)}")
             raise
     
+    def save_fill(self, fill: FillModel) -> str:
+        """
+        Save a fill and add it to the daily rollup.
+        
+        Args:
+            fill: Fill model
+            
+        Returns:
+            Fill ID
+        """
+        try:
+            key = {'symbol': fill.symbol, 'date': fill.timestamp.date().isoformat()}
+            update = {'$inc': {
+                'volume': fill.fill_qty,
+                'notional': fill.fill_qty * fill.fill_price,
+                'fills': 1
+            }}
+            if self.write_behind is not None:
+                self.write_behind.insert('fills', fill.to_dict())
+                self.write_behind.upsert('fills_daily', key, update=update)
+            else:
+                self.mongo_repo.save(fill)
+                self.daily_repo.upsert(key, update)
+            
+            return fill.fill_id
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save fill: {str(e)}")
+            raise
+    
     def find_by_order_id(self, order_internal_id: str) -> List[FillModel]:
         """
         Find fills by order ID.
@@ -284,10 +332,25 @@ class FillRepository:
             self.logger.error(f"Failed to find fills by symbol: {str(e)}")
             raise
     
+    def _ensure_daily_rollup(self) -> None:
+        """Backfill the daily rollup from the fills collection unless already done."""
+        if self._rollup_ready:
+            return
+        
+        state = self.daily_repo.collection.database['rollup_state']
+        if state.find_one({'_id': 'fills_daily'}) is None:
+            self.rebuild_daily_rollup()
+            state.update_one({'_id': 'fills_daily'},
+                             {'$set': {'backfilled_at': datetime.now().isoformat()}}, upsert=True)
+        self._rollup_ready = True
+    
     def calculate_vwap(self, symbol: str, start_time: datetime, end_time: datetime) -> float:
         """
         Calculate Volume-Weighted Average Price for a symbol.
         
+        Whole days in the range are read from the daily rollup; only the
+        partial days at either end are aggregated from individual fills.
+        
         Args:
             symbol: Asset symbol
             start_time: Start time
@@ -297,18 +360,48 @@ class FillRepository:
             VWAP or 0 if no fills
         """
         try:
-            # Get fills
-            fills = self.find_by_symbol(symbol)
+            self._ensure_daily_rollup()
+            total_value = 0.0
+            total_volume = 0.0
             
-            # Filter by time range
-            fills = [f for f in fills if start_time <= f.timestamp <= end_time]
+            # Whole days covered by [start_time, end_time]
+            first_day = start_time.date()
+            if start_time != datetime.combine(first_day, datetime.min.time(), start_time.tzinfo):
+                first_day += timedelta(days=1)
+            last_day = end_time.date()
+            if end_time < datetime.combine(last_day, datetime.max.time(), end_time.tzinfo):
+                last_day -= timedelta(days=1)
             
-            if not fills:
-                return 0.0
+            if first_day <= last_day:
+                for day in self.daily_repo.aggregate([
+                    {'$match': {
+                        'symbol': symbol,
+                        'date': {'$gte': first_day.isoformat(), '$lte': last_day.isoformat()}
+                    }},
+                    {'$group': {'_id': None, 'value': {'$sum': '$notional'}, 'volume': {'$sum': '$volume'}}}
+                ]):
+                    total_value += day['value']
+                    total_volume += day['volume']
                 
-            # Calculate VWAP
-            total_value = sum(f.fill_qty * f.fill_price for f in fills)
-            total_volume = sum(f.fill_qty for f in fills)
+                head_end = datetime.combine(first_day, datetime.min.time(), start_time.tzinfo)
+                tail_start = datetime.combine(last_day + timedelta(days=1), datetime.min.time(), end_time.tzinfo)
+                ranges = [
+                    {'timestamp': {'$gte': start_time.isoformat(), '$lt': head_end.isoformat()}},
+                    {'timestamp': {'$gte': tail_start.isoformat(), '$lte': end_time.isoformat()}}
+                ]
+            else:
+                ranges = [{'timestamp': {'$gte': start_time.isoformat(), '$lte': end_time.isoformat()}}]
+            
+            for edge in self.mongo_repo.aggregate([
+                {'$match': {'symbol': symbol, '$or': ranges}},
+                {'$group': {
+                    '_id': None,
+                    'value': {'$sum': {'$multiply': ['$fill_qty', '$fill_price']}},
+                    'volume': {'$sum': '$fill_qty'}
+                }}
+            ]):
+                total_value += edge['value']
+                total_volume += edge['volume']
             
             if total_volume == 0:
                 return 0.0
@@ -318,3 +411,77 @@ class FillRepository:
         except Exception as e:
             self.logger.error(f"Failed to calculate VWAP: {str(e)}")
             raise
+    
+    def get_daily_volume(self, symbol: str, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
+        """
+        Get per-day fill volume, notional and VWAP for a symbol.
+        
+        Args:
+            symbol: Asset symbol
+            start_date: First day
+            end_date: Last day
+            
+        Returns:
+            List of dicts with date, volume, notional, fills and vwap, oldest first
+        """
+        try:
+            self._ensure_daily_rollup()
+            days = self.daily_repo.find_by_query(
+                {
+                    'symbol': symbol,
+                    'date': {'$gte': start_date.date().isoformat(), '$lte': end_date.date().isoformat()}
+                },
+                sort_field='date'
+            )
+            
+            return [
+                {
+                    'date': day['date'],
+                    'volume': day['volume'],
+                    'notional': day['notional'],
+                    'fills': day['fills'],
+                    'vwap': day['notional'] / day['volume'] if day['volume'] else 0.0
+                }
+                for day in days
+            ]
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get daily fill volume: {str(e)}")
+            raise
+    
+    def rebuild_daily_rollup(self) -> int:
+        """
+        Recompute the daily fill rollup from the fills collection.
+        
+        Runs automatically once per database to backfill fills recorded
+        before the rollup existed; call it again to repair the rollup after
+        a crash replayed rollup increments.
+        
+        Returns:
+            Number of symbol-days written
+        """
+        try:
+            days = self.mongo_repo.aggregate([
+                {'$group': {
+                    '_id': {'symbol': '$symbol', 'date': {'$substr': ['$timestamp', 0, 10]}},
+                    'volume': {'$sum': '$fill_qty'},
+                    'notional': {'$sum': {'$multiply': ['$fill_qty', '$fill_price']}},
+                    'fills': {'$sum': 1}
+                }}
+            ])
+            
+            requests = []
+            for day in days:
+                key = {'symbol': day['_id']['symbol'], 'date': day['_id']['date']}
+                document = dict(key, volume=day['volume'], notional=day['notional'], fills=day['fills'])
+                requests.append(ReplaceOne(key, document, upsert=True))
+            
+            if requests:
+                self.daily_repo.collection.bulk_write(requests, ordered=False)
+            
+            self.logger.info(f"Rebuilt daily fill rollup for {len(requests)} symbol-days")
+            return len(requests)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild daily fill rollup: {str(e)}")
+            raise
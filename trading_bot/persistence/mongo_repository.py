@@ -26,16 +26,20 @@ class MongoRepository(BaseRepository[T]):
     interface, handling all database operations against MongoDB collections.
     """
     
-    def __init__(self, connection_manager: ConnectionManager, collection_name: str):
+    def __init__(self, connection_manager: ConnectionManager, collection_name: str,
+                 indexes: Optional[List[Dict[str, Any]]] = None):
         """
         Initialize the MongoDB repository.
         
         Args:
             connection_manager: MongoDB connection manager
             collection_name: Name of the MongoDB collection
+            indexes: Index specs created on first use, e.g.
+                {'keys': [('symbol', 1), ('timestamp', 1)]} plus create_index options
         """
         super().__init__(connection_manager)
         self.collection_name = collection_name
+        self.indexes = indexes or []
         self._collection = None
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
@@ -48,9 +52,20 @@ class MongoRepository(BaseRepository[T]):
             MongoDB collection
         """
         if self._collection is None:
-            self._collection = self.connection_manager.get_mongo_db()[self.collection_name]
+            collection = self.connection_manager.get_mongo_db()[self.collection_name]
+            self._ensure_indexes(collection)
+            self._collection = collection
         return self._collection
     
+    def _ensure_indexes(self, collection: Collection) -> None:
+        """Create the declared indexes; creating an existing index is a no-op."""
+        for spec in self.indexes:
+            try:
+                options = {name: value for name, value in spec.items() if name != 'keys'}
+                collection.create_index(spec['keys'], **options)
+            except PyMongoError as e:
+                self.logger.warning(f"Failed to create index {spec['keys']} on {self.collection_name}: {str(e)}")
+    
     def to_dict(self, entity: T) -> Dict[str, Any]:
         """
         Convert an entity to a dictionary for MongoDB storage.
@@ -189,12 +204,16 @@ class MongoRepository(BaseRepository[T]):
             self.logger.error(f"Failed to find entities in {self.collection_name}: {str(e)}")
             raise
     
-    def find_by_query(self, query: Dict[str, Any]) -> List[T]:
+    def find_by_query(self, query: Dict[str, Any], sort_field: Optional[str] = None,
+                      sort_direction: int = 1, limit: int = 0) -> List[T]:
         """
         Find entities by query in MongoDB.
         
         Args:
             query: MongoDB query
+            sort_field: Optional field to sort by
+            sort_direction: 1 for ascending, -1 for descending
+            limit: Maximum number of entities (0 for no limit)
             
         Returns:
             List of matching entities
@@ -203,7 +222,12 @@ class MongoRepository(BaseRepository[T]):
             PyMongoError: If the find operation fails
         """
         try:
-            data = list(self.collection.find(query))
+            cursor = self.collection.find(query)
+            if sort_field:
+                cursor = cursor.sort(sort_field, sort_direction)
+            if limit:
+                cursor = cursor.limit(limit)
+            data = list(cursor)
             self.logger.debug(f"Found {len(data)} entities in {self.collection_name} matching query")
             return [self.from_dict(item) for item in data]
             
@@ -211,6 +235,67 @@ class MongoRepository(BaseRepository[T]):
             self.logger.error(f"Failed to find entities in {self.collection_name} by query: {str(e)}")
             raise
     
+    def aggregate(self, pipeline: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Run an aggregation pipeline in MongoDB.
+        
+        Args:
+            pipeline: Aggregation pipeline stages
+            
+        Returns:
+            List of result documents
+            
+        Raises:
+            PyMongoError: If the aggregation fails
+        """
+        try:
+            data = list(self.collection.aggregate(pipeline))
+            self.logger.debug(f"Aggregated {len(data)} documents from {self.collection_name}")
+            return data
+            
+        except PyMongoError as e:
+            self.logger.error(f"Failed to aggregate {self.collection_name}: {str(e)}")
+            raise
+    
+    def upsert(self, key: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """
+        Apply an update to the document matching key, inserting it if missing.
+        
+        Args:
+            key: Filter identifying the document
+            update: Update document, e.g. {'$inc': {...}, '$set': {...}}
+            
+        Raises:
+            PyMongoError: If the update fails
+        """
+        try:
+            self.collection.update_one(key, update, upsert=True)
+            
+        except PyMongoError as e:
+            self.logger.error(f"Failed to upsert into {self.collection_name}: {str(e)}")
+            raise
+    
+    def update_matching(self, query: Dict[str, Any], update: Dict[str, Any]) -> bool:
+        """
+        Apply an update to the first document matching a query, if any.
+        
+        Args:
+            query: Filter, which may include conditions such as {'$lte': ...}
+            update: Update document
+            
+        Returns:
+            bool: True if a document matched
+            
+        Raises:
+            PyMongoError: If the update fails
+        """
+        try:
+            return self.collection.update_one(query, update).matched_count > 0
+            
+        except PyMongoError as e:
+            self.logger.error(f"Failed to update {self.collection_name}: {str(e)}")
+            raise
+    
     def delete(self, id: str) -> bool:
         """
         Delete an entity from MongoDB.
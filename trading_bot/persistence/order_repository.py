@@ -13,6 +13,7 @@ from typing import Dict, List, Any, Optional, Union
 from trading_bot.persistence.mongo_repository import MongoRepository
 from trading_bot.persistence.redis_repository import RedisRepository
 from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.write_behind import WriteBehindQueue
 from trading_bot.core.events import OrderAcknowledged, OrderFilled, OrderRejected, OrderCancelled
 
 
@@ -169,16 +170,20 @@ class OrderModel:
 class OrderRepository:
     """Repository for Order persistence"""
     
-    def __init__(self, connection_manager: ConnectionManager):
+    def __init__(self, connection_manager: ConnectionManager,
+                 write_behind: Optional[WriteBehindQueue] = None):
         """
         Initialize the order repository.
         
         Args:
             connection_manager: Database connection manager
+            write_behind: Optional write-behind queue; order writes become
+                upserts by internal_id, coalesced while pending
         """
         self.connection_manager = connection_manager
         self.mongo_repo = MongoRepository(connection_manager, 'orders')
-        self.redis_repo = RedisRepository(connection_manager, 'orders')
+        self.redis_repo = RedisRepository(connection_manager, 'orders', id_field='internal_id')
+        self.write_behind = write_behind
         self.logger = logging.getLogger(__name__)
         
         # Idempotency cache
@@ -206,7 +211,10 @@ class OrderRepository:
         
         try:
             # Save to MongoDB (durable storage)
-            mongo_id = self.mongo_repo.save(order)
+            if self.write_behind is not None:
+                self._write_order(order)
+            else:
+                self.mongo_repo.save(order)
             
             # If MongoDB save succeeded, save to Redis (hot cache)
             try:
@@ -220,6 +228,20 @@ class OrderRepository:
             self.logger.error(f"Failed to save order: {str(e)}")
             raise
     
+    def _write_order(self, order: OrderModel) -> None:
+        """
+        Write an order to MongoDB, through the write-behind queue if configured.
+        
+        Args:
+            order: Order to write
+        """
+        if self.write_behind is not None:
+            self.write_behind.upsert('orders', {'internal_id': order.internal_id}, order.to_dict())
+        elif order._id:
+            self.mongo_repo.update(order._id, order)
+        else:
+            self.mongo_repo.save(order)
+    
     def update_status(self, internal_id: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
         """
         Update order status.
@@ -250,10 +272,7 @@ class OrderRepository:
                 order.metadata.update(metadata)
             
             # Save to MongoDB
-            if order._id:
-                self.mongo_repo.update(order._id, order)
-            else:
-                self.mongo_repo.save(order)
+            self._write_order(order)
             
             # Update in Redis
             try:
@@ -292,14 +311,11 @@ class OrderRepository:
                     order.updated_at = datetime.now()
                     
                     # Save updates
-                    if order._id:
-                        self.mongo_repo.update(order._id, order)
-                    else:
-                        self.mongo_repo.save(order)
+                    self._write_order(order)
                 else:
                     # Create new order
                     order = OrderModel.from_order_acknowledged(event)
-                    self.mongo_repo.save(order)
+                    self._write_order(order)
                 
                 # Update Redis
                 try:
@@ -331,10 +347,7 @@ class OrderRepository:
                     order.metadata['rejection_reason'] = event.reason
             
             # Save to MongoDB
-            if order._id:
-                self.mongo_repo.update(order._id, order)
-            else:
-                self.mongo_repo.save(order)
+            self._write_order(order)
             
             # Update in Redis
             try:
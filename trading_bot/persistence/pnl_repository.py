@@ -9,9 +9,12 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Union, Tuple
 
+from pymongo import ReplaceOne
+
 from trading_bot.persistence.mongo_repository import MongoRepository
 from trading_bot.persistence.redis_repository import RedisRepository
 from trading_bot.persistence.connection_manager import ConnectionManager
+from trading_bot.persistence.write_behind import WriteBehindQueue
 
 
 class PnLModel:
@@ -144,20 +147,38 @@ class PnLModel:
 class PnLRepository:
     """Repository for PnL persistence"""
     
-    def __init__(self, connection_manager: ConnectionManager):
+    def __init__(self, connection_manager: ConnectionManager,
+                 write_behind: Optional[WriteBehindQueue] = None):
         """
         Initialize the PnL repository.
         
         Args:
             connection_manager: Database connection manager
+            write_behind: Optional write-behind queue for snapshot inserts
         """
         self.connection_manager = connection_manager
-        self.mongo_repo = MongoRepository(connection_manager, 'pnl_records')
+        self.mongo_repo = MongoRepository(connection_manager, 'pnl_records', indexes=[
+            {'keys': [('broker', 1), ('timestamp', 1)]},
+            {'keys': [('record_type', 1), ('timestamp', 1)]}
+        ])
+        # Per broker and day open/high/low/close equity, maintained on every snapshot
+        self.daily_repo = MongoRepository(connection_manager, 'pnl_daily', indexes=[
+            {'keys': [('broker', 1), ('date', 1)], 'unique': True},
+            {'keys': [('date', 1)]}
+        ])
         self.redis_repo = RedisRepository(connection_manager, 'pnl_latest')
+        self.write_behind = write_behind
         self.logger = logging.getLogger(__name__)
         
         # Cache for high watermark
         self._high_watermark = None
+        
+        # Snapshots recorded before the rollup existed are folded in once
+        self._rollup_ready = False
+        try:
+            self._ensure_daily_rollup()
+        except Exception as e:
+            self.logger.warning(f"Deferred daily PnL rollup backfill: {str(e)}")
     
     def record_snapshot(self, pnl: Union[PnLModel, Dict[str, Any]]) -> str:
         """
@@ -178,8 +199,8 @@ class PnLRepository:
                 self._high_watermark = self._get_high_watermark()
                 
             if self._high_watermark is not None:
-                if self.total_equity > self._high_watermark:
-                    self._high_watermark = self.total_equity
+                if pnl.total_equity > self._high_watermark:
+                    self._high_watermark = pnl.total_equity
                     pnl.equity_high_watermark = self._high_watermark
                     pnl.drawdown = 0.0
                     pnl.drawdown_pct = 0.0
@@ -188,7 +209,11 @@ class PnLRepository:
                     pnl.drawdown, pnl.drawdown_pct = pnl.calculate_drawdown(self._high_watermark)
             
             # Save to MongoDB
-            result = self.mongo_repo.save(pnl)
+            if self.write_behind is not None:
+                result = self.write_behind.insert('pnl_records', pnl.to_dict())
+            else:
+                result = self.mongo_repo.save(pnl)
+            self._update_daily_rollup(pnl)
             
             # Update latest in Redis
             try:
@@ -231,12 +256,59 @@ class PnLRepository:
                 pnl.daily_pnl = pnl.total_equity - yesterday_close.total_equity
             
             # Save to MongoDB
-            return self.mongo_repo.save(pnl)
+            result = self.mongo_repo.save(pnl)
+            self._update_daily_rollup(pnl)
+            return result
             
         except Exception as e:
             self.logger.error(f"Failed to record EOD PnL snapshot: {str(e)}")
             raise
     
+    def _update_daily_rollup(self, pnl: PnLModel) -> None:
+        """Fold a snapshot into its broker's open/high/low/close for the day."""
+        timestamp = pnl.timestamp.isoformat()
+        key = {'broker': pnl.broker, 'date': pnl.timestamp.date().isoformat()}
+        update = {
+            '$min': {'low_equity': pnl.total_equity, 'first_timestamp': timestamp},
+            '$max': {'high_equity': pnl.total_equity, 'last_timestamp': timestamp},
+            '$inc': {'snapshots': 1}
+        }
+        
+        # The open and close come from the earliest and latest snapshots of
+        # the day, whatever order snapshots are written in: after the $min and
+        # $max above, first_timestamp and last_timestamp only equal this
+        # timestamp if no earlier or later snapshot has been folded in
+        close = {
+            'close_equity': pnl.total_equity,
+            'unrealized_pnl': pnl.unrealized_pnl,
+            'realized_pnl': pnl.realized_pnl
+        }
+        if pnl.cash_balance is not None:
+            close['cash_balance'] = pnl.cash_balance
+        earliest = dict(key, first_timestamp={'$gte': timestamp})
+        latest = dict(key, last_timestamp={'$lte': timestamp})
+        
+        if self.write_behind is not None:
+            self.write_behind.upsert('pnl_daily', key, update=update)
+            self.write_behind.update('pnl_daily', earliest, {'$set': {'open_equity': pnl.total_equity}})
+            self.write_behind.update('pnl_daily', latest, {'$set': close})
+        else:
+            self.daily_repo.upsert(key, update)
+            self.daily_repo.update_matching(earliest, {'$set': {'open_equity': pnl.total_equity}})
+            self.daily_repo.update_matching(latest, {'$set': close})
+    
+    def _ensure_daily_rollup(self) -> None:
+        """Backfill the daily rollup from the PnL records unless already done."""
+        if self._rollup_ready:
+            return
+        
+        state = self.daily_repo.collection.database['rollup_state']
+        if state.find_one({'_id': 'pnl_daily'}) is None:
+            self.rebuild_daily_rollup()
+            state.update_one({'_id': 'pnl_daily'},
+                             {'$set': {'backfilled_at': datetime.now().isoformat()}}, upsert=True)
+        self._rollup_ready = True
+    
     def get_latest_snapshot(self, broker: Optional[str] = None) -> Optional[PnLModel]:
         """
         Get the latest PnL snapshot.
@@ -379,45 +451,62 @@ class PnLRepository:
         """
         Get daily PnL snapshots for the specified number of days.
         
+        Each snapshot is the day's closing equity from the daily rollup,
+        summed across brokers unless a broker is given. A broker with no
+        snapshots on a day contributes its most recent earlier close.
+        
         Args:
             days: Number of days to look back
             broker: Optional broker filter
             
         Returns:
-            List of daily PnLModel
+            List of daily PnLModel, oldest first
         """
         try:
+            self._ensure_daily_rollup()
+            
             # Calculate date range
-            end_date = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
-            start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+            end_date = datetime.now().date()
+            start_date = end_date - timedelta(days=days)
             
-            # Build query
-            query = {
-                'record_type': 'eod',
-                'timestamp': {
-                    '$gte': start_date.isoformat(),
-                    '$lte': end_date.isoformat()
-                }
+            match = {'date': {'$gte': start_date.isoformat(), '$lte': end_date.isoformat()}}
+            earlier = {'date': {'$lt': start_date.isoformat()}}
+            if broker:
+                match['broker'] = broker
+                earlier['broker'] = broker
+            
+            # Each broker's last close before the range seeds the forward fill
+            closes = {
+                seed['_id']: seed['close']
+                for seed in self.daily_repo.aggregate([
+                    {'$match': earlier},
+                    {'$sort': {'date': 1}},
+                    {'$group': {'_id': '$broker', 'close': {'$last': '$$ROOT'}}}
+                ])
             }
             
-            if broker:
-                query['broker'] = broker
-                
-            # Query MongoDB
-            records = self.mongo_repo.find_by_query(
-                query,
-                sort_field='timestamp',
-                sort_direction=1,
-                limit=days
-            )
+            # One row per broker and day, however many snapshots were recorded
+            rows: Dict[str, List[Dict[str, Any]]] = {}
+            for row in self.daily_repo.find_by_query(match, sort_field='date'):
+                rows.setdefault(row['date'], []).append(row)
             
-            # Convert to PnLModel if needed
             result = []
-            for record in records:
-                if isinstance(record, dict):
-                    result.append(PnLModel.from_dict(record))
-                else:
-                    result.append(record)
+            previous_equity = None
+            for date in sorted(rows):
+                for row in rows[date]:
+                    closes[row.get('broker')] = row
+                total_equity = sum(close['close_equity'] for close in closes.values())
+                result.append(PnLModel(
+                    timestamp=datetime.fromisoformat(max(row['last_timestamp'] for row in rows[date])),
+                    total_equity=total_equity,
+                    unrealized_pnl=sum(close['unrealized_pnl'] for close in closes.values()),
+                    realized_pnl=sum(close['realized_pnl'] for close in closes.values()),
+                    cash_balance=sum(close.get('cash_balance') or 0.0 for close in closes.values()),
+                    broker=broker,
+                    daily_pnl=total_equity - previous_equity if previous_equity is not None else None,
+                    record_type='daily'
+                ))
+                previous_equity = total_equity
                     
             return result
             
@@ -425,6 +514,51 @@ class PnLRepository:
             self.logger.error(f"Failed to get daily PnL snapshots: {str(e)}")
             raise
     
+    def rebuild_daily_rollup(self) -> int:
+        """
+        Recompute the daily PnL rollup from the recorded snapshots.
+        
+        Runs automatically once per database to backfill snapshots recorded
+        before the rollup existed.
+        
+        Returns:
+            Number of broker-days written
+        """
+        try:
+            days = self.mongo_repo.aggregate([
+                {'$sort': {'timestamp': 1}},
+                {'$group': {
+                    '_id': {'broker': '$broker', 'date': {'$substr': ['$timestamp', 0, 10]}},
+                    'open_equity': {'$first': '$total_equity'},
+                    'high_equity': {'$max': '$total_equity'},
+                    'low_equity': {'$min': '$total_equity'},
+                    'close_equity': {'$last': '$total_equity'},
+                    'unrealized_pnl': {'$last': '$unrealized_pnl'},
+                    'realized_pnl': {'$last': '$realized_pnl'},
+                    'cash_balance': {'$last': '$cash_balance'},
+                    'first_timestamp': {'$first': '$timestamp'},
+                    'last_timestamp': {'$last': '$timestamp'},
+                    'snapshots': {'$sum': 1}
+                }}
+            ])
+            
+            requests = []
+            for day in days:
+                key = {'broker': day['_id'].get('broker'), 'date': day['_id']['date']}
+                document = {name: value for name, value in day.items() if name != '_id' and value is not None}
+                document.update(key)
+                requests.append(ReplaceOne(key, document, upsert=True))
+            
+            if requests:
+                self.daily_repo.collection.bulk_write(requests, ordered=False)
+            
+            self.logger.info(f"Rebuilt daily PnL rollup for {len(requests)} broker-days")
+            return len(requests)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to rebuild daily PnL rollup: {str(e)}")
+            raise
+    
     def calculate_returns(self, period_days: int = 30) -> Dict[str, float]:
         """
         Calculate returns statistics.
@@ -8,7 +8,9 @@ This module provides the repository implementation for positions.
 import logging
 import json
 from datetime import datetime
-from typing import Dict, List, Any, Optional, Union, Set
+from typing import Dict, List, Any, Optional, Union
+
+from pymongo import ReplaceOne
 
 from trading_bot.persistence.mongo_repository import MongoRepository
 from trading_bot.persistence.redis_repository import RedisRepository
@@ -157,11 +159,11 @@ class PositionRepository:
         """
         self.connection_manager = connection_manager
         self.mongo_repo = MongoRepository(connection_manager, 'positions')
-        self.redis_repo = RedisRepository(connection_manager, 'positions')
+        # Positions written to Redis are marked dirty until synced to MongoDB
+        self.redis_repo = RedisRepository(
+            connection_manager, 'positions', id_field='position_id', track_dirty=True
+        )
         self.logger = logging.getLogger(__name__)
-        
-        # Set of positions that need to be synced to MongoDB
-        self._dirty_positions: Set[str] = set()
     
     def save_position(self, position: Union[PositionModel, Dict[str, Any]]) -> str:
         """
@@ -492,12 +494,11 @@ class PositionRepository:
                 else:
                     position_models.append(position)
             
-            # Save each position to Redis
-            for position in position_models:
-                try:
-                    self.redis_repo.save(position)
-                except Exception as e:
-                    self.logger.warning(f"Failed to load position to Redis cache: {str(e)}")
+            # Save positions to Redis in pipelined batches
+            try:
+                self.redis_repo.save_many(position_models)
+            except Exception as e:
+                self.logger.warning(f"Failed to load positions to Redis cache: {str(e)}")
             
             # Log summary
             self.logger.info(f"Loaded {len(position_models)} positions into repository")
@@ -506,44 +507,48 @@ class PositionRepository:
             self.logger.error(f"Failed to load positions: {str(e)}")
             raise
     
-    def sync_to_durable_storage(self) -> int:
+    def sync_to_durable_storage(self, full: bool = False) -> int:
         """
         Sync positions from Redis to MongoDB for durability.
         
+        Only positions written to Redis since the last sync are read (with
+        batched MGETs) and upserted by position_id in one bulk write, so the
+        cost scales with the number of changed positions. If the write fails
+        the positions stay marked for the next sync.
+        
+        Args:
+            full: Sync every position in Redis, not only changed ones
+            
         Returns:
             Number of positions synced
         """
         try:
-            # Get all positions from Redis
-            redis_positions = self.redis_repo.find_all()
+            position_ids = self.redis_repo.take_dirty()
+            if full:
+                position_ids = list(set(position_ids) | set(self.redis_repo.iter_ids()))
             
-            if not redis_positions:
+            if not position_ids:
                 return 0
             
-            # Sync each position to MongoDB
-            synced_count = 0
-            for position in redis_positions:
-                try:
-                    if isinstance(position, dict):
-                        position = PositionModel.from_dict(position)
-                    
-                    # Find MongoDB document ID
-                    mongo_position = self.find_by_position_id(position.position_id)
-                    
-                    if mongo_position and mongo_position._id:
-                        # Update in MongoDB
-                        self.mongo_repo.update(mongo_position._id, position)
-                    else:
-                        # Save as new
-                        self.mongo_repo.save(position)
-                    
-                    synced_count += 1
+            try:
+                positions = self.redis_repo.find_by_ids(position_ids)
                 
-                except Exception as e:
-                    self.logger.error(f"Failed to sync position {position.position_id}: {str(e)}")
+                requests = []
+                for position_id, position in positions.items():
+                    data = position.to_dict() if isinstance(position, PositionModel) else dict(position)
+                    data.pop('_id', None)
+                    requests.append(ReplaceOne({'position_id': position_id}, data, upsert=True))
+                
+                if requests:
+                    self.mongo_repo.collection.bulk_write(requests, ordered=False)
+            except Exception:
+                self.redis_repo.restore_dirty()
+                raise
+            
+            self.redis_repo.ack_dirty()
             
-            self.logger.info(f"Synced {synced_count} positions to durable storage")
-            return synced_count
+            self.logger.info(f"Synced {len(requests)} positions to durable storage")
+            return len(requests)
             
         except Exception as e:
             self.logger.error(f"Failed to sync positions to durable storage: {str(e)}")
@@ -3,6 +3,11 @@
 Redis Repository Implementation
 
 This module provides a Redis repository implementation for hot-state caching.
+
+Entity ids are kept in a per-prefix index set, so listing and counting
+entities never scans the keyspace, and multi-entity reads and writes are
+pipelined. Repositories can also track a dirty set of ids written since the
+last sync to durable storage.
 """
 
 import logging
@@ -25,16 +30,32 @@ class RedisRepository(BaseRepository[T]):
     with automatic serialization and deserialization of entities.
     """
     
-    def __init__(self, connection_manager: ConnectionManager, key_prefix: str):
+    # Keys read or written per round-trip in batch operations
+    BATCH_SIZE = 500
+    
+    def __init__(self, connection_manager: ConnectionManager, key_prefix: str,
+                 id_field: Optional[str] = None, track_dirty: bool = False):
         """
         Initialize the Redis repository.
         
         Args:
             connection_manager: Database connection manager
             key_prefix: Prefix for all Redis keys
+            id_field: Entity attribute or key holding its id (default: id/_id)
+            track_dirty: Record written ids in a dirty set (see take_dirty)
         """
         super().__init__(connection_manager)
         self.key_prefix = key_prefix
+        self.id_field = id_field
+        self.track_dirty = track_dirty
+        
+        # Index and dirty sets live outside the "{prefix}:*" entity namespace
+        self.index_key = f"__index__:{key_prefix}"
+        self.dirty_key = f"__dirty__:{key_prefix}"
+        self.syncing_key = f"__syncing__:{key_prefix}"
+        self.indexed_key = f"__indexed__:{key_prefix}"
+        self._index_ready = False
+        
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
     @property
@@ -54,6 +75,67 @@ class RedisRepository(BaseRepository[T]):
         """
         return f"{self.key_prefix}:{id}"
     
+    def _entity_id(self, entity: T) -> str:
+        """
+        Get the id of an entity.
+        
+        Args:
+            entity: Entity or dictionary
+            
+        Returns:
+            Entity id, or an empty string if it has none
+        """
+        fields = [self.id_field] if self.id_field else ['id', '_id']
+        for field in fields:
+            if isinstance(entity, dict):
+                value = entity.get(field)
+            else:
+                value = getattr(entity, field, None)
+            if value:
+                return str(value)
+        return ""
+    
+    def _ensure_index(self) -> None:
+        """
+        Add keys written before the index was introduced to the index set.
+        
+        Legacy keys are found with SCAN once per prefix; a marker key records
+        that the migration finished, so an index set started by a write
+        before the migration still gets the legacy keys.
+        """
+        if self._index_ready:
+            return
+        
+        if not self.redis.exists(self.indexed_key):
+            prefix_len = len(self.key_prefix) + 1
+            ids = []
+            for key in self.redis.scan_iter(match=f"{self.key_prefix}:*", count=1000):
+                key = key.decode() if isinstance(key, bytes) else key
+                ids.append(key[prefix_len:])
+                if len(ids) >= self.BATCH_SIZE:
+                    self.redis.sadd(self.index_key, *ids)
+                    ids = []
+            if ids:
+                self.redis.sadd(self.index_key, *ids)
+            self.redis.set(self.indexed_key, 1)
+        
+        self._index_ready = True
+    
+    def _write(self, items: Dict[str, str]) -> None:
+        """
+        Write serialized entities and their index entries in one round-trip.
+        
+        Args:
+            items: Mapping of entity id to JSON
+        """
+        self._ensure_index()
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.mset({self._make_key(id): json_str for id, json_str in items.items()})
+        pipe.sadd(self.index_key, *items)
+        if self.track_dirty:
+            pipe.sadd(self.dirty_key, *items)
+        pipe.execute()
+    
     def to_json(self, entity: T) -> str:
         """
         Convert an entity to JSON for Redis storage.
@@ -96,24 +178,15 @@ class RedisRepository(BaseRepository[T]):
             ID of the saved entity
         """
         try:
-            # Get ID from entity if available
-            entity_id = ""
-            if isinstance(entity, dict) and 'id' in entity:
-                entity_id = entity['id']
-            elif isinstance(entity, dict) and '_id' in entity:
-                entity_id = entity['_id']
-            elif hasattr(entity, 'id') and entity.id:
-                entity_id = entity.id
+            entity_id = self._entity_id(entity)
             
             if not entity_id:
                 raise ValueError("Entity must have an id to be saved in Redis")
             
             # Convert entity to JSON and save
-            json_str = self.to_json(entity)
-            key = self._make_key(entity_id)
-            self.redis.set(key, json_str)
+            self._write({entity_id: self.to_json(entity)})
             
-            self.logger.debug(f"Saved entity to Redis with key {key}")
+            self.logger.debug(f"Saved entity to Redis with key {self._make_key(entity_id)}")
             return entity_id
             
         except Exception as e:
@@ -133,11 +206,9 @@ class RedisRepository(BaseRepository[T]):
         """
         try:
             # Convert entity to JSON and save
-            json_str = self.to_json(entity)
-            key = self._make_key(id)
-            self.redis.set(key, json_str)
+            self._write({id: self.to_json(entity)})
             
-            self.logger.debug(f"Updated entity in Redis with key {key}")
+            self.logger.debug(f"Updated entity in Redis with key {self._make_key(id)}")
             return True
             
         except Exception as e:
@@ -169,6 +240,96 @@ class RedisRepository(BaseRepository[T]):
             self.logger.error(f"Failed to find entity in Redis: {str(e)}")
             raise
     
+    def save_many(self, entities: List[T]) -> List[str]:
+        """
+        Save several entities with pipelined writes.
+        
+        Args:
+            entities: Entities to save
+            
+        Returns:
+            IDs of the saved entities
+        """
+        try:
+            items = {}
+            for entity in entities:
+                entity_id = self._entity_id(entity)
+                if not entity_id:
+                    raise ValueError("Entity must have an id to be saved in Redis")
+                items[entity_id] = self.to_json(entity)
+            
+            ids = list(items)
+            for start in range(0, len(ids), self.BATCH_SIZE):
+                self._write({id: items[id] for id in ids[start:start + self.BATCH_SIZE]})
+            
+            self.logger.debug(f"Saved {len(ids)} entities to Redis with prefix {self.key_prefix}")
+            return ids
+            
+        except Exception as e:
+            self.logger.error(f"Failed to save entities to Redis: {str(e)}")
+            raise
+    
+    def save_with_key(self, key: str, entity: T) -> str:
+        """
+        Save an entity under an explicit id.
+        
+        Args:
+            key: Id to store the entity under
+            entity: Entity to save
+            
+        Returns:
+            The id
+        """
+        self.update(key, entity)
+        return key
+    
+    def find_by_key(self, key: str) -> Optional[T]:
+        """
+        Find an entity saved with save_with_key.
+        
+        Args:
+            key: Id the entity was stored under
+            
+        Returns:
+            The entity if found, None otherwise
+        """
+        return self.find_by_id(key)
+    
+    def find_by_ids(self, ids: List[str]) -> Dict[str, T]:
+        """
+        Find several entities with batched MGETs.
+        
+        Args:
+            ids: IDs of the entities
+            
+        Returns:
+            Mapping of id to entity for the ids that exist
+        """
+        try:
+            result = {}
+            for start in range(0, len(ids), self.BATCH_SIZE):
+                batch = ids[start:start + self.BATCH_SIZE]
+                values = self.redis.mget([self._make_key(id) for id in batch])
+                for id, json_str in zip(batch, values):
+                    if json_str:
+                        result[id] = self.from_json(json_str)
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Failed to find entities in Redis: {str(e)}")
+            raise
+    
+    def iter_ids(self):
+        """
+        Iterate over entity ids with SSCAN, without blocking Redis.
+        
+        Yields:
+            Entity ids
+        """
+        self._ensure_index()
+        for id in self.redis.sscan_iter(self.index_key, count=self.BATCH_SIZE):
+            yield id.decode() if isinstance(id, bytes) else id
+    
     def find_all(self) -> List[T]:
         """
         Find all entities in Redis with the key prefix.
@@ -177,21 +338,19 @@ class RedisRepository(BaseRepository[T]):
             List of all entities
         """
         try:
-            # Get all keys with the prefix
-            keys = self.redis.keys(f"{self.key_prefix}:*")
+            ids = list(self.iter_ids())
             
-            if not keys:
+            if not ids:
                 return []
             
-            # Get all values in a single operation
-            values = self.redis.mget(keys)
+            found = self.find_by_ids(ids)
             
-            # Convert values to entities
-            entities = []
-            for json_str in values:
-                if json_str:
-                    entities.append(self.from_json(json_str))
+            # Drop index entries whose keys expired or were removed directly
+            missing = [id for id in ids if id not in found]
+            if missing:
+                self.redis.srem(self.index_key, *missing)
             
+            entities = list(found.values())
             self.logger.debug(f"Found {len(entities)} entities in Redis with prefix {self.key_prefix}")
             return entities
             
@@ -211,7 +370,10 @@ class RedisRepository(BaseRepository[T]):
         """
         try:
             key = self._make_key(id)
-            result = self.redis.delete(key)
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.srem(self.index_key, id)
+            result = pipe.execute()[0]
             
             success = result > 0
             if success:
@@ -233,9 +395,8 @@ class RedisRepository(BaseRepository[T]):
             Number of entities
         """
         try:
-            # Get all keys with the prefix
-            keys = self.redis.keys(f"{self.key_prefix}:*")
-            count = len(keys)
+            self._ensure_index()
+            count = self.redis.scard(self.index_key)
             
             self.logger.debug(f"Counted {count} entities in Redis with prefix {self.key_prefix}")
             return count
@@ -243,3 +404,32 @@ class RedisRepository(BaseRepository[T]):
         except Exception as e:
             self.logger.error(f"Failed to count entities in Redis: {str(e)}")
             raise
+    
+    def take_dirty(self) -> List[str]:
+        """
+        Claim the ids written since the last sync.
+        
+        The dirty set is atomically moved into a syncing set, merging ids left
+        there by a sync that did not finish. Call ack_dirty once the entities
+        are stored durably, or restore_dirty if storing them failed.
+        
+        Returns:
+            Dirty entity ids
+        """
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.sunionstore(self.syncing_key, [self.syncing_key, self.dirty_key])
+        pipe.delete(self.dirty_key)
+        pipe.smembers(self.syncing_key)
+        members = pipe.execute()[-1]
+        return [id.decode() if isinstance(id, bytes) else id for id in members]
+    
+    def ack_dirty(self) -> None:
+        """Forget the ids claimed by take_dirty."""
+        self.redis.delete(self.syncing_key)
+    
+    def restore_dirty(self) -> None:
+        """Return the ids claimed by take_dirty to the dirty set."""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.sunionstore(self.dirty_key, [self.dirty_key, self.syncing_key])
+        pipe.delete(self.syncing_key)
+        pipe.execute()
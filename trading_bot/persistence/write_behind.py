@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Persistence Queue
+
+This module provides a write-behind queue that takes MongoDB writes off the
+event handling path. Writes are appended to a local journal, queued, and
+flushed by a background thread with one bulk_write per collection when the
+batch is full or the oldest write has waited for the flush interval.
+
+Inserts and conditional updates are queued as-is. Upserts are coalesced
+per entity, so a burst of status updates for the same order becomes one
+write carrying the latest fields, and a burst of counter increments becomes
+one $inc of their sum.
+On restart, writes in the journal that were not confirmed flushed are
+replayed; inserts carry a client-assigned _id and are replayed as upserts so
+a replay never duplicates a document. When a flush fails part way, only the
+writes that were not applied are requeued. $inc updates are not idempotent
+and may still be applied twice if the process dies between a flush and its
+commit marker, or if the server applied a write whose acknowledgement was
+lost, so counters maintained through the queue should be rebuildable.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from bson import ObjectId, json_util
+from pymongo import InsertOne, ReplaceOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from trading_bot.persistence.connection_manager import ConnectionManager
+
+
+class WriteBehindQueue:
+    """
+    Journaled, coalescing write-behind queue for MongoDB collections.
+    """
+
+    # How pending upserts of the same entity combine, per update operator
+    MERGE_OPERATORS = {
+        '$set': lambda old, new: new,
+        '$inc': lambda old, new: old + new,
+        '$min': min,
+        '$max': max,
+        '$setOnInsert': lambda old, new: old,
+    }
+
+    def __init__(
+        self,
+        connection_manager: ConnectionManager,
+        journal_path: Optional[str] = None,
+        max_batch_size: int = 500,
+        flush_interval: float = 0.05,
+        max_pending: int = 50000,
+        fsync: bool = True,
+        retry_interval: float = 1.0,
+        max_journal_bytes: int = 64 * 1024 * 1024
+    ):
+        """
+        Initialize the write-behind queue.
+
+        Args:
+            connection_manager: Database connection manager
+            journal_path: Journal file; writes are only held in memory if None
+            max_batch_size: Flush once this many writes are pending
+            flush_interval: Flush once the oldest pending write is this old (seconds)
+            max_pending: Producers block while this many writes are pending
+            fsync: Sync the journal to disk before a write is acknowledged
+            retry_interval: Initial delay after a failed flush (doubles up to 30s)
+            max_journal_bytes: Rewrite the journal with only pending writes beyond this size
+        """
+        self.connection_manager = connection_manager
+        self.journal_path = journal_path
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync = fsync
+        self.retry_interval = retry_interval
+        self.max_journal_bytes = max_journal_bytes
+        self.logger = logging.getLogger(__name__)
+
+        # Pending writes in flush order, keyed by entity for upserts
+        self._pending: 'OrderedDict[Tuple, Dict[str, Any]]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._sequence = 0
+        self._pending_since: Optional[float] = None
+
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+        # Metrics
+        self.enqueued = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self._in_flight = 0
+        self._flush_latencies = deque(maxlen=1024)
+
+        self._journal = None
+        if journal_path:
+            directory = os.path.dirname(journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            recovered = self._recover()
+            self._journal = open(journal_path, 'a')
+            if recovered:
+                self.logger.warning(f"Recovered {recovered} unflushed writes from {journal_path}")
+
+    def insert(self, collection: str, document: Dict[str, Any]) -> str:
+        """
+        Queue a document insert.
+
+        Args:
+            collection: Collection name
+            document: Document to insert; an _id is assigned if missing
+
+        Returns:
+            The document _id as a string
+        """
+        document = dict(document)
+        if not document.get('_id'):
+            document['_id'] = ObjectId()
+
+        self._enqueue({'op': 'insert', 'collection': collection, 'document': document})
+        return str(document['_id'])
+
+    def upsert(self, collection: str, key: Dict[str, Any], fields: Optional[Dict[str, Any]] = None,
+               update: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Queue an upsert of the document matching key.
+
+        Pending upserts for the same collection and key are merged: later
+        $set fields override earlier ones, $inc values are summed, $min and
+        $max keep the extreme value and $setOnInsert keeps the first value.
+
+        Args:
+            collection: Collection name
+            key: Filter identifying the entity, e.g. {'internal_id': ...}
+            fields: Fields to $set
+            update: Update document using the operators above
+        """
+        merged: Dict[str, Dict[str, Any]] = {}
+        if update:
+            unsupported = set(update) - set(self.MERGE_OPERATORS)
+            if unsupported:
+                raise ValueError(f"Unsupported update operators: {sorted(unsupported)}")
+            self._merge_update(merged, update)
+        if fields:
+            self._merge_update(merged, {'$set': fields})
+        if '$set' in merged:
+            merged['$set'].pop('_id', None)
+
+        self._enqueue({'op': 'upsert', 'collection': collection, 'key': dict(key), 'update': merged})
+
+    def update(self, collection: str, query: Dict[str, Any], update: Dict[str, Dict[str, Any]]) -> None:
+        """
+        Queue an update of the document matching query, without upserting.
+
+        Conditional updates are not coalesced; each is applied in queue order.
+
+        Args:
+            collection: Collection name
+            query: Filter, e.g. one that only matches while a condition holds
+            update: Update document
+        """
+        self._enqueue({'op': 'update', 'collection': collection, 'query': dict(query), 'update': update})
+
+    def _enqueue(self, entry: Dict[str, Any]) -> None:
+        with self._condition:
+            while len(self._pending) >= self.max_pending and self._running:
+                self._condition.wait()
+
+            self._sequence += 1
+            entry['seqs'] = [self._sequence]
+            self._journal_write(entry)
+            self._add(entry)
+            self.enqueued += 1
+
+            # Wake the flush thread to start the flush interval or flush a full batch
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_size:
+                self._condition.notify_all()
+
+    @classmethod
+    def _merge_update(cls, target: Dict[str, Dict[str, Any]], newer: Dict[str, Dict[str, Any]]) -> None:
+        """Merge a newer update document into target in place."""
+        for operator, values in newer.items():
+            merge = cls.MERGE_OPERATORS[operator]
+            current = target.setdefault(operator, {})
+            for name, value in values.items():
+                current[name] = merge(current[name], value) if name in current else value
+
+    def _entry_key(self, entry: Dict[str, Any]) -> Tuple:
+        if entry['op'] == 'upsert':
+            return ('upsert', entry['collection'], json_util.dumps(entry['key'], sort_keys=True))
+        return (entry['op'], entry['collection'], entry['seqs'][0])
+
+    def _add(self, entry: Dict[str, Any]) -> None:
+        """Add an entry to the pending writes, merging upserts of the same entity."""
+        key = self._entry_key(entry)
+        existing = self._pending.get(key)
+        if existing is not None:
+            self._merge_update(existing['update'], entry['update'])
+            existing['seqs'].extend(entry['seqs'])
+            self.coalesced += 1
+        else:
+            self._pending[key] = entry
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+
+    def _requeue(self, batch: List[Tuple[Tuple, Dict[str, Any]]]) -> None:
+        """Put a failed batch back in front of the writes queued since."""
+        for key, entry in reversed(batch):
+            newer = self._pending.pop(key, None)
+            if newer is not None:
+                self._merge_update(entry['update'], newer['update'])
+                entry['seqs'].extend(newer['seqs'])
+            # Inserts may have been applied before the failure
+            entry['replay'] = True
+            self._pending[key] = entry
+            self._pending.move_to_end(key, last=False)
+        if self._pending:
+            self._pending_since = time.monotonic()
+
+    def _journal_write(self, entry: Dict[str, Any]) -> None:
+        if self._journal is None:
+            return
+        self._journal.write(json_util.dumps(entry) + '\n')
+        self._journal.flush()
+        if self.fsync:
+            os.fsync(self._journal.fileno())
+
+    def _recover(self) -> int:
+        """Load journaled writes that were not committed."""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        entries = []
+        committed = set()
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json_util.loads(line)
+                except ValueError:
+                    # Torn write at the end of the journal was never acknowledged
+                    continue
+                if 'committed' in record:
+                    committed.update(record['committed'])
+                else:
+                    entries.append(record)
+
+        for entry in entries:
+            self._sequence = max([self._sequence] + entry['seqs'])
+            entry['seqs'] = [seq for seq in entry['seqs'] if seq not in committed]
+            if entry['seqs']:
+                entry['replay'] = True
+                self._add(entry)
+
+        self._rewrite_journal()
+        return len(self._pending)
+
+    def _rewrite_journal(self) -> None:
+        """Replace the journal with the pending writes only."""
+        if self._journal is not None:
+            self._journal.close()
+
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for entry in self._pending.values():
+                f.write(json_util.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.journal_path)
+
+        if self._journal is not None:
+            self._journal = open(self.journal_path, 'a')
+
+    def _commit(self, batch: List[Tuple[Tuple, Dict[str, Any]]]) -> None:
+        """Record flushed writes in the journal."""
+        if self._journal is None:
+            return
+
+        if not self._pending:
+            self._journal.seek(0)
+            self._journal.truncate()
+        elif self._journal.tell() > self.max_journal_bytes:
+            self._rewrite_journal()
+        else:
+            seqs = [seq for _, entry in batch for seq in entry['seqs']]
+            self._journal_write({'committed': seqs})
+
+    @staticmethod
+    def _to_request(entry: Dict[str, Any]):
+        if entry['op'] == 'upsert':
+            return UpdateOne(entry['key'], entry['update'], upsert=True)
+        if entry['op'] == 'update':
+            return UpdateOne(entry['query'], entry['update'])
+        document = entry['document']
+        if entry.get('replay'):
+            return ReplaceOne({'_id': document['_id']}, document, upsert=True)
+        return InsertOne(dict(document))
+
+    def _flush_batch(self) -> int:
+        """
+        Write up to max_batch_size pending writes.
+
+        Returns:
+            int: Number of writes flushed
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = []
+                while self._pending and len(batch) < self.max_batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                if not self._pending:
+                    self._pending_since = None
+                self._in_flight = len(batch)
+                self._condition.notify_all()
+
+            if not batch:
+                return 0
+
+            groups: Dict[str, List[Tuple[Tuple, Dict[str, Any]]]] = {}
+            for item in batch:
+                groups.setdefault(item[1]['collection'], []).append(item)
+
+            start = time.perf_counter()
+            applied: List[Tuple[Tuple, Dict[str, Any]]] = []
+            try:
+                db = self.connection_manager.get_mongo_db()
+                for collection, items in groups.items():
+                    ops = [self._to_request(entry) for _, entry in items]
+                    try:
+                        db[collection].bulk_write(ops, ordered=True)
+                    except BulkWriteError as e:
+                        # Ordered bulk writes stop at the first error; everything before it is applied
+                        errors = e.details.get('writeErrors') or []
+                        applied.extend(items[:errors[0]['index'] if errors else len(items)])
+                        raise
+                    applied.extend(items)
+            except Exception:
+                with self._condition:
+                    # Requeue only what was not applied so $inc updates are not repeated
+                    applied_keys = {key for key, _ in applied}
+                    self._requeue([item for item in batch if item[0] not in applied_keys])
+                    if applied:
+                        self.flushed += len(applied)
+                        self._commit(applied)
+                    self._in_flight = 0
+                    self.flush_failures += 1
+                raise
+
+            with self._condition:
+                self._flush_latencies.append(time.perf_counter() - start)
+                self.flushed += len(batch)
+                self.flushes += 1
+                self._in_flight = 0
+                self._commit(batch)
+
+            self.logger.debug(f"Flushed {len(batch)} writes to {len(groups)} collections")
+            return len(batch)
+
+    def flush(self) -> int:
+        """
+        Synchronously write everything pending.
+
+        Returns:
+            int: Number of writes flushed
+
+        Raises:
+            Exception: The database error if a batch fails (it stays queued)
+        """
+        total = 0
+        while True:
+            flushed = self._flush_batch()
+            if not flushed:
+                return total
+            total += flushed
+
+    def start(self) -> None:
+        """Start the background flush thread."""
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, name="WriteBehind", daemon=True)
+        self._thread.start()
+        self.logger.info("Write-behind queue started")
+
+    def stop(self, flush: bool = True, timeout: float = 10.0) -> None:
+        """
+        Stop the background flush thread.
+
+        Args:
+            flush: Write everything pending before returning
+            timeout: Seconds to wait for the thread
+        """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Writes left in the journal after failed final flush: {str(e)}")
+
+    def close(self) -> None:
+        """Stop, flush and close the journal."""
+        self.stop(flush=True)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def _flush_loop(self) -> None:
+        delay = self.retry_interval
+        while True:
+            with self._condition:
+                while self._running and not self._pending:
+                    self._condition.wait()
+                while self._running and len(self._pending) < self.max_batch_size:
+                    remaining = self._pending_since + self.flush_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._running:
+                    return
+
+            try:
+                self._flush_batch()
+                delay = self.retry_interval
+            except Exception as e:
+                self.logger.error(f"Write-behind flush failed, retrying in {delay:.1f}s: {str(e)}")
+                with self._condition:
+                    self._condition.wait_for(lambda: not self._running, timeout=delay)
+                delay = min(delay * 2, 30.0)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get queue and flush metrics.
+
+        Returns:
+            Dict with queue depth, counters and flush latency in milliseconds
+        """
+        with self._condition:
+            latencies = sorted(self._flush_latencies)
+            age = time.monotonic() - self._pending_since if self._pending_since is not None else 0.0
+            journal_bytes = self._journal.tell() if self._journal is not None else 0
+
+            return {
+                'queue_depth': len(self._pending),
+                'in_flight': self._in_flight,
+                'oldest_pending_ms': age * 1000,
+                'enqueued': self.enqueued,
+                'coalesced': self.coalesced,
+                'flushed': self.flushed,
+                'flushes': self.flushes,
+                'flush_failures': self.flush_failures,
+                'journal_bytes': journal_bytes,
+                'flush_latency_ms': {
+                    'last': self._flush_latencies[-1] * 1000 if latencies else 0.0,
+                    'mean': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+                    'p99': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0,
+                    'max': latencies[-1] * 1000 if latencies else 0.0
+                }
+            }
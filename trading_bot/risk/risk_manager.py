@@ -6,7 +6,6 @@ stop-loss mechanisms, and exposure controls.
 """
 
 import logging
-import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime, timedelta
@@ -16,6 +15,7 @@ import os
 
 # Import traditional config utils for backward compatibility
 from trading_bot.common.config_utils import setup_directories, save_state, load_state
+from trading_bot.risk.var_engine import PortfolioVaREngine
 
 # Import the new typed settings system
 try:
@@ -233,8 +233,19 @@ class RiskManager:
         # VaR settings
         self.var_confidence_level = self.config.get("var_confidence_level", 0.95)
         self.var_time_horizon = self.config.get("var_time_horizon", 1)  # days
-        self.position_var = {}  # Symbol -> VaR
+        self.position_var = {}  # Symbol -> component VaR
+        self.marginal_var = {}  # Symbol -> marginal VaR per unit of exposure
         self.portfolio_var = 0.0
+        self.portfolio_cvar = 0.0
+        self.var_engine = PortfolioVaREngine(
+            window=self.config.get("var_window", 252),
+            ewma_lambda=self.config.get("var_ewma_lambda", 0.94),
+            confidence_level=self.var_confidence_level,
+            time_horizon=self.var_time_horizon,
+            n_simulations=self.config.get("var_simulations", 10000),
+            student_t_df=self.config.get("var_student_t_df"),
+            seed=self.config.get("var_seed", 42)
+        )
         
         # Daily tracking
         self.today = datetime.now().date()
@@ -902,76 +913,60 @@ class RiskManager:
         else:
             self.risk_level = RiskLevel.LOW
     
-    def calculate_var(self, market_data: Dict[str, Dict[str, Any]], method: str = "historical"):
+    def on_bar(self, prices: Dict[str, float]):
         """
-        Calculate Value at Risk (VaR) for portfolio.
+        Feed one bar of prices to the VaR engine.
+        
+        Updates the rolling returns window and the EWMA covariance in place,
+        so calculate_var does not have to rebuild them from price lists.
         
         Args:
-            market_data: Dictionary mapping symbols to market data
-            method: VaR calculation method ('historical', 'parametric', or 'monte_carlo')
+            prices: Mapping of symbol to bar close price
         """
-        if method == "historical":
-            self._calculate_historical_var(market_data)
-        elif method == "parametric":
-            self._calculate_parametric_var(market_data)
-        elif method == "monte_carlo":
-            self._calculate_monte_carlo_var(market_data)
-        else:
-            logger.warning(f"Unknown VaR method: {method}, using historical")
-            self._calculate_historical_var(market_data)
+        self.var_engine.update(prices)
     
-    def _calculate_historical_var(self, market_data: Dict[str, Dict[str, Any]]):
+    def calculate_var(self, market_data: Dict[str, Dict[str, Any]], method: str = "historical") -> Dict[str, Any]:
         """
-        Calculate VaR using historical method.
+        Calculate Value at Risk (VaR) for portfolio.
+        
+        Positions are combined through their return covariance instead of
+        summing per-position VaRs. The engine is synced with the "close" price
+        lists in market_data: bars newer than the ones it holds are added
+        incrementally, and symbols it has not seen are seeded.
         
         Args:
             market_data: Dictionary mapping symbols to market data
-        """
-        # For each position, calculate historical returns
-        position_vars = {}
-        
-        for symbol, position in self.positions.items():
-            if symbol not in market_data:
-                continue
-            
-            # Get price history
-            prices = market_data[symbol].get("close", [])
-            if len(prices) < 30:  # Need sufficient history
-                continue
-            
-            # Calculate daily returns
-            returns = np.diff(prices) / prices[:-1]
-            
-            # Sort returns from worst to best
-            sorted_returns = np.sort(returns)
-            
-            # Find the return at the specified confidence level
-            var_index = int(len(sorted_returns) * (1 - self.var_confidence_level))
-            var_return = sorted_returns[var_index]
-            
-            # Calculate VAR in dollar terms
-            position_value = position.get("current_value", 0)
-            position_var = position_value * abs(var_return) * np.sqrt(self.var_time_horizon)
+            method: VaR calculation method ('historical', 'parametric', or 'monte_carlo')
             
-            position_vars[symbol] = position_var
-        
-        # Store position VaRs
-        self.position_var = position_vars
+        Returns:
+            Dict: VaR result with var, cvar, marginal_var and component_var
+        """
+        if method not in PortfolioVaREngine.METHODS:
+            logger.warning(f"Unknown VaR method: {method}, using historical")
+            method = "historical"
+        
+        # Add new bars from market_data and seed symbols that have no bars yet
+        history = {}
+        for symbol in self.positions:
+            prices = market_data.get(symbol, {}).get("close", [])
+            if len(prices) >= 30 or (symbol in self.var_engine.symbols and len(prices) > 0):
+                history[symbol] = prices  # New symbols need sufficient history
+        if history:
+            self.var_engine.sync_history(history)
+        
+        exposures = {
+            symbol: position.get("current_value", 0) * position.get("direction", 1)
+            for symbol, position in self.positions.items()
+        }
+        result = self.var_engine.calculate(exposures, method)
         
-        # Simple sum of position VaRs (ignoring correlations)
-        self.portfolio_var = sum(position_vars.values())
+        self.portfolio_var = result["var"]
+        self.portfolio_cvar = result["cvar"]
+        self.position_var = result["component_var"]
+        self.marginal_var = result["marginal_var"]
         
-        logger.debug(f"Historical VaR ({self.var_confidence_level*100}%, {self.var_time_horizon}-day): ${self.portfolio_var:.2f}")
-    
-    def _calculate_parametric_var(self, market_data: Dict[str, Dict[str, Any]]):
-        """Placeholder for parametric VaR calculation."""
-        logger.info("Parametric VaR calculation not yet implemented, using historical")
-        self._calculate_historical_var(market_data)
-    
-    def _calculate_monte_carlo_var(self, market_data: Dict[str, Dict[str, Any]]):
-        """Placeholder for Monte Carlo VaR calculation."""
-        logger.info("Monte Carlo VaR calculation not yet implemented, using historical")
-        self._calculate_historical_var(market_data)
+        logger.debug(f"{method.replace('_', ' ').title()} VaR ({self.var_confidence_level*100}%, {self.var_time_horizon}-day): ${self.portfolio_var:.2f}")
+        return result
     
     def check_risk_limits(self) -> Tuple[bool, List[str]]:
         """
@@ -1172,7 +1167,9 @@ class RiskManager:
                 - total_portfolio_risk: Portfolio exposure as percentage
                 - risk_level: Current risk level classification (string name)
                 - portfolio_var: Portfolio-level Value at Risk
-                - position_var: Dictionary mapping symbols to position VaR
+                - portfolio_cvar: Portfolio-level Conditional VaR (expected shortfall)
+                - position_var: Dictionary mapping symbols to component VaR
+                - marginal_var: Dictionary mapping symbols to marginal VaR
                 - positions_count: Number of open positions
                 - timestamp: ISO format timestamp of the metrics
                 
@@ -1205,7 +1202,9 @@ class RiskManager:
             "total_portfolio_risk": self.total_portfolio_risk,
             "risk_level": self.risk_level.name,
             "portfolio_var": self.portfolio_var,
+            "portfolio_cvar": self.portfolio_cvar,
             "position_var": self.position_var,
+            "marginal_var": self.marginal_var,
             "positions_count": len(self.positions),
             "timestamp": datetime.now().isoformat()
         }
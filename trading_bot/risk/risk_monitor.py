@@ -1,12 +1,79 @@
 import logging
 import numpy as np
-import pandas as pd
+from collections import deque
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 
+
+class _RollingSum:
+    """Sum of the last `window` values, updated in constant time."""
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self._updates = 0
+    
+    def add(self, value: float) -> None:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+        
+        # Re-sum once per window so floating point error cannot accumulate
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self.total = sum(self.values)
+    
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+
+class _PortfolioState:
+    """Running statistics of one portfolio, updated in constant time."""
+    
+    def __init__(self, timeframes: Dict[str, Dict[str, Any]]):
+        self.first_value = None
+        self.last_value = None
+        self.max_value = float("-inf")
+        self.min_value = float("inf")
+        self.peak = float("-inf")
+        self.current_drawdown = 0.0
+        self.max_drawdown = 0.0
+        
+        # Welford running mean/variance of returns
+        self.return_count = 0
+        self.return_mean = 0.0
+        self.return_m2 = 0.0
+        
+        self.rolling = {name: _RollingSum(params["window"]) for name, params in timeframes.items()}
+        self.breaches = []
+    
+    def add_return(self, value: float) -> None:
+        self.return_count += 1
+        delta = value - self.return_mean
+        self.return_mean += delta / self.return_count
+        self.return_m2 += delta * (value - self.return_mean)
+        for rolling in self.rolling.values():
+            rolling.add(value)
+    
+    @property
+    def volatility(self) -> float:
+        """Annualized population standard deviation of returns."""
+        if self.return_count < 2:
+            return 0.0
+        return np.sqrt(self.return_m2 / self.return_count) * np.sqrt(252)
+
+
 class RiskMonitor:
     """
     Monitors risk across multiple timeframes and portfolios.
+    
+    Drawdowns, rolling timeframe returns and breach counts are maintained as
+    running state, so each update costs the same however long the monitor has
+    been running. Value, return and drawdown histories are kept for the most
+    recent `history_size` updates (config, default 10000).
     """
     def __init__(self, config=None):
         self.config = config or {}
@@ -23,9 +90,11 @@ class RiskMonitor:
                     self.timeframes[timeframe].update(params)
         
         # Initialize portfolio tracking
+        self.history_size = self.config.get("history_size", 10000)
         self.portfolio_values = {}
         self.portfolio_returns = {}
         self.portfolio_drawdowns = {}
+        self._state: Dict[str, _PortfolioState] = {}
         
         # Risk breach tracking
         self.risk_breaches = []
@@ -61,46 +130,53 @@ class RiskMonitor:
         timestamp = timestamp or datetime.now()
         
         # Initialize if first update
-        if portfolio_id not in self.portfolio_values:
-            self.portfolio_values[portfolio_id] = []
-            self.portfolio_returns[portfolio_id] = []
+        if portfolio_id not in self._state:
+            self.portfolio_values[portfolio_id] = deque(maxlen=self.history_size)
+            self.portfolio_returns[portfolio_id] = deque(maxlen=self.history_size)
+            self.portfolio_drawdowns[portfolio_id] = deque(maxlen=self.history_size)
+            self._state[portfolio_id] = _PortfolioState(self.timeframes)
+        state = self._state[portfolio_id]
         
         # Add new value
         self.portfolio_values[portfolio_id].append((timestamp, value))
         
         # Calculate return if we have previous values
-        if len(self.portfolio_values[portfolio_id]) > 1:
-            prev_time, prev_value = self.portfolio_values[portfolio_id][-2]
-            current_return = (value / prev_value - 1) * 100
+        if state.last_value:
+            current_return = (value / state.last_value - 1) * 100
             self.portfolio_returns[portfolio_id].append((timestamp, current_return))
+            state.add_return(current_return)
+        
+        if state.first_value is None:
+            state.first_value = value
+        state.last_value = value
+        state.max_value = max(state.max_value, value)
+        state.min_value = min(state.min_value, value)
         
         # Update drawdown
-        self._update_drawdown(portfolio_id)
+        self._update_drawdown(portfolio_id, timestamp, value)
         
         # Check for risk breaches
         self._check_breaches(portfolio_id, timestamp)
     
-    def _update_drawdown(self, portfolio_id):
+    def _update_drawdown(self, portfolio_id, timestamp, value):
         """
-        Recalculate drawdown for a portfolio.
+        Update drawdown from the running peak.
         
         Args:
             portfolio_id: Portfolio identifier
+            timestamp: Timestamp of the value
+            value: Latest portfolio value
         """
-        values = [v for _, v in self.portfolio_values[portfolio_id]]
-        dates = [d for d, _ in self.portfolio_values[portfolio_id]]
-        
-        if len(values) < 2:
-            return
-        
-        # Calculate running maximum
-        running_max = np.maximum.accumulate(values)
+        state = self._state[portfolio_id]
+        state.peak = max(state.peak, value)
         
         # Calculate drawdown percentage
-        drawdowns = [(value / peak - 1) * 100 for value, peak in zip(values, running_max)]
+        drawdown = (value / state.peak - 1) * 100 if state.peak else 0.0
+        state.current_drawdown = drawdown
+        state.max_drawdown = min(state.max_drawdown, drawdown)
         
         # Store drawdown series
-        self.portfolio_drawdowns[portfolio_id] = list(zip(dates, drawdowns))
+        self.portfolio_drawdowns[portfolio_id].append((timestamp, drawdown))
     
     def _check_breaches(self, portfolio_id, timestamp):
         """
@@ -110,19 +186,15 @@ class RiskMonitor:
             portfolio_id: Portfolio identifier
             timestamp: Current timestamp
         """
-        returns = [(d, r) for d, r in self.portfolio_returns[portfolio_id] if d <= timestamp]
-        
-        if not returns:
-            return
+        state = self._state[portfolio_id]
         
         # Check each timeframe
         for timeframe, params in self.timeframes.items():
-            window = params["window"]
+            rolling = state.rolling[timeframe]
             threshold = params["threshold"]
             
-            if len(returns) >= window:
-                recent_returns = returns[-window:]
-                cumulative_return = sum(r for _, r in recent_returns)
+            if rolling.full:
+                cumulative_return = rolling.total
                 
                 if cumulative_return <= threshold:
                     breach = {
@@ -134,6 +206,7 @@ class RiskMonitor:
                         "severity": abs(cumulative_return / threshold)
                     }
                     self.risk_breaches.append(breach)
+                    state.breaches.append(breach)
                     self.logger.warning(f"Risk breach in {portfolio_id}: {timeframe} return {cumulative_return:.2f}% exceeded threshold {threshold:.2f}%")
     
     def run_stress_test(self, portfolio_id, strategy_allocations, strategy_profiles):
@@ -221,35 +294,26 @@ class RiskMonitor:
         }
         
         for portfolio in portfolios:
-            if portfolio not in self.portfolio_values:
+            state = self._state.get(portfolio)
+            if state is None:
                 continue
-                
-            # Get most recent values
-            current_value = self.portfolio_values[portfolio][-1][1] if self.portfolio_values[portfolio] else 0
-            
-            # Calculate current drawdown
-            current_drawdown = self.portfolio_drawdowns[portfolio][-1][1] if self.portfolio_drawdowns[portfolio] else 0
             
             # Calculate recent returns
-            recent_returns = {}
-            for timeframe, params in self.timeframes.items():
-                window = params["window"]
-                if portfolio in self.portfolio_returns and len(self.portfolio_returns[portfolio]) >= window:
-                    recent_returns[timeframe] = sum(r for _, r in self.portfolio_returns[portfolio][-window:])
-                else:
-                    recent_returns[timeframe] = None
+            recent_returns = {
+                timeframe: rolling.total if rolling.full else None
+                for timeframe, rolling in state.rolling.items()
+            }
             
             # Get recent breaches
-            portfolio_breaches = [b for b in self.risk_breaches if b["portfolio_id"] == portfolio]
-            recent_breaches = sorted(portfolio_breaches[-5:], key=lambda x: x["timestamp"], reverse=True) if portfolio_breaches else []
+            recent_breaches = sorted(state.breaches[-5:], key=lambda x: x["timestamp"], reverse=True)
             
             # Add to report
             report["portfolios"][portfolio] = {
-                "current_value": current_value,
-                "current_drawdown": current_drawdown,
+                "current_value": state.last_value,
+                "current_drawdown": state.current_drawdown,
                 "recent_returns": recent_returns,
                 "recent_breaches": recent_breaches,
-                "breach_count": len(portfolio_breaches)
+                "breach_count": len(state.breaches)
             }
         
         return report
@@ -264,30 +328,13 @@ class RiskMonitor:
         Returns:
             dict: Portfolio risk metrics
         """
-        if portfolio_id not in self.portfolio_values or not self.portfolio_values[portfolio_id]:
+        state = self._state.get(portfolio_id)
+        if state is None:
             return {}
         
-        # Get portfolio values as pandas series
-        dates = [d for d, _ in self.portfolio_values[portfolio_id]]
-        values = [v for _, v in self.portfolio_values[portfolio_id]]
-        portfolio_series = pd.Series(values, index=dates)
-        
-        # Get returns
+        # Get retained returns
         returns = [r for _, r in self.portfolio_returns[portfolio_id]]
         
-        # Calculate metrics
-        current_value = values[-1]
-        max_value = max(values)
-        min_value = min(values)
-        current_drawdown = self.portfolio_drawdowns[portfolio_id][-1][1] if self.portfolio_drawdowns[portfolio_id] else 0
-        max_drawdown = min([d for _, d in self.portfolio_drawdowns[portfolio_id]]) if self.portfolio_drawdowns[portfolio_id] else 0
-        
-        # Calculate volatility (annualized)
-        if len(returns) > 1:
-            volatility = np.std(returns) * np.sqrt(252)
-        else:
-            volatility = 0
-        
         # Calculate VaR (Value at Risk)
         if len(returns) > 0:
             var_95 = np.percentile(returns, 5)  # 95% VaR
@@ -297,19 +344,21 @@ class RiskMonitor:
             var_99 = 0
         
         return {
-            "current_value": current_value,
-            "max_value": max_value,
-            "min_value": min_value,
-            "return_pct": (current_value / values[0] - 1) * 100 if values else 0,
-            "current_drawdown": current_drawdown,
-            "max_drawdown": max_drawdown,
-            "volatility": volatility,
+            "current_value": state.last_value,
+            "max_value": state.max_value,
+            "min_value": state.min_value,
+            "return_pct": (state.last_value / state.first_value - 1) * 100 if state.first_value else 0,
+            "current_drawdown": state.current_drawdown,
+            "max_drawdown": state.max_drawdown,
+            "volatility": state.volatility,
             "var_95": var_95,
             "var_99": var_99,
-            "breach_count": len([b for b in self.risk_breaches if b["portfolio_id"] == portfolio_id])
+            "breach_count": len(state.breaches)
         }
         
     def reset(self):
         """Reset risk monitor state."""
         # Keep portfolio history for analysis but clear breaches
-        self.risk_breaches = [] 
\ No newline at end of file
+        self.risk_breaches = []
+        for state in self._state.values():
+            state.breaches = [] 
\ No newline at end of file
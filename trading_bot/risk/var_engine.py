@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Portfolio VaR Engine - Incremental returns and covariance state for
+correlation-aware Value at Risk.
+
+The engine keeps a rolling window of per-symbol returns and an EWMA
+covariance matrix that are updated in place as bars arrive, so a VaR request
+only has to combine the current exposures with state that is already there:
+
+- historical: full revaluation of the exposures over the returns window
+- parametric: variance-covariance VaR from the EWMA covariance
+- monte_carlo: seeded, batched simulations from the EWMA covariance
+  (normal or Student-t)
+
+Each method also reports marginal and component VaR per position. Component
+VaRs sum to the portfolio VaR.
+"""
+
+import logging
+from statistics import NormalDist
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("VaREngine")
+
+
+class PortfolioVaREngine:
+    """
+    Rolling returns matrix and EWMA covariance with vectorized VaR/CVaR.
+
+    update() costs O(k^2) for k symbols (one rank-one covariance update).
+    VaR requests cost O(window * k) for historical and O(k^2) for parametric.
+    """
+
+    METHODS = ("historical", "parametric", "monte_carlo")
+    TAIL_LENGTH = 10  # Recent prices kept per symbol to locate new bars in price lists
+
+    def __init__(self,
+                 window: int = 252,
+                 ewma_lambda: float = 0.94,
+                 confidence_level: float = 0.95,
+                 time_horizon: int = 1,
+                 n_simulations: int = 10000,
+                 simulation_batch_size: int = 2000,
+                 student_t_df: Optional[float] = None,
+                 seed: int = 42,
+                 initial_capacity: int = 64):
+        """
+        Initialize the engine.
+
+        Args:
+            window: Number of returns kept for historical VaR
+            ewma_lambda: EWMA decay factor for the covariance (RiskMetrics uses 0.94)
+            confidence_level: VaR confidence level
+            time_horizon: VaR horizon in bars (square-root-of-time scaling)
+            n_simulations: Monte Carlo scenarios
+            simulation_batch_size: Scenarios generated per batch
+            student_t_df: Degrees of freedom for Student-t simulations (normal if None)
+            seed: Random seed for Monte Carlo simulations
+            initial_capacity: Initial number of symbol slots
+        """
+        if not 0 < ewma_lambda < 1:
+            raise ValueError("ewma_lambda must be between 0 and 1")
+        if student_t_df is not None and student_t_df <= 2:
+            raise ValueError("student_t_df must be greater than 2")
+
+        self.window = window
+        self.ewma_lambda = ewma_lambda
+        self.confidence_level = confidence_level
+        self.time_horizon = time_horizon
+        self.n_simulations = n_simulations
+        self.simulation_batch_size = simulation_batch_size
+        self.student_t_df = student_t_df
+        self.seed = seed
+
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._tails: Dict[str, List[float]] = {}
+
+        capacity = max(1, initial_capacity)
+        # Ring buffer of returns (rows are bars, NaN where a symbol had no history)
+        self._returns = np.full((window, capacity), np.nan)
+        self._last_prices = np.full(capacity, np.nan)
+        self._cov = np.zeros((capacity, capacity))
+        self._row = 0       # Next ring buffer row to write
+        self._count = 0     # Valid rows in the ring buffer
+        self._bars = 0      # Bars seen by the covariance
+
+        # Cached Cholesky factor of the covariance
+        self._cov_version = 0
+        self._cholesky: Optional[np.ndarray] = None
+        self._cholesky_version = -1
+
+    @property
+    def n_symbols(self) -> int:
+        return len(self.symbols)
+
+    def _ensure_symbols(self, symbols: Sequence[str]) -> None:
+        """Add columns for new symbols, growing the arrays as needed."""
+        new = [s for s in symbols if s not in self._index]
+        if not new:
+            return
+
+        needed = self.n_symbols + len(new)
+        capacity = self._last_prices.shape[0]
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            k = self.n_symbols
+            returns = np.full((self.window, capacity), np.nan)
+            returns[:, :k] = self._returns[:, :k]
+            last_prices = np.full(capacity, np.nan)
+            last_prices[:k] = self._last_prices[:k]
+            cov = np.zeros((capacity, capacity))
+            cov[:k, :k] = self._cov[:k, :k]
+            self._returns, self._last_prices, self._cov = returns, last_prices, cov
+
+        for symbol in new:
+            self._index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        self._cov_version += 1
+
+    def update(self, prices: Dict[str, float]) -> None:
+        """
+        Add one bar of prices.
+
+        Symbols missing from the bar are treated as unchanged. A symbol's
+        first price only sets its reference price.
+
+        Args:
+            prices: Mapping of symbol to price for this bar
+        """
+        self._ensure_symbols(list(prices))
+        k = self.n_symbols
+
+        columns = np.fromiter((self._index[s] for s in prices), dtype=np.intp, count=len(prices))
+        values = np.fromiter(prices.values(), dtype=float, count=len(prices))
+
+        previous = self._last_prices[columns]
+        returns = np.zeros(k)
+        valid = (previous > 0) & np.isfinite(values)
+        returns[columns[valid]] = values[valid] / previous[valid] - 1.0
+        self._last_prices[columns[np.isfinite(values)]] = values[np.isfinite(values)]
+
+        for symbol, value in prices.items():
+            if np.isfinite(value):
+                tail = self._tails.setdefault(symbol, [])
+                tail.append(float(value))
+                del tail[:-self.TAIL_LENGTH]
+
+        self._returns[self._row, :k] = returns
+        self._row = (self._row + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+        # EWMA covariance: S <- lambda * S + (1 - lambda) * r r'
+        cov = self._cov[:k, :k]
+        cov *= self.ewma_lambda
+        cov += (1.0 - self.ewma_lambda) * np.outer(returns, returns)
+        self._bars += 1
+        self._cov_version += 1
+
+    def load_history(self, price_history: Dict[str, Sequence[float]]) -> None:
+        """
+        Seed symbols from price histories, aligned so the last prices coincide
+        with the most recent bar.
+
+        Args:
+            price_history: Mapping of symbol to a list of prices (oldest first)
+        """
+        returns_by_symbol = {}
+        for symbol, prices in price_history.items():
+            prices = np.asarray(prices, dtype=float)
+            if len(prices) < 2:
+                continue
+            returns_by_symbol[symbol] = (prices[1:] / prices[:-1] - 1.0)[-self.window:]
+            self._ensure_symbols([symbol])
+            self._last_prices[self._index[symbol]] = prices[-1]
+            self._tails[symbol] = prices[-self.TAIL_LENGTH:].tolist()
+        if not returns_by_symbol:
+            return
+
+        longest = max(len(r) for r in returns_by_symbol.values())
+        grew = longest > self._count
+        if grew:
+            # Rows before the current history start empty for existing symbols
+            rows = self._ring_rows(longest)[:longest - self._count]
+            self._returns[rows, :] = np.nan
+            self._count = longest
+            self._bars = max(self._bars, longest)
+
+        for symbol, returns in returns_by_symbol.items():
+            column = self._index[symbol]
+            rows = self._ring_rows(self._count)
+            self._returns[rows, column] = np.nan
+            self._returns[rows[len(rows) - len(returns):], column] = returns
+
+        if grew:
+            self._recompute_covariance()
+        else:
+            self._recompute_covariance([self._index[s] for s in returns_by_symbol])
+
+    def sync_history(self, price_history: Dict[str, Sequence[float]]) -> None:
+        """
+        Bring the engine up to date with price histories.
+
+        The most recent prices the engine has seen for each symbol are
+        located in its history and only the prices after them are added as
+        new bars. Symbols the engine has never seen are seeded with
+        load_history(). Histories that do not contain the engine's recent
+        prices (lagging behind the bars fed to update(), or not overlapping
+        them at all) are skipped, keeping the engine's state.
+
+        Args:
+            price_history: Mapping of symbol to a list of prices (oldest first)
+        """
+        new_bars = {}
+        seed = {}
+        for symbol, prices in price_history.items():
+            prices = np.asarray(prices, dtype=float)
+            if symbol not in self._tails:
+                seed[symbol] = prices
+                continue
+            offset = self._new_bars_offset(symbol, prices)
+            if offset is None:
+                logger.debug(f"Skipping {symbol} history that does not reach the engine's last price")
+            elif offset < len(prices):
+                new_bars[symbol] = prices[offset:]
+
+        if new_bars:
+            # Align the latest bars; symbols with fewer new bars are unchanged before theirs
+            n_steps = max(len(bars) for bars in new_bars.values())
+            for step in range(n_steps):
+                self.update({
+                    symbol: bars[step - (n_steps - len(bars))]
+                    for symbol, bars in new_bars.items()
+                    if step >= n_steps - len(bars)
+                })
+        if seed:
+            self.load_history(seed)
+
+    def _new_bars_offset(self, symbol: str, prices: np.ndarray) -> Optional[int]:
+        """
+        Index in prices after the engine's most recent prices for symbol.
+
+        Histories shorter than the kept tail are matched on as many of the
+        most recent prices as leave one possible new bar.
+
+        Returns:
+            The offset, or None if the prices are not found
+        """
+        tail = self._tails[symbol][-(len(prices) - 1):] if len(prices) > 1 else []
+        if not tail:
+            return None
+        windows = np.lib.stride_tricks.sliding_window_view(prices, len(tail))
+        matches = np.flatnonzero((windows == np.asarray(tail)).all(axis=1))
+        if not len(matches):
+            return None
+        return int(matches[-1]) + len(tail)
+
+    def _ring_rows(self, n: int) -> np.ndarray:
+        """Ring buffer rows of the last n bars, oldest first."""
+        return (self._row - n + np.arange(n)) % self.window
+
+    def _recompute_covariance(self, columns: Optional[List[int]] = None) -> None:
+        """Rebuild the EWMA covariance (or some of its rows) from the returns window."""
+        k = self.n_symbols
+        rows = self._ring_rows(self._count)
+        matrix = np.nan_to_num(self._returns[rows, :k])
+        ages = np.arange(len(rows) - 1, -1, -1)
+        weights = (1.0 - self.ewma_lambda) * self.ewma_lambda ** ages
+
+        weighted = matrix * weights[:, None]
+        if columns is None:
+            self._cov[:k, :k] = weighted.T @ matrix
+        else:
+            block = weighted[:, columns].T @ matrix
+            self._cov[columns, :k] = block
+            self._cov[:k, columns] = block.T
+        self._cov_version += 1
+
+    def covariance(self) -> np.ndarray:
+        """
+        Get the bias-corrected EWMA covariance of per-bar returns.
+
+        Returns:
+            k x k covariance matrix in the order of self.symbols
+        """
+        k = self.n_symbols
+        weight = 1.0 - self.ewma_lambda ** max(self._bars, 1)
+        return self._cov[:k, :k] / weight
+
+    def returns_matrix(self) -> np.ndarray:
+        """
+        Get the returns window (oldest bar first), with missing history as zero.
+
+        Returns:
+            count x k returns matrix in the order of self.symbols
+        """
+        rows = self._ring_rows(self._count)
+        return np.nan_to_num(self._returns[rows, :self.n_symbols])
+
+    def exposure_vector(self, exposures: Dict[str, float]) -> np.ndarray:
+        """
+        Convert signed position values to a vector in engine symbol order.
+
+        Args:
+            exposures: Mapping of symbol to signed position value
+
+        Returns:
+            Exposure vector (symbols the engine has not seen are ignored)
+        """
+        vector = np.zeros(self.n_symbols)
+        for symbol, value in exposures.items():
+            column = self._index.get(symbol)
+            if column is None:
+                logger.debug(f"No return history for {symbol}, excluded from VaR")
+            else:
+                vector[column] = value
+        return vector
+
+    def calculate(self, exposures: Dict[str, float], method: str = "historical") -> Dict[str, Any]:
+        """
+        Calculate portfolio VaR and CVaR with per-position contributions.
+
+        Args:
+            exposures: Mapping of symbol to signed position value
+            method: 'historical', 'parametric' or 'monte_carlo'
+
+        Returns:
+            Dictionary with var, cvar (positive losses in currency units),
+            marginal_var and component_var per symbol
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown VaR method: {method}")
+
+        x = self.exposure_vector(exposures)
+        held = [s for s in exposures if s in self._index]
+        result = {
+            "method": method,
+            "confidence_level": self.confidence_level,
+            "time_horizon": self.time_horizon,
+            "var": 0.0,
+            "cvar": 0.0,
+            "marginal_var": {s: 0.0 for s in held},
+            "component_var": {s: 0.0 for s in held}
+        }
+        if not x.any() or self._count == 0:
+            return result
+
+        if method == "historical":
+            var, cvar, components = self._historical(x)
+        elif method == "parametric":
+            var, cvar, components = self._parametric(x)
+        else:
+            var, cvar, components = self._monte_carlo(x)
+
+        scale = np.sqrt(self.time_horizon)
+        result["var"] = float(var * scale)
+        result["cvar"] = float(cvar * scale)
+        for symbol in held:
+            column = self._index[symbol]
+            component = float(components[column] * scale)
+            result["component_var"][symbol] = component
+            result["marginal_var"][symbol] = component / x[column] if x[column] else 0.0
+        return result
+
+    def _historical(self, x: np.ndarray):
+        """Full revaluation over the returns window."""
+        scenarios = self.returns_matrix()
+        pnl = scenarios @ x
+        var = -np.quantile(pnl, 1.0 - self.confidence_level)
+        tail = pnl <= -var
+        cvar = -pnl[tail].mean() if tail.any() else var
+
+        # Contributions from the scenarios around the VaR quantile
+        order = np.argsort(pnl)
+        centre = int(np.floor((1.0 - self.confidence_level) * (len(pnl) - 1)))
+        band = max(1, len(pnl) // 100)
+        nearest = order[max(0, centre - band):centre + band + 1]
+        components = -x * scenarios[nearest].mean(axis=0)
+        return var, cvar, self._scale_components(components, var)
+
+    def _parametric(self, x: np.ndarray):
+        """Variance-covariance VaR from the EWMA covariance (zero mean)."""
+        sigma_x = self.covariance() @ x
+        sigma_p = np.sqrt(max(float(x @ sigma_x), 0.0))
+        if sigma_p == 0:
+            return 0.0, 0.0, np.zeros_like(x)
+
+        z = NormalDist().inv_cdf(self.confidence_level)
+        var = z * sigma_p
+        cvar = sigma_p * np.exp(-0.5 * z * z) / np.sqrt(2 * np.pi) / (1.0 - self.confidence_level)
+        # Euler allocation: component_i = x_i * dVaR/dx_i
+        components = x * z * sigma_x / sigma_p
+        return var, cvar, components
+
+    def _monte_carlo(self, x: np.ndarray):
+        """Seeded, batched simulations from the EWMA covariance."""
+        factor = self._cholesky_factor()
+        loading = factor.T @ x
+        rng = np.random.default_rng(self.seed)
+
+        pnl = np.empty(self.n_simulations)
+        for start in range(0, self.n_simulations, self.simulation_batch_size):
+            size = min(self.simulation_batch_size, self.n_simulations - start)
+            shocks = rng.standard_normal((size, len(x)))
+            batch = shocks @ loading
+            if self.student_t_df is not None:
+                df = self.student_t_df
+                batch *= np.sqrt((df - 2.0) / rng.chisquare(df, size))
+            pnl[start:start + size] = batch
+
+        var = -np.quantile(pnl, 1.0 - self.confidence_level)
+        tail = pnl <= -var
+        cvar = -pnl[tail].mean() if tail.any() else var
+
+        # The simulated distribution is elliptical, so contributions are
+        # proportional to x_i * (Sigma x)_i
+        components = x * (self.covariance() @ x)
+        return var, cvar, self._scale_components(components, var)
+
+    @staticmethod
+    def _scale_components(components: np.ndarray, var: float) -> np.ndarray:
+        total = components.sum()
+        if total == 0:
+            return components
+        return components * (var / total)
+
+    def _cholesky_factor(self) -> np.ndarray:
+        """Cholesky factor of the covariance, recomputed only after it changed."""
+        if self._cholesky_version != self._cov_version:
+            cov = self.covariance()
+            try:
+                self._cholesky = np.linalg.cholesky(cov + np.eye(len(cov)) * 1e-12)
+            except np.linalg.LinAlgError:
+                # Not positive definite (e.g. fewer bars than symbols): clip eigenvalues
+                eigenvalues, eigenvectors = np.linalg.eigh(cov)
+                self._cholesky = eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+            self._cholesky_version = self._cov_version
+        return self._cholesky
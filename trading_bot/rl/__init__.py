@@ -7,7 +7,7 @@ This package provides reinforcement learning tools for portfolio optimization,
 including environments, agents, and training utilities.
 """
 
-from .trading_env import TradingEnv
+from .trading_env import TradingEnv, VectorTradingEnv
 from .agent_trainer import AgentTrainer, TrainingProgressCallback
 
-__all__ = ['TradingEnv', 'AgentTrainer', 'TrainingProgressCallback'] 
\ No newline at end of file
+__all__ = ['TradingEnv', 'VectorTradingEnv', 'AgentTrainer', 'TrainingProgressCallback'] 
\ No newline at end of file
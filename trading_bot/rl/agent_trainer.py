@@ -21,11 +21,84 @@ from stable_baselines3 import PPO, A2C, DDPG, SAC, TD3
 from stable_baselines3.common.callbacks import BaseCallback, EvalCallback, CheckpointCallback
 from stable_baselines3.common.logger import configure
 from stable_baselines3.common.monitor import Monitor
-from stable_baselines3.common.vec_env import DummyVecEnv, VecNormalize
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecEnv, VecNormalize
 from stable_baselines3.common.evaluation import evaluate_policy
 
 # Import our custom environment
-from trading_bot.rl.trading_env import TradingEnv
+from trading_bot.rl.trading_env import TradingEnv, VectorTradingEnv
+
+
+class TradingVecEnv(VecEnv):
+    """
+    Stable-Baselines3 VecEnv interface for VectorTradingEnv.
+    """
+    
+    def __init__(self, venv: VectorTradingEnv):
+        """
+        Initialize the wrapper.
+        
+        Args:
+            venv: Vectorized trading environment
+        """
+        self.venv = venv
+        self._actions = None
+        super(TradingVecEnv, self).__init__(venv.num_envs, venv.single_observation_space, venv.single_action_space)
+    
+    def reset(self) -> np.ndarray:
+        """Reset all episodes and return the initial observations."""
+        observations, _ = self.venv.reset(seed=self._seeds[0] if self._seeds else None)
+        self._reset_seeds()
+        return observations
+    
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = actions
+    
+    def step_wait(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[Dict[str, Any]]]:
+        observations, rewards, terminated, truncated, info = self.venv.step(self._actions)
+        dones = terminated | truncated
+        
+        keys = [key for key in info if key != 'final_obs']
+        infos = [{key: info[key][i] for key in keys} for i in range(self.num_envs)]
+        if 'final_obs' in info:
+            for i in np.flatnonzero(dones):
+                infos[i]['terminal_observation'] = info['final_obs'][i]
+                infos[i]['TimeLimit.truncated'] = bool(truncated[i] and not terminated[i])
+        
+        return observations, rewards.astype(np.float32), dones, infos
+    
+    def close(self) -> None:
+        self.venv.close()
+    
+    def get_attr(self, attr_name: str, indices=None) -> List[Any]:
+        return [getattr(self.venv.env, attr_name)] * len(self._get_indices(indices))
+    
+    def set_attr(self, attr_name: str, value: Any, indices=None) -> None:
+        setattr(self.venv.env, attr_name, value)
+    
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> List[Any]:
+        result = getattr(self.venv.env, method_name)(*method_args, **method_kwargs)
+        return [result] * len(self._get_indices(indices))
+    
+    def env_is_wrapped(self, wrapper_class, indices=None) -> List[bool]:
+        return [False] * len(self._get_indices(indices))
+
+
+def _make_env(env: TradingEnv) -> Callable[[], TradingEnv]:
+    """Factory that builds a copy of an environment (for subprocess workers)."""
+    def _init() -> TradingEnv:
+        return TradingEnv(
+            df_dict=env.df_dict,
+            features_list=env.features_list,
+            initial_balance=env.initial_balance,
+            trading_cost=env.trading_cost,
+            slippage=env.slippage,
+            window_size=env.window_size,
+            max_steps=env.max_episode_steps,
+            reward_type=env.reward_type,
+            reward_scale=env.reward_scale,
+            allow_short=env.allow_short
+        )
+    return _init
 
 
 class TrainingProgressCallback(BaseCallback):
@@ -166,7 +239,9 @@ class AgentTrainer:
                  eval_env: Optional[TradingEnv] = None,
                  agent_type: str = 'ppo',
                  model_params: Optional[Dict[str, Any]] = None,
-                 output_dir: str = './rl_models'):
+                 output_dir: str = './rl_models',
+                 n_envs: int = 1,
+                 vec_env_type: str = 'vector'):
         """
         Initialize the agent trainer.
         
@@ -176,8 +251,16 @@ class AgentTrainer:
             agent_type: Type of RL agent ('ppo', 'a2c', 'sac', 'ddpg', 'td3')
             model_params: Parameters for the RL agent
             output_dir: Directory for saving models and logs
+            n_envs: Number of training episodes collected in parallel
+                (-1 = one per CPU core)
+            vec_env_type: How parallel episodes are stepped: 'vector' (one
+                VectorTradingEnv stepping all episodes with array operations)
+                or 'subproc' (one TradingEnv per worker process)
         """
         self.train_env = train_env
+        self.n_envs = (os.cpu_count() or 1) if n_envs == -1 else n_envs
+        self.vec_env_type = vec_env_type.lower()
+        self.vec_env = self._create_vec_env()
         self.eval_env = eval_env or train_env
         self.agent_type = agent_type.lower()
         self.model_params = model_params or {}
@@ -196,6 +279,23 @@ class AgentTrainer:
         # Generate a unique run ID
         self.run_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         
+    def _create_vec_env(self) -> Union[TradingEnv, VecEnv]:
+        """
+        Create the environment the agent collects experience from.
+        
+        Returns:
+            train_env itself for a single episode, otherwise a VecEnv
+        """
+        if self.n_envs <= 1:
+            return self.train_env
+        
+        if self.vec_env_type == 'vector':
+            return TradingVecEnv(VectorTradingEnv(self.train_env, self.n_envs))
+        elif self.vec_env_type == 'subproc':
+            return SubprocVecEnv([_make_env(self.train_env) for _ in range(self.n_envs)])
+        else:
+            raise ValueError(f"Unsupported vectorized environment type: {self.vec_env_type}")
+    
     def _create_agent(self) -> Any:
         """
         Create a reinforcement learning agent.
@@ -205,15 +305,15 @@ class AgentTrainer:
         """
         # Create and configure the agent based on type
         if self.agent_type == 'ppo':
-            model = PPO('MlpPolicy', self.train_env, verbose=1, **self.model_params)
+            model = PPO('MlpPolicy', self.vec_env, verbose=1, **self.model_params)
         elif self.agent_type == 'a2c':
-            model = A2C('MlpPolicy', self.train_env, verbose=1, **self.model_params)
+            model = A2C('MlpPolicy', self.vec_env, verbose=1, **self.model_params)
         elif self.agent_type == 'sac':
-            model = SAC('MlpPolicy', self.train_env, verbose=1, **self.model_params)
+            model = SAC('MlpPolicy', self.vec_env, verbose=1, **self.model_params)
         elif self.agent_type == 'ddpg':
-            model = DDPG('MlpPolicy', self.train_env, verbose=1, **self.model_params)
+            model = DDPG('MlpPolicy', self.vec_env, verbose=1, **self.model_params)
         elif self.agent_type == 'td3':
-            model = TD3('MlpPolicy', self.train_env, verbose=1, **self.model_params)
+            model = TD3('MlpPolicy', self.vec_env, verbose=1, **self.model_params)
         else:
             raise ValueError(f"Unsupported agent type: {self.agent_type}")
         
@@ -434,15 +534,15 @@ class AgentTrainer:
             filepath: Path to the saved model
         """
         if self.agent_type == 'ppo':
-            self.model = PPO.load(filepath, env=self.train_env)
+            self.model = PPO.load(filepath, env=self.vec_env)
         elif self.agent_type == 'a2c':
-            self.model = A2C.load(filepath, env=self.train_env)
+            self.model = A2C.load(filepath, env=self.vec_env)
         elif self.agent_type == 'sac':
-            self.model = SAC.load(filepath, env=self.train_env)
+            self.model = SAC.load(filepath, env=self.vec_env)
         elif self.agent_type == 'ddpg':
-            self.model = DDPG.load(filepath, env=self.train_env)
+            self.model = DDPG.load(filepath, env=self.vec_env)
         elif self.agent_type == 'td3':
-            self.model = TD3.load(filepath, env=self.train_env)
+            self.model = TD3.load(filepath, env=self.vec_env)
         else:
             raise ValueError(f"Unsupported agent type: {self.agent_type}")
             
@@ -519,9 +619,9 @@ class AgentTrainer:
                     current_prices[symbol] = 0.0
             
             # Set portfolio positions
-            for symbol, shares in current_portfolio.items():
-                if symbol in env.portfolio:
-                    env.portfolio[symbol] = shares
+            for i, symbol in enumerate(env.asset_list):
+                if symbol in current_portfolio:
+                    env.positions[i] = current_portfolio[symbol]
             
             # Recalculate portfolio value
             portfolio_value = cash
@@ -4,17 +4,191 @@
 Trading Environment Module for Reinforcement Learning
 
 This module provides a custom OpenAI Gym environment for training
-reinforcement learning agents on portfolio optimization tasks.
+reinforcement learning agents on portfolio optimization tasks, and a
+vectorized variant that steps many episodes at once.
+
+Market data is converted once into arrays: a contiguous
+(time, assets, features) float32 feature tensor and a (time, assets) close
+price matrix. Observations copy a window of the tensor and portfolio
+accounting works on position arrays, so stepping never touches pandas.
 """
 
 import numpy as np
 import pandas as pd
 import gymnasium as gym
 from gymnasium import spaces
+from gymnasium.vector.utils import batch_space
 from typing import Dict, List, Any, Tuple, Optional, Union
 from collections import defaultdict
 
 
+def _normalize_allocations(action: np.ndarray, allow_short: bool) -> np.ndarray:
+    """
+    Scale actions so the absolute allocations of each row sum to 1.0.
+    
+    Args:
+        action: Raw actions, shape (..., num_assets)
+        allow_short: Whether negative allocations are allowed
+        
+    Returns:
+        Allocation array (all zeros, i.e. all cash, where every action is zero)
+    """
+    action = np.asarray(action)
+    if not allow_short:
+        # If shorts not allowed, ensure all values are positive then normalize
+        action = np.maximum(action, 0.0)
+    
+    action_sum = np.sum(np.abs(action), axis=-1, keepdims=True)
+    return np.divide(action, action_sum, out=np.zeros_like(action), where=action_sum > 0)
+
+
+def _rebalance(positions: np.ndarray, cash: Union[float, np.ndarray], prices: np.ndarray,
+               allocations: np.ndarray, trading_cost: float, slippage: float) -> Tuple:
+    """
+    Trade every asset towards its target allocation at the given prices.
+    
+    Args:
+        positions: Shares held, shape (..., num_assets)
+        cash: Cash balance, shape (...)
+        prices: Current prices, shape (num_assets,)
+        allocations: Target allocations, shape (..., num_assets)
+        trading_cost: Trading cost as percentage of trade value
+        slippage: Slippage as percentage of asset price
+        
+    Returns:
+        Tuple of (positions, cash, shares traded, number of trades, trading costs)
+    """
+    current_values = positions * prices
+    total_value = np.expand_dims(cash + current_values.sum(axis=-1), -1)
+    
+    # Calculate trade value (positive = buy, negative = sell)
+    trade_values = allocations * total_value - current_values
+    
+    # Only trade if the difference is significant
+    traded = np.abs(trade_values) > 0.01
+    costs = np.where(traded, np.abs(trade_values) * trading_cost, 0.0)
+    
+    # Apply slippage - adjust price worse for the trader
+    trade_prices = prices * (1 + np.sign(trade_values) * slippage)
+    shares = np.where(traded, trade_values / trade_prices, 0.0)
+    
+    # Subtract both the trade value and the trading cost from cash
+    cash = cash - np.where(traded, trade_values + costs, 0.0).sum(axis=-1)
+    
+    return positions + shares, cash, shares, traded.sum(axis=-1), costs.sum(axis=-1)
+
+
+def _update_moments(count, mean, m2, value, mask=True) -> Tuple:
+    """Welford update of a running mean and sum of squared deviations where mask is set."""
+    count = count + mask
+    delta = value - mean
+    mean = mean + np.where(mask, delta / np.maximum(count, 1), 0.0)
+    m2 = m2 + np.where(mask, delta * (value - mean), 0.0)
+    return count, mean, m2
+
+
+def _risk_adjusted_reward(reward_type: str, returns: Union[float, np.ndarray],
+                          return_moments: Tuple, downside_moments: Tuple) -> Union[float, np.ndarray]:
+    """
+    Calculate the unscaled reward from running return moments.
+    
+    Args:
+        reward_type: Type of reward function ('returns', 'sharpe', 'sortino')
+        returns: Latest portfolio returns
+        return_moments: Running (count, mean, m2) of all episode returns
+        downside_moments: Running (count, mean, m2) of negative episode returns
+        
+    Returns:
+        Reward value(s)
+    """
+    count, mean, m2 = return_moments
+    if reward_type == 'sharpe':
+        # Sharpe ratio based reward
+        volatility = np.sqrt(m2 / np.maximum(count, 1))
+        return np.where(count > 1, mean / np.maximum(volatility, 1e-8), 0.0)
+    
+    if reward_type == 'sortino':
+        # Sortino ratio based reward; with no negative returns, a high reward
+        negative_count, _, negative_m2 = downside_moments
+        downside_deviation = np.sqrt(negative_m2 / np.maximum(negative_count, 1))
+        sortino = np.where(negative_count > 0, mean / np.maximum(downside_deviation, 1e-8), mean * 10)
+        return np.where(count > 1, sortino, 0.0)
+    
+    # Simple returns-based reward (also the default)
+    return returns
+
+
+def _update_episode_ratios(return_moments: Tuple, downside_moments: Tuple,
+                           volatility, sharpe, sortino) -> Tuple:
+    """
+    Update episode volatility, Sharpe and Sortino ratios after a step.
+    
+    Ratios keep their previous value while they are undefined (fewer than two
+    returns, zero volatility or no downside deviation).
+    
+    Returns:
+        Tuple of (volatility, sharpe, sortino)
+    """
+    count, mean, m2 = return_moments
+    negative_count, _, negative_m2 = downside_moments
+    
+    enough = count > 1
+    volatility = np.where(enough, np.sqrt(m2 / np.maximum(count, 1)), volatility)
+    has_volatility = enough & (volatility > 0)
+    sharpe = np.where(has_volatility, mean / np.where(has_volatility, volatility, 1.0), sharpe)
+    
+    downside_deviation = np.sqrt(negative_m2 / np.maximum(negative_count, 1))
+    has_downside = has_volatility & (negative_count > 0) & (downside_deviation > 0)
+    sortino = np.where(has_downside, mean / np.where(has_downside, downside_deviation, 1.0), sortino)
+    
+    return volatility, sharpe, sortino
+
+
+def _build_observation(window: np.ndarray, positions: np.ndarray, cash: Union[float, np.ndarray],
+                       prices: np.ndarray, initial_balance: float,
+                       recent_returns: Union[float, np.ndarray],
+                       recent_volatility: Union[float, np.ndarray]) -> np.ndarray:
+    """
+    Assemble observations from a feature window and portfolio state.
+    
+    Args:
+        window: Feature window, shape (window_size, num_assets, num_features)
+        positions: Shares held, shape (..., num_assets)
+        cash: Cash balance, shape (...)
+        prices: Current prices, shape (num_assets,)
+        initial_balance: Starting cash balance
+        recent_returns: Mean of recent returns, shape (...)
+        recent_volatility: Standard deviation of recent returns, shape (...)
+        
+    Returns:
+        float32 observations, shape (..., obs_dim)
+    """
+    batch_shape = np.shape(cash)
+    num_assets = positions.shape[-1]
+    feature_dim = window.size
+    observation = np.empty(batch_shape + (feature_dim + num_assets + 4,), dtype=np.float32)
+    
+    # 1. Historical features, flattened asset by asset
+    observation[..., :feature_dim] = window.transpose(1, 0, 2).reshape(feature_dim)
+    
+    # 2. Current portfolio allocations (zero if the portfolio has no value)
+    values = positions * prices
+    total_value = np.asarray(cash + values.sum(axis=-1))
+    has_value = total_value > 0
+    observation[..., feature_dim:feature_dim + num_assets] = np.divide(
+        values, np.expand_dims(total_value, -1), out=np.zeros_like(values),
+        where=np.expand_dims(has_value, -1))
+    observation[..., feature_dim + num_assets] = np.divide(
+        cash, total_value, out=np.zeros(batch_shape), where=has_value)
+    
+    # 3. Portfolio performance metrics
+    observation[..., -3] = total_value / initial_balance
+    observation[..., -2] = recent_returns
+    observation[..., -1] = recent_volatility
+    
+    return observation
+
+
 class TradingEnv(gym.Env):
     """
     A trading environment for reinforcement learning portfolio optimization.
@@ -84,6 +258,15 @@ class TradingEnv(gym.Env):
             if missing_features:
                 raise ValueError(f"DataFrame for {symbol} is missing features: {missing_features}")
         
+        # Convert all assets to arrays once, aligned on the shortest history
+        num_rows = min(len(df) for df in df_dict.values())
+        self.feature_tensor = np.ascontiguousarray(np.stack(
+            [df[features_list].to_numpy(dtype=np.float32)[:num_rows] for df in df_dict.values()], axis=1
+        ))
+        self.price_matrix = np.ascontiguousarray(np.stack(
+            [df['close'].to_numpy(dtype=np.float64)[:num_rows] for df in df_dict.values()], axis=1
+        ))
+        
         # Define the action space: allocation percentage for each asset + cash
         # Values are bounded between -1 (full short) and 1 (full long) if shorts allowed
         # Or between 0 and 1 if shorts not allowed
@@ -116,7 +299,7 @@ class TradingEnv(gym.Env):
         )
         
         # Initialize state variables
-        self.portfolio = None
+        self.positions = None
         self.cash = None
         self.current_step = None
         self.nav_history = None
@@ -132,6 +315,8 @@ class TradingEnv(gym.Env):
         self.episode_sortino = None
         self.episode_trades = None
         self.episode_costs = None
+        self._return_moments = None
+        self._downside_moments = None
         
         # Reset the environment to initialize state
         self.reset()
@@ -150,13 +335,13 @@ class TradingEnv(gym.Env):
         super().reset(seed=seed)
         
         # Reset portfolio state
-        self.portfolio = {symbol: 0.0 for symbol in self.asset_list}
+        self.positions = np.zeros(len(self.asset_list))
         self.cash = self.initial_balance
         self.current_step = self.window_size
         self.nav_history = [self.initial_balance]
         self.returns_history = [0.0]
         self.portfolio_value = self.initial_balance
-        self.last_trades = {symbol: 0.0 for symbol in self.asset_list}
+        self.last_trades = np.zeros(len(self.asset_list))
         
         # Initialize history buffer for window state
         self.history = defaultdict(list)
@@ -169,18 +354,27 @@ class TradingEnv(gym.Env):
         self.episode_trades = 0
         self.episode_costs = 0.0
         
+        # Running (count, mean, sum of squared deviations) of all and of negative returns
+        self._return_moments = (0, 0.0, 0.0)
+        self._downside_moments = (0, 0.0, 0.0)
+        
         # Get initial observation
         observation = self._get_observation()
         
         info = {
             'portfolio_value': self.portfolio_value,
-            'portfolio': self.portfolio.copy(),
+            'portfolio': self.portfolio,
             'cash': self.cash,
             'step': self.current_step
         }
         
         return observation, info
     
+    @property
+    def portfolio(self) -> Dict[str, float]:
+        """Shares held per asset."""
+        return dict(zip(self.asset_list, self.positions.tolist()))
+    
     def step(self, action: np.ndarray) -> Tuple[np.ndarray, float, bool, bool, Dict]:
         """
         Execute action in the environment.
@@ -192,32 +386,17 @@ class TradingEnv(gym.Env):
             Tuple of (next_state, reward, terminated, truncated, info)
         """
         # Get current prices for all assets
-        current_prices = {symbol: self.df_dict[symbol].iloc[self.current_step]['close'] 
-                         for symbol in self.asset_list}
+        current_prices = self.price_matrix[self.current_step]
         
-        # Normalize action to ensure sum is 1.0 (proper allocation vector)
-        if not self.allow_short:
-            # If shorts not allowed, ensure all values are positive then normalize
-            action = np.maximum(action, 0.0)
-            
-        # Calculate the sum of absolute allocations (for normalization)
-        action_sum = np.sum(np.abs(action))
-        if action_sum > 0:
-            action = action / action_sum
-        else:
-            # If all actions are zero, allocate everything to cash
-            action = np.zeros_like(action)
+        # Normalize action to ensure sum is 1.0 (proper allocation vector);
+        # if all actions are zero, allocate everything to cash
+        action = _normalize_allocations(action, self.allow_short)
         
         # Store the previous portfolio value for reward calculation
         prev_portfolio_value = self.portfolio_value
         
-        # Calculate current portfolio value
-        portfolio_value = self.cash
-        for symbol, shares in self.portfolio.items():
-            portfolio_value += shares * current_prices[symbol]
-        
-        # Track last portfolio value
-        self.portfolio_value = portfolio_value
+        # Calculate current portfolio value and track it
+        self.portfolio_value = float(self.cash + self.positions @ current_prices)
         
         # Execute trades based on target allocations
         self._execute_trades(action, current_prices)
@@ -226,9 +405,7 @@ class TradingEnv(gym.Env):
         self.current_step += 1
         
         # Calculate the new portfolio value after trading
-        new_portfolio_value = self.cash
-        for symbol, shares in self.portfolio.items():
-            new_portfolio_value += shares * current_prices[symbol]
+        new_portfolio_value = float(self.cash + self.positions @ current_prices)
         
         # Calculate return and update history
         returns = (new_portfolio_value - prev_portfolio_value) / prev_portfolio_value
@@ -236,17 +413,13 @@ class TradingEnv(gym.Env):
         self.returns_history.append(returns)
         self.episode_returns.append(returns)
         
-        # Update episode metrics
-        if len(self.episode_returns) > 1:
-            self.episode_volatility = np.std(self.episode_returns)
-            if self.episode_volatility > 0:
-                self.episode_sharpe = np.mean(self.episode_returns) / self.episode_volatility
-                # Calculate Sortino ratio (downside deviation only)
-                negative_returns = [r for r in self.episode_returns if r < 0]
-                if negative_returns:
-                    downside_deviation = np.std(negative_returns)
-                    if downside_deviation > 0:
-                        self.episode_sortino = np.mean(self.episode_returns) / downside_deviation
+        # Update episode metrics from running moments
+        self._return_moments = tuple(map(float, _update_moments(*self._return_moments, returns)))
+        self._downside_moments = tuple(map(float, _update_moments(*self._downside_moments, returns, returns < 0)))
+        self.episode_volatility, self.episode_sharpe, self.episode_sortino = map(float, _update_episode_ratios(
+            self._return_moments, self._downside_moments,
+            self.episode_volatility, self.episode_sharpe, self.episode_sortino
+        ))
         
         # Calculate reward based on the specified type
         reward = self._calculate_reward(returns)
@@ -261,7 +434,7 @@ class TradingEnv(gym.Env):
         info = {
             'portfolio_value': new_portfolio_value,
             'returns': returns,
-            'portfolio': self.portfolio.copy(),
+            'portfolio': self.portfolio,
             'cash': self.cash,
             'sharpe_ratio': self.episode_sharpe,
             'sortino_ratio': self.episode_sortino,
@@ -280,75 +453,23 @@ class TradingEnv(gym.Env):
         Returns:
             Numpy array with the observation
         """
-        # 1. Get historical features for each asset
-        historical_features = []
-        
-        for symbol in self.asset_list:
-            # Get window of data for this asset
-            start_idx = self.current_step - self.window_size
-            end_idx = self.current_step
-            asset_history = self.df_dict[symbol].iloc[start_idx:end_idx]
-            
-            # Extract the requested features
-            asset_features = asset_history[self.features_list].values
-            
-            # Flatten and append
-            historical_features.append(asset_features.flatten())
-        
-        # Concatenate all historical features
-        all_features = np.concatenate(historical_features)
-        
-        # 2. Current portfolio allocations
-        current_prices = {symbol: self.df_dict[symbol].iloc[self.current_step]['close'] 
-                         for symbol in self.asset_list}
-        
-        # Calculate total portfolio value
-        total_value = self.cash
-        for symbol, shares in self.portfolio.items():
-            total_value += shares * current_prices[symbol]
-            
-        # If the portfolio has no value, set allocations to zero
-        if total_value <= 0:
-            portfolio_allocations = np.zeros(len(self.asset_list) + 1)
-        else:
-            # Calculate allocation percentages
-            portfolio_allocations = []
-            for symbol in self.asset_list:
-                value = self.portfolio[symbol] * current_prices[symbol]
-                allocation = value / total_value
-                portfolio_allocations.append(allocation)
-            
-            # Add cash allocation
-            cash_allocation = self.cash / total_value
-            portfolio_allocations.append(cash_allocation)
-            
-        # 3. Portfolio performance metrics
-        # - Current portfolio value (normalized)
-        # - Recent returns
-        # - Recent volatility
-        
-        normalized_value = total_value / self.initial_balance
+        # Window of historical features for all assets (a view of the tensor)
+        window = self.feature_tensor[self.current_step - self.window_size:self.current_step]
         
         # Calculate recent returns if we have enough history
         if len(self.returns_history) > 1:
-            recent_returns = np.mean(self.returns_history[-min(10, len(self.returns_history)):])
-            recent_volatility = np.std(self.returns_history[-min(20, len(self.returns_history)):])
+            recent_returns = np.mean(self.returns_history[-10:])
+            recent_volatility = np.std(self.returns_history[-20:])
         else:
             recent_returns = 0.0
             recent_volatility = 0.0
         
-        performance_metrics = [normalized_value, recent_returns, recent_volatility]
-        
-        # Combine all parts of the observation
-        observation = np.concatenate([
-            all_features,
-            portfolio_allocations,
-            performance_metrics
-        ]).astype(np.float32)
-        
-        return observation
+        return _build_observation(
+            window, self.positions, self.cash, self.price_matrix[self.current_step],
+            self.initial_balance, recent_returns, recent_volatility
+        )
     
-    def _execute_trades(self, target_allocations: np.ndarray, current_prices: Dict[str, float]) -> None:
+    def _execute_trades(self, target_allocations: np.ndarray, current_prices: np.ndarray) -> None:
         """
         Execute trades based on target allocations.
         
@@ -356,58 +477,15 @@ class TradingEnv(gym.Env):
             target_allocations: Target allocation vector for assets (excluding cash)
             current_prices: Current prices for all assets
         """
-        # Calculate total portfolio value
-        total_value = self.cash
-        for symbol, shares in self.portfolio.items():
-            total_value += shares * current_prices[symbol]
-        
-        # Track total trading costs
-        total_trading_cost = 0.0
-        
-        # Reset last trades
-        self.last_trades = {symbol: 0.0 for symbol in self.asset_list}
-        
-        # Calculate target values for each asset
-        target_values = {}
-        for i, symbol in enumerate(self.asset_list):
-            # Get target allocation for this asset
-            target_allocation = target_allocations[i]
-            
-            # Calculate target value
-            target_values[symbol] = target_allocation * total_value
-        
-        # Execute trades for each asset
-        for symbol in self.asset_list:
-            price = current_prices[symbol]
-            current_value = self.portfolio[symbol] * price
-            target_value = target_values[symbol]
-            
-            # Calculate trade value (positive = buy, negative = sell)
-            trade_value = target_value - current_value
-            
-            if abs(trade_value) > 0.01:  # Only trade if the difference is significant
-                # Calculate trading cost
-                trading_cost = abs(trade_value) * self.trading_cost
-                
-                # Apply slippage - adjust price worse for the trader
-                trade_price = price * (1 + np.sign(trade_value) * self.slippage)
-                
-                # Calculate shares to trade
-                shares_to_trade = trade_value / trade_price
-                
-                # Update portfolio
-                self.portfolio[symbol] += shares_to_trade
-                
-                # Update cash (subtract both the trade value and the trading cost)
-                self.cash -= (trade_value + trading_cost)
-                
-                # Update trade tracking
-                self.last_trades[symbol] = shares_to_trade
-                self.episode_trades += 1
-                total_trading_cost += trading_cost
-        
-        # Update total trading costs for this episode
-        self.episode_costs += total_trading_cost
+        self.positions, cash, self.last_trades, num_trades, trading_costs = _rebalance(
+            self.positions, self.cash, current_prices, target_allocations,
+            self.trading_cost, self.slippage
+        )
+        self.cash = float(cash)
+        
+        # Update trade tracking and total trading costs for this episode
+        self.episode_trades += int(num_trades)
+        self.episode_costs += float(trading_costs)
     
     def _calculate_reward(self, returns: float) -> float:
         """
@@ -419,35 +497,9 @@ class TradingEnv(gym.Env):
         Returns:
             Calculated reward value
         """
-        if self.reward_type == 'returns':
-            # Simple returns-based reward
-            reward = returns
-            
-        elif self.reward_type == 'sharpe':
-            # Sharpe ratio based reward
-            if len(self.episode_returns) > 1:
-                vol = max(self.episode_volatility, 1e-8)  # Avoid division by zero
-                sharpe = np.mean(self.episode_returns) / vol
-                reward = sharpe
-            else:
-                reward = 0.0
-                
-        elif self.reward_type == 'sortino':
-            # Sortino ratio based reward
-            if len(self.episode_returns) > 1:
-                negative_returns = [r for r in self.episode_returns if r < 0]
-                if negative_returns:
-                    downside_deviation = max(np.std(negative_returns), 1e-8)
-                    sortino = np.mean(self.episode_returns) / downside_deviation
-                    reward = sortino
-                else:
-                    # No negative returns, high reward
-                    reward = np.mean(self.episode_returns) * 10
-            else:
-                reward = 0.0
-        else:
-            # Default to returns
-            reward = returns
+        reward = float(_risk_adjusted_reward(
+            self.reward_type, returns, self._return_moments, self._downside_moments
+        ))
         
         # Apply reward scaling
         reward = reward * self.reward_scale
@@ -463,12 +515,8 @@ class TradingEnv(gym.Env):
         """
         if self.render_mode == 'human':
             # Calculate portfolio value
-            portfolio_value = self.cash
-            current_prices = {symbol: self.df_dict[symbol].iloc[self.current_step]['close'] 
-                            for symbol in self.asset_list}
-            
-            for symbol, shares in self.portfolio.items():
-                portfolio_value += shares * current_prices[symbol]
+            current_prices = self.price_matrix[self.current_step]
+            portfolio_value = self.cash + self.positions @ current_prices
             
             # Print portfolio state
             print(f"Step: {self.current_step}")
@@ -476,8 +524,8 @@ class TradingEnv(gym.Env):
             print(f"Cash: ${self.cash:.2f}")
             print("Allocations:")
             
-            for symbol, shares in self.portfolio.items():
-                asset_value = shares * current_prices[symbol]
+            for symbol, shares, price in zip(self.asset_list, self.positions, current_prices):
+                asset_value = shares * price
                 allocation = asset_value / portfolio_value if portfolio_value > 0 else 0
                 print(f"  {symbol}: {shares:.4f} shares, ${asset_value:.2f} ({allocation:.2%})")
             
@@ -549,4 +597,179 @@ class TradingEnv(gym.Env):
             'average_return': np.mean(self.episode_returns) if self.episode_returns else 0,
         }
         
-        return stats 
\ No newline at end of file
+        return stats 
+
+class VectorTradingEnv(gym.vector.VectorEnv):
+    """
+    Vectorized variant of TradingEnv that steps many episodes at once.
+    
+    All episodes share the feature tensor and price matrix of a template
+    TradingEnv and run in lockstep over the same dates, differing only in the
+    actions taken, so a step is a few array operations over
+    (num_envs, num_assets) rather than num_envs separate environment steps.
+    Episodes end together and are reset in the same step; their final
+    observations are returned in infos['final_obs'].
+    """
+    
+    metadata = {'render_modes': []}
+    
+    def __init__(self, env: TradingEnv, num_envs: int):
+        """
+        Initialize the vectorized environment.
+        
+        Args:
+            env: Template environment providing data and trading parameters
+            num_envs: Number of episodes stepped together
+        """
+        super(VectorTradingEnv, self).__init__()
+        
+        self.env = env
+        self.num_envs = num_envs
+        self.single_observation_space = env.observation_space
+        self.single_action_space = env.action_space
+        self.observation_space = batch_space(env.observation_space, num_envs)
+        self.action_space = batch_space(env.action_space, num_envs)
+        
+        # Initialize state variables
+        self.positions = None
+        self.cash = None
+        self.current_step = None
+        self.portfolio_value = None
+        self.returns_history = None
+        self.num_returns = None
+        self.episode_volatility = None
+        self.episode_sharpe = None
+        self.episode_sortino = None
+        self.episode_trades = None
+        self.episode_costs = None
+        self._return_moments = None
+        self._downside_moments = None
+    
+    def reset(self, seed: Optional[int] = None, options: Dict[str, Any] = None) -> Tuple[np.ndarray, Dict]:
+        """
+        Reset all episodes to the initial state.
+        
+        Args:
+            seed: Random seed for reproducibility
+            options: Additional options for reset
+            
+        Returns:
+            Initial observations and info dictionary
+        """
+        if seed is not None:
+            self._np_random, self._np_random_seed = gym.utils.seeding.np_random(seed)
+        
+        env = self.env
+        num_envs, num_assets = self.num_envs, len(env.asset_list)
+        
+        self.positions = np.zeros((num_envs, num_assets))
+        self.cash = np.full(num_envs, float(env.initial_balance))
+        self.current_step = env.window_size
+        self.portfolio_value = self.cash.copy()
+        
+        # Returns history per episode; column 0 is the initial zero return
+        self.returns_history = np.zeros((num_envs, env.max_episode_steps + 1))
+        self.num_returns = 1
+        
+        # Initialize episode metrics
+        self.episode_volatility = np.zeros(num_envs)
+        self.episode_sharpe = np.zeros(num_envs)
+        self.episode_sortino = np.zeros(num_envs)
+        self.episode_trades = np.zeros(num_envs, dtype=np.int64)
+        self.episode_costs = np.zeros(num_envs)
+        self._return_moments = (0, np.zeros(num_envs), np.zeros(num_envs))
+        self._downside_moments = (np.zeros(num_envs, dtype=np.int64), np.zeros(num_envs), np.zeros(num_envs))
+        
+        info = {
+            'portfolio_value': self.portfolio_value.copy(),
+            'cash': self.cash.copy(),
+            'step': np.full(num_envs, self.current_step)
+        }
+        
+        return self._get_observation(), info
+    
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, Dict]:
+        """
+        Execute one action per episode.
+        
+        Args:
+            actions: Array of allocations, shape (num_envs, num_assets)
+            
+        Returns:
+            Tuple of (next_states, rewards, terminated, truncated, info)
+        """
+        env = self.env
+        current_prices = env.price_matrix[self.current_step]
+        allocations = _normalize_allocations(actions, env.allow_short)
+        
+        prev_portfolio_value = self.portfolio_value
+        self.portfolio_value = self.cash + self.positions @ current_prices
+        
+        self.positions, self.cash, _, num_trades, trading_costs = _rebalance(
+            self.positions, self.cash, current_prices, allocations, env.trading_cost, env.slippage
+        )
+        self.episode_trades += num_trades
+        self.episode_costs += trading_costs
+        self.current_step += 1
+        
+        new_portfolio_value = self.cash + self.positions @ current_prices
+        returns = (new_portfolio_value - prev_portfolio_value) / prev_portfolio_value
+        self.returns_history[:, self.num_returns] = returns
+        self.num_returns += 1
+        
+        self._return_moments = _update_moments(*self._return_moments, returns)
+        self._downside_moments = _update_moments(*self._downside_moments, returns, returns < 0)
+        self.episode_volatility, self.episode_sharpe, self.episode_sortino = _update_episode_ratios(
+            self._return_moments, self._downside_moments,
+            self.episode_volatility, self.episode_sharpe, self.episode_sortino
+        )
+        
+        rewards = np.broadcast_to(_risk_adjusted_reward(
+            env.reward_type, returns, self._return_moments, self._downside_moments
+        ), (self.num_envs,)) * env.reward_scale
+        
+        done = self.current_step >= env.window_size + env.max_episode_steps - 1
+        terminated = np.full(self.num_envs, done)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        
+        observation = self._get_observation()
+        info = {
+            'portfolio_value': new_portfolio_value,
+            'returns': returns,
+            'cash': self.cash.copy(),
+            'sharpe_ratio': self.episode_sharpe,
+            'sortino_ratio': self.episode_sortino,
+            'volatility': self.episode_volatility,
+            'trades': self.episode_trades.copy(),
+            'trading_costs': self.episode_costs.copy(),
+            'step': np.full(self.num_envs, self.current_step)
+        }
+        
+        if done:
+            info['final_obs'] = observation
+            observation, _ = self.reset()
+        
+        return observation, rewards, terminated, truncated, info
+    
+    def _get_observation(self) -> np.ndarray:
+        """
+        Construct the observations of all episodes.
+        
+        Returns:
+            Numpy array with observations, shape (num_envs, obs_dim)
+        """
+        env = self.env
+        window = env.feature_tensor[self.current_step - env.window_size:self.current_step]
+        
+        if self.num_returns > 1:
+            history = self.returns_history[:, :self.num_returns]
+            recent_returns = history[:, -10:].mean(axis=1)
+            recent_volatility = history[:, -20:].std(axis=1)
+        else:
+            recent_returns = 0.0
+            recent_volatility = 0.0
+        
+        return _build_observation(
+            window, self.positions, self.cash, env.price_matrix[self.current_step],
+            env.initial_balance, recent_returns, recent_volatility
+        )
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Event Bus Benchmark
+
+This script pushes synthetic MARKET_DATA events through the EventBus and
+reports end-to-end throughput (publish to handler completion) and handler
+latency percentiles.
+
+Usage:
+    python -m trading_bot.testing.event_bus_benchmark --events 200000
+    python -m trading_bot.testing.event_bus_benchmark --pooled --workers 4
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+from typing import Dict, List, Any
+
+logger = logging.getLogger("event_bus_benchmark")
+
+# Add project root to path if needed for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from trading_bot.event_system.event_bus import EventBus, EventHandler
+from trading_bot.event_system.event_types import Event, EventType
+
+TARGET_EVENTS_PER_SECOND = 200_000
+
+
+def run_benchmark(n_events: int, workers: int = 1, inline: bool = True,
+                  publish_batch_size: int = 1000, symbols: List[str] = None) -> Dict[str, Any]:
+    """
+    Publish events and wait until every one has been handled.
+
+    Args:
+        n_events: Number of MARKET_DATA events
+        workers: EventBus worker threads
+        inline: Register the handler as inline (otherwise it runs via the pool path)
+        publish_batch_size: Events per publish_batch call (1 uses publish)
+        symbols: Symbols to cycle through
+
+    Returns:
+        Dict with event count, elapsed seconds, events per second and handler latency
+    """
+    symbols = symbols or ['SPY', 'QQQ', 'AAPL', 'MSFT', 'IWM']
+    events = [
+        Event(EventType.MARKET_DATA, {'symbol': symbols[i % len(symbols)], 'price': 100.0 + i % 7}, 'benchmark')
+        for i in range(n_events)
+    ]
+
+    last_prices = {}
+
+    def on_market_data(event: Event) -> None:
+        last_prices[event.data['symbol']] = event.data['price']
+
+    bus = EventBus(max_queue_size=max(publish_batch_size * 4, 1000), worker_threads=workers)
+    bus.register_handler(EventHandler(on_market_data, EventType.MARKET_DATA, inline=inline, name='market_data'))
+    # Handlers for other event types must not slow down MARKET_DATA dispatch
+    for event_type in [EventType.ORDER_FILLED, EventType.SIGNAL_GENERATED, EventType.RISK_LIMIT_BREACHED]:
+        bus.register_handler(EventHandler(lambda event: None, event_type, name=event_type.value))
+
+    bus.start()
+    start = time.perf_counter()
+    if publish_batch_size > 1:
+        for i in range(0, n_events, publish_batch_size):
+            bus.publish_batch(events[i:i + publish_batch_size])
+    else:
+        for event in events:
+            bus.publish(event)
+    bus.event_queue.join()
+    elapsed = time.perf_counter() - start
+    bus.stop()
+    bus.thread_pool.shutdown(wait=False)
+
+    handler_metrics = bus.get_metrics()['handlers']
+    latency = next(h['latency'] for h in handler_metrics if h['name'] == 'market_data')
+
+    return {
+        'events': n_events,
+        'seconds': elapsed,
+        'events_per_second': n_events / elapsed if elapsed > 0 else float('inf'),
+        'latency': latency
+    }
+
+
+def main():
+    """Run the event bus benchmark."""
+    parser = argparse.ArgumentParser(description="Measure EventBus MARKET_DATA throughput")
+    parser.add_argument('--events', type=int, default=200_000, help="Number of events")
+    parser.add_argument('--workers', type=int, default=1, help="EventBus worker threads")
+    parser.add_argument('--pooled', action='store_true', help="Register the handler as non-inline")
+    parser.add_argument('--publish-batch', type=int, default=1000,
+                        help="Events per publish_batch call (1 publishes one at a time)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    result = run_benchmark(args.events, args.workers, not args.pooled, args.publish_batch)
+
+    print("\n" + "=" * 70)
+    print("EVENT BUS BENCHMARK")
+    print("=" * 70)
+    print(f"Events:           {result['events']:,}")
+    print(f"Elapsed:          {result['seconds']:.3f}s")
+    print(f"Throughput:       {result['events_per_second']:,.0f} events/sec")
+    print(f"Handler p50/p99:  {result['latency']['p50_ms']:.4f} / {result['latency']['p99_ms']:.4f} ms")
+    print(f"Target:           {TARGET_EVENTS_PER_SECOND:,} events/sec "
+          f"({'met' if result['events_per_second'] >= TARGET_EVENTS_PER_SECOND else 'NOT met'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Regime Inference Benchmark
+
+This script compares regime-routed inference in ModelTrainer (one model
+call per regime block) with the previous row-by-row implementation, which
+made one model call per row, and checks that both give the same results.
+
+Usage:
+    python -m trading_bot.testing.regime_inference_benchmark --rows 100000
+    python -m trading_bot.testing.regime_inference_benchmark --rows 20000 --reference-rows 2000
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Tuple
+
+logger = logging.getLogger("regime_inference_benchmark")
+
+# Add project root to path if needed for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sklearn.linear_model import LogisticRegression
+
+from trading_bot.models.model_trainer import ModelTrainer
+
+REGIME_COLUMN = 'regime'
+
+
+def build_trainer(n_features: int = 10, regimes: Tuple[str, ...] = ('bull', 'bear', 'sideways'),
+                  seed: int = 42) -> ModelTrainer:
+    """
+    Build a trainer with a default model and one model per regime (except the last).
+
+    Args:
+        n_features: Number of features
+        regimes: Regime labels; the last one has no model and uses the default model
+        seed: Random seed
+
+    Returns:
+        ModelTrainer with fitted models
+    """
+    rng = np.random.RandomState(seed)
+    columns = [f'f{i}' for i in range(n_features)]
+    trainer = ModelTrainer({})
+
+    def fit(shift: float) -> LogisticRegression:
+        X = pd.DataFrame(rng.normal(shift, 1, (500, n_features)), columns=columns)
+        y = (X.sum(axis=1) + rng.normal(0, 1, 500) > shift * n_features).astype(int)
+        return LogisticRegression().fit(X, y)
+
+    trainer.models['default'] = fit(0.0)
+    for i, regime in enumerate(regimes[:-1]):
+        trainer.regime_models[regime] = fit(float(i + 1))
+    return trainer
+
+
+def generate_rows(n_rows: int, n_features: int = 10,
+                  regimes: Tuple[str, ...] = ('bull', 'bear', 'sideways'),
+                  seed: int = 7) -> pd.DataFrame:
+    """
+    Generate feature rows with interleaved regimes.
+
+    Args:
+        n_rows: Number of rows
+        n_features: Number of features
+        regimes: Regime labels
+        seed: Random seed
+
+    Returns:
+        Feature DataFrame with a regime column
+    """
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame(rng.normal(0, 1, (n_rows, n_features)), columns=[f'f{i}' for i in range(n_features)])
+    X[REGIME_COLUMN] = rng.choice(list(regimes), size=n_rows)
+    return X
+
+
+def row_by_row(trainer: ModelTrainer, X: pd.DataFrame, model_name: str = 'default',
+               method: str = 'predict') -> np.ndarray:
+    """
+    Previous implementation: one model call per row.
+
+    Args:
+        trainer: Trainer with regime models
+        X: Feature DataFrame with a regime column
+        model_name: Fallback model name
+        method: 'predict' or 'predict_proba'
+
+    Returns:
+        Numpy array with predictions (or class probabilities)
+    """
+    if method == 'predict':
+        predictions = np.zeros(len(X))
+    else:
+        sample_model = next(iter(trainer.models.values()))
+        n_classes = sample_model.predict_proba(X.drop(columns=[REGIME_COLUMN]).iloc[:1]).shape[1]
+        predictions = np.zeros((len(X), n_classes))
+
+    for idx, row_regime in enumerate(X[REGIME_COLUMN]):
+        model = trainer.regime_models.get(row_regime, trainer.models.get(model_name))
+        if model is not None:
+            row_features = X.iloc[idx:idx+1].drop(columns=[REGIME_COLUMN])
+            predictions[idx] = getattr(model, method)(row_features)[0]
+
+    return predictions
+
+
+def run_benchmark(n_rows: int, reference_rows: int) -> Dict[str, Any]:
+    """
+    Time grouped and row-by-row inference.
+
+    Args:
+        n_rows: Rows scored by the grouped implementation
+        reference_rows: Rows scored by the row-by-row implementation (its
+            throughput is extrapolated to n_rows)
+
+    Returns:
+        Dictionary with timings per method
+    """
+    trainer = build_trainer()
+    X = generate_rows(n_rows)
+    results = {}
+
+    for method in ['predict', 'predict_proba']:
+        start = time.perf_counter()
+        grouped = getattr(trainer, method)(X, regime_column=REGIME_COLUMN)
+        grouped_seconds = time.perf_counter() - start
+
+        sample = X.iloc[:reference_rows]
+        start = time.perf_counter()
+        reference = row_by_row(trainer, sample, method=method)
+        reference_seconds = (time.perf_counter() - start) * n_rows / max(len(sample), 1)
+
+        results[method] = {
+            'grouped_seconds': grouped_seconds,
+            'row_by_row_seconds': reference_seconds,
+            'speedup': reference_seconds / grouped_seconds if grouped_seconds > 0 else float('inf'),
+            'matches': bool(np.allclose(grouped[:len(sample)], reference))
+        }
+
+    return results
+
+
+def main():
+    """Run the regime inference benchmark."""
+    parser = argparse.ArgumentParser(description="Compare grouped and row-by-row regime inference")
+    parser.add_argument('--rows', type=int, default=100_000, help="Rows to score")
+    parser.add_argument('--reference-rows', type=int, default=5_000,
+                        help="Rows scored row by row (extrapolated to --rows)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    results = run_benchmark(args.rows, min(args.reference_rows, args.rows))
+
+    print("\n" + "=" * 70)
+    print("REGIME INFERENCE BENCHMARK")
+    print("=" * 70)
+    print(f"Rows:             {args.rows:,}")
+    for method, result in results.items():
+        print(f"{method}:")
+        print(f"  Grouped:        {result['grouped_seconds']:.3f}s")
+        print(f"  Row by row:     {result['row_by_row_seconds']:.3f}s (extrapolated)")
+        print(f"  Speedup:        {result['speedup']:,.0f}x")
+        print(f"  Results match:  {result['matches']}")
+
+
+if __name__ == "__main__":
+    main()
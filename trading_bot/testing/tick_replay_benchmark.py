@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Tick Replay Benchmark
+
+This script replays recorded (or synthetic) ticks through the real-time
+DataProcessor and reports tick throughput, to track the cost of bar
+aggregation on the live data path.
+
+Usage:
+    python -m trading_bot.testing.tick_replay_benchmark --ticks 200000
+    python -m trading_bot.testing.tick_replay_benchmark --file ticks.csv
+
+Tick files need 'symbol', 'timestamp' and 'price' columns and an optional
+'volume' column (CSV or Parquet).
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger("tick_replay_benchmark")
+
+# Add project root to path if needed for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from trading_bot.data.bar_aggregator import BarAggregator
+
+DEFAULT_TIMEFRAMES = ['1min', '5min', '15min', '1hour', '1day']
+TARGET_TICKS_PER_SECOND = 100_000
+
+
+def generate_ticks(n_ticks: int, symbols: List[str], ticks_per_second: int = 50,
+                   seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    Generate synthetic random-walk ticks.
+
+    Args:
+        n_ticks: Number of ticks to generate
+        symbols: Symbols to interleave
+        ticks_per_second: Simulated market tick rate
+        seed: Random seed
+
+    Returns:
+        List of tick dictionaries in time order
+    """
+    rng = np.random.RandomState(seed)
+    start = pd.Timestamp('2024-01-02 09:30:00')
+    offsets = np.sort(rng.randint(0, max(n_ticks // ticks_per_second, 1) * 10**9, size=n_ticks))
+    timestamps = (start + pd.to_timedelta(offsets, unit='ns')).to_pydatetime()
+
+    symbol_index = rng.randint(0, len(symbols), size=n_ticks)
+    returns = rng.normal(0, 0.0002, size=n_ticks)
+    prices = np.full(len(symbols), 100.0)
+    volumes = rng.randint(1, 500, size=n_ticks)
+
+    ticks = []
+    for i in range(n_ticks):
+        s = symbol_index[i]
+        prices[s] *= 1 + returns[i]
+        ticks.append({
+            'symbol': symbols[s],
+            'timestamp': timestamps[i],
+            'price': float(prices[s]),
+            'volume': int(volumes[i])
+        })
+    return ticks
+
+
+def load_ticks(path: str) -> List[Dict[str, Any]]:
+    """
+    Load ticks from a CSV or Parquet file.
+
+    Args:
+        path: Path to the tick file
+
+    Returns:
+        List of tick dictionaries sorted by timestamp
+    """
+    if path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_csv(path)
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    if 'volume' not in df.columns:
+        df['volume'] = 0
+    df = df.sort_values('timestamp')
+
+    records = df[['symbol', 'timestamp', 'price', 'volume']].to_dict('records')
+    for record in records:
+        record['timestamp'] = record['timestamp'].to_pydatetime()
+    return records
+
+
+def replay(ticks: List[Dict[str, Any]], processor: Optional[Any] = None,
+           timeframes: Optional[List[str]] = None) -> Dict[str, float]:
+    """
+    Replay ticks and measure throughput.
+
+    Args:
+        ticks: Tick dictionaries
+        processor: Object with a ``process_tick(dict)`` method; when None the
+            ticks are fed straight to a BarAggregator
+        timeframes: Timeframes for the default aggregator
+
+    Returns:
+        Dict with tick count, elapsed seconds and ticks per second
+    """
+    if processor is not None:
+        handle = processor.process_tick
+    else:
+        aggregator = BarAggregator(timeframes or DEFAULT_TIMEFRAMES)
+
+        def handle(tick):
+            aggregator.update(tick['symbol'], tick['timestamp'], tick['price'], tick['volume'])
+
+    start = time.perf_counter()
+    for tick in ticks:
+        handle(tick)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'ticks': len(ticks),
+        'seconds': elapsed,
+        'ticks_per_second': len(ticks) / elapsed if elapsed > 0 else float('inf')
+    }
+
+
+def main():
+    """Run the tick replay benchmark."""
+    parser = argparse.ArgumentParser(description="Replay ticks through the real-time DataProcessor")
+    parser.add_argument('--file', help="CSV or Parquet tick file (synthetic ticks if omitted)")
+    parser.add_argument('--ticks', type=int, default=200_000, help="Number of synthetic ticks")
+    parser.add_argument('--symbols', default='SPY,QQQ,AAPL,MSFT,IWM', help="Comma-separated synthetic symbols")
+    parser.add_argument('--aggregator-only', action='store_true',
+                        help="Benchmark the BarAggregator without the DataProcessor wrapper")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.file:
+        ticks = load_ticks(args.file)
+    else:
+        ticks = generate_ticks(args.ticks, args.symbols.split(','))
+
+    processor = None
+    if not args.aggregator_only:
+        from trading_bot.data.real_time_data_processor import DataProcessor
+        processor = DataProcessor(DEFAULT_TIMEFRAMES)
+
+    result = replay(ticks, processor)
+
+    print("\n" + "=" * 70)
+    print("TICK REPLAY BENCHMARK")
+    print("=" * 70)
+    print(f"Ticks:            {result['ticks']:,}")
+    print(f"Elapsed:          {result['seconds']:.3f}s")
+    print(f"Throughput:       {result['ticks_per_second']:,.0f} ticks/sec")
+    print(f"Target:           {TARGET_TICKS_PER_SECOND:,} ticks/sec "
+          f"({'met' if result['ticks_per_second'] >= TARGET_TICKS_PER_SECOND else 'NOT met'})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import os
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtesting.order_book_simulator import (
+    OrderBook,
+    OrderBookEntry,
+    OrderBookSimulator,
+    OrderSide,
+    ScenarioResult,
+    ScenarioTester,
+)
+
+
+def reference_match(levels, volume):
+    """Straightforward level-by-level matcher used as the expected result."""
+    remaining = volume
+    matched = 0.0
+    notional = 0.0
+    book = [[price, size] for price, size in levels]
+    for level in book:
+        if remaining <= 0:
+            break
+        executed = min(remaining, level[1])
+        matched += executed
+        notional += executed * level[0]
+        level[1] -= executed
+        remaining -= executed
+    book = [(price, size) for price, size in book if size >= 1e-10]
+    average = notional / matched if matched > 0 else None
+    return matched, average, book
+
+
+class TestOrderBook(unittest.TestCase):
+    """Test suite for the array-backed OrderBook."""
+
+    def setUp(self):
+        """Set up a book with a few levels on each side."""
+        self.book = OrderBook("SPY", tick_size=0.01, depth=5)
+        for price, volume in [(100.02, 30), (100.01, 20), (100.03, 50)]:
+            self.book.add_order(OrderSide.ASK, price, volume)
+        for price, volume in [(99.99, 25), (99.98, 40), (99.97, 10)]:
+            self.book.add_order(OrderSide.BID, price, volume)
+
+    def test_levels_sorted_best_first(self):
+        """Bids sort high to low and asks low to high."""
+        np.testing.assert_allclose([p for p, _ in self.book.levels(OrderSide.ASK)], [100.01, 100.02, 100.03])
+        np.testing.assert_allclose([p for p, _ in self.book.levels(OrderSide.BID)], [99.99, 99.98, 99.97])
+        self.assertAlmostEqual(self.book.spread, 0.02)
+        self.assertAlmostEqual(self.book.ask_volume, 100)
+
+    def test_add_existing_level_merges_volume(self):
+        """Adding at an existing price increases that level."""
+        self.book.add_order(OrderSide.ASK, 100.02, 5)
+        self.assertEqual(len(self.book.asks), 3)
+        self.assertAlmostEqual(dict(self.book.levels(OrderSide.ASK))[100.02], 35)
+
+    def test_depth_is_trimmed(self):
+        """Worst levels beyond depth are dropped along with their volume."""
+        for price in [100.04, 100.05, 100.06]:
+            self.book.add_order(OrderSide.ASK, price, 1)
+        self.assertEqual(len(self.book.asks), 5)
+        self.assertAlmostEqual(self.book.ask_volume, 102)
+
+    def test_remove_volume(self):
+        """Removing a full level deletes it."""
+        removed = self.book.remove_volume(OrderSide.BID, 99.99, 100)
+        self.assertAlmostEqual(removed, 25)
+        self.assertAlmostEqual(self.book.best_bid_price, 99.98)
+        self.assertEqual(self.book.remove_volume(OrderSide.BID, 50.0, 1), 0.0)
+
+    def test_match_market_order_matches_reference(self):
+        """Market orders fill at level prices, not level volumes."""
+        rng = np.random.RandomState(7)
+        for _ in range(50):
+            book = OrderBook("SPY", tick_size=0.01, depth=10)
+            prices = 100 + np.arange(10) * 0.01
+            sizes = rng.uniform(1, 100, size=10)
+            for price, size in zip(prices, sizes):
+                book.add_order(OrderSide.ASK, price, size)
+            levels = book.levels(OrderSide.ASK)
+            volume = rng.uniform(0, sizes.sum() * 1.2)
+
+            expected_matched, expected_price, expected_book = reference_match(levels, volume)
+            matched, price = book.match_market_order(OrderSide.BID, volume)
+
+            self.assertAlmostEqual(matched, expected_matched)
+            self.assertAlmostEqual(price, expected_price)
+            self.assertEqual(len(book.levels(OrderSide.ASK)), len(expected_book))
+            for (p, v), (ep, ev) in zip(book.levels(OrderSide.ASK), expected_book):
+                self.assertAlmostEqual(p, ep)
+                self.assertAlmostEqual(v, ev)
+
+    def test_market_impact_is_vectorized_and_read_only(self):
+        """Batch impact queries agree with the reference and leave the book intact."""
+        levels = self.book.levels(OrderSide.ASK)
+        sizes = np.array([0.0, 10.0, 20.0, 45.0, 100.0, 150.0])
+
+        executed, average = self.book.market_impact(OrderSide.BID, sizes)
+
+        for size, filled, price in zip(sizes, executed, average):
+            expected_matched, expected_price, _ = reference_match(levels, size)
+            self.assertAlmostEqual(filled, expected_matched)
+            if expected_price is None:
+                self.assertTrue(np.isnan(price))
+            else:
+                self.assertAlmostEqual(price, expected_price)
+        self.assertEqual(self.book.levels(OrderSide.ASK), levels)
+
+    def test_snapshot_setter_compatibility(self):
+        """Assigning entry lists replaces a side."""
+        self.book.bids = [OrderBookEntry(99.5, 10)]
+        self.assertAlmostEqual(self.book.bid_volume, 10)
+        self.book.asks = []
+        self.assertIsNone(self.book.spread)
+
+
+class TestOrderBookSimulator(unittest.TestCase):
+    """Test suite for OrderBookSimulator book generation."""
+
+    def setUp(self):
+        self.simulator = OrderBookSimulator(symbols=["SPY"], depth=10, random_seed=42)
+        bar = pd.Series({"open": 400.0, "high": 402.0, "low": 399.0, "close": 401.0, "volume": 1e6})
+        self.simulator.update_from_ohlcv("SPY", bar)
+
+    def test_book_generated_around_close(self):
+        bid, ask = self.simulator.get_best_bid_ask("SPY")
+        self.assertLess(bid, 401.0)
+        self.assertGreater(ask, 401.0)
+        self.assertEqual(len(self.simulator.get_book_depth("SPY", OrderSide.BID)), 10)
+
+    def test_update_reprices_existing_levels(self):
+        """Levels move to the new close and keep part of their volume."""
+        bars = [pd.Series({"open": 401.0, "high": 406.0, "low": 400.0, "close": close, "volume": 1e6})
+                for close in (401.0, 405.0, 403.5)]
+        # Both simulators draw the same fresh volumes from the shared seed
+        books = {}
+        for memory in (0.0, 0.5):
+            simulator = OrderBookSimulator(symbols=["SPY"], depth=10, random_seed=42, book_memory=memory)
+            for bar in bars:
+                previous = {side: simulator.get_book_depth("SPY", side) for side in OrderSide}
+                simulator.update_from_ohlcv("SPY", bar)
+            books[memory] = simulator
+        rebuilt, blended = books[0.0], books[0.5]
+
+        bid, ask = blended.get_best_bid_ask("SPY")
+        self.assertLess(bid, 403.5)
+        self.assertGreater(ask, 403.5)
+        for side in OrderSide:
+            expected = rebuilt.get_book_depth("SPY", side)
+            levels = blended.get_book_depth("SPY", side)
+            np.testing.assert_allclose([p for p, _ in levels], [p for p, _ in expected])
+            np.testing.assert_allclose([v for _, v in levels],
+                                       [0.5 * v + 0.5 * e for (_, v), (_, e) in zip(previous[side], expected)])
+
+    def test_update_refills_consumed_levels(self):
+        book = self.simulator.get_order_book("SPY")
+        for _ in range(3):
+            book.remove_volume(OrderSide.ASK, book.best_ask_price, np.inf)
+        self.assertEqual(len(book.asks), 7)
+
+        bar = pd.Series({"open": 401.0, "high": 402.0, "low": 400.0, "close": 401.5, "volume": 1e6})
+        self.simulator.update_from_ohlcv("SPY", bar)
+        asks = self.simulator.get_book_depth("SPY", OrderSide.ASK)
+        self.assertEqual(len(asks), 10)
+        self.assertTrue(np.all(np.diff([p for p, _ in asks]) > 0))
+
+    def test_batch_market_impact(self):
+        sizes = [100, 1000, 10000]
+        executed, average = self.simulator.simulate_market_impact("SPY", OrderSide.BID, sizes)
+        self.assertEqual(len(executed), 3)
+        self.assertTrue(np.all(np.diff(average) >= 0))
+
+        # A scalar order still executes against the book
+        filled, price = self.simulator.simulate_market_impact("SPY", OrderSide.BID, 100)
+        self.assertAlmostEqual(filled, 100)
+        self.assertAlmostEqual(price, average[0])
+
+
+class TestScenarioTester(unittest.TestCase):
+    """Test suite for serial and parallel scenario execution."""
+
+    def setUp(self):
+        np.random.seed(0)
+        close = 100 * np.exp(np.cumsum(np.random.randn(150) * 0.01))
+        self.ohlc = pd.DataFrame({
+            "open": close, "high": close * 1.01, "low": close * 0.99,
+            "close": close, "volume": 1e6
+        })
+        self.results_dir = tempfile.mkdtemp()
+
+    def _tester(self):
+        simulator = OrderBookSimulator(symbols=["SPY", "QQQ"])
+        return ScenarioTester(simulator, results_dir=self.results_dir)
+
+    def test_payload_round_trip(self):
+        result = self._tester().run_scenario("flash_crash", self.ohlc, "SPY", save_results=False)
+        restored = ScenarioResult.from_payload(result.to_payload())
+
+        self.assertEqual(restored.equity_curve, result.equity_curve)
+        self.assertEqual(restored.metrics.to_dict(), result.metrics.to_dict())
+        self.assertEqual(restored.scenario.name, "flash_crash")
+
+    def test_parallel_matches_independent_runs(self):
+        """Each parallel result equals the scenario run alone with the same seed."""
+        parallel = self._tester().run_all_scenarios(
+            self.ohlc, "SPY", parallel=True, max_workers=2, random_seed=7
+        )
+
+        self.assertEqual(set(parallel), set(self._tester().scenarios))
+        for name, result in parallel.items():
+            expected = self._tester().run_scenario(
+                name, self.ohlc, "SPY", random_seed=7, save_results=False
+            )
+            self.assertEqual(expected.equity_curve, result.equity_curve)
+            self.assertEqual(expected.metrics.to_dict(), result.metrics.to_dict())
+            self.assertEqual(
+                [(e['bar'], e['circuit_level'], e['market_regime']) for e in expected.risk_events],
+                [(e['bar'], e['circuit_level'], e['market_regime']) for e in result.risk_events]
+            )
+
+    def test_parallel_multiple_symbols(self):
+        results = self._tester().run_scenarios_parallel(
+            {"SPY": self.ohlc, "QQQ": self.ohlc * 2},
+            scenario_names=["moderate_crash", "liquidity_crisis"],
+            max_workers=2,
+            random_seed=1
+        )
+
+        self.assertEqual(set(results), {"SPY", "QQQ"})
+        self.assertEqual(set(results["QQQ"]), {"moderate_crash", "liquidity_crisis"})
+
+    def test_parallel_multiple_symbols_keeps_every_result(self):
+        tester = self._tester()
+        results = tester.run_scenarios_parallel(
+            {"SPY": self.ohlc, "QQQ": self.ohlc * 2},
+            scenario_names=["flash_crash"],
+            max_workers=2,
+            random_seed=1
+        )
+
+        self.assertIs(tester.results["flash_crash_SPY"], results["SPY"]["flash_crash"])
+        self.assertIs(tester.results["flash_crash_QQQ"], results["QQQ"]["flash_crash"])
+        saved = sorted(name.rsplit("_", 2)[0] for name in os.listdir(self.results_dir)
+                       if os.path.isdir(os.path.join(self.results_dir, name)))
+        self.assertEqual(saved, ["flash_crash_QQQ", "flash_crash_SPY"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.backtesting.portfolio_calculator import PortfolioCalculator
+
+
+def random_book(n_days=120, seed=0, fractional=False):
+    """Trades and a close price panel for a small multi-asset, multi-currency book."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2023-01-02', periods=n_days)
+    specs = {
+        'AAPL': ('stock', 'equity', 'USD', 'momentum'),
+        'SAP': ('stock', 'equity', 'EUR', 'value'),
+        'TM': ('stock', 'equity', 'JPY', 'value'),
+        'SPY_C': ('option', 'options', 'USD', 'hedge'),
+        'ES': ('future', 'futures', 'USD', 'momentum'),
+    }
+    prices = pd.DataFrame(
+        100.0 * np.cumprod(1 + rng.normal(0, 0.01, (n_days, len(specs))), axis=0),
+        index=dates, columns=list(specs)
+    ).round(2)
+    # Gaps fall back to average price
+    prices.iloc[rng.integers(0, n_days, 15), rng.integers(0, len(specs), 15)] = np.nan
+
+    trades = []
+    for date in dates:
+        for symbol in rng.choice(list(specs), size=rng.integers(0, 4), replace=False):
+            trade_type, asset_class, currency, strategy = specs[symbol]
+            price = prices.loc[date, symbol]
+            trades.append({
+                'symbol': symbol,
+                'quantity': float(rng.choice([0.1, 0.2, 0.5]) if fractional else rng.integers(1, 20)),
+                'price': 100.0 if np.isnan(price) else float(price),
+                # Sells sometimes exceed the position (or come with none)
+                'direction': 'buy' if rng.random() < 0.55 else 'sell',
+                'date': date.to_pydatetime(),
+                'type': trade_type,
+                'asset_class': asset_class,
+                'currency': currency,
+                'strategy': strategy,
+                'commission': float(rng.choice([0.0, 1.0, 2.5])),
+                'slippage': float(rng.choice([0.0, 0.5])),
+            })
+    return trades, prices
+
+
+def run_per_trade(calculator, trades, prices):
+    """Existing path: process each day's trades, then value the book."""
+    for date in prices.index:
+        calculator.process_trades([t for t in trades if t['date'] == date])
+        market_data = {
+            symbol: {'close': price} for symbol, price in prices.loc[date].items() if not np.isnan(price)
+        }
+        calculator.calculate_portfolio_value(date.to_pydatetime(), market_data)
+
+
+class TestColumnarPortfolioCalculator(unittest.TestCase):
+    """Test suite comparing the columnar accounting engine with the per-trade path."""
+
+    def setUp(self):
+        self.trades, self.prices = random_book()
+        self.expected = PortfolioCalculator(initial_capital=100000.0)
+        run_per_trade(self.expected, self.trades, self.prices)
+        self.columnar = PortfolioCalculator(initial_capital=100000.0)
+        self.result = self.columnar.calculate_portfolio_series(self.trades, self.prices)
+
+    def test_valuation_series_match(self):
+        expected = pd.DataFrame(self.expected.daily_portfolio_values).set_index('date')
+        portfolio = self.result['portfolio']
+        np.testing.assert_allclose(portfolio['value'], expected['value'], rtol=1e-12)
+        np.testing.assert_allclose(portfolio['cash'], expected['cash'], rtol=1e-12)
+        np.testing.assert_allclose(portfolio['positions'], expected['positions'], rtol=1e-12, atol=1e-9)
+        self.assertAlmostEqual(portfolio['fees'].iloc[-1], sum(f['amount'] for f in self.expected.fees))
+
+        pd.testing.assert_frame_equal(self.columnar.get_performance_series(),
+                                      self.expected.get_performance_series())
+
+    def test_trade_state_matches(self):
+        expected, columnar = self.expected, self.columnar
+        self.assertAlmostEqual(columnar.cash_balance, expected.cash_balance, places=6)
+        self.assertEqual(len(columnar.cash_transactions), len(expected.cash_transactions))
+        self.assertEqual([f['type'] for f in columnar.fees], [f['type'] for f in expected.fees])
+
+        self.assertEqual(set(columnar.current_positions), set(expected.current_positions))
+        for symbol, position in expected.current_positions.items():
+            for key, value in position.items():
+                if isinstance(value, float):
+                    self.assertAlmostEqual(columnar.current_positions[symbol][key], value)
+                else:
+                    self.assertEqual(columnar.current_positions[symbol][key], value)
+
+        self.assertEqual(
+            {s: [lot['remaining_quantity'] for lot in lots] for s, lots in columnar.open_trades.items()},
+            {s: [lot['remaining_quantity'] for lot in lots] for s, lots in expected.open_trades.items() if lots}
+        )
+
+        self.assertEqual(len(columnar.closed_positions), len(expected.closed_positions))
+        for got, want in zip(columnar.closed_positions, expected.closed_positions):
+            self.assertEqual((got['trade_id'], got['exit_date'], got['holding_period']),
+                             (want['trade_id'], want['exit_date'], want['holding_period']))
+            self.assertAlmostEqual(got['realized_pnl'], want['realized_pnl'])
+
+    def test_analysis_matches(self):
+        got = self.columnar.get_attribution_analysis()['strategy_attribution']
+        want = self.expected.get_attribution_analysis()['strategy_attribution']
+        self.assertEqual(set(got), set(want))
+        for strategy, metrics in want.items():
+            for key, value in metrics.items():
+                self.assertAlmostEqual(got[strategy][key], value, places=6)
+
+        self.assertEqual(self.columnar.get_trade_metrics().keys(), self.expected.get_trade_metrics().keys())
+
+        got, want = self.columnar.get_drawdown_analysis(), self.expected.get_drawdown_analysis()
+        self.assertAlmostEqual(got['max_drawdown'], want['max_drawdown'])
+        self.assertEqual(
+            [(p['start_date'], p['end_date'], p['duration']) for p in got['drawdown_periods']],
+            [(p['start_date'], p['end_date'], p['duration']) for p in want['drawdown_periods']]
+        )
+        self.assertEqual([p['recovery_date'] for p in got['recovery_periods']],
+                         [p['recovery_date'] for p in want['recovery_periods']])
+
+    def test_fractional_lots_close_like_per_trade_path(self):
+        for seed in range(40):
+            trades, prices = random_book(n_days=40, seed=seed, fractional=True)
+            expected = PortfolioCalculator(initial_capital=100000.0)
+            run_per_trade(expected, trades, prices)
+            columnar = PortfolioCalculator(initial_capital=100000.0)
+            columnar.calculate_portfolio_series(trades, prices)
+
+            with self.subTest(seed=seed):
+                self.assertEqual(set(columnar.current_positions), set(expected.current_positions))
+                self.assertEqual(
+                    [(t['trade_id'], t['exit_date']) for t in columnar.closed_positions],
+                    [(t['trade_id'], t['exit_date']) for t in expected.closed_positions]
+                )
+                np.testing.assert_allclose([t['realized_pnl'] for t in columnar.closed_positions],
+                                           [t['realized_pnl'] for t in expected.closed_positions],
+                                           atol=1e-9)
+                self.assertEqual(
+                    {s: [lot['trade_id'] for lot in lots] for s, lots in columnar.open_trades.items()},
+                    {s: [lot['trade_id'] for lot in lots] for s, lots in expected.open_trades.items() if lots}
+                )
+
+    def test_fx_panel_revalues_foreign_positions(self):
+        fx_rates = pd.DataFrame({'EUR': 1.10, 'JPY': 0.0070}, index=self.prices.index[:1])
+        fx_rates.loc[self.prices.index[60]] = [1.20, 0.0065]
+        calculator = PortfolioCalculator(initial_capital=100000.0)
+        result = calculator.calculate_portfolio_series(self.trades, self.prices, fx_rates=fx_rates)
+
+        quantities = result['quantities']['SAP']
+        priced = quantities[(quantities > 0) & self.prices['SAP'].notna()].index
+        for date, rate in [(priced[priced < self.prices.index[60]][-1], 1.10), (priced[-1], 1.20)]:
+            self.assertAlmostEqual(result['market_values'].loc[date, 'SAP'],
+                                   quantities[date] * self.prices.loc[date, 'SAP'] * rate)
+
+        first_sap = next(t for t in self.trades if t['currency'] == 'EUR')
+        transaction = calculator.cash_transactions[self.trades.index(first_sap)]
+        total = first_sap['price'] * first_sap['quantity'] + first_sap['commission'] + first_sap['slippage']
+        self.assertAlmostEqual(abs(transaction['amount']),
+                               total * 1.10 if first_sap['direction'] == 'buy'
+                               else first_sap['price'] * first_sap['quantity'] * 1.10
+                               - (first_sap['commission'] + first_sap['slippage']) * 1.10)
+
+    def test_unordered_trades_rejected(self):
+        with self.assertRaises(ValueError):
+            PortfolioCalculator().calculate_portfolio_series(self.trades[::-1], self.prices)
+
+    def test_multi_year_book_is_fast(self):
+        trades, prices = random_book(n_days=750, seed=1)
+        start = time.perf_counter()
+        PortfolioCalculator().calculate_portfolio_series(trades, prices)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
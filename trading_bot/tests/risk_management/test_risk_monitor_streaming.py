@@ -0,0 +1,78 @@
+import time
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from trading_bot.risk.risk_monitor import RiskMonitor
+
+
+class TestRiskMonitorStreaming(unittest.TestCase):
+    """Test suite for the running drawdown, rolling return and breach state"""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.values = 100000.0 * np.cumprod(1 + rng.normal(0, 0.02, 400))
+        self.start = datetime(2024, 1, 1)
+        self.monitor = RiskMonitor({"history_size": 100})
+        for i, value in enumerate(self.values):
+            self.monitor.update_portfolio("main", value, self.start + timedelta(days=i))
+
+    def test_metrics_match_full_history(self):
+        values = self.values
+        returns = (values[1:] / values[:-1] - 1) * 100
+        drawdowns = (values / np.maximum.accumulate(values) - 1) * 100
+
+        metrics = self.monitor.get_portfolio_metrics("main")
+        self.assertAlmostEqual(metrics["current_drawdown"], drawdowns[-1])
+        self.assertAlmostEqual(metrics["max_drawdown"], drawdowns.min())
+        self.assertAlmostEqual(metrics["max_value"], values.max())
+        self.assertAlmostEqual(metrics["return_pct"], (values[-1] / values[0] - 1) * 100)
+        self.assertAlmostEqual(metrics["volatility"], np.std(returns) * np.sqrt(252))
+
+        report = self.monitor.get_risk_report("main")["portfolios"]["main"]
+        self.assertAlmostEqual(report["recent_returns"]["weekly"], returns[-5:].sum())
+        self.assertAlmostEqual(report["recent_returns"]["monthly"], returns[-20:].sum())
+
+        # Histories are bounded
+        self.assertEqual(len(self.monitor.portfolio_values["main"]), 100)
+        self.assertEqual(len(self.monitor.portfolio_drawdowns["main"]), 100)
+
+    def test_breaches_indexed_by_portfolio(self):
+        returns = (self.values[1:] / self.values[:-1] - 1) * 100
+        expected = sum(
+            1 for window, threshold in [(1, -3.0), (5, -8.0), (20, -15.0)]
+            for end in range(window, len(returns) + 1)
+            if returns[end - window:end].sum() <= threshold
+        )
+        monitor = self.monitor
+        monitor.update_portfolio("other", 100.0, self.start)
+        monitor.update_portfolio("other", 90.0, self.start + timedelta(days=1))
+
+        main = monitor.get_risk_report("main")["portfolios"]["main"]
+        self.assertEqual(main["breach_count"], expected)
+        self.assertEqual(monitor.get_risk_report()["portfolios"]["other"]["breach_count"], 1)
+        self.assertEqual(len(monitor.risk_breaches), expected + 1)
+        self.assertLessEqual(len(main["recent_breaches"]), 5)
+
+        monitor.reset()
+        self.assertEqual(monitor.get_portfolio_metrics("main")["breach_count"], 0)
+
+    def test_update_cost_independent_of_history(self):
+        monitor = RiskMonitor()
+
+        def timed_updates(offset, n=2000):
+            start = time.perf_counter()
+            for i in range(n):
+                monitor.update_portfolio("p", 100.0 + (i % 7), self.start + timedelta(minutes=offset + i))
+            return time.perf_counter() - start
+
+        first = timed_updates(0)
+        for i in range(20000):
+            monitor.update_portfolio("p", 100.0 + (i % 7), self.start)
+        later = timed_updates(30000)
+        self.assertLess(later, first * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
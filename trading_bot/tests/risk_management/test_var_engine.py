@@ -0,0 +1,180 @@
+import time
+import unittest
+
+import numpy as np
+
+from trading_bot.risk.risk_manager import RiskManager
+from trading_bot.risk.var_engine import PortfolioVaREngine
+
+
+def simulate_prices(n_bars, n_symbols, seed=0, correlation=0.6):
+    rng = np.random.default_rng(seed)
+    cov = np.full((n_symbols, n_symbols), correlation) + np.eye(n_symbols) * (1 - correlation)
+    cov *= 0.01 ** 2
+    returns = rng.multivariate_normal(np.zeros(n_symbols), cov, size=n_bars)
+    return 100.0 * np.cumprod(1 + np.vstack([np.zeros(n_symbols), returns]), axis=0)
+
+
+class TestPortfolioVaREngine(unittest.TestCase):
+    """Test suite for the incremental VaR engine"""
+
+    def setUp(self):
+        self.symbols = ['AAA', 'BBB', 'CCC']
+        self.prices = simulate_prices(300, 3)
+
+    def _fed_engine(self, **kwargs):
+        engine = PortfolioVaREngine(window=252, **kwargs)
+        for row in self.prices:
+            engine.update(dict(zip(self.symbols, row)))
+        return engine
+
+    def test_incremental_state_matches_batch(self):
+        engine = self._fed_engine(initial_capacity=1)
+        returns = self.prices[1:] / self.prices[:-1] - 1
+
+        # Rolling window holds the last 252 returns in order
+        np.testing.assert_allclose(engine.returns_matrix(), returns[-252:])
+
+        # EWMA recursion equals the explicitly weighted sum
+        lam = engine.ewma_lambda
+        padded = np.vstack([np.zeros(3), returns])
+        weights = (1 - lam) * lam ** np.arange(len(padded) - 1, -1, -1)
+        expected = (padded * weights[:, None]).T @ padded / (1 - lam ** len(padded))
+        np.testing.assert_allclose(engine.covariance(), expected)
+
+        # Seeding from price lists gives the same state as feeding bars
+        seeded = PortfolioVaREngine(window=252)
+        seeded.load_history({s: self.prices[:, i] for i, s in enumerate(self.symbols)})
+        np.testing.assert_allclose(seeded.returns_matrix(), engine.returns_matrix())
+        exposures = {'AAA': 50000.0, 'BBB': -20000.0, 'CCC': 10000.0}
+        self.assertAlmostEqual(seeded.calculate(exposures, 'historical')['var'],
+                               engine.calculate(exposures, 'historical')['var'])
+
+    def test_var_reflects_correlation(self):
+        engine = self._fed_engine()
+        long_only = engine.calculate({'AAA': 50000.0, 'BBB': 50000.0}, 'parametric')
+        hedged = engine.calculate({'AAA': 50000.0, 'BBB': -50000.0}, 'parametric')
+        single = engine.calculate({'AAA': 50000.0}, 'parametric')
+
+        self.assertLess(long_only['var'], 2 * single['var'])
+        self.assertLess(hedged['var'], single['var'])
+        self.assertGreater(long_only['cvar'], long_only['var'])
+
+    def test_methods_agree_and_components_sum(self):
+        engine = self._fed_engine(n_simulations=20000)
+        exposures = {'AAA': 40000.0, 'BBB': 30000.0, 'CCC': -10000.0}
+        results = {method: engine.calculate(exposures, method) for method in PortfolioVaREngine.METHODS}
+
+        parametric = results['parametric']['var']
+        self.assertAlmostEqual(results['monte_carlo']['var'], parametric, delta=0.05 * parametric)
+        self.assertAlmostEqual(results['historical']['var'], parametric, delta=0.35 * parametric)
+
+        for result in results.values():
+            self.assertAlmostEqual(sum(result['component_var'].values()), result['var'], places=6)
+            self.assertAlmostEqual(result['marginal_var']['AAA'] * 40000.0, result['component_var']['AAA'])
+
+        # Seeded simulations are reproducible; Student-t tails are heavier at 99%
+        self.assertEqual(engine.calculate(exposures, 'monte_carlo')['var'], results['monte_carlo']['var'])
+        normal = self._fed_engine(confidence_level=0.99).calculate(exposures, 'monte_carlo')
+        fat = self._fed_engine(confidence_level=0.99, student_t_df=4).calculate(exposures, 'monte_carlo')
+        self.assertGreater(fat['cvar'], normal['cvar'])
+
+        with self.assertRaises(ValueError):
+            engine.calculate(exposures, 'delta_gamma')
+
+    def test_new_symbols_and_empty_portfolio(self):
+        engine = self._fed_engine()
+        self.assertEqual(engine.calculate({}, 'historical')['var'], 0.0)
+
+        engine.update({'DDD': 10.0})
+        engine.update({'DDD': 10.5, 'AAA': 101.0})
+        self.assertEqual(engine.symbols[-1], 'DDD')
+        self.assertAlmostEqual(engine.returns_matrix()[-1, 3], 0.05)
+        self.assertEqual(engine.returns_matrix()[-1, 1], 0.0)
+
+    def test_sync_history_adds_only_new_bars(self):
+        engine = self._fed_engine()
+        synced = PortfolioVaREngine(window=252)
+        # Sliding 100-bar price lists, advanced by a varying number of bars
+        for end in (100, 101, 105, 180, 250, 301):
+            synced.sync_history({s: self.prices[end - 100:end, i] for i, s in enumerate(self.symbols)})
+
+        np.testing.assert_allclose(synced.returns_matrix()[-200:], engine.returns_matrix()[-200:])
+        exposures = {'AAA': 50000.0, 'BBB': -20000.0}
+        self.assertAlmostEqual(synced.calculate(exposures, 'historical')['var'],
+                               engine.calculate(exposures, 'historical')['var'])
+
+        # A history that no longer contains the engine's recent prices is skipped
+        returns = synced.returns_matrix()
+        synced.sync_history({'AAA': self.prices[:50, 0]})
+        np.testing.assert_array_equal(synced.returns_matrix(), returns)
+
+    def test_sync_history_skips_lagging_snapshots(self):
+        engine = PortfolioVaREngine(window=252)
+        synced = PortfolioVaREngine(window=252)
+        for row in self.prices[:300]:
+            engine.update(dict(zip(self.symbols, row)))
+            synced.update(dict(zip(self.symbols, row)))
+
+        # market_data two bars behind the per-bar feed, and a short one
+        synced.sync_history({'AAA': self.prices[198:298, 0], 'BBB': self.prices[293:298, 1]})
+        np.testing.assert_array_equal(synced.returns_matrix(), engine.returns_matrix())
+
+        # Short histories ahead of the engine still add their new bars
+        synced.sync_history({s: self.prices[296:301, i] for i, s in enumerate(self.symbols)})
+        engine.update(dict(zip(self.symbols, self.prices[300])))
+        np.testing.assert_allclose(synced.returns_matrix(), engine.returns_matrix())
+
+    def test_per_bar_update_for_500_names(self):
+        engine = PortfolioVaREngine(window=252)
+        prices = simulate_prices(80, 500, seed=1)
+        symbols = [f'S{i}' for i in range(500)]
+        engine.load_history({s: prices[:60, i] for i, s in enumerate(symbols)})
+        exposures = {s: 10000.0 for s in symbols}
+
+        start = time.perf_counter()
+        for row in prices[60:]:
+            engine.update(dict(zip(symbols, row)))
+            engine.calculate(exposures, 'historical')
+            engine.calculate(exposures, 'parametric')
+        per_bar = (time.perf_counter() - start) / 20
+        self.assertLess(per_bar, 0.05)
+
+
+
+class TestRiskManagerVaR(unittest.TestCase):
+    """Test suite for RiskManager.calculate_var on top of the engine"""
+
+    def setUp(self):
+        self.prices = simulate_prices(300, 2, seed=3)
+        self.positions = {
+            'AAA': {'current_value': 50000.0, 'direction': 1},
+            'BBB': {'current_value': 30000.0, 'direction': 1}
+        }
+
+    def _risk_manager(self):
+        risk_manager = RiskManager(config={'stop_loss_type': 'VOLATILITY'})
+        risk_manager.positions = dict(self.positions)
+        return risk_manager
+
+    def _market_data(self, end):
+        return {s: {'close': list(self.prices[end - 120:end, i])} for i, s in enumerate(['AAA', 'BBB'])}
+
+    def test_var_follows_new_market_data(self):
+        risk_manager = self._risk_manager()
+        first = risk_manager.calculate_var(self._market_data(150), 'parametric')['var']
+
+        # Prices after a volatility spike
+        self.prices[150:] = self.prices[149] * np.cumprod(
+            1 + np.random.default_rng(0).normal(0, 0.05, (151, 2)), axis=0)
+        second = risk_manager.calculate_var(self._market_data(160), 'parametric')['var']
+        self.assertGreater(second, first)
+
+        # Only the ten new bars were appended to the engine's history
+        returns = risk_manager.var_engine.returns_matrix()
+        self.assertEqual(len(returns), 119 + 10)
+        np.testing.assert_allclose(returns[-10:], self.prices[150:160] / self.prices[149:159] - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
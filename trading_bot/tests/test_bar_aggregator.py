@@ -0,0 +1,101 @@
+import unittest
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+
+from trading_bot.data.bar_aggregator import BarAggregator, BarSeries, TimeframeBarsView
+
+
+class TestBarAggregator(unittest.TestCase):
+    """Test suite for array-backed tick-to-bar aggregation"""
+
+    def setUp(self):
+        rng = np.random.RandomState(3)
+        offsets = np.sort(rng.randint(0, 3 * 3600 * 10**9, size=5000))
+        self.ticks = pd.DataFrame({
+            'timestamp': pd.Timestamp('2024-01-02 09:30') + pd.to_timedelta(offsets, unit='ns'),
+            'price': 100 + np.cumsum(rng.randn(5000) * 0.05),
+            'volume': rng.randint(1, 100, size=5000).astype(float)
+        })
+
+    def _reference(self, rule):
+        grouped = self.ticks.set_index('timestamp').resample(rule)
+        bars = pd.DataFrame({
+            'open': grouped['price'].first(),
+            'high': grouped['price'].max(),
+            'low': grouped['price'].min(),
+            'close': grouped['price'].last(),
+            'volume': grouped['volume'].sum()
+        })
+        return bars.dropna()
+
+    def test_matches_pandas_resample(self):
+        aggregator = BarAggregator(['1min', '5min', '1hour'])
+        for row in self.ticks.itertuples(index=False):
+            aggregator.update('SPY', row.timestamp, row.price, row.volume)
+
+        for timeframe, rule in [('1min', '1min'), ('5min', '5min'), ('1hour', '1h')]:
+            expected = self._reference(rule)
+            bars = aggregator.get_bars('SPY', timeframe)
+            self.assertTrue(bars.index.equals(expected.index))
+            np.testing.assert_allclose(bars.values, expected.values)
+
+    def test_new_bar_reporting(self):
+        aggregator = BarAggregator(['1min', '5min'])
+        start = datetime(2024, 1, 2, 9, 30)
+
+        self.assertEqual(aggregator.update('SPY', start, 100.0, 1), ['1min', '5min'])
+        self.assertEqual(aggregator.update('SPY', start + timedelta(seconds=30), 101.0, 1), [])
+        self.assertEqual(aggregator.update('SPY', start + timedelta(minutes=1), 102.0, 1), ['1min'])
+
+    def test_late_ticks(self):
+        series = BarSeries('1min')
+        base = 1_700_000_000 * 10**9 // 60_000_000_000 * 60_000_000_000
+        minute = 60 * 10**9
+
+        series.update(base, 100.0, 1)
+        series.update(base + 2 * minute, 102.0, 1)
+        self.assertFalse(series.update(base + 10, 99.0, 5))  # Late tick for an existing bar
+        self.assertTrue(series.update(base + minute, 101.0, 1))  # Missing bar is inserted
+
+        bars = series.to_frame()
+        self.assertEqual(len(bars), 3)
+        self.assertTrue(bars.index.is_monotonic_increasing)
+        self.assertEqual(bars['low'].iloc[0], 99.0)
+        self.assertEqual(bars['volume'].iloc[0], 6)
+
+    def test_max_bars_retained(self):
+        series = BarSeries('1min', max_bars=10, initial_capacity=2)
+        minute = 60 * 10**9
+        for i in range(25):
+            series.update(i * minute, float(i), 1)
+
+        bars = series.to_frame()
+        self.assertEqual(len(bars), 10)
+        self.assertEqual(list(bars['open']), [float(i) for i in range(15, 25)])
+        self.assertEqual(len(series.to_frame(3)), 3)
+
+    def test_timezone_preserved(self):
+        aggregator = BarAggregator(['1day'])
+        timestamp = pd.Timestamp('2024-01-02 20:00', tz='America/New_York')
+        aggregator.update('SPY', timestamp, 100.0, 1)
+
+        bars = aggregator.get_bars('SPY', '1day')
+        self.assertEqual(bars.index[0], pd.Timestamp('2024-01-02', tz='America/New_York'))
+
+    def test_view(self):
+        aggregator = BarAggregator(['1min'])
+        view = TimeframeBarsView(aggregator, '1min')
+        self.assertNotIn('SPY', view)
+        with self.assertRaises(KeyError):
+            view['SPY']
+
+        aggregator.update('SPY', datetime(2024, 1, 2, 9, 30), 100.0, 1)
+        self.assertIn('SPY', view)
+        self.assertEqual(list(view), ['SPY'])
+        self.assertEqual(len(view['SPY']), 1)
+        self.assertTrue(aggregator.get_bars('QQQ', '1min').empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
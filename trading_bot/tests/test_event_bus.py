@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import unittest
+
+from trading_bot.event_system.event_bus import EventBus, EventHandler, LatencyHistogram
+from trading_bot.event_system.event_types import Event, EventType
+
+
+def make_event(event_type=EventType.MARKET_DATA, symbol='SPY', priority=1, source='test'):
+    return Event(event_type, {'symbol': symbol}, source, metadata={'priority': priority})
+
+
+class TestEventBus(unittest.TestCase):
+    """Test suite for EventBus dispatch"""
+
+    def setUp(self):
+        self.bus = EventBus(max_queue_size=100, worker_threads=2)
+        self.calls = []
+
+    def tearDown(self):
+        if self.bus.running:
+            self.bus.stop()
+        self.bus.thread_pool.shutdown(wait=True)
+
+    def _handler(self, name, event_type=None, **kwargs):
+        def callback(event):
+            self.calls.append((name, event.data['symbol'], threading.current_thread().name))
+        return EventHandler(callback, event_type, name=name, **kwargs)
+
+    def test_type_indexed_dispatch(self):
+        self.bus.register_handler(self._handler('market', EventType.MARKET_DATA))
+        self.bus.register_handler(self._handler('orders', [EventType.ORDER_FILLED, EventType.ORDER_CANCELED]))
+        self.bus.register_handler(self._handler('all', priority=10))
+        self.bus.register_handler(self._handler('qqq_only', EventType.MARKET_DATA, symbol_filter='QQQ'))
+
+        self.bus._process_event(make_event(EventType.MARKET_DATA, 'SPY'))
+        self.assertEqual(sorted(name for name, _, _ in self.calls), ['all', 'market'])
+
+        self.calls.clear()
+        self.bus._process_event(make_event(EventType.ORDER_CANCELED, 'QQQ'))
+        self.assertEqual(sorted(name for name, _, _ in self.calls), ['all', 'orders'])
+
+        self.calls.clear()
+        self.bus._process_event(make_event(EventType.MARKET_DATA, 'QQQ'))
+        self.assertEqual(sorted(name for name, _, _ in self.calls), ['all', 'market', 'qqq_only'])
+
+    def test_registration_changes_refresh_dispatch(self):
+        self.bus._process_event(make_event())
+        self.bus.register_handler(self._handler('late', EventType.MARKET_DATA))
+        self.bus._process_event(make_event())
+        self.assertEqual(len(self.calls), 1)
+
+        self.assertTrue(self.bus.unregister_handler('late'))
+        self.bus._process_event(make_event())
+        self.assertEqual(len(self.calls), 1)
+        self.assertFalse(self.bus.unregister_handler('late'))
+
+    def test_inline_and_pooled_handlers(self):
+        self.bus.register_handler(self._handler('inline', EventType.MARKET_DATA, inline=True))
+        self.bus.register_handler(self._handler('pooled_a', EventType.MARKET_DATA))
+        self.bus.register_handler(self._handler('pooled_b', EventType.MARKET_DATA))
+
+        self.bus._process_event(make_event())
+
+        threads = {name: thread for name, _, thread in self.calls}
+        self.assertEqual(threads['inline'], threading.current_thread().name)
+        self.assertTrue(threads['pooled_a'].startswith('EventBus'))
+        self.assertTrue(threads['pooled_b'].startswith('EventBus'))
+
+        # A single matching handler is run directly
+        self.calls.clear()
+        self.bus.unregister_handler('inline')
+        self.bus.unregister_handler('pooled_b')
+        self.bus._process_event(make_event())
+        self.assertEqual(self.calls[0][2], threading.current_thread().name)
+
+    def test_batch_drain_order(self):
+        events = [make_event(symbol=f'S{i}', priority=1) for i in range(5)]
+        urgent = make_event(symbol='URGENT', priority=5)
+
+        self.assertEqual(self.bus.publish_batch(events), 5)
+        self.assertTrue(self.bus.publish(urgent))
+
+        batch = self.bus._get_batch(timeout=0)
+        self.assertEqual([event.data['symbol'] for _, _, event in batch], ['URGENT', 'S0', 'S1', 'S2', 'S3', 'S4'])
+        self.assertEqual(self.bus._get_batch(timeout=0), [])
+
+        self.bus._task_done(len(batch))
+        self.bus.event_queue.join()
+
+    def test_publish_batch_respects_queue_size(self):
+        bus = EventBus(max_queue_size=3, worker_threads=1)
+        self.assertEqual(bus.publish_batch([make_event() for _ in range(5)], block=False), 3)
+        self.assertEqual(bus.event_queue.qsize(), 3)
+        bus.thread_pool.shutdown(wait=True)
+
+    def test_workers_process_published_events(self):
+        self.bus.register_handler(self._handler('market', EventType.MARKET_DATA, inline=True))
+        self.bus.start()
+        self.bus.publish_batch([make_event(symbol=f'S{i}') for i in range(50)])
+        for i in range(50, 60):
+            self.bus.publish(make_event(symbol=f'S{i}'))
+        self.bus.event_queue.join()
+
+        self.assertEqual(len(self.calls), 60)
+        metrics = self.bus.get_metrics()
+        self.assertEqual(metrics['events_processed'], 60)
+        latency = metrics['handlers'][0]['latency']
+        self.assertEqual(latency['count'], 60)
+        self.assertEqual(sum(latency['buckets'].values()), 60)
+
+
+class TestAsyncEventBus(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the asyncio EventBus mode"""
+
+    async def asyncSetUp(self):
+        self.bus = EventBus(max_queue_size=4, worker_threads=2)
+        self.calls = []
+
+    async def asyncTearDown(self):
+        await self.bus.stop_async(drain=False)
+        if self.bus.running:
+            self.bus.stop()
+        self.bus.thread_pool.shutdown(wait=True)
+
+    async def test_coroutine_and_sync_handlers(self):
+        loop_thread = threading.current_thread().name
+
+        async def on_data(event):
+            await asyncio.sleep(0)
+            self.calls.append(('coroutine', threading.current_thread().name))
+
+        def on_data_sync(event):
+            self.calls.append(('sync', threading.current_thread().name))
+
+        def on_data_inline(event):
+            self.calls.append(('inline', threading.current_thread().name))
+
+        self.bus.register_handler(EventHandler(on_data, EventType.MARKET_DATA, async_handler=True))
+        self.bus.register_handler(EventHandler(on_data_sync, EventType.MARKET_DATA))
+        self.bus.register_handler(EventHandler(on_data_inline, EventType.MARKET_DATA, inline=True))
+
+        self.assertTrue(await self.bus.publish_async(make_event()))
+        await self.bus.async_queue.join()
+
+        threads = dict(self.calls)
+        self.assertEqual(threads['coroutine'], loop_thread)
+        self.assertEqual(threads['inline'], loop_thread)
+        self.assertTrue(threads['sync'].startswith('EventBus'))
+        self.assertEqual(self.bus.get_metrics()['events_processed'], 1)
+
+    async def test_backpressure(self):
+        release = asyncio.Event()
+
+        async def slow(event):
+            await release.wait()
+
+        self.bus.register_handler(EventHandler(slow, EventType.MARKET_DATA, async_handler=True))
+        await self.bus.start_async()
+
+        # One event in the handler plus max_queue_size queued
+        for _ in range(5):
+            self.assertTrue(await self.bus.publish_async(make_event(), timeout=1.0))
+        self.assertFalse(await self.bus.publish_async(make_event(), timeout=0.05))
+
+        release.set()
+        await self.bus.stop_async()
+        self.assertEqual(self.bus.events_processed, 5)
+
+    async def test_bridge_from_threaded_bus(self):
+        received = asyncio.Queue()
+
+        async def on_fill(event):
+            await received.put(event.data['symbol'])
+
+        self.bus.register_handler(EventHandler(on_fill, EventType.ORDER_FILLED, async_handler=True))
+        await self.bus.start_async()
+        self.bus.start()
+
+        # Threaded publishers reach coroutine handlers on the loop
+        self.bus.publish(make_event(EventType.ORDER_FILLED, 'SPY'))
+        self.assertEqual(await asyncio.wait_for(received.get(), 1.0), 'SPY')
+
+        # Other threads can publish straight into the async queue
+        thread = threading.Thread(
+            target=self.bus.publish_threadsafe, args=(make_event(EventType.ORDER_FILLED, 'QQQ'),)
+        )
+        thread.start()
+        self.assertEqual(await asyncio.wait_for(received.get(), 1.0), 'QQQ')
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Test suite for handler latency histograms"""
+
+    def test_percentiles(self):
+        histogram = LatencyHistogram()
+        for _ in range(90):
+            histogram.record(3e-6)
+        for _ in range(10):
+            histogram.record(0.003)
+
+        self.assertEqual(histogram.percentile(50), 0.005)
+        self.assertEqual(histogram.percentile(99), 0.003 * 1000)
+        summary = histogram.to_dict()
+        self.assertEqual(summary['buckets'], {'<=5us': 90, '<=5000us': 10})
+        self.assertAlmostEqual(summary['max_ms'], 3.0)
+
+    def test_empty(self):
+        self.assertEqual(LatencyHistogram().percentile(99), 0.0)
+        self.assertEqual(LatencyHistogram().to_dict()['buckets'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import json
+import time
+import asyncio
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from trading_bot.brokers.http_transport import (
+    AIOHTTP_AVAILABLE, AsyncHttpTransport, HttpTransport, RateLimitExceeded, TokenBucket, shared_rate_limiter
+)
+
+
+class MockBrokerHandler(BaseHTTPRequestHandler):
+    """Quote endpoint that records requests and the connection they arrived on"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append((self.path, self.client_address[1], self.headers.get('Authorization')))
+        if self.path.startswith('/slow'):
+            time.sleep(0.2)
+        if self.path.startswith('/limited'):
+            self._reply(429, {'fault': 'rate limited'}, {'Retry-After': '0.3'})
+        else:
+            self._reply(200, {'quotes': {'path': self.path}})
+
+    def _reply(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockServerTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), MockBrokerHandler)
+        cls.server.daemon_threads = True
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.server.requests = []
+
+
+class TestHttpTransport(MockServerTestCase):
+    """Test suite for the pooled HTTP transport"""
+
+    def test_keep_alive_reuses_connection(self):
+        transport = HttpTransport(self.base_url, headers={'Authorization': 'Bearer abc'})
+        for i in range(20):
+            response = transport.get('/v1/markets/quotes', params={'symbols': f'S{i}'})
+            self.assertEqual(response.status_code, 200)
+        transport.close()
+
+        self.assertEqual(len(self.server.requests), 20)
+        self.assertEqual(len({port for _, port, _ in self.server.requests}), 1)
+        self.assertEqual(self.server.requests[0][2], 'Bearer abc')
+
+    def test_identical_in_flight_gets_coalesce(self):
+        transport = HttpTransport(self.base_url)
+        results = []
+
+        def fetch(symbols):
+            results.append(transport.get('/slow/quotes', params={'symbols': symbols}).json())
+
+        threads = [threading.Thread(target=fetch, args=('SPY,QQQ',)) for _ in range(8)]
+        threads.append(threading.Thread(target=fetch, args=('IWM',)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 9)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(transport.get_metrics()['requests_coalesced'], 7)
+
+        # Finished requests are not reused
+        transport.get('/slow/quotes', params={'symbols': 'SPY,QQQ'})
+        self.assertEqual(len(self.server.requests), 3)
+        transport.close()
+
+    def test_rate_limit_shared_between_clients(self):
+        limiter = TokenBucket(rate=50, capacity=5)
+        first = HttpTransport(self.base_url, rate_limiter=limiter, block=True)
+        second = HttpTransport(self.base_url, rate_limiter=limiter, block=True)
+
+        start = time.monotonic()
+        for i in range(10):
+            (first if i % 2 else second).get('/quotes', params={'i': i})
+        elapsed = time.monotonic() - start
+
+        # 5 burst tokens, then 5 more at 50/s
+        self.assertGreaterEqual(elapsed, 0.09)
+
+        # By default an empty bucket raises instead of sleeping on the calling thread
+        non_blocking = HttpTransport(self.base_url, rate_limiter=TokenBucket(rate=0.1, capacity=2))
+        non_blocking.get('/quotes', params={'burst': 1})
+        non_blocking.get('/quotes', params={'burst': 2})
+        start = time.monotonic()
+        with self.assertRaises(RateLimitExceeded) as raised:
+            non_blocking.get('/quotes', params={'burst': 3})
+        self.assertLess(time.monotonic() - start, 0.05)
+        self.assertGreater(raised.exception.wait, 9)
+        self.assertEqual(len(self.server.requests), 12)
+        for transport in (first, second, non_blocking):
+            transport.close()
+
+        self.assertIs(shared_rate_limiter('key-1', 1.0, 5), shared_rate_limiter('key-1', 1, 5.0))
+        self.assertIsNot(shared_rate_limiter('key-1', 1.0), shared_rate_limiter('key-2', 1.0))
+
+        # Clients with different limits on one key share a bucket at the strictest limit
+        limiter = shared_rate_limiter('key-3', 2.0, 2)
+        self.assertIs(limiter, shared_rate_limiter('key-3', 1.0, 5))
+        self.assertEqual((limiter.rate, limiter.capacity), (1.0, 2))
+        self.assertLessEqual(limiter.available, 2)
+
+    def test_429_pauses_shared_limiter(self):
+        limiter = TokenBucket(rate=1000, capacity=10)
+        transport = HttpTransport(self.base_url, rate_limiter=limiter)
+
+        self.assertEqual(transport.get('/limited').status_code, 429)
+        self.assertGreater(limiter.reserve(), 0.2)
+        self.assertEqual(transport.get_metrics()['rate_limited'], 1)
+        transport.close()
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test suite for the token bucket limiter"""
+
+    def test_reserve_and_refill(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+        self.assertAlmostEqual(bucket.try_acquire(), 1.5)
+
+        now[0] = 10.0
+        self.assertEqual(bucket.available, 2)
+        self.assertEqual(bucket.try_acquire(), 0.0)
+
+        bucket.pause(3.0)
+        self.assertAlmostEqual(bucket.reserve(), 3.5)
+
+
+@unittest.skipUnless(AIOHTTP_AVAILABLE, "aiohttp not installed")
+class TestAsyncHttpTransport(MockServerTestCase):
+    """Test suite for the asyncio transport"""
+
+    def test_coalescing_and_pooling(self):
+        async def run():
+            transport = AsyncHttpTransport(self.base_url, rate_limiter=TokenBucket(rate=100, capacity=20))
+            try:
+                same = [transport.get('/slow/quotes', params={'symbols': 'SPY'}) for _ in range(5)]
+                responses = await asyncio.gather(*same, transport.get('/slow/quotes', params={'symbols': 'QQQ'}))
+                for i in range(5):
+                    await transport.get('/quotes', params={'i': i})
+                return responses, transport.get_metrics()
+            finally:
+                await transport.close()
+
+        responses, metrics = asyncio.run(run())
+        self.assertEqual([r.status_code for r in responses], [200] * 6)
+        self.assertEqual(responses[0].json(), {'quotes': {'path': '/slow/quotes?symbols=SPY'}})
+        self.assertEqual(metrics['requests_coalesced'], 4)
+        self.assertEqual(len(self.server.requests), 7)
+        # The sequential requests reuse pooled connections
+        self.assertLessEqual(len({port for _, port, _ in self.server.requests}), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from trading_bot.utils.indicator_engine import IndicatorEngine
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """Test suite for the shared memoizing indicator engine"""
+
+    def setUp(self):
+        rng = np.random.RandomState(7)
+        n = 300
+        close = 100 + np.cumsum(rng.randn(n))
+        self.data = pd.DataFrame({
+            'open': close + rng.randn(n) * 0.1,
+            'high': close + rng.rand(n),
+            'low': close - rng.rand(n),
+            'close': close,
+            'volume': rng.randint(100, 1000, size=n).astype(float)
+        }, index=pd.date_range('2024-01-01', periods=n, freq='D'))
+        self.engine = IndicatorEngine()
+
+    def test_matches_reference_formulas(self):
+        close = self.data['close']
+
+        delta = close.diff()
+        avg_gain = delta.where(delta > 0, 0).rolling(14).mean()
+        avg_loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+        pd.testing.assert_series_equal(
+            self.engine.compute(self.data, 'rsi'), 100 - 100 / (1 + avg_gain / avg_loss), check_names=False
+        )
+
+        macd = self.engine.compute(self.data, 'macd')
+        line = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+        pd.testing.assert_series_equal(macd['macd'], line, check_names=False)
+        pd.testing.assert_series_equal(macd['signal'], line.ewm(span=9, adjust=False).mean(), check_names=False)
+
+        bands = self.engine.compute(self.data, 'bollinger', period=20, num_std=2.0)
+        upper = close.rolling(20).mean() + 2 * close.rolling(20).std()
+        pd.testing.assert_series_equal(bands['upper'], upper, check_names=False)
+
+        tr = pd.concat([
+            self.data['high'] - self.data['low'],
+            (self.data['high'] - close.shift(1)).abs(),
+            (self.data['low'] - close.shift(1)).abs()
+        ], axis=1).max(axis=1)
+        pd.testing.assert_series_equal(
+            self.engine.compute(self.data, 'atr'), tr.rolling(14).mean(), check_names=False
+        )
+
+    def test_wilder_smoothing(self):
+        rsi = self.engine.compute(self.data, 'rsi', smoothing='wilder')
+        self.assertEqual(rsi.isna().sum(), 13)
+        self.assertTrue(rsi.dropna().between(0, 100).all())
+
+        atr = self.engine.compute(self.data, 'atr', period=14, smoothing='wilder')
+        tr = self.engine.compute(self.data, 'true_range')
+        self.assertAlmostEqual(atr.iloc[13], tr.iloc[:14].mean())
+        self.assertAlmostEqual(atr.iloc[14], (atr.iloc[13] * 13 + tr.iloc[14]) / 14)
+
+        adx = self.engine.compute(self.data, 'adx', smoothing='wilder')
+        self.assertTrue(adx['adx'].dropna().between(0, 100).all())
+
+    def test_cache_hits_and_shared_dependencies(self):
+        first = self.engine.compute(self.data, 'adx', symbol='SPY', timeframe='1d')
+        misses = self.engine.cache_info()['misses']
+
+        # Same data in a different frame object hits the cache
+        self.assertIs(self.engine.compute(self.data.copy(), 'adx', symbol='SPY', timeframe='1d'), first)
+
+        # ATR was computed as an ADX dependency
+        self.engine.compute(self.data, 'atr', symbol='SPY', timeframe='1d')
+        self.assertEqual(self.engine.cache_info()['misses'], misses)
+
+        # New data is a new version
+        changed = self.data.copy()
+        changed.iloc[-1, changed.columns.get_loc('close')] += 1
+        self.assertIsNot(self.engine.compute(changed, 'adx', symbol='SPY', timeframe='1d'), first)
+
+        # Columns the indicator does not read do not affect the key
+        changed = self.data.copy()
+        changed['volume'] = 0.0
+        self.engine.compute(changed, 'rsi', symbol='SPY', timeframe='1d')
+        misses = self.engine.cache_info()['misses']
+        self.engine.compute(self.data, 'rsi', symbol='SPY', timeframe='1d')
+        self.assertEqual(self.engine.cache_info()['misses'], misses)
+
+    def test_explicit_version(self):
+        first = self.engine.compute(self.data, 'sma', symbol='SPY', version=1)
+        self.assertIs(self.engine.compute(self.data.iloc[:10], 'sma', symbol='SPY', version=1), first)
+        self.assertIsNot(self.engine.compute(self.data, 'sma', symbol='SPY', version=2), first)
+
+    def test_lru_eviction_and_invalidate(self):
+        engine = IndicatorEngine(max_entries=3)
+        for period in [5, 10, 20, 50]:
+            engine.compute(self.data, 'sma', symbol='SPY', period=period)
+        self.assertEqual(engine.cache_info()['size'], 3)
+
+        engine.compute(self.data, 'sma', symbol='SPY', period=10)
+        self.assertEqual(engine.hits, 1)
+        engine.compute(self.data, 'sma', symbol='SPY', period=5)
+        self.assertEqual(engine.hits, 1)
+
+        engine.compute(self.data, 'sma', symbol='QQQ', period=5)
+        self.assertEqual(engine.invalidate(symbol='SPY'), 2)
+        self.assertEqual(engine.cache_info()['size'], 1)
+
+    def test_unknown_indicator_and_parameter(self):
+        with self.assertRaises(KeyError):
+            self.engine.compute(self.data, 'not_an_indicator')
+        with self.assertRaises(ValueError):
+            self.engine.compute(self.data, 'rsi', window=14)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+import json
+import unittest
+
+import numpy as np
+
+from trading_bot.event_system.event_manager import EventManager
+from trading_bot.event_system.event_types import EventType
+from trading_bot.event_system.latency_tracer import HdrHistogram, LatencyTracer, TRACE_KEY
+from trading_bot.strategies.base_strategy import SignalType
+
+
+class FakeClock:
+    """Nanosecond clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHdrHistogram(unittest.TestCase):
+    """Test suite for the log-linear latency histogram"""
+
+    def test_percentiles_within_relative_error(self):
+        rng = np.random.default_rng(3)
+        values = rng.lognormal(mean=12, sigma=2, size=20000).astype(np.int64)
+        histogram = HdrHistogram()
+        for value in values:
+            histogram.record(int(value))
+
+        for pct in (50, 90, 99, 99.9):
+            expected = np.percentile(values, pct, method='inverted_cdf') / 1e6
+            self.assertAlmostEqual(histogram.percentile(pct), expected, delta=expected / 100)
+        self.assertEqual(histogram.to_dict()['max_ms'], values.max() / 1e6)
+
+    def test_small_and_oversized_values(self):
+        histogram = HdrHistogram(max_value_ns=10**9)
+        histogram.record(100)
+        histogram.record(5 * 10**9)
+        self.assertEqual(histogram.percentile(50), 100 / 1e6)
+        self.assertEqual(histogram.percentile(100), 1000.0)
+
+
+class TestLatencyTracer(unittest.TestCase):
+    """Test suite for sampled pipeline tracing"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracer = LatencyTracer(sample_rate=1.0, clock=self.clock)
+
+    def test_trace_follows_tick_through_derived_events(self):
+        tracer = self.tracer
+        token = tracer.activate(tracer.start_trace("tick_received"))
+        try:
+            self.clock.now += 2000
+            tracer.mark(tracer.current(), "bar_emitted")
+            market_trace = tracer.current_or_start("market_data_published")
+        finally:
+            tracer.deactivate(token)
+        self.assertIsNone(tracer.current())
+
+        # Two strategies handle the same market data event
+        signals = []
+        for name, cost in (("fast", 1000), ("slow", 50000)):
+            with tracer.span(market_trace, f"strategy.{name}"):
+                self.clock.now += cost
+            signal_trace = tracer.fork(market_trace)
+            tracer.mark(signal_trace, "signal_published")
+            signals.append(signal_trace)
+
+        self.assertEqual(signals[0]["stages"]["signal_published"], 3000)
+        self.assertEqual(signals[1]["stages"]["signal_published"], 53000)
+        self.assertNotIn("signal_published", market_trace["stages"])
+        self.assertEqual(market_trace["spans"], {"strategy.fast": 1000, "strategy.slow": 50000})
+
+        metrics = tracer.get_metrics()
+        self.assertEqual(metrics["tick_received.bar_emitted"]["count"], 1)
+        self.assertEqual(metrics["tick_received.signal_published"]["count"], 2)
+        self.assertAlmostEqual(metrics["strategy.slow"]["max_ms"], 0.05)
+
+    def test_sampling(self):
+        tracer = LatencyTracer(sample_rate=0.1, clock=self.clock)
+        traces = [tracer.start_trace() for _ in range(1000)]
+        self.assertEqual(sum(trace is not None for trace in traces), 100)
+
+        # Untraced events record nothing
+        tracer.mark(None, "bar_emitted")
+        with tracer.span(None, "risk.check_risk_limits"):
+            pass
+        self.assertEqual(tracer.get_metrics(), {})
+        self.assertIsNone(tracer.fork(None))
+
+        # An unsampled tick does not start a second trace further down its call stack
+        tracer.set_sample_rate(1.0)
+        token = tracer.activate(None)
+        self.assertIsNone(tracer.current_or_start("market_data_published"))
+        tracer.deactivate(token)
+        trace = tracer.current_or_start("market_data_published")
+        self.assertEqual(trace["origin"], "market_data_published")
+
+        tracer.set_sample_rate(0)
+        self.assertIsNone(tracer.start_trace())
+
+    def test_trace_is_serializable_metadata(self):
+        trace = self.tracer.start_trace()
+        self.tracer.mark(trace, "order_published")
+        metadata = json.loads(json.dumps({TRACE_KEY: trace}))
+        self.assertEqual(metadata[TRACE_KEY]["stages"], {"tick_received": 0, "order_published": 0})
+
+
+class LongStrategy:
+    """Strategy that goes long on every symbol it sees"""
+
+    def generate_signals(self, data, timestamp):
+        return {symbol: SignalType.LONG for symbol in data}
+
+
+class TestEventManagerTracing(unittest.TestCase):
+    """Test suite for traces flowing through EventManager"""
+
+    def setUp(self):
+        self.manager = EventManager(config={"event_worker_threads": 1})
+        self.tracer = self.manager.latency_tracer
+        self.addCleanup(self.tracer.set_sample_rate, self.tracer.sample_rate)
+        self.addCleanup(self.manager.event_bus.thread_pool.shutdown, wait=True)
+        self.tracer.set_sample_rate(1.0)
+        self.tracer.reset()
+        self.manager.register_strategy("long", LongStrategy())
+
+    def _dispatch(self):
+        """Process queued events on this thread, returning them in order"""
+        events = []
+        queue = self.manager.event_bus.event_queue
+        while not queue.empty():
+            event = queue.get_nowait()[2]
+            self.manager.event_bus._process_event(event)
+            events.append(event)
+        return events
+
+    def test_publish_started_traces_kept_apart_from_tick_traces(self):
+        token = self.tracer.activate(self.tracer.start_trace("tick_received"))
+        try:
+            self.manager.publish_market_data("SPY", {"close": 100.0})
+        finally:
+            self.tracer.deactivate(token)
+        self.manager.publish_market_data("QQQ", {"close": 200.0})
+
+        events = self._dispatch()
+        signals = [event for event in events if event.event_type == EventType.SIGNAL_GENERATED]
+        self.assertEqual([event.data["symbol"] for event in signals], ["SPY", "QQQ"])
+        self.assertEqual([event.metadata[TRACE_KEY]["origin"] for event in signals],
+                         ["tick_received", "market_data_published"])
+
+        metrics = self.tracer.get_metrics()
+        for stage in ("market_data_published", "strategy_dispatch", "signal_published"):
+            self.assertEqual(metrics[f"tick_received.{stage}"]["count"], 1)
+        for stage in ("strategy_dispatch", "signal_published"):
+            self.assertEqual(metrics[f"market_data_published.{stage}"]["count"], 1)
+        self.assertNotIn("market_data_published.market_data_published", metrics)
+        self.assertEqual(metrics["strategy.long"]["count"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+
+from trading_bot.data.data_storage import DataStorage
+import trading_bot.data.market_data_store as market_data_store
+from trading_bot.data.market_data_store import MarketDataStore, OptionChainStore
+
+
+def make_bars(start, periods, freq='1min', seed=0):
+    rng = np.random.RandomState(seed)
+    close = 100 + np.cumsum(rng.randn(periods))
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.randint(100, 1000, size=periods)
+    }, index=pd.date_range(start, periods=periods, freq=freq, name='timestamp'))
+
+
+class TestMarketDataStore(unittest.TestCase):
+    """Test suite for the partitioned columnar market data store"""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.store = MarketDataStore(self.base_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def test_append_partitions_and_round_trip(self):
+        bars = make_bars('2024-01-02 23:00', 180)
+        self.assertEqual(self.store.append('SPY', '1min', bars.iloc[:90]), 90)
+        self.assertEqual(self.store.append('SPY', '1min', bars.iloc[90:]), 90)
+
+        # One part per date touched by each append
+        info = self.store.get_info('SPY', '1min')
+        self.assertEqual(info['rows'], 180)
+        self.assertEqual(info['parts'], 3)
+        self.assertEqual(info['start'], bars.index[0])
+        self.assertEqual(self.store.list_datasets(), {'SPY': ['1min']})
+
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1min'), bars, check_freq=False)
+
+        # Compacting to month partitions merges the parts
+        self.assertEqual(self.store.compact('SPY', '1min', partition='month'), 180)
+        self.assertEqual(self.store.get_info('SPY', '1min')['parts'], 1)
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1min'), bars, check_freq=False)
+
+    def test_range_reads_prune_parts(self):
+        self.store.append('SPY', '1h', make_bars('2024-01-01', 24 * 10, freq='1h'))
+
+        # Remove a part outside the range; pruned reads never open it
+        manifest = self.store._load_manifest(self.store._dataset_dir('SPY', '1h'))
+        (self.store._dataset_dir('SPY', '1h') / manifest['parts'][0]['path']).unlink()
+
+        data = self.store.read('SPY', '1h', start='2024-01-03 05:00', end='2024-01-04')
+        self.assertEqual(data.index[0], pd.Timestamp('2024-01-03 05:00'))
+        self.assertEqual(data.index[-1], pd.Timestamp('2024-01-04'))
+        self.assertEqual(len(data), 20)
+
+        arrays = self.store.read('SPY', '1h', start='2024-01-05', end='2024-01-05 23:00',
+                                 columns=['close'], as_numpy=True)
+        self.assertEqual(set(arrays), {'timestamp', 'close'})
+        self.assertEqual(len(arrays['close']), 24)
+
+        self.assertEqual(len(self.store.read('SPY', '1h', start='2025-01-01')), 0)
+        self.assertIsNone(self.store.read('QQQ', '1h'))
+
+    def test_overlapping_appends_keep_last_write_until_compacted(self):
+        bars = make_bars('2024-01-02', 10, freq='1D')
+        self.store.append('SPY', '1d', bars)
+
+        revised = bars.iloc[3:6].copy()
+        revised['close'] += 50
+        self.store.append('SPY', '1d', revised)
+
+        expected = bars.copy()
+        expected.loc[revised.index, 'close'] = revised['close']
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1d'), expected, check_freq=False)
+
+        self.assertEqual(self.store.compact('SPY', '1d'), 10)
+        self.assertEqual(self.store.get_info('SPY', '1d')['parts'], 1)
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1d'), expected, check_freq=False)
+
+    def test_failed_compaction_keeps_dataset(self):
+        bars = make_bars('2024-01-02 23:00', 180)
+        self.store.append('SPY', '1min', bars.iloc[:90])
+        self.store.append('SPY', '1min', bars.iloc[60:])
+        parts = self.store.get_info('SPY', '1min')['parts']
+
+        write_ipc = market_data_store._write_ipc
+        written = []
+
+        def fail_second_write(path, table):
+            written.append(path)
+            if len(written) == 2:
+                raise OSError("disk full")
+            write_ipc(path, table)
+
+        with patch.object(market_data_store, '_write_ipc', side_effect=fail_second_write):
+            with self.assertRaises(OSError):
+                self.store.compact('SPY', '1min')
+
+        # The old parts and manifest are untouched and the new part was removed
+        self.assertEqual(self.store.get_info('SPY', '1min')['parts'], parts)
+        self.assertFalse(written[0].exists())
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1min'), bars, check_freq=False)
+
+        self.assertEqual(self.store.compact('SPY', '1min'), 180)
+        self.assertEqual(self.store.get_info('SPY', '1min')['parts'], 2)
+        pd.testing.assert_frame_equal(self.store.read('SPY', '1min'), bars, check_freq=False)
+
+    def test_timestamp_column_and_timezone(self):
+        frame = make_bars('2024-03-01 09:30', 5, seed=1).reset_index().rename(columns={'timestamp': 'datetime'})
+        frame['datetime'] = frame['datetime'].dt.tz_localize('America/New_York')
+        self.store.append('AAPL', '1min', frame)
+
+        data = self.store.read('AAPL', '1min', start='2024-03-01 09:31', end='2024-03-01 09:33')
+        self.assertEqual(list(data.columns), list(frame.columns))
+        pd.testing.assert_frame_equal(data, frame.iloc[1:4].reset_index(drop=True))
+
+        with self.assertRaises(ValueError):
+            self.store.append('AAPL', '1min', frame.drop(columns=['volume']))
+        with self.assertRaises(ValueError):
+            self.store.append('AAPL', '1min', frame.drop(columns=['datetime']))
+
+    def test_read_many(self):
+        for i, symbol in enumerate(['SPY', 'QQQ', 'IWM']):
+            self.store.append(symbol, '1d', make_bars('2024-01-01', 20, freq='1D', seed=i))
+        data = self.store.read_many(['SPY', 'QQQ', 'IWM', 'DIA'], '1d', start='2024-01-10')
+        self.assertEqual(sorted(data), ['IWM', 'QQQ', 'SPY'])
+        self.assertEqual(len(data['QQQ']), 11)
+
+
+class TestColumnarDataStorage(unittest.TestCase):
+    """Test suite for DataStorage on top of the columnar stores"""
+
+    def setUp(self):
+        self.base_dir = tempfile.mkdtemp()
+        self.storage = DataStorage(base_dir=self.base_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.base_dir)
+
+    def test_market_data_append_and_delete(self):
+        bars = make_bars('2024-01-02', 10, freq='1D')
+        self.assertTrue(self.storage.save_market_data('SPY', bars.iloc[:5]))
+        self.assertTrue(self.storage.save_market_data('SPY', bars.iloc[5:]))
+
+        loaded = self.storage.load_market_data('SPY', start='2024-01-05')
+        pd.testing.assert_frame_equal(loaded, bars.loc['2024-01-05':], check_freq=False)
+        self.assertEqual(self.storage.list_available_data('market'), {'SPY': ['ohlcv']})
+
+        self.assertTrue(self.storage.delete_market_data('SPY', 'ohlcv'))
+        self.assertIsNone(self.storage.load_market_data('SPY'))
+
+    def test_resaved_history_is_deduplicated(self):
+        bars = make_bars('2024-01-02', 10, freq='1D')
+        for _ in range(3):
+            self.assertTrue(self.storage.save_market_data('SPY', bars))
+
+        info = self.storage.market_store.get_info('SPY', 'ohlcv')
+        self.assertEqual((info['rows'], info['parts']), (10, 1))
+        pd.testing.assert_frame_equal(self.storage.load_market_data('SPY'), bars, check_freq=False)
+
+    def test_schema_change_replaces_stored_data(self):
+        bars = make_bars('2024-01-02', 10, freq='1D')
+        self.assertTrue(self.storage.save_market_data('SPY', bars[['close']]))
+        self.assertTrue(self.storage.save_market_data('SPY', bars[['close', 'volume']]))
+        pd.testing.assert_frame_equal(self.storage.load_market_data('SPY'), bars[['close', 'volume']],
+                                      check_freq=False)
+
+        # Data without timestamps is kept as a file, which loads then read
+        untimed = bars.reset_index(drop=True)
+        self.assertTrue(self.storage.save_market_data('SPY', untimed))
+        pd.testing.assert_frame_equal(self.storage.load_market_data('SPY'), untimed)
+
+    def test_append_migrates_legacy_parquet(self):
+        bars = make_bars('2024-01-02', 100, freq='1D')
+        (self.storage.market_data_dir / 'SPY').mkdir()
+        legacy_path = self.storage.market_data_dir / 'SPY' / 'ohlcv.parquet'
+        bars.iloc[:-1].to_parquet(legacy_path)
+
+        self.assertTrue(self.storage.save_market_data('SPY', bars.iloc[-1:]))
+        self.assertFalse(legacy_path.exists())
+        pd.testing.assert_frame_equal(self.storage.load_market_data('SPY'), bars, check_freq=False)
+
+    def test_option_chains_are_columnar(self):
+        calls = pd.DataFrame({'strike': [95.0, 100.0], 'bid': [6.1, 2.4], 'contract': ['C95', 'C100']})
+        chain = {
+            'symbol': 'SPY',
+            'underlying_price': 99.5,
+            'calls': calls,
+            'chains': {'2024-06-21': {'puts': calls.assign(contract=['P95', 'P100'])}}
+        }
+        self.assertTrue(self.storage.save_option_data('SPY', '2024-06-21', chain))
+        self.assertFalse(list(self.storage.option_data_dir.rglob('*.pkl')))
+
+        loaded = self.storage.load_option_data('SPY', '2024-06-21')
+        self.assertEqual(loaded['underlying_price'], 99.5)
+        pd.testing.assert_frame_equal(loaded['calls'], calls)
+        self.assertEqual(list(loaded['chains']['2024-06-21']['puts']['contract']), ['P95', 'P100'])
+        self.assertEqual(self.storage.list_available_data('option'), {'SPY': ['2024-06-21']})
+
+    def test_reads_legacy_pickles(self):
+        chain = {'calls': pd.DataFrame({'strike': [100.0]})}
+        (self.storage.option_data_dir / 'SPY').mkdir()
+        pd.to_pickle(chain, self.storage.option_data_dir / 'SPY' / '2024_06_21.pkl')
+        self.assertFalse(OptionChainStore(self.storage.option_data_dir).exists('SPY', '2024-06-21'))
+        loaded = self.storage.load_option_data('SPY', '2024-06-21')
+        pd.testing.assert_frame_equal(loaded['calls'], chain['calls'])
+
+
+if __name__ == '__main__':
+    unittest.main()
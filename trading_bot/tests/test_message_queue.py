@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import unittest
+
+from trading_bot.event_system.message_queue import MessageQueue, Message, QueueType
+
+
+class TestAsyncMessageQueue(unittest.IsolatedAsyncioTestCase):
+    """Test suite for asyncio MessageQueue delivery"""
+
+    async def test_delivers_to_coroutine_and_sync_subscribers(self):
+        mq = MessageQueue('quotes', max_size=10)
+        received = []
+        loop_thread = threading.current_thread().name
+
+        async def on_quote(message):
+            received.append(('coroutine', message.payload, threading.current_thread().name))
+
+        def on_quote_sync(message):
+            received.append(('sync', message.payload, threading.current_thread().name))
+
+        mq.subscribe(on_quote)
+        mq.subscribe(on_quote_sync)
+
+        self.assertIsNone(mq.async_queue)
+        self.assertTrue(await mq.publish_async({'symbol': 'SPY'}))
+        await mq.stop_async()
+
+        by_kind = {kind: (payload, thread) for kind, payload, thread in received}
+        self.assertEqual(by_kind['coroutine'], ({'symbol': 'SPY'}, loop_thread))
+        self.assertTrue(by_kind['sync'][1].startswith('MQ-quotes-Async'))
+        self.assertEqual(mq.get_stats()['messages_out'], 1)
+
+    async def test_priority_order_and_backpressure(self):
+        mq = MessageQueue('orders', queue_type=QueueType.PRIORITY, max_size=3)
+        release = asyncio.Event()
+        received = []
+
+        async def on_order(message):
+            await release.wait()
+            received.append(message.payload)
+
+        mq.subscribe(on_order)
+        await mq.start_async()
+
+        await mq.publish_async(Message('first'))
+        await asyncio.sleep(0)  # First message is taken by the worker
+        for payload, priority in [('low', 0), ('high', 5), ('mid', 1)]:
+            self.assertTrue(await mq.publish_async(Message(payload, priority=priority), timeout=1.0))
+        self.assertFalse(await mq.publish_async(Message('overflow'), timeout=0.05))
+
+        release.set()
+        await mq.stop_async()
+        self.assertEqual(received, ['first', 'high', 'mid', 'low'])
+
+    async def test_publish_threadsafe(self):
+        mq = MessageQueue('ticks', max_size=10)
+        received = asyncio.Queue()
+
+        async def on_tick(message):
+            await received.put(message.payload)
+
+        mq.subscribe(on_tick)
+        self.assertFalse(mq.publish_threadsafe('dropped'))
+        await mq.start_async()
+
+        thread = threading.Thread(target=mq.publish_threadsafe, args=('tick',))
+        thread.start()
+        self.assertEqual(await asyncio.wait_for(received.get(), 1.0), 'tick')
+        await asyncio.get_running_loop().run_in_executor(None, thread.join)
+        await mq.stop_async()
+
+
+if __name__ == '__main__':
+    unittest.main()
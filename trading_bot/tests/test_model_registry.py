@@ -0,0 +1,217 @@
+import os
+import pickle
+import tempfile
+import threading
+import time
+import unittest
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LinearRegression
+
+import trading_bot.api.prediction_service as service
+from trading_bot.ml_pipeline.model_cache import ModelCache, estimate_model_size, load_cached
+from trading_bot.ml_pipeline.model_registry import ModelRegistry
+
+UNPICKLED = []
+
+
+class TrackedModel:
+    """Model that records when it is unpickled"""
+
+    def __init__(self, name, n_values=1000):
+        self.name = name
+        self.coef_ = np.arange(n_values, dtype=float)
+
+    def __setstate__(self, state):
+        UNPICKLED.append(state['name'])
+        self.__dict__.update(state)
+
+    def predict(self, X):
+        return np.asarray(X) @ self.coef_[:np.asarray(X).shape[1]]
+
+
+class TestModelCache(unittest.TestCase):
+    """Test suite for the LRU model cache"""
+
+    def test_size_accounting(self):
+        self.assertEqual(estimate_model_size(TrackedModel('a')), (8000, 0))
+        forest = RandomForestClassifier(n_estimators=3, random_state=0).fit(
+            np.random.RandomState(0).normal(size=(200, 4)), np.arange(200) % 2)
+        # Fitted trees hold their nodes in extension types without a __dict__
+        nodes_bytes = sum(tree.tree_.__getstate__()['nodes'].nbytes for tree in forest.estimators_)
+        self.assertGreater(estimate_model_size(forest)[0], nodes_bytes)
+
+    def test_lru_eviction_by_memory(self):
+        cache = ModelCache(max_bytes=20000)
+        for name in ('a', 'b'):
+            cache.put(name, TrackedModel(name))
+        cache.get('a')
+        cache.put('c', TrackedModel('c'))
+
+        self.assertEqual([key in cache for key in ('a', 'b', 'c')], [True, False, True])
+        stats = cache.get_stats()
+        self.assertEqual((stats['current_bytes'], stats['evictions'], stats['hits']), (16000, 1, 1))
+
+        # A model larger than the budget is kept until the next one arrives
+        cache.put('big', TrackedModel('big', n_values=10000))
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(cache.get_stats()['current_bytes'], 0)
+
+    def test_concurrent_misses_load_once(self):
+        cache = ModelCache()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            time.sleep(0.05)
+            return TrackedModel('x')
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('x', loader)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(loads), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+
+class TestModelRegistry(unittest.TestCase):
+    """Test suite for the indexed, lazily loading model registry"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = self.tmp.name
+        self.cache = ModelCache()
+        del UNPICKLED[:]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_versions_from_manifest(self):
+        registry = ModelRegistry(self.path, cache=self.cache)
+        registry.register_model('m', TrackedModel('v1'), 'ml')
+        registry.register_model('m', TrackedModel('v2'), 'ml')
+        registry.register_model('other', TrackedModel('other'), 'ml')
+
+        self.assertEqual(registry.load_model('m').name, 'v2')
+        self.assertEqual(registry.load_model('m', version='1').name, 'v1')
+        self.assertEqual(registry.load_model('m').name, 'v2')
+        self.assertEqual(registry.get_model_versions('m'), ['1', '2'])
+
+        # Reopening reads the manifest and unpickles nothing until a model is used
+        del UNPICKLED[:]
+        reopened = ModelRegistry(self.path, cache=ModelCache())
+        self.assertEqual(UNPICKLED, [])
+        self.assertEqual(reopened.manifest, registry.manifest)
+        self.assertEqual(reopened.load_model('other').name, 'other')
+        self.assertEqual(UNPICKLED, ['other'])
+
+        # Registries created before the manifest existed are indexed once
+        os.remove(registry.manifest_path)
+        self.assertEqual(ModelRegistry(self.path, cache=ModelCache()).manifest, registry.manifest)
+
+        registry.delete_model('m', version='1')
+        self.assertEqual(registry.get_model_versions('m'), ['2'])
+        with self.assertRaises(ValueError):
+            registry.load_model('m', version='1')
+
+    def test_manifest_rebuild_for_names_containing_v(self):
+        registry = ModelRegistry(self.path, cache=self.cache)
+        registry.register_model('spy_volatility', TrackedModel('v1'), 'ml')
+        registry.register_model('spy_volatility', TrackedModel('v2'), 'ml')
+
+        # Registries created before the manifest existed are indexed from the files
+        os.remove(registry.manifest_path)
+        reopened = ModelRegistry(self.path, cache=ModelCache())
+        self.assertEqual(reopened.manifest, registry.manifest)
+        self.assertEqual(reopened.get_model_versions('spy_volatility'), ['1', '2'])
+        self.assertEqual(reopened.load_model('spy_volatility', version='1').name, 'v1')
+
+    def test_loads_once_per_file(self):
+        registry = ModelRegistry(self.path, cache=self.cache)
+        registry.register_model('m', TrackedModel('m'), 'ml')
+        first = registry.load_model('m')
+        self.assertIs(registry.load_model('m'), first)
+        self.assertEqual(UNPICKLED, ['m'])
+
+        # Re-registering a version rewrites the file, so it is loaded again
+        registry.register_model('m', TrackedModel('m2'), 'ml', version='1')
+        self.assertEqual(registry.load_model('m').name, 'm2')
+
+        registry.clear_cache()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_large_models_are_memory_mapped(self):
+        rng = np.random.RandomState(0)
+        X = rng.normal(size=(100, 50))
+        model = LinearRegression().fit(X, rng.normal(size=(100, 200)))
+
+        registry = ModelRegistry(self.path, cache=self.cache, mmap_threshold_bytes=0)
+        registry.register_model('linear', model, 'ml')
+        loaded = registry.load_model('linear')
+
+        self.assertIsInstance(loaded.coef_, np.memmap)
+        np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+        stats = self.cache.get_stats()
+        self.assertGreaterEqual(stats['mapped_bytes'], model.coef_.nbytes)
+        self.assertLess(stats['current_bytes'], model.coef_.nbytes)
+
+    def test_register_model_file_does_not_unpickle(self):
+        source = os.path.join(self.path, 'source.pkl')
+        with open(source, 'wb') as f:
+            pickle.dump(TrackedModel('file'), f)
+
+        registry = ModelRegistry(os.path.join(self.path, 'registry'), cache=self.cache)
+        registry.register_model_file('file_model', source)
+        self.assertEqual(UNPICKLED, [])
+        self.assertEqual(registry.load_model('file_model').name, 'file')
+
+
+class TestPredictionServiceLoading(unittest.TestCase):
+    """Test suite for lazy model loading in the prediction service"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for i in range(5):
+            joblib.dump({'model': TrackedModel(f'model_{i}')}, os.path.join(self.tmp.name, f'model_{i}.pkl'))
+        del UNPICKLED[:]
+
+    def tearDown(self):
+        service.loaded_models = {}
+        self.tmp.cleanup()
+
+    def test_models_load_on_first_use(self):
+        models = service.load_models(self.tmp.name)
+        self.assertEqual(sorted(models), [f'model_{i}' for i in range(5)])
+        self.assertEqual(UNPICKLED, [])
+
+        package = service.loaded_models['model_3']
+        self.assertIs(service.loaded_models['model_3'], package)
+        self.assertEqual(UNPICKLED, ['model_3'])
+
+        # Files replaced on disk are picked up on their next use
+        path = os.path.join(self.tmp.name, 'model_3.pkl')
+        joblib.dump({'model': TrackedModel('replaced')}, path)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+        self.assertEqual(service.loaded_models['model_3']['model'].name, 'replaced')
+
+    def test_raw_model_files_shared_with_other_callers(self):
+        path = os.path.join(self.tmp.name, 'raw.pkl')
+        joblib.dump(TrackedModel('raw'), path)
+        service.load_models(self.tmp.name)
+
+        # Whichever caller loads the file first, each gets the shape it expects
+        self.assertEqual(load_cached(path).name, 'raw')
+        self.assertEqual(service.loaded_models['raw']['model'].name, 'raw')
+        self.assertEqual(load_cached(path).name, 'raw')
+        self.assertEqual(UNPICKLED, ['raw'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.models.model_trainer import ModelTrainer, _SharedFeatureMatrix
+from trading_bot.testing.regime_inference_benchmark import (
+    REGIME_COLUMN, build_trainer, generate_rows, row_by_row
+)
+
+
+class CountingModel:
+    """Wraps a model and counts calls"""
+
+    def __init__(self, model):
+        self.model = model
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return self.model.predict_proba(X)
+
+
+class TestRegimeInference(unittest.TestCase):
+    """Test suite for grouped regime-routed inference"""
+
+    def setUp(self):
+        self.trainer = build_trainer()
+        self.X = generate_rows(600)
+
+    def test_grouped_matches_row_by_row(self):
+        for method in ['predict', 'predict_proba']:
+            grouped = getattr(self.trainer, method)(self.X, regime_column=REGIME_COLUMN)
+            # Batched matrix products may differ from single-row ones in the last bit
+            np.testing.assert_allclose(grouped, row_by_row(self.trainer, self.X, method=method), rtol=1e-12)
+
+    def test_one_call_per_regime(self):
+        models = [self.trainer.models['default']] + list(self.trainer.regime_models.values())
+        self.trainer.models['default'] = CountingModel(self.trainer.models['default'])
+        for regime, model in list(self.trainer.regime_models.items()):
+            self.trainer.regime_models[regime] = CountingModel(model)
+
+        self.trainer.predict(self.X, regime_column=REGIME_COLUMN)
+        counting = [self.trainer.models['default']] + list(self.trainer.regime_models.values())
+        self.assertEqual([model.calls for model in counting], [1] * len(models))
+
+    def test_rows_without_model_stay_zero(self):
+        del self.trainer.models['default']
+        X = self.X.copy()
+        X.loc[X.index[:5], REGIME_COLUMN] = None
+
+        predictions = self.trainer.predict_proba(X, regime_column=REGIME_COLUMN)
+        unscored = X[REGIME_COLUMN].isna().to_numpy() | (X[REGIME_COLUMN] == 'sideways').to_numpy()
+        self.assertTrue((predictions[unscored] == 0).all())
+        np.testing.assert_allclose(predictions[~unscored].sum(axis=1), 1.0)
+
+    def test_feature_explanation_batches_model_calls(self):
+        features = self.X.drop(columns=[REGIME_COLUMN])
+        model = self.trainer.models['default']
+        self.trainer.feature_importance['default'] = {f'f{i}': 1.0 / (i + 1) for i in range(10)}
+        self.trainer.models['default'] = CountingModel(model)
+
+        explanations = self.trainer.get_feature_explanation(features)
+        self.assertEqual(self.trainer.models['default'].calls, 1)
+
+        probabilities = model.predict_proba(features)
+        self.assertEqual([e['prediction'] for e in explanations], list(np.argmax(probabilities, axis=1)))
+        self.assertEqual(explanations[0]['confidence'], probabilities[0].max())
+        self.assertEqual(list(explanations[0]['top_features']), ['f0', 'f1', 'f2', 'f3', 'f4'])
+
+
+class TestParallelCrossValidation(unittest.TestCase):
+    """Test suite for pooled, cached time-series CV and regime training"""
+
+    def setUp(self):
+        self.X = generate_rows(1500).drop(columns=[REGIME_COLUMN])
+        self.y = pd.Series((self.X['f0'] + self.X['f1'] > 0).astype(int))
+        self.params = {'model_algorithm': 'random_forest', 'n_estimators': 10,
+                       'calculate_shap': False, 'cv_splits': 4}
+
+    def test_pool_matches_serial(self):
+        serial = ModelTrainer(dict(self.params)).time_series_cv(self.X, self.y)
+        pooled = ModelTrainer(dict(self.params, cv_workers=2)).time_series_cv(self.X, self.y)
+
+        self.assertEqual(pooled['cv_results']['test_scores'], serial['cv_results']['test_scores'])
+        self.assertEqual(pooled['cv_results']['fold_3_metrics'], serial['cv_results']['fold_3_metrics'])
+        self.assertEqual(pooled['cv_results']['fold_indices'], serial['cv_results']['fold_indices'])
+
+    def test_shared_matrix_with_mixed_dtypes(self):
+        X = self.X.copy()
+        X['flag'] = X['f0'] > 0
+        shared = _SharedFeatureMatrix(X)
+        try:
+            name, shape, dtype, columns = shared.descriptor
+            self.assertEqual(np.dtype(dtype), np.float64)
+            mapped = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shared._shm.buf)
+            np.testing.assert_array_equal(mapped, X.astype(float).to_numpy())
+        finally:
+            shared.close()
+
+    def test_cache_skips_unchanged_folds(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            params = dict(self.params, cv_cache_dir=cache_dir)
+            first = ModelTrainer(dict(params)).time_series_cv(self.X, self.y)
+
+            rerun = ModelTrainer(dict(params))
+            rerun._run_tasks = lambda *args: self.fail("cached folds were refit")
+            self.assertEqual(rerun.time_series_cv(self.X, self.y)['cv_results']['test_scores'],
+                             first['cv_results']['test_scores'])
+
+            # Changed parameters or data miss the cache (one entry per fold)
+            self.assertEqual(len(os.listdir(cache_dir)), 4)
+            ModelTrainer(dict(params, n_estimators=11)).time_series_cv(self.X, self.y)
+            self.assertEqual(len(os.listdir(cache_dir)), 8)
+            y = self.y.copy()
+            y.iloc[-1] = 1 - y.iloc[-1]
+            ModelTrainer(dict(params)).time_series_cv(self.X, y)
+            self.assertEqual(len(os.listdir(cache_dir)), 12)
+
+    def test_warm_start_only_for_solver_initialization(self):
+        params = dict(self.params, model_algorithm='logistic_regression', cv_warm_start=True)
+        cold = ModelTrainer(dict(params, cv_warm_start=False)).time_series_cv(self.X, self.y)
+        warm = ModelTrainer(params).time_series_cv(self.X, self.y)
+        np.testing.assert_allclose(warm['cv_results']['test_scores'], cold['cv_results']['test_scores'], atol=0.01)
+
+        # Tree ensembles would add estimators instead, so they are fit cold
+        forest = ModelTrainer(dict(self.params, cv_warm_start=True)).time_series_cv(self.X, self.y)
+        baseline = ModelTrainer(dict(self.params)).time_series_cv(self.X, self.y)
+        self.assertEqual(forest['cv_results']['test_scores'], baseline['cv_results']['test_scores'])
+
+    def test_regime_models_pooled(self):
+        X = generate_rows(1500)
+        serial = ModelTrainer(dict(self.params))
+        pooled = ModelTrainer(dict(self.params, cv_workers=2))
+        for trainer in (serial, pooled):
+            trainer.train_regime_specific_models(X, self.y, REGIME_COLUMN)
+
+        self.assertEqual(set(pooled.regime_models), {'bull', 'bear', 'sideways'})
+        self.assertIn('regime_bull', pooled.feature_importance)
+        np.testing.assert_array_equal(pooled.predict(X, regime_column=REGIME_COLUMN),
+                                      serial.predict(X, regime_column=REGIME_COLUMN))
+
+
+if __name__ == '__main__':
+    unittest.main()
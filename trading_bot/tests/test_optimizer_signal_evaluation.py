@@ -0,0 +1,115 @@
+import unittest
+import pandas as pd
+import numpy as np
+
+from trading_bot.ml_pipeline.signal_evaluation import generate_signal_records
+
+
+class LegacyCrossStrategy:
+    """Moving average cross strategy that only implements generate_signals"""
+
+    def __init__(self, parameters=None):
+        self.parameters = parameters or {'window': 5}
+
+    def generate_signals(self, data):
+        window = self.parameters['window']
+        if len(data) < window:
+            return None
+        close = data['close'].iloc[-1]
+        mean = data['close'].iloc[-window:].mean()
+        if close > mean:
+            return {'action': 'buy'}
+        if close < mean:
+            return {'action': 'sell'}
+        return None
+
+
+class VectorizedCrossStrategy(LegacyCrossStrategy):
+    """Same strategy with a whole-series signal method"""
+
+    def generate_signal_series(self, data):
+        window = self.parameters['window']
+        mean = data['close'].rolling(window).mean()
+        actions = pd.Series(None, index=data.index, dtype=object)
+        actions[data['close'] > mean] = 'buy'
+        actions[data['close'] < mean] = 'sell'
+        return actions
+
+
+class StreamingCrossStrategy(LegacyCrossStrategy):
+    """Same strategy with a stateful per-bar update"""
+
+    def reset(self):
+        self.closes = []
+
+    def on_bar(self, timestamp, bar):
+        self.closes.append(bar['close'])
+        return self.generate_signals(pd.DataFrame({'close': self.closes[-self.parameters['window']:]}))
+
+
+class TestSignalEvaluationModes(unittest.TestCase):
+
+    def setUp(self):
+        np.random.seed(42)
+        index = pd.date_range('2023-01-01', periods=200, freq='D')
+        self.data = pd.DataFrame({
+            'close': 100 + np.cumsum(np.random.randn(200))
+        }, index=index)
+
+    def _actions(self, signals):
+        return [(s['timestamp'], s['symbol'], s['action']) for s in signals]
+
+    def test_vectorized_matches_legacy(self):
+        legacy = generate_signal_records(LegacyCrossStrategy(), self.data, 'SPY')
+        vectorized = generate_signal_records(VectorizedCrossStrategy(), self.data, 'SPY')
+
+        self.assertTrue(legacy)
+        self.assertEqual(self._actions(legacy), self._actions(vectorized))
+
+    def test_streaming_matches_legacy(self):
+        legacy = generate_signal_records(LegacyCrossStrategy(), self.data, 'SPY')
+        streaming = generate_signal_records(StreamingCrossStrategy(), self.data, 'SPY')
+
+        self.assertEqual(self._actions(legacy), self._actions(streaming))
+
+    def test_last_bar_is_excluded(self):
+        signals = generate_signal_records(VectorizedCrossStrategy(), self.data, 'SPY')
+
+        self.assertNotIn(self.data.index[-1], [s['timestamp'] for s in signals])
+
+    def test_dataframe_output(self):
+        class FrameStrategy(VectorizedCrossStrategy):
+            def generate_signal_series(self, data):
+                actions = super().generate_signal_series(data)
+                return pd.DataFrame({'action': actions, 'confidence': 0.5})
+
+        signals = generate_signal_records(FrameStrategy(), self.data, 'SPY')
+
+        self.assertTrue(signals)
+        self.assertTrue(all(s['confidence'] == 0.5 for s in signals))
+
+    def test_numeric_signals(self):
+        class NumericStrategy(VectorizedCrossStrategy):
+            def generate_signal_series(self, data):
+                actions = super().generate_signal_series(data)
+                return actions.map({'buy': 1, 'sell': -1}).fillna(0)
+
+        legacy = generate_signal_records(LegacyCrossStrategy(), self.data, 'SPY')
+        numeric = generate_signal_records(NumericStrategy(), self.data, 'SPY')
+
+        self.assertEqual(self._actions(legacy), self._actions(numeric))
+
+    def test_failing_series_falls_back_to_per_bar(self):
+        class BrokenSeriesStrategy(StreamingCrossStrategy):
+            def generate_signal_series(self, data):
+                raise ValueError("not supported for this data")
+
+        legacy = generate_signal_records(LegacyCrossStrategy(), self.data, 'SPY')
+        with self.assertLogs('trading_bot.ml_pipeline.signal_evaluation', level='WARNING'):
+            signals = generate_signal_records(BrokenSeriesStrategy(), self.data, 'SPY')
+
+        self.assertEqual(self._actions(legacy), self._actions(signals))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from trading_bot.utils.options_pricing import (
+    black_scholes,
+    black_scholes_vectorized,
+    binomial_tree,
+    binomial_tree_vectorized,
+    calculate_greeks,
+    calculate_greeks_vectorized,
+    implied_volatility,
+    implied_volatility_vectorized,
+    price_chain,
+)
+
+
+class TestVectorizedOptionsPricing(unittest.TestCase):
+    """Test suite for whole-chain pricing, Greeks and implied volatility"""
+
+    def setUp(self):
+        self.S = 450.0
+        self.r = 0.04
+        self.K = np.linspace(350, 550, 41).repeat(2)
+        self.T = np.tile([0.05, 0.5], 41)
+        self.sigma = 0.18 + 0.4 * np.abs(self.K / self.S - 1)
+        self.types = np.where(np.arange(len(self.K)) % 4 < 2, 'call', 'put')
+
+    def test_prices_and_greeks_match_scalar(self):
+        prices = black_scholes_vectorized(self.S, self.K, self.T, self.r, self.sigma, self.types)
+        greeks = calculate_greeks_vectorized(self.S, self.K, self.T, self.r, self.sigma, self.types)
+
+        for i in range(len(self.K)):
+            args = (self.S, self.K[i], self.T[i], self.r, self.sigma[i], self.types[i])
+            self.assertAlmostEqual(prices[i], black_scholes(*args))
+            for name, value in calculate_greeks(*args).items():
+                self.assertAlmostEqual(greeks[name][i], value)
+
+    def test_put_call_parity(self):
+        calls = black_scholes_vectorized(self.S, self.K, self.T, self.r, self.sigma, 'call')
+        puts = black_scholes_vectorized(self.S, self.K, self.T, self.r, self.sigma, 'put')
+        np.testing.assert_allclose(calls - puts, self.S - self.K * np.exp(-self.r * self.T))
+
+        call_theta = calculate_greeks_vectorized(self.S, self.K, self.T, self.r, self.sigma, 'call')['theta']
+        put_theta = calculate_greeks_vectorized(self.S, self.K, self.T, self.r, self.sigma, 'put')['theta']
+        np.testing.assert_allclose(
+            (call_theta - put_theta) * 365, -self.r * self.K * np.exp(-self.r * self.T)
+        )
+
+    def test_expired_options(self):
+        prices = black_scholes_vectorized(100.0, [90.0, 110.0], 0.0, self.r, 0.2, ['call', 'put'])
+        greeks = calculate_greeks_vectorized(100.0, [90.0, 110.0, 90.0], 0.0, self.r, 0.2, ['call', 'put', 'put'])
+
+        np.testing.assert_allclose(prices, [10.0, 10.0])
+        np.testing.assert_allclose(greeks['delta'], [1.0, -1.0, 0.0])
+        np.testing.assert_allclose(greeks['gamma'], 0.0)
+
+    def test_zero_volatility_uses_discounted_strike(self):
+        prices = black_scholes_vectorized(100.0, [90.0, 110.0, 102.0], 1.0, self.r, 0.0, ['call', 'put', 'call'])
+        discounted = np.array([90.0, 110.0, 102.0]) * np.exp(-self.r)
+        np.testing.assert_allclose(prices, [100.0 - discounted[0], discounted[1] - 100.0, 100.0 - discounted[2]])
+
+    def test_implied_volatility_round_trip(self):
+        prices = black_scholes_vectorized(self.S, self.K, self.T, self.r, self.sigma, self.types)
+        iv = implied_volatility_vectorized(prices, self.S, self.K, self.T, self.r, self.types)
+
+        solved = ~np.isnan(iv)
+        self.assertTrue(solved.sum() > len(iv) * 0.8)
+        recovered = black_scholes_vectorized(
+            self.S, self.K[solved], self.T[solved], self.r, iv[solved], self.types[solved]
+        )
+        np.testing.assert_allclose(recovered, prices[solved], atol=1e-4)
+
+    def test_implied_volatility_unsolvable(self):
+        # Below intrinsic value and above the 500% volatility price
+        iv = implied_volatility_vectorized([5.0, 200.0], 100.0, 90.0, 0.5, self.r, 'call')
+        self.assertTrue(np.isnan(iv).all())
+        self.assertIsNone(implied_volatility(5.0, 100.0, 90.0, 0.5, self.r, 'call'))
+
+    def test_deep_otm_solved_to_volatility_precision(self):
+        # Prices far below the tolerance in price terms still recover sigma
+        K = np.array([110.0, 130.0, 150.0, 160.0])
+        prices = black_scholes_vectorized(100.0, K, 0.25, self.r, 0.15, 'call')
+        self.assertLess(prices[-1], 1e-8)
+        iv = implied_volatility_vectorized(prices, 100.0, K, 0.25, self.r, 'call')
+        np.testing.assert_allclose(iv, 0.15, atol=1e-5)
+
+    def test_deep_otm_uses_bisection_fallback(self):
+        price = black_scholes(100.0, 180.0, 0.1, self.r, 0.9, 'call')
+        iv = implied_volatility_vectorized(price, 100.0, 180.0, 0.1, self.r, 'call', initial_guess=0.05)
+        self.assertAlmostEqual(float(iv), 0.9, places=3)
+
+    def test_binomial_matches_scalar_and_converges(self):
+        american = binomial_tree_vectorized(self.S, self.K[:10], self.T[:10], self.r, self.sigma[:10], 100, 'put')
+        european = binomial_tree_vectorized(self.S, self.K[:10], self.T[:10], self.r, self.sigma[:10], 500, 'put',
+                                            american=False)
+
+        for i in range(10):
+            self.assertAlmostEqual(
+                american[i], binomial_tree(self.S, self.K[i], self.T[i], self.r, self.sigma[i], 100, 'put')
+            )
+        self.assertTrue(np.all(american >= binomial_tree_vectorized(
+            self.S, self.K[:10], self.T[:10], self.r, self.sigma[:10], 100, 'put', american=False
+        ) - 1e-12))
+        np.testing.assert_allclose(
+            european, black_scholes_vectorized(self.S, self.K[:10], self.T[:10], self.r, self.sigma[:10], 'put'),
+            atol=0.05
+        )
+
+    def test_price_chain(self):
+        chain = pd.DataFrame({'strike': self.K, 'T': self.T, 'option_type': self.types})
+        chain['mid'] = black_scholes_vectorized(self.S, self.K, self.T, self.r, self.sigma, self.types)
+
+        priced = price_chain(chain, self.S, self.r, price_column='mid')
+
+        for column in ['implied_volatility', 'theoretical_price', 'delta', 'gamma', 'theta', 'vega', 'rho']:
+            self.assertIn(column, priced.columns)
+        self.assertNotIn('delta', chain.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
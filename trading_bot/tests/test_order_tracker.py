@@ -0,0 +1,187 @@
+import threading
+import unittest
+
+from trading_bot.brokers.multi_broker_executor import MultiBrokerExecutor
+from trading_bot.brokers.order_tracker import OrderTracker, normalize_status
+from trading_bot.event_system.event_bus import EventBus
+from trading_bot.event_system.event_types import EventType
+
+
+class FakeBroker:
+    """Broker whose orders fill after a set number of order list polls"""
+
+    def __init__(self, name='fake', fill_after=2, fill_price=101.5, stream=False):
+        self.name = name
+        self.status = 'connected'
+        self.fill_after = fill_after
+        self.fill_price = fill_price
+        self.orders = {}
+        self.order_list_calls = 0
+        self.placed = []
+        self.stream_callback = None
+        self.lock = threading.Lock()
+        if stream:
+            self.subscribe_order_updates = self._subscribe
+
+    def _subscribe(self, callback):
+        self.stream_callback = callback
+
+    def place_equity_order(self, symbol, side, quantity, order_type='market', duration='day',
+                           price=None, stop_price=None):
+        with self.lock:
+            order_id = str(len(self.placed) + 1)
+            self.placed.append({'id': order_id, 'symbol': symbol, 'side': side, 'type': order_type,
+                                'price': price, 'stop_price': stop_price})
+            self.orders[order_id] = {'id': order_id, 'status': 'open', 'quantity': quantity,
+                                     'exec_quantity': 0, 'polls': 0}
+        return {'id': order_id, 'status': 'ok'}
+
+    def get_orders(self):
+        with self.lock:
+            self.order_list_calls += 1
+            for order in self.orders.values():
+                order['polls'] += 1
+                if order['polls'] >= self.fill_after and order['status'] == 'open':
+                    order.update(status='filled', exec_quantity=order['quantity'],
+                                 avg_fill_price=self.fill_price)
+            return [dict(order) for order in self.orders.values()]
+
+    def get_positions(self):
+        return []
+
+    def refresh_connection(self):
+        return True
+
+
+class TestOrderTracker(unittest.TestCase):
+    """Test suite for event-driven order tracking"""
+
+    def setUp(self):
+        self.bus = EventBus(max_queue_size=100, worker_threads=1)
+        self.tracker = OrderTracker(event_bus=self.bus, min_interval=0.01, max_interval=0.05)
+
+    def tearDown(self):
+        self.tracker.stop()
+        self.bus.thread_pool.shutdown(wait=True)
+
+    def _published(self):
+        events = []
+        while not self.bus.event_queue.empty():
+            events.append(self.bus.event_queue.get_nowait()[2])
+        return events
+
+    def test_one_poll_per_broker_for_all_open_orders(self):
+        broker = FakeBroker(fill_after=3)
+        futures = []
+        for symbol in ['SPY', 'QQQ', 'IWM']:
+            order_id = broker.place_equity_order(symbol, 'buy', 10)['id']
+            futures.append(self.tracker.track(broker, order_id, symbol=symbol, side='buy', quantity=10))
+
+        orders = [future.result(timeout=2) for future in futures]
+        self.assertEqual([order.status for order in orders], ['filled'] * 3)
+        self.assertEqual(orders[0].avg_fill_price, 101.5)
+        self.assertLessEqual(broker.order_list_calls, 4)
+
+        events = self._published()
+        self.assertEqual([event.event_type for event in events], [EventType.ORDER_FILLED] * 3)
+        self.assertEqual(events[0].data['broker'], 'fake')
+        self.assertEqual(events[0].data['filled_quantity'], 10)
+
+        metrics = self.tracker.get_metrics()
+        self.assertEqual((metrics['open_orders'], metrics['events_published']), (0, 3))
+        self.assertEqual(metrics['fill_latency']['count'], 3)
+
+    def test_streamed_updates_skip_polling(self):
+        broker = FakeBroker(fill_after=1000, stream=True)
+        self.assertTrue(self.tracker.register_stream(broker))
+        updates = []
+        future = self.tracker.track(broker, '42', symbol='SPY', side='sell', quantity=5,
+                                    callback=lambda order: updates.append(order.status))
+
+        broker.stream_callback({'id': '42', 'status': 'partially_filled', 'exec_quantity': 2,
+                                'avg_fill_price': 99.0})
+        broker.stream_callback({'id': '42', 'status': 'partially_filled', 'exec_quantity': 2})
+        broker.stream_callback({'id': '42', 'status': 'canceled', 'exec_quantity': 2})
+        broker.stream_callback({'id': '42', 'status': 'filled'})
+
+        order = future.result(timeout=1)
+        self.assertEqual(order.status, 'canceled')
+        self.assertEqual(updates, ['partially_filled', 'canceled'])
+        self.assertEqual([event.event_type for event in self._published()],
+                         [EventType.ORDER_UPDATED, EventType.ORDER_CANCELED])
+        self.assertEqual(self.tracker.get_metrics()['poll_intervals']['fake'], 30.0)
+
+    def test_terminal_events_held_until_bus_has_room(self):
+        bus = EventBus(max_queue_size=1, worker_threads=1)
+        self.addCleanup(bus.thread_pool.shutdown, wait=True)
+        tracker = OrderTracker(event_bus=bus, publish_timeout=0.01)
+        broker = FakeBroker(fill_after=1000, stream=True)
+        tracker.register_stream(broker)
+        future = tracker.track(broker, '7', symbol='SPY', side='buy', quantity=3)
+        tracker.stop()
+
+        # Fill the bus with an intermediate update, then fill the order
+        broker.stream_callback({'id': '7', 'status': 'partially_filled', 'exec_quantity': 1})
+        broker.stream_callback({'id': '7', 'status': 'partially_filled', 'exec_quantity': 2})
+        broker.stream_callback({'id': '7', 'status': 'filled', 'avg_fill_price': 50.0})
+
+        self.assertEqual(future.result(timeout=1).status, 'filled')
+        metrics = tracker.get_metrics()
+        self.assertEqual((metrics['events_dropped'], metrics['undelivered_events']), (1, 1))
+        self.assertGreaterEqual(metrics['events_deferred'], 1)
+
+        bus.event_queue.get_nowait()
+        tracker.poll_once(force=True)
+        event = bus.event_queue.get_nowait()[2]
+        self.assertEqual((event.event_type, event.data['filled_quantity']), (EventType.ORDER_FILLED, 3))
+        self.assertEqual(tracker.get_metrics()['undelivered_events'], 0)
+
+    def test_interval_backs_off_while_unchanged(self):
+        broker = FakeBroker(fill_after=1000)
+        self.tracker.running = True  # drive polls by hand
+        self.tracker.track(broker, broker.place_equity_order('SPY', 'buy', 1)['id'])
+
+        for _ in range(10):
+            self.assertEqual(self.tracker.poll_once(force=True), 0)
+        self.assertEqual(self.tracker.get_metrics()['poll_intervals']['fake'], 0.05)
+
+        # A new order resets the interval
+        self.tracker.track(broker, broker.place_equity_order('QQQ', 'buy', 1)['id'])
+        self.assertEqual(self.tracker.get_metrics()['poll_intervals']['fake'], 0.01)
+        self.tracker.running = False
+
+    def test_status_normalization(self):
+        self.assertEqual(normalize_status('FILLED'), 'filled')
+        self.assertEqual(normalize_status('expired'), 'canceled')
+        self.assertEqual(normalize_status('REJECTED'), 'rejected')
+        self.assertEqual(normalize_status('pending'), 'open')
+
+
+class TestMultiBrokerExecutorTracking(unittest.TestCase):
+    """Test suite for fill handling in MultiBrokerExecutor"""
+
+    def test_execute_trade_waits_on_tracker_and_places_exits(self):
+        broker = FakeBroker(fill_after=2, fill_price=200.0)
+        tracker = OrderTracker(min_interval=0.01, max_interval=0.05)
+        executor = MultiBrokerExecutor([broker], order_tracker=tracker, retry_delay=0)
+
+        try:
+            trade = executor.execute_trade('SPY', 'buy', quantity=10, stop_loss_pct=5,
+                                           check_market_hours=False)
+        finally:
+            tracker.stop()
+
+        self.assertTrue(trade['success'])
+        self.assertEqual(trade['status'], 'filled')
+        self.assertEqual(trade['filled_price'], 200.0)
+        stop_order = broker.placed[1]
+        self.assertEqual((stop_order['type'], stop_order['stop_price']), ('stop', 190.0))
+
+        # Filled entry with no position left is closed without another broker call
+        calls = broker.order_list_calls
+        self.assertEqual(executor.get_active_trades(), [])
+        self.assertEqual(broker.order_list_calls, calls)
+
+
+if __name__ == '__main__':
+    unittest.main()
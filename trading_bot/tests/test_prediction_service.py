@@ -0,0 +1,162 @@
+import asyncio
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from fastapi import HTTPException
+
+import trading_bot.api.prediction_service as service
+from trading_bot.api.inference_batcher import FeatureLayout, InferenceBatcher, InferenceMetrics
+from trading_bot.api.prediction_service import PredictionFeatures
+
+
+class CountingModel:
+    """Wraps a model and counts calls"""
+
+    def __init__(self, model):
+        self.model = model
+        self.feature_names_in_ = model.feature_names_in_
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        return self.model.predict(X)
+
+    def predict_proba(self, X):
+        self.calls += 1
+        return self.model.predict_proba(X)
+
+
+class TestPredictionService(unittest.TestCase):
+    """Test suite for micro-batched prediction requests"""
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        columns = [f'f{i}' for i in range(6)]
+        X = pd.DataFrame(rng.normal(0, 1, (400, 6)), columns=columns)
+        y = (X['f0'] + X['f3'] > 0).astype(int)
+
+        models = {
+            'regime_bull': LogisticRegression().fit(X, y),
+            'regime_bear': RandomForestClassifier(n_estimators=10, random_state=0).fit(X, 1 - y),
+        }
+        service.loaded_models = {name: {'model': CountingModel(model)} for name, model in models.items()}
+        service.feature_layouts = {}
+        meta_X = pd.DataFrame([self._members(row) for row in X.to_dict('records')])
+        service.loaded_models['meta_model'] = {'model': CountingModel(LogisticRegression().fit(meta_X, y))}
+
+        # Requests send features in arbitrary order, with extras the models ignore
+        self.requests = []
+        for row in X.iloc[:40].to_dict('records'):
+            shuffled = dict(reversed(list(row.items())))
+            shuffled['unused'] = 1.0
+            self.requests.append(PredictionFeatures(features=shuffled))
+
+        self.metrics = InferenceMetrics()
+        service.inference_metrics = self.metrics
+        service.batcher = InferenceBatcher(max_batch_size=64, max_wait_ms=20.0, metrics=self.metrics)
+
+    def tearDown(self):
+        service.batcher = None
+
+    def _members(self, row):
+        """Previous implementation: one-row DataFrame and one call per regime model"""
+        features = pd.DataFrame([row])
+        values = {}
+        for name in ('regime_bull', 'regime_bear'):
+            model = service.loaded_models[name]['model'].model
+            values[f"{name}_pred"] = model.predict(features)[0]
+            for i, p in enumerate(model.predict_proba(features)[0]):
+                values[f"{name}_prob_{i}"] = p
+        return values
+
+    def _gather(self, endpoint, **kwargs):
+        async def run():
+            return await asyncio.gather(*[endpoint(request, **kwargs) for request in self.requests])
+        return asyncio.run(run())
+
+    def test_feature_layout(self):
+        layout = FeatureLayout(['a', 'b', 'c'])
+        X = layout.matrix([{'c': 3.0, 'a': 1.0, 'z': 9.0}, {'b': 2.0}])
+        np.testing.assert_array_equal(X, [[1.0, np.nan, 3.0], [np.nan, 2.0, np.nan]])
+        self.assertIs(layout.model_input(X), X)
+
+        named = FeatureLayout.for_model(service.loaded_models['regime_bull'], {})
+        frame = named.model_input(named.matrix([{'f1': 1.0}]))
+        self.assertEqual(list(frame.columns), [f'f{i}' for i in range(6)])
+
+    def test_concurrent_predictions_share_one_model_call(self):
+        responses = self._gather(service.predict, model_name='regime_bull')
+        model = service.loaded_models['regime_bull']['model']
+        self.assertEqual(model.calls, 2)
+
+        for request, response in zip(self.requests, responses):
+            features = pd.DataFrame([request.features])[list(model.feature_names_in_)]
+            self.assertEqual(response.prediction, model.model.predict(features)[0])
+            self.assertAlmostEqual(response.probability, model.model.predict_proba(features)[0].max())
+
+    def test_ensemble_matches_one_row_path(self):
+        responses = self._gather(service.predict_ensemble)
+        for name in ('regime_bull', 'regime_bear', 'meta_model'):
+            self.assertEqual(service.loaded_models[name]['model'].calls, 2)
+
+        meta_model = service.loaded_models['meta_model']['model'].model
+        for request, response in zip(self.requests, responses):
+            expected = self._members({f'f{i}': request.features[f'f{i}'] for i in range(6)})
+            self.assertEqual(list(response.explanation['ensemble_features']), list(expected))
+            for column, value in expected.items():
+                self.assertAlmostEqual(response.explanation['ensemble_features'][column], value)
+            self.assertEqual(response.prediction, meta_model.predict(pd.DataFrame([expected]))[0])
+
+    def test_malformed_request_fails_alone(self):
+        del self.requests[5].features['f3']
+
+        async def run():
+            return await asyncio.gather(*[service.predict(request, model_name='regime_bull')
+                                          for request in self.requests], return_exceptions=True)
+        responses = asyncio.run(run())
+
+        self.assertIsInstance(responses[5], HTTPException)
+        self.assertEqual(responses[5].status_code, 422)
+        self.assertIn('f3', responses[5].detail)
+        self.assertTrue(all(response.prediction is not None
+                            for i, response in enumerate(responses) if i != 5))
+        self.assertEqual(service.loaded_models['regime_bull']['model'].calls, 2)
+        self.assertEqual(self.metrics.requests, len(self.requests) - 1)
+
+    def test_failed_batch_is_retried_per_request(self):
+        def handler(items):
+            if 'bad' in items:
+                raise ValueError('bad request')
+            return [item.upper() for item in items]
+
+        async def run():
+            batcher = InferenceBatcher(max_batch_size=8, max_wait_ms=20.0, metrics=self.metrics)
+            results = await asyncio.gather(*[batcher.submit('key', handler, item)
+                                             for item in ('a', 'bad', 'c')], return_exceptions=True)
+            await batcher.close()
+            return results
+        results = asyncio.run(run())
+
+        self.assertEqual([results[0], results[2]], ['A', 'C'])
+        self.assertIsInstance(results[1], ValueError)
+        metrics = self.metrics.get_metrics()
+        self.assertEqual((metrics['requests'], metrics['batches'], metrics['errors']), (3, 1, 1))
+
+    def test_metrics(self):
+        self._gather(service.predict, model_name='regime_bear')
+        service.batcher = None
+        asyncio.run(service.predict(self.requests[0], model_name='regime_bear'))
+
+        metrics = asyncio.run(service.get_inference_metrics())
+        self.assertEqual(metrics['requests'], len(self.requests) + 1)
+        self.assertEqual(metrics['batches'], 2)
+        self.assertEqual(metrics['batch_size']['max'], len(self.requests))
+        self.assertLessEqual(metrics['latency_ms']['p50'], metrics['latency_ms']['p99'])
+        self.assertFalse(metrics['batching']['enabled'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import sys
+import time
+import importlib
+import threading
+import unittest
+from unittest import mock
+
+from trading_bot.brokers.quote_service import QuoteService
+from trading_bot.utils.ttl_cache import ShardedTTLCache
+
+
+class FakeMarketData:
+    """Broker quote and chain endpoints that record every call"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.quote_calls = []
+        self.chain_calls = []
+        self.lock = threading.Lock()
+
+    def fetch_quotes(self, symbols, greeks):
+        with self.lock:
+            self.quote_calls.append(list(symbols))
+        time.sleep(self.delay)
+        return {symbol: {'symbol': symbol, 'last': float(len(symbol)), 'greeks': greeks} for symbol in symbols}
+
+    def fetch_option_chain(self, symbol, expiration, greeks):
+        with self.lock:
+            self.chain_calls.append((symbol, expiration, greeks))
+        time.sleep(self.delay)
+        return [{'underlying': symbol, 'strike': 100.0, 'expiration_date': expiration}]
+
+
+class TestQuoteService(unittest.TestCase):
+    """Test suite for batched quote and option chain access"""
+
+    def setUp(self):
+        self.source = FakeMarketData()
+        self.service = QuoteService(self.source.fetch_quotes, self.source.fetch_option_chain,
+                                    batch_window=0.05)
+
+    def test_concurrent_quotes_are_batched(self):
+        symbols = [f'SYM{i}' for i in range(20)]
+        results = {}
+
+        def request(symbol):
+            results[symbol] = self.service.get_quote(symbol)
+
+        threads = [threading.Thread(target=request, args=(symbol,)) for symbol in symbols + symbols[:5]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.source.quote_calls), 1)
+        self.assertEqual(sorted(self.source.quote_calls[0]), sorted(symbols))
+        self.assertEqual(results['SYM3']['symbol'], 'SYM3')
+
+        # Answered from the cache afterwards
+        self.service.get_quote('SYM3')
+        self.assertEqual(len(self.source.quote_calls), 1)
+
+    def test_serial_quotes_skip_batch_window(self):
+        self.service.get_quote('FIRST')
+
+        start = time.monotonic()
+        for i in range(5):
+            self.service.get_quote(f'S{i}')
+        self.assertLess(time.monotonic() - start, self.service.batch_window)
+        self.assertEqual(len(self.source.quote_calls), 6)
+
+    def test_quotes_fetched_in_chunks_and_only_when_missing(self):
+        symbols = [f'S{i}' for i in range(300)]
+        quotes = self.service.get_quotes(symbols)
+        self.assertEqual(len(quotes), 300)
+        self.assertEqual([len(call) for call in self.source.quote_calls], [200, 100])
+
+        quotes = self.service.get_quotes(symbols[:10] + ['NEW'])
+        self.assertEqual(len(quotes), 11)
+        self.assertEqual(self.source.quote_calls[-1], ['NEW'])
+
+        # Quotes with Greeks are cached separately
+        self.assertTrue(self.service.get_quotes(['S1'], greeks=True)['S1']['greeks'])
+        self.assertEqual(self.service.get_cached_quotes(['S1', 'MISSING']).keys(), {'S1'})
+
+        metrics = self.service.get_metrics()
+        self.assertEqual(metrics['quote_fetches'], 4)
+        self.assertEqual(metrics['cache']['by_type']['quote']['hits'], 11)
+
+    def test_fetch_errors_reach_every_batched_caller(self):
+        def failing(symbols, greeks):
+            raise ConnectionError("broker unavailable")
+
+        service = QuoteService(failing, batch_window=0.05)
+        errors = []
+
+        def request(symbol):
+            try:
+                service.get_quote(symbol)
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request, args=(f'S{i}',)) for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 5)
+
+    def test_option_chains_cached_and_fetched_concurrently(self):
+        self.source.delay = 0.1
+        symbols = ['SPY', 'QQQ', 'IWM', 'AAPL']
+
+        start = time.monotonic()
+        chains = self.service.get_option_chains(symbols, '2024-06-21')
+        self.assertLess(time.monotonic() - start, 0.3)
+        self.assertEqual(set(chains), set(symbols))
+        self.assertEqual(len(self.source.chain_calls), 4)
+
+        self.service.get_option_chain('SPY', '2024-06-21')
+        self.service.get_option_chain('SPY', '2024-07-19')
+        self.assertEqual(len(self.source.chain_calls), 5)
+
+    def test_option_chain_without_source(self):
+        service = QuoteService(self.source.fetch_quotes)
+        with self.assertRaises(RuntimeError):
+            service.get_option_chain('SPY')
+        self.assertEqual(service.get_option_chains(['SPY']), {})
+
+
+class TestShardedTTLCache(unittest.TestCase):
+    """Test suite for the sharded TTL cache"""
+
+    def test_ttl_per_data_type_and_max_age(self):
+        now = [0.0]
+        cache = ShardedTTLCache({'quote': 10, 'option_chain': 15}, clock=lambda: now[0])
+        cache.set('quote', 'SPY', {'last': 1})
+        cache.set('option_chain', 'SPY', [1])
+
+        now[0] = 5.0
+        self.assertEqual(cache.get('quote', 'SPY'), {'last': 1})
+        self.assertIsNone(cache.get('quote', 'SPY', max_age=2))
+
+        now[0] = 12.0
+        self.assertIsNone(cache.get('quote', 'SPY'))
+        self.assertEqual(cache.get('option_chain', 'SPY'), [1])
+
+        metrics = cache.get_metrics()
+        self.assertEqual((metrics['hits'], metrics['misses']), (2, 2))
+        self.assertEqual(metrics['size'], 1)
+
+        cache.invalidate('option_chain')
+        self.assertIsNone(cache.get('option_chain', 'SPY'))
+
+    def test_set_with_age(self):
+        now = [100.0]
+        cache = ShardedTTLCache({'quote': 10}, clock=lambda: now[0])
+        cache.set('quote', 'SPY', {'last': 1}, age=8.0)
+
+        self.assertEqual(cache.get('quote', 'SPY'), {'last': 1})
+        now[0] = 103.0
+        self.assertIsNone(cache.get('quote', 'SPY'))
+
+    def test_lru_eviction(self):
+        cache = ShardedTTLCache(shards=1, maxsize=3)
+        for symbol in ['A', 'B', 'C']:
+            cache.set('quote', symbol, symbol)
+        cache.get('quote', 'A')
+        cache.set('quote', 'D', 'D')
+
+        self.assertIsNone(cache.get('quote', 'B'))
+        self.assertEqual(cache.get_many('quote', ['A', 'C', 'D']), {'A': 'A', 'C': 'C', 'D': 'D'})
+        self.assertEqual(cache.get_metrics()['evictions'], 1)
+
+    def test_options_data_imports_without_broker_clients(self):
+        # alpaca-trade-api is optional; None in sys.modules makes its import fail
+        modules = {name: module for name, module in sys.modules.items()
+                   if not name.startswith(('trading_bot.brokers', 'trading_bot.data.options_market_data'))}
+        modules['alpaca_trade_api'] = None
+        with mock.patch.dict(sys.modules, modules, clear=True):
+            module = importlib.import_module('trading_bot.data.options_market_data')
+            self.assertIs(module.ShardedTTLCache, ShardedTTLCache)
+            self.assertNotIn('trading_bot.brokers', sys.modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
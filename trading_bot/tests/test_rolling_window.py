@@ -0,0 +1,57 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from trading_bot.utils.rolling_window import RollingWindow
+
+
+class TestRollingWindow(unittest.TestCase):
+    """Test suite for the RollingWindow ring buffer."""
+
+    def setUp(self):
+        np.random.seed(42)
+        self.values = np.random.randn(1000) * 0.02 + 0.001
+
+    def test_statistics_match_numpy(self):
+        """Rolling moments agree with a full recomputation at every step."""
+        window = RollingWindow(20)
+        for i, value in enumerate(self.values):
+            window.append(value)
+            expected = self.values[max(0, i - 19):i + 1]
+            np.testing.assert_allclose(window.values(), expected)
+            self.assertAlmostEqual(window.mean(), expected.mean(), places=12)
+            self.assertAlmostEqual(window.std(), np.std(expected), places=12)
+            if len(expected) > 1:
+                self.assertAlmostEqual(window.std(ddof=1), np.std(expected, ddof=1), places=12)
+
+    def test_matches_pandas_rolling(self):
+        """Sample standard deviation matches pandas rolling std."""
+        window = RollingWindow(49)
+        expected = pd.Series(self.values).rolling(49).std()
+        for i, value in enumerate(self.values):
+            window.append(value)
+            if window.is_full:
+                self.assertAlmostEqual(window.std(ddof=1), expected.iloc[i], places=12)
+
+    def test_eviction_and_clear(self):
+        """Full windows return the evicted value and clear keeps capacity."""
+        window = RollingWindow(3)
+        self.assertIsNone(window.mean())
+        for value in [1.0, 2.0, 3.0]:
+            self.assertIsNone(window.append(value))
+        self.assertEqual(window.append(4.0), 1.0)
+        self.assertEqual(window.last, 4.0)
+        self.assertEqual(window.sum(), 9.0)
+        self.assertEqual(window.median(), 3.0)
+
+        window.clear()
+        self.assertEqual(len(window), 0)
+        self.assertEqual(window.size, 3)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            RollingWindow(0)
+
+
+if __name__ == '__main__':
+    unittest.main()
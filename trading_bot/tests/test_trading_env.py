@@ -0,0 +1,114 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from trading_bot.rl.trading_env import TradingEnv, VectorTradingEnv
+
+FEATURES = ['f1', 'close']
+
+
+def market_data(n_assets=3, n_rows=200, seed=0):
+    """Random walk prices with one extra feature per asset."""
+    rng = np.random.default_rng(seed)
+    df_dict = {}
+    for i in range(n_assets):
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, n_rows))
+        df_dict[f'A{i}'] = pd.DataFrame({
+            'open': close, 'high': close, 'low': close, 'close': close,
+            'volume': 1e6, 'f1': rng.normal(size=n_rows)
+        })
+    # Assets with a longer history are aligned on the shortest one
+    df_dict['A0'] = pd.concat([df_dict['A0'], df_dict['A0'].iloc[:5]], ignore_index=True)
+    return df_dict
+
+
+def reference_trades(portfolio, cash, prices, allocations, trading_cost, slippage):
+    """Previous per-asset trade loop."""
+    total_value = cash + sum(portfolio[s] * prices[s] for s in portfolio)
+    for i, symbol in enumerate(portfolio):
+        trade_value = allocations[i] * total_value - portfolio[symbol] * prices[symbol]
+        if abs(trade_value) > 0.01:
+            trade_price = prices[symbol] * (1 + np.sign(trade_value) * slippage)
+            portfolio[symbol] += trade_value / trade_price
+            cash -= trade_value + abs(trade_value) * trading_cost
+    return cash
+
+
+class TestTradingEnv(unittest.TestCase):
+    """Test suite for the array-based trading environment"""
+
+    def setUp(self):
+        self.df_dict = market_data()
+        self.env = TradingEnv(self.df_dict, FEATURES, window_size=10)
+        self.rng = np.random.default_rng(1)
+
+    def test_observation_layout(self):
+        env = self.env
+        env.step(np.array([0.2, 0.5, 0.3], dtype=np.float32))
+        observation = env._get_observation()
+
+        expected = np.concatenate([
+            df.iloc[env.current_step - 10:env.current_step][FEATURES].values.flatten()
+            for df in self.df_dict.values()
+        ]).astype(np.float32)
+        feature_dim = len(expected)
+        np.testing.assert_array_equal(observation[:feature_dim], expected)
+        self.assertEqual(observation.shape, env.observation_space.shape)
+        self.assertAlmostEqual(float(observation[feature_dim:feature_dim + 4].sum()), 1.0, places=5)
+
+    def test_accounting_matches_per_asset_loop(self):
+        env = self.env
+        portfolio = {symbol: 0.0 for symbol in env.asset_list}
+        cash = env.initial_balance
+        for _ in range(40):
+            action = self.rng.random(3).astype(np.float32)
+            prices = {s: df['close'].iloc[env.current_step] for s, df in self.df_dict.items()}
+            cash = reference_trades(portfolio, cash, prices, action / action.sum(),
+                                    env.trading_cost, env.slippage)
+            env.step(action)
+
+        self.assertAlmostEqual(env.cash, cash, places=6)
+        for symbol, shares in env.portfolio.items():
+            self.assertAlmostEqual(shares, portfolio[symbol], places=9)
+
+        returns = np.array(env.episode_returns)
+        self.assertAlmostEqual(env.episode_volatility, returns.std())
+        self.assertAlmostEqual(env.episode_sharpe, returns.mean() / returns.std())
+        self.assertAlmostEqual(env._calculate_reward(returns[-1]), returns.mean() / returns.std())
+
+    def test_zero_action_holds_cash(self):
+        _, reward, _, _, info = self.env.step(np.zeros(3, dtype=np.float32))
+        self.assertEqual(info['cash'], self.env.initial_balance)
+        self.assertEqual(info['trades'], 0)
+        self.assertEqual(reward, 0.0)
+
+    def test_vector_env_matches_single_envs(self):
+        num_envs = 4
+        venv = VectorTradingEnv(self.env, num_envs)
+        envs = [TradingEnv(self.df_dict, FEATURES, window_size=10) for _ in range(num_envs)]
+        observations, _ = venv.reset()
+        np.testing.assert_array_equal(observations[0], envs[0].reset()[0])
+
+        done = False
+        while not done:
+            actions = self.rng.random((num_envs, 3)).astype(np.float32)
+            actions[0] = 0
+            observations, rewards, terminated, _, info = venv.step(actions)
+            results = [env.step(action) for env, action in zip(envs, actions)]
+            done = results[0][2]
+
+            final = info['final_obs'] if done else observations
+            np.testing.assert_allclose(final, [r[0] for r in results], rtol=1e-5, atol=1e-6)
+            np.testing.assert_allclose(rewards, [r[1] for r in results], rtol=1e-6, atol=1e-9)
+            np.testing.assert_allclose(info['portfolio_value'], [r[4]['portfolio_value'] for r in results])
+            self.assertEqual(list(info['trades']), [r[4]['trades'] for r in results])
+            self.assertTrue((terminated == done).all())
+
+        # Episodes are reset together
+        np.testing.assert_array_equal(observations, np.stack([env.reset()[0] for env in envs]))
+        self.assertTrue((venv.cash == self.env.initial_balance).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,14 +12,15 @@ import time
 import logging
 import traceback
 from typing import Dict, List, Any, Optional, Union, Tuple
-from datetime import datetime, timedelta
-import requests
+from datetime import date, datetime, timedelta
 from enum import Enum
 from dateutil import parser
 from requests.exceptions import RequestException, Timeout
 from urllib.parse import urljoin
 import pandas as pd
 
+from trading_bot.brokers.http_transport import HttpTransport, RateLimitExceeded, shared_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 class OrderType(Enum):
@@ -106,8 +107,13 @@ class TradierClient:
         # Set up base URL based on environment
         self.base_url = self.SANDBOX_API_BASE_URL if use_sandbox else self.LIVE_API_BASE_URL
         
-        # Rate limiting tracking
-        self._last_request_time = 0
+        # Pooled connections; the rate limit budget is shared by all clients using this key,
+        # at the strictest limit any of them registers
+        self.transport = HttpTransport(
+            headers=self._get_headers(),
+            rate_limiter=shared_rate_limiter(api_key, self.MAX_REQUESTS_PER_SECOND, self.MAX_REQUESTS_PER_SECOND),
+            timeout=timeout
+        )
         
         logger.info(f"Initialized Tradier {'sandbox' if use_sandbox else 'live'} API client")
         
@@ -118,18 +124,6 @@ class TradierClient:
             "Accept": "application/json"
         }
         
-    def _handle_rate_limiting(self):
-        """Handle rate limiting by adding appropriate delays between requests."""
-        current_time = time.time()
-        time_since_last_request = current_time - self._last_request_time
-        
-        # If we've made a request less than 1 second ago, sleep to respect rate limit
-        if time_since_last_request < (1.0 / self.MAX_REQUESTS_PER_SECOND):
-            sleep_time = (1.0 / self.MAX_REQUESTS_PER_SECOND) - time_since_last_request
-            time.sleep(sleep_time)
-            
-        self._last_request_time = time.time()
-        
     def _make_request(
         self, 
         method: str, 
@@ -152,13 +146,11 @@ class TradierClient:
             Dictionary containing the API response
             
         Raises:
-            TradierAPIError: If the API returns an error
+            TradierAPIError: If the API returns an error, or with status 429 if
+                the shared rate limit has no token available
         """
-        # Respect rate limits
-        self._handle_rate_limiting()
-        
-        # Merge default headers with any additional headers
-        request_headers = self._get_headers()
+        # Headers beyond the session defaults
+        request_headers = {}
         
         # Full URL to the API endpoint
         url = urljoin(self.base_url, endpoint)
@@ -173,10 +165,10 @@ class TradierClient:
         
         while attempts < self.max_retries:
             try:
-                response = requests.request(
-                    method=method,
-                    url=url,
-                    headers=request_headers,
+                response = self.transport.request(
+                    method,
+                    url,
+                    headers=request_headers or None,
                     params=params,
                     data=data,
                     json=json_data,
@@ -207,6 +199,9 @@ class TradierClient:
                         response_data=response.text
                     )
                     
+            except RateLimitExceeded as e:
+                # No token left in the budget shared by clients using this key
+                raise TradierAPIError(status_code=429, message=str(e)) from e
             except (RequestException, Timeout) as e:
                 attempts += 1
                 last_exception = e
@@ -14,6 +14,8 @@ from datetime import datetime, timedelta
 import scipy.stats as stats
 import logging
 
+from trading_bot.utils.options_pricing import price_and_greeks_vectorized
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -222,39 +224,8 @@ def black_scholes_price(
     Returns:
         Tuple of (option_price, greeks)
     """
-    if T <= 0:
-        # Handle expired options
-        if option_type == 'call':
-            return max(0, S - K), {'delta': 1 if S > K else 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-        else:
-            return max(0, K - S), {'delta': -1 if S < K else 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-    
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    if option_type == 'call':
-        price = S * stats.norm.cdf(d1) - K * np.exp(-r * T) * stats.norm.cdf(d2)
-        delta = stats.norm.cdf(d1)
-        rho = K * T * np.exp(-r * T) * stats.norm.cdf(d2) / 100
-    else:  # put
-        price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1)
-        delta = stats.norm.cdf(d1) - 1
-        rho = -K * T * np.exp(-r * T) * stats.norm.cdf(-d2) / 100
-    
-    gamma = stats.norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    vega = S * np.sqrt(T) * stats.norm.pdf(d1) / 100
-    theta = (-S * sigma * stats.norm.pdf(d1)) / (2 * np.sqrt(T)) - r * K * np.exp(-r * T) * stats.norm.cdf(d2 if option_type == 'call' else -d2)
-    theta = theta / 365  # Daily theta
-    
-    greeks = {
-        'delta': delta,
-        'gamma': gamma,
-        'theta': theta,
-        'vega': vega,
-        'rho': rho
-    }
-    
-    return price, greeks
+    price, greeks = price_and_greeks_vectorized(S, K, T, r, sigma, option_type)
+    return float(price), {name: float(value) for name, value in greeks.items()}
 
 def price_butterfly_spread(
     butterfly: ButterflySpread,
@@ -279,28 +250,25 @@ def price_butterfly_spread(
     # Convert days to years
     T = days_to_expiration / 365.0
     
-    total_price = 0
-    total_greeks = {'delta': 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-    
-    # Price each leg
-    for leg in butterfly.legs:
-        price, greeks = black_scholes_price(
-            S=underlying_price,
-            K=leg.strike,
-            T=T,
-            r=risk_free_rate,
-            sigma=volatility,
-            option_type=leg.option_type
-        )
-        
-        # Store price and Greeks in leg object
-        leg.price = price
-        leg.greeks = greeks
-        
-        # Add to totals (considering quantity)
-        total_price += price * leg.quantity
-        for greek, value in greeks.items():
-            total_greeks[greek] += value * leg.quantity
+    # Price all legs at once
+    prices, greeks = price_and_greeks_vectorized(
+        S=underlying_price,
+        K=np.array([leg.strike for leg in butterfly.legs], dtype=float),
+        T=T,
+        r=risk_free_rate,
+        sigma=volatility,
+        option_type=[leg.option_type for leg in butterfly.legs]
+    )
+    quantities = np.array([leg.quantity for leg in butterfly.legs], dtype=float)
+    
+    # Store price and Greeks in leg objects
+    for i, leg in enumerate(butterfly.legs):
+        leg.price = float(prices[i])
+        leg.greeks = {greek: float(values[i]) for greek, values in greeks.items()}
+    
+    # Totals (considering quantity)
+    total_price = float(prices @ quantities)
+    total_greeks = {greek: float(values @ quantities) for greek, values in greeks.items()}
     
     # Calculate maximum profit and loss
     # For a balanced butterfly, max profit occurs when underlying = center strike at expiration
@@ -19,6 +19,8 @@ from sklearn.preprocessing import StandardScaler, MinMaxScaler
 from sklearn.feature_selection import SelectKBest, f_regression, mutual_info_regression
 from scipy import stats
 
+from trading_bot.utils.indicator_engine import compute_indicator
+
 try:
     import cudf
     import cupy as cp
@@ -332,7 +334,7 @@ class FeatureEngineering:
         if self.market_regime == "trending" or self.market_regime == "downtrend":
             # Add momentum-focused features for trending markets
             if 'adx' not in df.columns and 'high' in df.columns and 'low' in df.columns:
-                df['adx'] = ta.trend.ADXIndicator(df['high'], df['low'], df['close']).adx()
+                df['adx'] = compute_indicator(df, 'adx', period=14, smoothing='wilder')['adx']
                 
             # Add trend strength metrics
             for period in [10, 20, 50]:
@@ -406,27 +408,26 @@ class FeatureEngineering:
         if 'trend' in ta_feature_sets:
             # Simple Moving Averages
             for period in lookback_periods:
-                df[f'sma_{period}'] = ta.trend.sma_indicator(temp_df['close'], window=period)
+                df[f'sma_{period}'] = compute_indicator(temp_df, 'sma', period=period)
                 
                 # Calculate price relative to SMA as a ratio
                 df[f'close_to_sma_{period}'] = temp_df['close'] / df[f'sma_{period}']
             
             # Exponential Moving Averages
             for period in lookback_periods:
-                df[f'ema_{period}'] = ta.trend.ema_indicator(temp_df['close'], window=period)
+                df[f'ema_{period}'] = compute_indicator(temp_df, 'ema', period=period, min_periods=period)
                 
                 # Calculate price relative to EMA as a ratio
                 df[f'close_to_ema_{period}'] = temp_df['close'] / df[f'ema_{period}']
             
             # Moving Average Convergence Divergence (MACD)
-            macd = ta.trend.MACD(temp_df['close'])
-            df['macd'] = macd.macd()
-            df['macd_signal'] = macd.macd_signal()
-            df['macd_hist'] = macd.macd_diff()
+            macd = compute_indicator(temp_df, 'macd', warmup=True)
+            df['macd'] = macd['macd']
+            df['macd_signal'] = macd['signal']
+            df['macd_hist'] = macd['hist']
             
             # Average Directional Index (ADX) - Trend strength
-            adx = ta.trend.ADXIndicator(temp_df['high'], temp_df['low'], temp_df['close'])
-            df['adx'] = adx.adx()
+            df['adx'] = compute_indicator(temp_df, 'adx', period=14, smoothing='wilder')['adx']
             
             # Additional trend indicators
             df['cci'] = ta.trend.cci(temp_df['high'], temp_df['low'], temp_df['close'])
@@ -443,12 +444,12 @@ class FeatureEngineering:
         # Add momentum indicators
         if 'momentum' in ta_feature_sets:
             # Relative Strength Index (RSI)
-            df['rsi_14'] = ta.momentum.rsi(temp_df['close'], window=14)
+            df['rsi_14'] = compute_indicator(temp_df, 'rsi', period=14, smoothing='wilder')
             
             # Stochastic Oscillator
-            stoch = ta.momentum.StochasticOscillator(temp_df['high'], temp_df['low'], temp_df['close'])
-            df['slowk'] = stoch.stoch()
-            df['slowd'] = stoch.stoch_signal()
+            stoch = compute_indicator(temp_df, 'stochastic', k_period=14, d_period=3)
+            df['slowk'] = stoch['k']
+            df['slowd'] = stoch['d']
             
             # Williams %R
             df['willr'] = ta.momentum.williams_r(temp_df['high'], temp_df['low'], temp_df['close'])
@@ -470,22 +471,19 @@ class FeatureEngineering:
         # Add volatility indicators
         if 'volatility' in ta_feature_sets:
             # Average True Range (ATR)
-            atr = ta.volatility.AverageTrueRange(
-                temp_df['high'], temp_df['low'], temp_df['close'], window=14
-            )
-            df['atr'] = atr.average_true_range()
+            df['atr'] = compute_indicator(temp_df, 'atr', period=14, smoothing='wilder')
             df['atr_percent'] = df['atr'] / temp_df['close'] * 100
             
             # Bollinger Bands
             for period in [20]:  # Standard Bollinger Band period
-                bollinger = ta.volatility.BollingerBands(
-                    temp_df['close'], window=period, window_dev=2
+                bollinger = compute_indicator(temp_df, 'bollinger', period=period, num_std=2, ddof=0)
+                df[f'bb_upper_{period}'] = bollinger['upper']
+                df[f'bb_middle_{period}'] = bollinger['middle']
+                df[f'bb_lower_{period}'] = bollinger['lower']
+                df[f'bb_width_{period}'] = (bollinger['upper'] - bollinger['lower']) / bollinger['middle'] * 100
+                df[f'bb_position_{period}'] = (
+                    (temp_df['close'] - bollinger['lower']) / (bollinger['upper'] - bollinger['lower'])
                 )
-                df[f'bb_upper_{period}'] = bollinger.bollinger_hband()
-                df[f'bb_middle_{period}'] = bollinger.bollinger_mavg()
-                df[f'bb_lower_{period}'] = bollinger.bollinger_lband()
-                df[f'bb_width_{period}'] = bollinger.bollinger_wband()
-                df[f'bb_position_{period}'] = bollinger.bollinger_pband()
             
             # Normalized historical volatility
             for period in lookback_periods:
@@ -994,7 +992,7 @@ class FeatureEngineering:
                 # Calculate moving averages if not already present
                 ma_col = f'sma_{window}'
                 if ma_col not in result_df.columns:
-                    result_df[ma_col] = ta.trend.sma_indicator(result_df['close'], window=window)
+                    result_df[ma_col] = compute_indicator(result_df, 'sma', period=window)
                     
                 # Calculate trend strength
                 result_df[f'trend_strength_{window}'] = (result_df['close'] - result_df[ma_col]) / result_df[ma_col] * 100
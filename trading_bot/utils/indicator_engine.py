@@ -0,0 +1,416 @@
+"""
+Indicator Engine
+
+Shared, vectorized technical indicator library with memoized,
+dependency-aware computation.
+
+Results are cached under (symbol, timeframe, indicator, params, data version)
+with LRU eviction, and indicators that build on each other (MACD on EMAs,
+ATR and ADX on the true range, Bollinger Bands on the SMA and rolling
+standard deviation) resolve their inputs through the same cache. However many
+strategies or feature pipelines ask for an indicator, it is computed once per
+data update.
+
+Callers that track data updates themselves (e.g. a bar count) can pass it as
+``version``; otherwise the version is a hash of the input columns and index.
+"""
+
+import hashlib
+import logging
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Callable, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+IndicatorResult = Union[pd.Series, pd.DataFrame]
+
+
+# ---------------------------------------------------------------------------
+# Indicator functions
+#
+# Each takes the input frame, a dict of resolved dependency results and its
+# parameters, and returns a Series or DataFrame aligned with the input index.
+# ---------------------------------------------------------------------------
+
+def _smooth(series: pd.Series, period: int, smoothing: str) -> pd.Series:
+    """
+    Smooth a series with a simple, Wilder or exponential moving average.
+
+    Wilder smoothing is an EMA with alpha = 1 / period that starts once a full
+    window is available, matching the ``ta`` library.
+    """
+    if smoothing == 'sma':
+        return series.rolling(window=period).mean()
+    elif smoothing == 'wilder':
+        return series.ewm(alpha=1.0 / period, min_periods=period, adjust=False).mean()
+    elif smoothing == 'ema':
+        return series.ewm(span=period, min_periods=period, adjust=False).mean()
+    raise ValueError(f"Unknown smoothing method: {smoothing}")
+
+
+def _sma(data: pd.DataFrame, deps: Dict[str, Any], column: str, period: int) -> pd.Series:
+    return data[column].rolling(window=period).mean()
+
+
+def _ema(data: pd.DataFrame, deps: Dict[str, Any], column: str, period: int,
+         min_periods: int) -> pd.Series:
+    return data[column].ewm(span=period, min_periods=min_periods, adjust=False).mean()
+
+
+def _rolling_std(data: pd.DataFrame, deps: Dict[str, Any], column: str, period: int,
+                 ddof: int) -> pd.Series:
+    return data[column].rolling(window=period).std(ddof=ddof)
+
+
+def _true_range(data: pd.DataFrame, deps: Dict[str, Any]) -> pd.Series:
+    high = data['high'].values
+    low = data['low'].values
+    prev_close = data['close'].shift(1).values
+    # fmax ignores the missing previous close on the first bar (TR = high - low)
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return pd.Series(tr, index=data.index)
+
+
+def _directional_movement(data: pd.DataFrame, deps: Dict[str, Any]) -> pd.DataFrame:
+    up_move = data['high'].diff()
+    down_move = -data['low'].diff()
+    plus_dm = up_move.where((up_move > down_move) & (up_move > 0), 0.0)
+    minus_dm = down_move.where((down_move > up_move) & (down_move > 0), 0.0)
+    return pd.DataFrame({'plus_dm': plus_dm, 'minus_dm': minus_dm}, index=data.index)
+
+
+def _atr(data: pd.DataFrame, deps: Dict[str, Any], period: int, smoothing: str) -> pd.Series:
+    tr = deps['true_range']
+    if smoothing != 'wilder':
+        return _smooth(tr, period, smoothing)
+
+    # Wilder's ATR is seeded with the simple average of the first window
+    seeded = tr.copy()
+    if len(tr) < period:
+        return pd.Series(np.nan, index=tr.index)
+    seeded.iloc[:period - 1] = np.nan
+    seeded.iloc[period - 1] = tr.iloc[:period].mean()
+    return seeded.ewm(alpha=1.0 / period, adjust=False, ignore_na=True).mean()
+
+
+def _rsi(data: pd.DataFrame, deps: Dict[str, Any], column: str, period: int,
+         smoothing: str) -> pd.Series:
+    delta = data[column].diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+
+    avg_gain = _smooth(gain, period, smoothing)
+    avg_loss = _smooth(loss, period, smoothing)
+
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+def _macd(data: pd.DataFrame, deps: Dict[str, Any], column: str, fast_period: int,
+          slow_period: int, signal_period: int, warmup: bool) -> pd.DataFrame:
+    macd = deps['fast'] - deps['slow']
+    signal = macd.ewm(span=signal_period, min_periods=signal_period if warmup else 0,
+                      adjust=False).mean()
+    return pd.DataFrame({'macd': macd, 'signal': signal, 'hist': macd - signal}, index=data.index)
+
+
+def _bollinger(data: pd.DataFrame, deps: Dict[str, Any], column: str, period: int,
+               num_std: float, ddof: int) -> pd.DataFrame:
+    middle = deps['middle']
+    width = deps['std'] * num_std
+    return pd.DataFrame({
+        'upper': middle + width,
+        'middle': middle,
+        'lower': middle - width
+    }, index=data.index)
+
+
+def _stochastic(data: pd.DataFrame, deps: Dict[str, Any], k_period: int, d_period: int,
+                slowing: int) -> pd.DataFrame:
+    lowest = data['low'].rolling(k_period).min()
+    highest = data['high'].rolling(k_period).max()
+    k = 100 * (data['close'] - lowest) / (highest - lowest)
+    if slowing > 1:
+        k = k.rolling(slowing).mean()
+    return pd.DataFrame({'k': k, 'd': k.rolling(d_period).mean()}, index=data.index)
+
+
+def _adx(data: pd.DataFrame, deps: Dict[str, Any], period: int, smoothing: str) -> pd.DataFrame:
+    atr = deps['atr']
+    dm = deps['directional_movement']
+    plus_di = 100 * _smooth(dm['plus_dm'], period, smoothing) / atr
+    minus_di = 100 * _smooth(dm['minus_dm'], period, smoothing) / atr
+    dx = 100 * (plus_di - minus_di).abs() / (plus_di + minus_di)
+    adx = _smooth(dx, period, smoothing)
+    return pd.DataFrame({'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di, 'atr': atr},
+                        index=data.index)
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IndicatorSpec:
+    """Definition of a registered indicator"""
+    name: str
+    function: Callable[..., IndicatorResult]
+    inputs: Callable[[Dict[str, Any]], List[str]]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    dependencies: Callable[[Dict[str, Any]], Dict[str, Tuple[str, Dict[str, Any]]]] = \
+        field(default=lambda params: {})
+
+    def resolve(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Merge parameters over the defaults, rejecting unknown names"""
+        unknown = set(params) - set(self.defaults)
+        if unknown:
+            raise ValueError(f"Unknown parameters for indicator '{self.name}': {sorted(unknown)}")
+        resolved = dict(self.defaults)
+        resolved.update(params)
+        return resolved
+
+
+INDICATORS: Dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(name: str, function: Callable[..., IndicatorResult],
+                       inputs: Union[List[str], Callable[[Dict[str, Any]], List[str]]],
+                       defaults: Optional[Dict[str, Any]] = None,
+                       dependencies: Optional[Callable[[Dict[str, Any]],
+                                                       Dict[str, Tuple[str, Dict[str, Any]]]]] = None) -> None:
+    """
+    Register an indicator with the engine.
+
+    Args:
+        name: Indicator name
+        function: ``function(data, deps, **params)`` returning a Series or DataFrame
+        inputs: Input columns read directly by the function, or a callable
+            mapping the resolved parameters to them
+        defaults: Parameter names and default values
+        dependencies: Callable mapping the resolved parameters to
+            ``{alias: (indicator_name, params)}`` computed first and passed in ``deps``
+    """
+    INDICATORS[name] = IndicatorSpec(
+        name=name,
+        function=function,
+        inputs=inputs if callable(inputs) else (lambda params, columns=list(inputs): columns),
+        defaults=defaults or {},
+        dependencies=dependencies or (lambda params: {})
+    )
+
+
+register_indicator('sma', _sma, lambda p: [p['column']], {'column': 'close', 'period': 20})
+register_indicator('ema', _ema, lambda p: [p['column']],
+                   {'column': 'close', 'period': 20, 'min_periods': 0})
+register_indicator('rolling_std', _rolling_std, lambda p: [p['column']],
+                   {'column': 'close', 'period': 20, 'ddof': 1})
+register_indicator('true_range', _true_range, ['high', 'low', 'close'])
+register_indicator('directional_movement', _directional_movement, ['high', 'low'])
+register_indicator(
+    'atr', _atr, [], {'period': 14, 'smoothing': 'sma'},
+    lambda p: {'true_range': ('true_range', {})}
+)
+register_indicator('rsi', _rsi, lambda p: [p['column']],
+                   {'column': 'close', 'period': 14, 'smoothing': 'sma'})
+register_indicator(
+    'macd', _macd, [],
+    {'column': 'close', 'fast_period': 12, 'slow_period': 26, 'signal_period': 9, 'warmup': False},
+    lambda p: {
+        'fast': ('ema', {'column': p['column'], 'period': p['fast_period'],
+                         'min_periods': p['fast_period'] if p['warmup'] else 0}),
+        'slow': ('ema', {'column': p['column'], 'period': p['slow_period'],
+                         'min_periods': p['slow_period'] if p['warmup'] else 0})
+    }
+)
+register_indicator(
+    'bollinger', _bollinger, [], {'column': 'close', 'period': 20, 'num_std': 2.0, 'ddof': 1},
+    lambda p: {
+        'middle': ('sma', {'column': p['column'], 'period': p['period']}),
+        'std': ('rolling_std', {'column': p['column'], 'period': p['period'], 'ddof': p['ddof']})
+    }
+)
+register_indicator('stochastic', _stochastic, ['high', 'low', 'close'],
+                   {'k_period': 14, 'd_period': 3, 'slowing': 1})
+register_indicator(
+    'adx', _adx, [], {'period': 14, 'smoothing': 'sma'},
+    lambda p: {
+        'atr': ('atr', {'period': p['period'], 'smoothing': p['smoothing']}),
+        'directional_movement': ('directional_movement', {})
+    }
+)
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+class _ComputeContext:
+    """Per-call state: the data, its cache namespace and input fingerprints"""
+
+    __slots__ = ('data', 'symbol', 'timeframe', 'version', '_digests')
+
+    def __init__(self, data: pd.DataFrame, symbol: Optional[str], timeframe: Optional[str],
+                 version: Any):
+        self.data = data
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.version = version
+        self._digests: Dict[str, str] = {}
+
+    def data_version(self, columns: List[str]) -> Any:
+        """Explicit version if given, otherwise a hash of the index and input columns"""
+        if self.version is not None:
+            return self.version
+
+        parts = []
+        for column in ['__index__'] + sorted(columns):
+            digest = self._digests.get(column)
+            if digest is None:
+                if column == '__index__':
+                    values = np.asarray(self.data.index.values)
+                    if values.dtype == object:
+                        values = pd.util.hash_array(values)
+                else:
+                    values = np.asarray(self.data[column].values, dtype=np.float64)
+                digest = hashlib.blake2b(np.ascontiguousarray(values).tobytes(), digest_size=16).hexdigest()
+                self._digests[column] = digest
+            parts.append(digest)
+        return (len(self.data), tuple(parts))
+
+
+class IndicatorEngine:
+    """
+    Memoizing indicator engine.
+
+    Results are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the engine.
+
+        Args:
+            max_entries: Maximum number of cached results (least recently used are evicted)
+        """
+        self.max_entries = max_entries
+        self._cache: 'OrderedDict[Tuple, IndicatorResult]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def compute(self, data: pd.DataFrame, indicator: str, symbol: Optional[str] = None,
+                timeframe: Optional[str] = None, version: Any = None, **params) -> IndicatorResult:
+        """
+        Compute (or fetch from cache) an indicator.
+
+        Args:
+            data: Input data (OHLCV columns as required by the indicator)
+            indicator: Registered indicator name
+            symbol: Symbol namespace for the cache key
+            timeframe: Timeframe namespace for the cache key
+            version: Data version; when None the inputs are hashed
+            **params: Indicator parameters (unspecified ones use defaults)
+
+        Returns:
+            Series or DataFrame aligned with ``data.index``
+        """
+        context = _ComputeContext(data, symbol, timeframe, version)
+        return self._compute(context, indicator, params)
+
+    def _compute(self, context: _ComputeContext, indicator: str,
+                 params: Dict[str, Any]) -> IndicatorResult:
+        spec = INDICATORS.get(indicator)
+        if spec is None:
+            raise KeyError(f"Unknown indicator: {indicator}")
+
+        params = spec.resolve(params)
+        dependencies = spec.dependencies(params)
+        key = (
+            context.symbol, context.timeframe, indicator, tuple(sorted(params.items())),
+            context.data_version(spec.inputs(params) + self._dependency_inputs(dependencies))
+        )
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        deps = {
+            alias: self._compute(context, name, dep_params)
+            for alias, (name, dep_params) in dependencies.items()
+        }
+        result = spec.function(context.data, deps, **params)
+
+        with self._lock:
+            self._cache[key] = result
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return result
+
+    def _dependency_inputs(self, dependencies: Dict[str, Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """All input columns read by a dependency tree"""
+        columns = []
+        for name, params in dependencies.values():
+            spec = INDICATORS[name]
+            resolved = spec.resolve(params)
+            columns.extend(spec.inputs(resolved))
+            columns.extend(self._dependency_inputs(spec.dependencies(resolved)))
+        return sorted(set(columns))
+
+    def invalidate(self, symbol: Optional[str] = None, timeframe: Optional[str] = None) -> int:
+        """
+        Drop cached results.
+
+        Args:
+            symbol: Only drop results for this symbol (all if None)
+            timeframe: Only drop results for this timeframe (all if None)
+
+        Returns:
+            int: Number of entries removed
+        """
+        with self._lock:
+            if symbol is None and timeframe is None:
+                removed = len(self._cache)
+                self._cache.clear()
+                return removed
+
+            keys = [
+                key for key in self._cache
+                if (symbol is None or key[0] == symbol) and (timeframe is None or key[1] == timeframe)
+            ]
+            for key in keys:
+                del self._cache[key]
+            return len(keys)
+
+    def cache_info(self) -> Dict[str, int]:
+        """Cache statistics"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'size': len(self._cache), 'max_entries': self.max_entries}
+
+
+_engine: Optional[IndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Get the process-wide shared indicator engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = IndicatorEngine()
+    return _engine
+
+
+def compute_indicator(data: pd.DataFrame, indicator: str, **kwargs) -> IndicatorResult:
+    """Compute an indicator with the shared engine (see ``IndicatorEngine.compute``)"""
+    return get_indicator_engine().compute(data, indicator, **kwargs)
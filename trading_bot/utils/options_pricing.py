@@ -5,15 +5,384 @@ Options Pricing Models
 
 This module provides implementations of various options pricing models
 including Black-Scholes and Binomial Tree, along with Greeks calculations.
+
+The ``*_vectorized`` functions accept scalars or NumPy arrays (broadcast
+against each other) so a whole options chain can be priced, have its Greeks
+computed, or have its implied volatilities solved in one call. The scalar
+functions are thin wrappers around them.
 """
 
 import logging
 import numpy as np
-from scipy.stats import norm
-from typing import Dict, Any, Optional, List, Tuple
+import pandas as pd
+from scipy.special import ndtr
+from typing import Dict, Any, Optional, List, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+ArrayLike = Union[float, np.ndarray, List[float], pd.Series]
+
+GREEK_NAMES = ['delta', 'gamma', 'theta', 'vega', 'rho']
+SECOND_ORDER_GREEK_NAMES = ['vanna', 'volga', 'charm']
+
+# Implied volatility search bounds (1% to 500%)
+MIN_VOLATILITY = 0.01
+MAX_VOLATILITY = 5.0
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def _norm_pdf(x: np.ndarray) -> np.ndarray:
+    """Standard normal probability density"""
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def is_call_array(option_type: Any) -> np.ndarray:
+    """
+    Convert option types to a boolean "is call" array.
+
+    Args:
+        option_type: 'call'/'put' string, boolean(s), an enum with a 'CALL'/'PUT'
+            value, or an array-like of any of these
+
+    Returns:
+        Boolean array (0-d for scalar input)
+    """
+    if isinstance(option_type, (bool, np.bool_)):
+        return np.asarray(option_type)
+    if isinstance(option_type, str) or hasattr(option_type, 'value'):
+        return np.asarray(str(getattr(option_type, 'value', option_type)).lower() == 'call')
+
+    values = np.asarray(option_type)
+    if values.dtype == bool:
+        return values
+    return np.array([
+        str(getattr(value, 'value', value)).lower() == 'call' for value in values.ravel()
+    ]).reshape(values.shape)
+
+
+def _broadcast(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike, sigma: ArrayLike,
+               option_type: Any) -> Tuple[np.ndarray, ...]:
+    """Broadcast pricing inputs to a common shape as float arrays"""
+    return np.broadcast_arrays(
+        np.asarray(S, dtype=np.float64),
+        np.asarray(K, dtype=np.float64),
+        np.asarray(T, dtype=np.float64),
+        np.asarray(r, dtype=np.float64),
+        np.asarray(sigma, dtype=np.float64),
+        is_call_array(option_type)
+    )
+
+
+def _d1_d2(S: np.ndarray, K: np.ndarray, T: np.ndarray, r: np.ndarray,
+           sigma: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """d1, d2 and sigma * sqrt(T) for live (T > 0, sigma > 0) inputs"""
+    vol_sqrt_t = sigma * np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / vol_sqrt_t
+    return d1, d1 - vol_sqrt_t, vol_sqrt_t
+
+
+def _intrinsic(S: np.ndarray, K: np.ndarray, is_call: np.ndarray) -> np.ndarray:
+    return np.where(is_call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+
+
+def _zero_vol_price(S: np.ndarray, K: np.ndarray, T: np.ndarray, r: np.ndarray,
+                    is_call: np.ndarray) -> np.ndarray:
+    """Value with no volatility: intrinsic value against the discounted strike"""
+    return _intrinsic(S, K * np.exp(-r * np.maximum(T, 0.0)), is_call)
+
+
+def black_scholes_vectorized(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                             sigma: ArrayLike, option_type: Any = 'call') -> np.ndarray:
+    """
+    Calculate option prices using the Black-Scholes model.
+
+    Args:
+        S: Current stock price(s)
+        K: Strike price(s)
+        T: Time(s) to expiration in years
+        r: Risk-free interest rate(s) (annual, decimal)
+        sigma: Volatility(ies) (annual, decimal)
+        option_type: Option type(s), see ``is_call_array``
+
+    Returns:
+        Array of option prices (intrinsic value against the discounted strike
+        where T <= 0 or sigma <= 0)
+    """
+    return price_and_greeks_vectorized(S, K, T, r, sigma, option_type, greeks=False)[0]
+
+
+def price_and_greeks_vectorized(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                                sigma: ArrayLike, option_type: Any = 'call',
+                                greeks: bool = True,
+                                second_order: bool = False) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Calculate Black-Scholes prices and Greeks, sharing d1/d2 between them.
+
+    Theta is per calendar day; vega and rho are per 1% change. Options with
+    T <= 0 or sigma <= 0 are valued at max(S - K*exp(-rT), 0) for calls
+    (max(K*exp(-rT) - S, 0) for puts) with a delta of +/-1 when in the money
+    and all other Greeks zero.
+
+    Args:
+        S: Current stock price(s)
+        K: Strike price(s)
+        T: Time(s) to expiration in years
+        r: Risk-free interest rate(s) (annual, decimal)
+        sigma: Volatility(ies) (annual, decimal)
+        option_type: Option type(s), see ``is_call_array``
+        greeks: Whether to compute Greeks
+        second_order: Whether to add vanna, volga and charm (daily)
+
+    Returns:
+        Tuple of (prices, dict of Greek arrays)
+    """
+    S, K, T, r, sigma, is_call = _broadcast(S, K, T, r, sigma, option_type)
+    live = (T > 0) & (sigma > 0)
+
+    price = _zero_vol_price(S, K, T, r, is_call)
+    names = (GREEK_NAMES + SECOND_ORDER_GREEK_NAMES) if second_order else GREEK_NAMES
+    result = {name: np.zeros(S.shape) for name in names} if greeks else {}
+    if greeks:
+        expired_itm = ~live & (price > 0)
+        result['delta'] = np.where(expired_itm, np.where(is_call, 1.0, -1.0), 0.0)
+
+    if not live.any():
+        return price, result
+
+    if not live.all():
+        S, K, T, r, sigma, is_call = (a[live] for a in (S, K, T, r, sigma, is_call))
+
+    d1, d2, vol_sqrt_t = _d1_d2(S, K, T, r, sigma)
+    discount = K * np.exp(-r * T)
+    sign = np.where(is_call, 1.0, -1.0)
+    nd1 = ndtr(sign * d1)
+    nd2 = ndtr(sign * d2)
+    live_price = sign * (S * nd1 - discount * nd2)
+
+    if live.all():
+        price = live_price
+    else:
+        price[live] = live_price
+
+    if not greeks:
+        return price, result
+
+    pdf_d1 = _norm_pdf(d1)
+    sqrt_t = np.sqrt(T)
+    vega = S * sqrt_t * pdf_d1
+    values = {
+        'delta': sign * nd1,
+        'gamma': pdf_d1 / (S * vol_sqrt_t),
+        'theta': (-(S * sigma * pdf_d1) / (2 * sqrt_t) - sign * r * discount * nd2) / 365.0,
+        'vega': vega / 100,
+        'rho': sign * T * discount * nd2 / 100
+    }
+    if second_order:
+        values['vanna'] = -pdf_d1 * d2 / sigma
+        values['volga'] = vega / 100 * d1 * d2 / sigma
+        values['charm'] = -pdf_d1 * (2 * r * T - d2 * vol_sqrt_t) / (2 * T * vol_sqrt_t) / 365.0
+
+    for name, value in values.items():
+        if live.all():
+            result[name] = value
+        else:
+            result[name][live] = value
+
+    return price, result
+
+
+def calculate_greeks_vectorized(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                                sigma: ArrayLike, option_type: Any = 'call',
+                                second_order: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Calculate Black-Scholes Greeks for arrays of options.
+
+    Args:
+        S, K, T, r, sigma: Standard Black-Scholes parameters (scalars or arrays)
+        option_type: Option type(s), see ``is_call_array``
+        second_order: Whether to add vanna, volga and charm
+
+    Returns:
+        Dictionary of Greek arrays (see ``price_and_greeks_vectorized``)
+    """
+    return price_and_greeks_vectorized(S, K, T, r, sigma, option_type, second_order=second_order)[1]
+
+
+def implied_volatility_vectorized(market_price: ArrayLike, S: ArrayLike, K: ArrayLike,
+                                  T: ArrayLike, r: ArrayLike, option_type: Any = 'call',
+                                  initial_guess: float = 0.3,
+                                  max_iterations: int = 50,
+                                  precision: float = 0.00001) -> np.ndarray:
+    """
+    Solve implied volatilities for arrays of options.
+
+    Runs Newton-Raphson on all options at once, then bisects the options that
+    did not converge (e.g. near-zero vega deep in or out of the money).
+
+    Args:
+        market_price: Market price(s) of the options
+        S, K, T, r: Standard Black-Scholes parameters (scalars or arrays)
+        option_type: Option type(s), see ``is_call_array``
+        initial_guess: Initial volatility guess for Newton iterations
+        max_iterations: Maximum number of Newton iterations
+        precision: Volatility tolerance; Newton stops once its step in sigma
+            (price error / vega) is smaller, so deep out-of-the-money options
+            with tiny prices are still solved to this precision
+
+    Returns:
+        Array of implied volatilities, NaN where no volatility in
+        [MIN_VOLATILITY, MAX_VOLATILITY] reproduces the price
+    """
+    price = np.asarray(market_price, dtype=np.float64)
+    S, K, T, r, price, is_call = _broadcast(S, K, T, r, price, option_type)
+    iv = np.full(S.shape, np.nan)
+
+    # Prices outside the attainable range have no solution
+    low_price = black_scholes_vectorized(S, K, T, r, MIN_VOLATILITY, is_call)
+    high_price = black_scholes_vectorized(S, K, T, r, MAX_VOLATILITY, is_call)
+    valid = ((T > 0) & (price >= _intrinsic(S, K, is_call)) &
+             (price >= low_price) & (price <= high_price))
+    if not valid.any():
+        return iv
+
+    index = np.flatnonzero(valid.ravel())
+    S, K, T, r, price, is_call = (a.ravel()[index] for a in (S, K, T, r, price, is_call))
+    sigma = np.full(len(index), float(initial_guess))
+    converged = np.zeros(len(index), dtype=bool)
+
+    # Newton-Raphson on the options that have not converged yet
+    active = np.arange(len(index))
+    for _ in range(max_iterations):
+        model, greeks = price_and_greeks_vectorized(
+            S[active], K[active], T[active], r[active], sigma[active], is_call[active]
+        )
+        diff = model - price[active]
+        vega = greeks['vega'] * 100
+
+        stalled = vega < 1e-10
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta_sigma = np.where(stalled, np.inf, diff / vega)
+        step = ~stalled & (diff != 0)
+        sigma[active[step]] = np.clip(sigma[active[step]] - delta_sigma[step],
+                                      MIN_VOLATILITY, MAX_VOLATILITY)
+        done = (diff == 0) | (np.abs(delta_sigma) < precision)
+        converged[active[done]] = True
+        step &= ~done
+        active = active[step]
+        if len(active) == 0:
+            break
+
+    # Bisection fallback
+    remaining = np.flatnonzero(~converged)
+    if len(remaining):
+        low = np.full(len(remaining), MIN_VOLATILITY)
+        high = np.full(len(remaining), MAX_VOLATILITY)
+        n_steps = int(np.ceil(np.log2((MAX_VOLATILITY - MIN_VOLATILITY) / precision)))
+        args = (S[remaining], K[remaining], T[remaining], r[remaining])
+        for _ in range(n_steps):
+            mid = (low + high) / 2
+            below = black_scholes_vectorized(*args, mid, is_call[remaining]) < price[remaining]
+            low = np.where(below, mid, low)
+            high = np.where(below, high, mid)
+        sigma[remaining] = (low + high) / 2
+
+    iv.ravel()[index] = sigma
+    return iv
+
+
+def binomial_tree_vectorized(S: ArrayLike, K: ArrayLike, T: ArrayLike, r: ArrayLike,
+                             sigma: ArrayLike, steps: int, option_type: Any = 'call',
+                             american: bool = True) -> np.ndarray:
+    """
+    Price options on Cox-Ross-Rubinstein binomial lattices.
+
+    Each backward step updates every node of every option's lattice at once.
+
+    Args:
+        S, K, T, r, sigma: Standard Black-Scholes parameters (scalars or arrays)
+        steps: Number of time steps in the tree
+        option_type: Option type(s), see ``is_call_array``
+        american: True for American options, False for European
+
+    Returns:
+        Array of option prices (intrinsic value where T <= 0)
+    """
+    if steps <= 0:
+        logger.warning("Binomial tree requires at least 1 step. Using 1 step.")
+        steps = 1
+
+    S, K, T, r, sigma, is_call = _broadcast(S, K, T, r, sigma, option_type)
+    shape = S.shape
+    S, K, T, r, sigma, is_call = (a.ravel() for a in (S, K, T, r, sigma, is_call))
+
+    price = _intrinsic(S, K, is_call)
+    live = T > 0
+    if not live.any():
+        return price.reshape(shape)
+
+    S, K, T, r, sigma, is_call = (a[live][:, None] for a in (S, K, T, r, sigma, is_call))
+    dt = T / steps
+    u = np.exp(sigma * np.sqrt(dt))
+    d = 1 / u
+    growth = np.exp(r * dt)
+    p = (growth - d) / (u - d)
+    discount = 1 / growth
+    sign = np.where(is_call, 1.0, -1.0)
+
+    # Node j at step i has price S * u^(i - 2j)
+    j = np.arange(steps + 1)
+    values = np.maximum(sign * (S * u ** (steps - 2 * j) - K), 0.0)
+
+    for i in range(steps - 1, -1, -1):
+        values = discount * (p * values[:, :i + 1] + (1 - p) * values[:, 1:i + 2])
+        if american:
+            exercise = np.maximum(sign * (S * u ** (i - 2 * j[:i + 1]) - K), 0.0)
+            values = np.maximum(values, exercise)
+
+    price[live] = values[:, 0]
+    return price.reshape(shape)
+
+
+def price_chain(chain: pd.DataFrame, S: float, r: float, price_column: Optional[str] = None,
+                sigma_column: str = 'implied_volatility', second_order: bool = False) -> pd.DataFrame:
+    """
+    Price an options chain and add Greek columns.
+
+    The chain needs 'strike', 'option_type' and either 'T' (years) or
+    'days_to_expiration' columns. If ``price_column`` is given, implied
+    volatilities are solved from it first and written to ``sigma_column``.
+
+    Args:
+        chain: Options chain
+        S: Underlying price
+        r: Risk-free interest rate
+        price_column: Column of market prices to solve implied volatility from
+        sigma_column: Column holding (or receiving) implied volatilities
+        second_order: Whether to add vanna, volga and charm columns
+
+    Returns:
+        Copy of the chain with 'theoretical_price' and Greek columns
+    """
+    result = chain.copy()
+    T = result['T'].values if 'T' in result else result['days_to_expiration'].values / 365.0
+    K = result['strike'].values
+    is_call = is_call_array(result['option_type'].values)
+
+    if price_column is not None:
+        result[sigma_column] = implied_volatility_vectorized(
+            result[price_column].values, S, K, T, r, is_call
+        )
+
+    price, greeks = price_and_greeks_vectorized(
+        S, K, T, r, result[sigma_column].values, is_call, second_order=second_order
+    )
+    result['theoretical_price'] = price
+    for name, values in greeks.items():
+        result[name] = values
+
+    return result
+
 def black_scholes(S: float, K: float, T: float, r: float, sigma: float, 
                  option_type: str = 'call') -> float:
     """
@@ -31,25 +400,7 @@ def black_scholes(S: float, K: float, T: float, r: float, sigma: float,
         Option price
     """
     try:
-        # Handle special cases
-        if T <= 0:
-            # Option is expired
-            if option_type.lower() == 'call':
-                return max(0, S - K)
-            else:
-                return max(0, K - S)
-        
-        # Calculate d1 and d2 parameters
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        # Calculate option price based on type
-        if option_type.lower() == 'call':
-            price = S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
-        else:  # Put option
-            price = K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
-        
-        return price
+        return float(black_scholes_vectorized(S, K, T, r, sigma, option_type))
     
     except Exception as e:
         logger.error(f"Error in Black-Scholes calculation: {e}")
@@ -75,64 +426,14 @@ def calculate_greeks(S: float, K: float, T: float, r: float, sigma: float,
         # Handle special cases
         if T <= 0:
             # Option is expired, all Greeks are zero
-            return {
-                'delta': 0.0, 
-                'gamma': 0.0, 
-                'theta': 0.0, 
-                'vega': 0.0, 
-                'rho': 0.0
-            }
+            return {name: 0.0 for name in GREEK_NAMES}
         
-        # Calculate d1 and d2 parameters
-        d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        # Calculate Greeks
-        
-        # Delta - rate of change of option price with respect to stock price
-        if option_type.lower() == 'call':
-            delta = norm.cdf(d1)
-        else:
-            delta = norm.cdf(d1) - 1
-        
-        # Gamma - rate of change of delta with respect to stock price (same for calls and puts)
-        gamma = norm.pdf(d1) / (S * sigma * np.sqrt(T))
-        
-        # Theta - rate of change of option price with respect to time (per day)
-        if option_type.lower() == 'call':
-            theta = -(S * sigma * norm.pdf(d1)) / (2 * np.sqrt(T)) - r * K * np.exp(-r * T) * norm.cdf(d2)
-        else:
-            theta = -(S * sigma * norm.pdf(d1)) / (2 * np.sqrt(T)) + r * K * np.exp(-r * T) * norm.cdf(-d2)
-        
-        # Convert to daily theta
-        theta = theta / 365.0
-        
-        # Vega - rate of change of option price with respect to volatility (per 1% change)
-        vega = S * np.sqrt(T) * norm.pdf(d1) / 100
-        
-        # Rho - rate of change of option price with respect to interest rate (per 1% change)
-        if option_type.lower() == 'call':
-            rho = K * T * np.exp(-r * T) * norm.cdf(d2) / 100
-        else:
-            rho = -K * T * np.exp(-r * T) * norm.cdf(-d2) / 100
-        
-        return {
-            'delta': delta,
-            'gamma': gamma,
-            'theta': theta,
-            'vega': vega,
-            'rho': rho
-        }
+        greeks = calculate_greeks_vectorized(S, K, T, r, sigma, option_type)
+        return {name: float(value) for name, value in greeks.items()}
     
     except Exception as e:
         logger.error(f"Error in Greeks calculation: {e}")
-        return {
-            'delta': 0.0, 
-            'gamma': 0.0, 
-            'theta': 0.0, 
-            'vega': 0.0, 
-            'rho': 0.0
-        }
+        return {name: 0.0 for name in GREEK_NAMES}
 
 def binomial_tree(S: float, K: float, T: float, r: float, sigma: float, 
                  steps: int, option_type: str = 'call', 
@@ -154,73 +455,37 @@ def binomial_tree(S: float, K: float, T: float, r: float, sigma: float,
         Option price
     """
     try:
-        # Handle special cases
-        if T <= 0:
-            # Option is expired
-            if option_type.lower() == 'call':
-                return max(0, S - K)
-            else:
-                return max(0, K - S)
-        
-        if steps <= 0:
-            logger.warning("Binomial tree requires at least 1 step. Using 1 step.")
-            steps = 1
-        
-        # Time step
-        dt = T / steps
-        
-        # Up and down factors
-        u = np.exp(sigma * np.sqrt(dt))
-        d = 1 / u
-        
-        # Risk-neutral probability
-        p = (np.exp(r * dt) - d) / (u - d)
-        
-        # Initialize stock price tree
-        stock_tree = np.zeros((steps + 1, steps + 1))
-        
-        # Initialize option price tree
-        option_tree = np.zeros((steps + 1, steps + 1))
-        
-        # Build stock price tree
-        for i in range(steps + 1):
-            for j in range(i + 1):
-                stock_tree[j, i] = S * (u ** (i - j)) * (d ** j)
-        
-        # Calculate option value at each leaf node
-        if option_type.lower() == 'call':
-            option_tree[:, steps] = np.maximum(0, stock_tree[:, steps] - K)
-        else:
-            option_tree[:, steps] = np.maximum(0, K - stock_tree[:, steps])
-        
-        # Work backwards through the tree
-        for i in range(steps - 1, -1, -1):
-            for j in range(i + 1):
-                # Option value if held
-                option_held = np.exp(-r * dt) * (p * option_tree[j, i + 1] + (1 - p) * option_tree[j + 1, i + 1])
-                
-                if american:
-                    # Option value if exercised
-                    if option_type.lower() == 'call':
-                        option_exercised = max(0, stock_tree[j, i] - K)
-                    else:
-                        option_exercised = max(0, K - stock_tree[j, i])
-                    
-                    # Choose the maximum value (exercise or hold)
-                    option_tree[j, i] = max(option_held, option_exercised)
-                else:
-                    option_tree[j, i] = option_held
-        
-        return option_tree[0, 0]
+        return float(binomial_tree_vectorized(S, K, T, r, sigma, steps, option_type, american))
     
     except Exception as e:
         logger.error(f"Error in binomial tree calculation: {e}")
         return 0.0
 
+def _check_iv_inputs(market_price: float, S: float, K: float, T: float, r: float,
+                     option_type: str) -> bool:
+    """Log why a scalar implied volatility has no solution; True if it may have one"""
+    if T <= 0:
+        return False
+    
+    # If market price is less than intrinsic value (arbitrage), there is no solution
+    intrinsic = float(_intrinsic(np.asarray(S), np.asarray(K), is_call_array(option_type)))
+    if market_price < intrinsic:
+        logger.warning(f"Market price ({market_price}) below intrinsic value ({intrinsic})")
+        return False
+    
+    # Check if price is within theoretical bounds
+    low_price = black_scholes(S, K, T, r, MIN_VOLATILITY, option_type)
+    high_price = black_scholes(S, K, T, r, MAX_VOLATILITY, option_type)
+    if market_price < low_price or market_price > high_price:
+        logger.warning(f"Market price ({market_price}) outside theoretical bounds: [{low_price}, {high_price}]")
+        return False
+    
+    return True
+
 def implied_volatility(market_price: float, S: float, K: float, T: float, r: float, 
                       option_type: str = 'call', precision: float = 0.0001) -> Optional[float]:
     """
-    Calculate implied volatility using bisection method.
+    Calculate implied volatility (Newton-Raphson with a bisection fallback).
     
     Args:
         market_price: Market price of the option
@@ -235,52 +500,12 @@ def implied_volatility(market_price: float, S: float, K: float, T: float, r: flo
         Implied volatility or None if calculation fails
     """
     try:
-        # Handle special cases
-        if T <= 0:
+        if not _check_iv_inputs(market_price, S, K, T, r, option_type):
             return None
         
-        # Calculate intrinsic value
-        if option_type.lower() == 'call':
-            intrinsic = max(0, S - K)
-        else:
-            intrinsic = max(0, K - S)
-        
-        # If market price is less than intrinsic value (arbitrage), return None
-        if market_price < intrinsic:
-            logger.warning(f"Market price ({market_price}) below intrinsic value ({intrinsic})")
-            return None
-        
-        # Define bounds for IV search (1% to 500%)
-        low = 0.01
-        high = 5.0
-        
-        # Check if price is within theoretical bounds
-        low_price = black_scholes(S, K, T, r, low, option_type)
-        high_price = black_scholes(S, K, T, r, high, option_type)
-        
-        if market_price < low_price or market_price > high_price:
-            logger.warning(f"Market price ({market_price}) outside theoretical bounds: [{low_price}, {high_price}]")
-            return None
-        
-        # Binary search for implied volatility
-        iterations = 0
-        max_iterations = 100
-        
-        while high - low > precision and iterations < max_iterations:
-            mid = (low + high) / 2
-            mid_price = black_scholes(S, K, T, r, mid, option_type)
-            
-            if mid_price < market_price:
-                low = mid
-            else:
-                high = mid
-            
-            iterations += 1
-        
-        if iterations >= max_iterations:
-            logger.warning(f"Implied volatility calculation reached maximum iterations")
-        
-        return (low + high) / 2
+        iv = float(implied_volatility_vectorized(market_price, S, K, T, r, option_type,
+                                                 precision=precision))
+        return None if np.isnan(iv) else iv
     
     except Exception as e:
         logger.error(f"Error calculating implied volatility: {e}")
@@ -294,6 +519,8 @@ def newton_implied_volatility(market_price: float, S: float, K: float, T: float,
     """
     Calculate implied volatility using Newton-Raphson method.
     
+    Falls back to bisection if Newton-Raphson does not converge.
+    
     Args:
         market_price: Market price of the option
         S, K, T, r: Standard Black-Scholes parameters
@@ -306,48 +533,18 @@ def newton_implied_volatility(market_price: float, S: float, K: float, T: float,
         Implied volatility or None if calculation fails
     """
     try:
-        # Handle special cases
-        if T <= 0:
+        if not _check_iv_inputs(market_price, S, K, T, r, option_type):
             return None
         
-        sigma = initial_guess
-        iterations = 0
-        
-        while iterations < max_iterations:
-            # Calculate option price and vega at current sigma
-            price = black_scholes(S, K, T, r, sigma, option_type)
-            greeks = calculate_greeks(S, K, T, r, sigma, option_type)
-            vega = greeks['vega'] * 100  # Convert to per 1.0 change in vol
-            
-            # Calculate price difference
-            price_diff = price - market_price
-            
-            # Check if we've reached desired precision
-            if abs(price_diff) < precision:
-                return sigma
-            
-            # Check for near-zero vega to avoid division by zero
-            if abs(vega) < 1e-10:
-                logger.warning("Vega too small, switching to bisection method")
-                return implied_volatility(market_price, S, K, T, r, option_type, precision)
-            
-            # Update sigma using Newton-Raphson formula
-            sigma = sigma - price_diff / vega
-            
-            # Ensure sigma stays within reasonable bounds (1% to 500%)
-            sigma = max(0.01, min(5.0, sigma))
-            
-            iterations += 1
-        
-        logger.warning(f"Newton method reached maximum iterations ({max_iterations})")
-        
-        # Fall back to bisection method if Newton method didn't converge
-        return implied_volatility(market_price, S, K, T, r, option_type, precision)
+        iv = float(implied_volatility_vectorized(market_price, S, K, T, r, option_type,
+                                                 initial_guess=initial_guess,
+                                                 max_iterations=max_iterations,
+                                                 precision=precision))
+        return None if np.isnan(iv) else iv
     
     except Exception as e:
         logger.error(f"Error in Newton implied volatility calculation: {e}")
-        # Fall back to bisection method
-        return implied_volatility(market_price, S, K, T, r, option_type, precision)
+        return None
 
 def calculate_iv_rank(current_iv: float, historical_iv: List[float]) -> float:
     """
@@ -0,0 +1,145 @@
+"""
+Rolling Window
+
+Fixed-size NumPy ring buffer with O(1) rolling statistics, for per-bar
+updates that would otherwise re-slice or re-concatenate a growing history.
+"""
+
+import numpy as np
+from typing import Optional
+
+
+class RollingWindow:
+    """
+    Fixed-size ring buffer with O(1) rolling sum, mean and variance
+
+    Appending a value overwrites the oldest one once the window is full. The
+    mean and variance are maintained with Welford-style add/replace updates,
+    and are recomputed exactly from the buffer each time the write position
+    wraps around so floating point drift cannot accumulate on long runs.
+    """
+
+    __slots__ = ('size', '_buffer', '_count', '_head', '_mean', '_m2')
+
+    def __init__(self, size: int):
+        """
+        Initialize the rolling window
+
+        Args:
+            size: Maximum number of values retained
+        """
+        if size <= 0:
+            raise ValueError(f"RollingWindow size must be positive, got {size}")
+
+        self.size = size
+        self._buffer = np.zeros(size, dtype=np.float64)
+        self._count = 0
+        self._head = 0  # Next write position
+        self._mean = 0.0
+        self._m2 = 0.0  # Sum of squared deviations from the mean
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        """Whether the window holds ``size`` values"""
+        return self._count == self.size
+
+    @property
+    def last(self) -> Optional[float]:
+        """Most recently appended value"""
+        if self._count == 0:
+            return None
+        return float(self._buffer[self._head - 1])
+
+    def append(self, value: float) -> Optional[float]:
+        """
+        Add a value to the window
+
+        Args:
+            value: Value to add
+
+        Returns:
+            The value evicted from the window, or None if it was not full
+        """
+        value = float(value)
+        evicted = None
+
+        if self._count < self.size:
+            self._count += 1
+            delta = value - self._mean
+            self._mean += delta / self._count
+            self._m2 += delta * (value - self._mean)
+        else:
+            evicted = float(self._buffer[self._head])
+            old_mean = self._mean
+            self._mean += (value - evicted) / self._count
+            self._m2 += (value - evicted) * (value - self._mean + evicted - old_mean)
+
+        self._buffer[self._head] = value
+        self._head += 1
+
+        if self._head == self.size:
+            self._head = 0
+            self._resync()
+
+        return evicted
+
+    def _resync(self) -> None:
+        """Recompute the running moments exactly from the buffer"""
+        values = self._buffer[:self._count]
+        self._mean = float(values.mean())
+        self._m2 = float(((values - self._mean) ** 2).sum())
+
+    def values(self) -> np.ndarray:
+        """Values in the window, oldest first (a copy)"""
+        if self._count < self.size:
+            return self._buffer[:self._count].copy()
+        return np.concatenate([self._buffer[self._head:], self._buffer[:self._head]])
+
+    def sum(self) -> float:
+        """Sum of values in the window"""
+        return self._mean * self._count
+
+    def mean(self) -> Optional[float]:
+        """Mean of values in the window"""
+        if self._count == 0:
+            return None
+        return self._mean
+
+    def var(self, ddof: int = 0) -> Optional[float]:
+        """
+        Variance of values in the window
+
+        Args:
+            ddof: Delta degrees of freedom (0 matches ``np.var``, 1 matches pandas)
+        """
+        if self._count <= ddof:
+            return None
+        return max(self._m2, 0.0) / (self._count - ddof)
+
+    def std(self, ddof: int = 0) -> Optional[float]:
+        """
+        Standard deviation of values in the window
+
+        Args:
+            ddof: Delta degrees of freedom (0 matches ``np.std``, 1 matches pandas)
+        """
+        variance = self.var(ddof)
+        if variance is None:
+            return None
+        return float(np.sqrt(variance))
+
+    def median(self) -> Optional[float]:
+        """Median of values in the window (O(size))"""
+        if self._count == 0:
+            return None
+        return float(np.median(self._buffer[:self._count]))
+
+    def clear(self) -> None:
+        """Remove all values, keeping the allocated buffer"""
+        self._count = 0
+        self._head = 0
+        self._mean = 0.0
+        self._m2 = 0.0
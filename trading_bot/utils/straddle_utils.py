@@ -13,6 +13,8 @@ from typing import Dict, List, Tuple, Any, Optional
 from datetime import datetime, timedelta
 import scipy.stats as stats
 import logging
+
+from trading_bot.utils.options_pricing import price_and_greeks_vectorized
 from scipy.stats import norm
 
 # Setup logging
@@ -40,39 +42,8 @@ def black_scholes_price(
     Returns:
         Tuple of (option_price, greeks)
     """
-    if T <= 0:
-        # Handle expired options
-        if option_type == 'call':
-            return max(0, S - K), {'delta': 1 if S > K else 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-        else:
-            return max(0, K - S), {'delta': -1 if S < K else 0, 'gamma': 0, 'theta': 0, 'vega': 0, 'rho': 0}
-    
-    d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
-    d2 = d1 - sigma * np.sqrt(T)
-    
-    if option_type == 'call':
-        price = S * stats.norm.cdf(d1) - K * np.exp(-r * T) * stats.norm.cdf(d2)
-        delta = stats.norm.cdf(d1)
-        rho = K * T * np.exp(-r * T) * stats.norm.cdf(d2) / 100
-    else:  # put
-        price = K * np.exp(-r * T) * stats.norm.cdf(-d2) - S * stats.norm.cdf(-d1)
-        delta = stats.norm.cdf(d1) - 1
-        rho = -K * T * np.exp(-r * T) * stats.norm.cdf(-d2) / 100
-    
-    gamma = stats.norm.pdf(d1) / (S * sigma * np.sqrt(T))
-    vega = S * np.sqrt(T) * stats.norm.pdf(d1) / 100
-    theta = (-S * sigma * stats.norm.pdf(d1)) / (2 * np.sqrt(T)) - r * K * np.exp(-r * T) * stats.norm.cdf(d2 if option_type == 'call' else -d2)
-    theta = theta / 365  # Daily theta
-    
-    greeks = {
-        'delta': delta,
-        'gamma': gamma,
-        'theta': theta,
-        'vega': vega,
-        'rho': rho
-    }
-    
-    return price, greeks
+    price, greeks = price_and_greeks_vectorized(S, K, T, r, sigma, option_type)
+    return float(price), {name: float(value) for name, value in greeks.items()}
 
 def price_straddle(
     current_price: float,
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Sharded TTL Cache
+
+ShardedTTLCache is an in-memory cache split into independently locked
+shards, with a staleness bound per data type ('quote', 'option_chain',
+...) and hit/miss metrics. It has no dependencies outside the standard
+library so data modules can use it without importing broker clients.
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Callable, Tuple
+
+
+class _Shard:
+    """One independently locked part of a ShardedTTLCache"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Tuple[str, Any], Tuple[Any, float]]' = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.evictions = 0
+
+
+class ShardedTTLCache:
+    """
+    Thread-safe in-memory TTL cache with a staleness bound per data type.
+
+    Entries are spread over shards by key hash so concurrent readers of
+    different symbols rarely contend. Each shard evicts least recently used
+    entries once it is full.
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 10.0,
+                 shards: int = 16, maxsize: int = 20000, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+
+        Args:
+            ttls: Maximum age in seconds per data type
+            default_ttl: Maximum age for data types not in ttls
+            shards: Number of shards
+            maxsize: Maximum number of entries across all shards
+            clock: Monotonic clock in seconds
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self._clock = clock
+        self._shards = [_Shard(max(1, maxsize // shards)) for _ in range(shards)]
+
+    def _shard(self, data_type: str, key: Any) -> _Shard:
+        return self._shards[hash((data_type, key)) % len(self._shards)]
+
+    def ttl(self, data_type: str) -> float:
+        """Staleness bound in seconds for a data type."""
+        return self.ttls.get(data_type, self.default_ttl)
+
+    def get(self, data_type: str, key: Any, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            data_type: Data type, e.g. 'quote'
+            key: Cache key, e.g. the symbol
+            max_age: Tighter staleness bound for this read (seconds)
+
+        Returns:
+            The cached value, or None if missing or too old
+        """
+        bound = self.ttl(data_type) if max_age is None else min(max_age, self.ttl(data_type))
+        shard = self._shard(data_type, key)
+        now = self._clock()
+
+        with shard.lock:
+            entry = shard.entries.get((data_type, key))
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age <= bound:
+                    shard.entries.move_to_end((data_type, key))
+                    shard.hits[data_type] = shard.hits.get(data_type, 0) + 1
+                    return value
+                if age > self.ttl(data_type):
+                    del shard.entries[(data_type, key)]
+            shard.misses[data_type] = shard.misses.get(data_type, 0) + 1
+            return None
+
+    def get_many(self, data_type: str, keys: List[Any], max_age: Optional[float] = None) -> Dict[Any, Any]:
+        """
+        Get cached values for several keys.
+
+        Args:
+            data_type: Data type
+            keys: Cache keys
+            max_age: Tighter staleness bound for this read (seconds)
+
+        Returns:
+            Dict of the keys that were found fresh
+        """
+        found = {}
+        for key in keys:
+            value = self.get(data_type, key, max_age)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(self, data_type: str, key: Any, value: Any, age: float = 0.0) -> None:
+        """
+        Store a value.
+
+        Args:
+            data_type: Data type
+            key: Cache key
+            value: Value to cache
+            age: Seconds since the value was produced (e.g. when loaded from
+                a file cache), counted against its staleness bound
+        """
+        shard = self._shard(data_type, key)
+        now = self._clock() - max(0.0, age)
+        with shard.lock:
+            shard.entries[(data_type, key)] = (value, now)
+            shard.entries.move_to_end((data_type, key))
+            while len(shard.entries) > shard.maxsize:
+                shard.entries.popitem(last=False)
+                shard.evictions += 1
+
+    def set_many(self, data_type: str, values: Dict[Any, Any]) -> None:
+        """Store several values of one data type."""
+        for key, value in values.items():
+            self.set(data_type, key, value)
+
+    def invalidate(self, data_type: Optional[str] = None, key: Any = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            data_type: Only drop this data type (all if None)
+            key: Only drop this key of data_type
+        """
+        if data_type is not None and key is not None:
+            shard = self._shard(data_type, key)
+            with shard.lock:
+                shard.entries.pop((data_type, key), None)
+            return
+
+        for shard in self._shards:
+            with shard.lock:
+                if data_type is None:
+                    shard.entries.clear()
+                else:
+                    for entry_key in [k for k in shard.entries if k[0] == data_type]:
+                        del shard.entries[entry_key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get hit/miss metrics.
+
+        Returns:
+            Dict with totals, hit rate, per data type counts, size and evictions
+        """
+        by_type: Dict[str, Dict[str, int]] = {}
+        size = 0
+        evictions = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+                evictions += shard.evictions
+                for data_type, count in shard.hits.items():
+                    by_type.setdefault(data_type, {'hits': 0, 'misses': 0})['hits'] += count
+                for data_type, count in shard.misses.items():
+                    by_type.setdefault(data_type, {'hits': 0, 'misses': 0})['misses'] += count
+
+        hits = sum(counts['hits'] for counts in by_type.values())
+        misses = sum(counts['misses'] for counts in by_type.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'by_type': by_type,
+            'size': size,
+            'evictions': evictions
+        }